@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+공원 서비스 권역 분석 스크립트
+
+보행 도로망과 공원 CSV로 격자 셀마다 가장 가까운 공원까지 보행 거리를 계산하고,
+공원 유형별 유치거리 밖의 사각지대를 격자(.asc)와 GeoJSON으로 저장합니다.
+
+--scenario를 주면 가상 공원 추가/제거 전후를 OD 거리 캐시로 비교합니다 (지구단위계획 예정지 중첩 분석).
+
+입력: data/인천광역시_미추홀구_도시공원정보_20250105.csv, 도로망 (OSM PBF 또는 GeoJSON)
+출력: output/accessibility/ (시나리오: output/accessibility/scenario/)
+"""
+
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+from src.accessibility import (
+    DEFAULT_CELL_SIZE, DEFAULT_MAX_DISTANCE, DEFAULT_MAX_SNAP, SERVICE_DISTANCES,
+    RoadNetwork, ServiceAreaAnalyzer, service_distance
+)
+from src.od_cache import ODCache, ScenarioAccessibility, load_scenario
+from src.park_catalog import DEFAULT_PARK_CSV, load_parks_from_csv
+
+load_dotenv()
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="공원 서비스 권역(도보 접근성) 분석")
+    parser.add_argument(
+        '--network', default=os.getenv('ROAD_NETWORK_PATH'),
+        help="보행 도로망 파일 (.osm.pbf 또는 GeoJSON, 기본: 환경변수 ROAD_NETWORK_PATH)"
+    )
+    parser.add_argument(
+        '--parks', default=DEFAULT_PARK_CSV,
+        help="공원 정보 CSV"
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=None,
+        help="모든 공원에 같은 유치거리 적용 (미터, 기본: 공원 유형별 "
+             + ', '.join(f"{name} {distance}m" for name, distance in SERVICE_DISTANCES.items()) + ")"
+    )
+    parser.add_argument('--cell-size', type=float, default=DEFAULT_CELL_SIZE, help="격자 셀 크기 (미터)")
+    parser.add_argument(
+        '--max-snap', type=float, default=DEFAULT_MAX_SNAP,
+        help="셀 중심에서 도로까지 이 거리보다 멀면 분석 제외 (미터)"
+    )
+    parser.add_argument(
+        '--max-distance', type=float, default=DEFAULT_MAX_DISTANCE,
+        help="거리 격자 계산 상한 (미터)"
+    )
+    parser.add_argument('--output', default='output/accessibility', help="결과 폴더")
+    parser.add_argument(
+        '--scenario', default=None,
+        help='가상 공원 시나리오 JSON ({"add": [{"name", "lat", "lng", "area", "type"}], "remove": ["공원명"]})'
+    )
+    parser.add_argument(
+        '--od-cache-dir', default=os.getenv('OD_CACHE_DIR', 'output/od_cache'),
+        help="시나리오 분석용 셀-노드 거리 캐시 폴더 (기본: 환경변수 OD_CACHE_DIR 또는 output/od_cache)"
+    )
+    return parser.parse_args()
+
+
+def run_scenario(args, analyzer: ServiceAreaAnalyzer, parks, baseline_summary):
+    """
+    OD 캐시로 시나리오(공원 추가/제거) 전후 비교
+
+    Args:
+        args: 명령행 인자
+        analyzer: 도로망 + 분석 격자
+        parks: 현재 공원 목록
+        baseline_summary: 현재 공원 분석 요약
+    """
+    scenario = load_scenario(args.scenario)
+    threshold = max(service_distance(park, args.threshold) for park in parks + scenario['add'])
+
+    od = ODCache(args.od_cache_dir).load_or_build(analyzer, threshold)
+    state = ScenarioAccessibility(analyzer, od, threshold=args.threshold)
+    for park in parks:
+        state.add_park(park)
+
+    print(f"\n🧪 시나리오: {args.scenario}")
+    for name in scenario['remove']:
+        print(f"   ➖ {name} 제거 ({state.remove_park(name) * 1000:.1f}ms)")
+    for park in scenario['add']:
+        print(f"   ➕ {park['name']} 추가 ({state.add_park(park) * 1000:.1f}ms)")
+
+    result = state.to_service_area()
+    summary = result.summary()
+    paths = result.save(os.path.join(args.output, 'scenario'))
+
+    delta = summary['uncovered_area_km2'] - baseline_summary['uncovered_area_km2']
+    print(f"   권역 안: {summary['coverage_ratio']:.1%} (현재 {baseline_summary['coverage_ratio']:.1%})")
+    print(f"   사각지대: {summary['uncovered_area_km2']:.2f}㎢ ({delta:+.2f}㎢)")
+    for name, path in paths.items():
+        print(f"💾 {name}: {path}")
+
+
+def main():
+    """
+    서비스 권역 분석 실행
+    """
+    args = parse_args()
+    if not args.network:
+        print("❌ 도로망 파일을 지정하세요 (--network 또는 ROAD_NETWORK_PATH)")
+        return
+
+    parks = load_parks_from_csv(args.parks)
+    print(f"🌳 공원 {len(parks)}개")
+
+    started = time.perf_counter()
+    network = RoadNetwork.load(args.network)
+    print(f"🛣️  도로망: 노드 {network.num_nodes:,}개, 간선 {network.num_edges:,}개 "
+          f"({time.perf_counter() - started:.2f}초)")
+
+    started = time.perf_counter()
+    analyzer = ServiceAreaAnalyzer(network, cell_size=args.cell_size, max_snap=args.max_snap,
+                                   max_distance=args.max_distance)
+    print(f"🔲 격자: {analyzer.cols} x {analyzer.rows} ({args.cell_size:g}m), "
+          f"분석 셀 {int(analyzer.valid.sum()):,}개 ({time.perf_counter() - started:.2f}초)")
+
+    result = analyzer.analyze(parks, threshold=args.threshold)
+    summary = result.summary()
+    paths = result.save(args.output)
+
+    print(f"\n📊 서비스 권역 ({summary['elapsed_sec']:.2f}초)")
+    print(f"   권역 안: {summary['covered_cells']:,}셀 ({summary['coverage_ratio']:.1%})")
+    print(f"   사각지대: {summary['uncovered_cells']:,}셀 ({summary['uncovered_area_km2']:.2f}㎢)")
+    print(f"   가장 가까운 공원까지 거리 중앙값: {summary['median_distance_m']}m")
+    for name, path in paths.items():
+        print(f"💾 {name}: {path}")
+
+    if args.scenario:
+        run_scenario(args, analyzer, parks, summary)
+
+
+if __name__ == '__main__':
+    main()
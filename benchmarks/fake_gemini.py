@@ -0,0 +1,346 @@
+"""
+벤치마크용 가짜 Gemini API 서버
+
+google-genai SDK가 호출하는 generateContent 엔드포인트를 흉내 내어
+응답 지연, 503 과부하 비율, 깨진 JSON 비율을 조절할 수 있습니다.
+thinkingConfig의 사고 예산과 maxOutputTokens도 흉내 내어, 사고 토큰이 출력 상한을 잡아먹으면
+응답을 MAX_TOKENS로 잘라 보냅니다.
+GeminiEvaluator(base_url=...) 또는 환경변수 GEMINI_BASE_URL로 연결합니다.
+
+단독 실행:
+    python -m benchmarks.fake_gemini --port 8765 --latency-ms 800 --rate-503 0.1
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+from PIL import Image
+
+from src.image_prep import image_tokens
+
+INDICATORS = ['facility_maintenance', 'rest_facilities', 'greenery_diversity', 'openness', 'aesthetics']
+LEVELS = ['low', 'medium', 'high']
+
+# 깨진 JSON 종류 (모델이 실제로 내놓는 형태)
+MALFORMED_KINDS = ['truncated', 'trailing_comma', 'fenced', 'prose']
+
+
+class FakeGeminiConfig:
+    """가짜 서버 동작 설정"""
+
+    def __init__(
+        self,
+        latency_ms: float = 500.0,
+        jitter_ms: float = 100.0,
+        rate_503: float = 0.0,
+        malformed_rate: float = 0.0,
+        not_visible_rate: float = 0.2,
+        consistency: float = 0.0,
+        thinking_tokens: int = 0,
+        ms_per_token: float = 0.0,
+        reason_chars: int = 0,
+        seed: int = 0
+    ):
+        """
+        초기화
+
+        Args:
+            latency_ms: 평균 응답 지연 (밀리초)
+            jitter_ms: 지연 표준편차 (밀리초)
+            rate_503: 503 과부하 응답 비율 (0~1)
+            malformed_rate: 깨진 JSON 응답 비율 (0~1)
+            not_visible_rate: 모든 항목이 not_visible인 응답 비율 (0~1)
+            consistency: 같은 이미지에 항목별 고정 등급을 답할 확률 (0이면 매번 무작위, 합의 평가 벤치마크용)
+            thinking_tokens: 사고 예산을 지정하지 않은 요청의 평균 사고 토큰 (모델 기본 동적 사고)
+            ms_per_token: 사고/출력 토큰당 추가 지연 (밀리초)
+            reason_chars: reason 길이 (0이면 짧은 고정 문구, 스키마 maxLength가 있으면 그 안으로 자름)
+            seed: 난수 시드
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_503 = rate_503
+        self.malformed_rate = malformed_rate
+        self.not_visible_rate = not_visible_rate
+        self.consistency = consistency
+        self.thinking_tokens = thinking_tokens
+        self.ms_per_token = ms_per_token
+        self.reason_chars = reason_chars
+        self.seed = seed
+
+
+class FakeGeminiServer:
+    """가짜 Gemini API 서버 (백그라운드 스레드)"""
+
+    def __init__(self, config: FakeGeminiConfig = None, port: int = 0):
+        """
+        초기화
+
+        Args:
+            config: 서버 동작 설정
+            port: 포트 (0이면 빈 포트 자동 선택)
+        """
+        self.config = config or FakeGeminiConfig()
+        self.port = port
+        self.server = None
+        self.thread = None
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0, 'errors_503': 0, 'malformed': 0, 'not_visible': 0, 'request_bytes': 0,
+            'prescreen_requests': 0, 'thoughts_tokens': 0, 'truncated': 0,
+        }
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    def start(self):
+        """서버 시작"""
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length)
+                status, payload = fake.handle(self.path, body)
+
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # 로그 출력 억제
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _roll(self, rate: float) -> bool:
+        with self._lock:
+            return self._random.random() < rate
+
+    def handle(self, path: str, body: bytes):
+        """
+        요청 하나 처리
+
+        Args:
+            path: 요청 경로 (/v1beta/models/{model}:generateContent)
+            body: 요청 본문
+
+        Returns:
+            (HTTP 상태 코드, 응답 JSON)
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['request_bytes'] += len(body)
+            delay = max(0.0, self._random.gauss(self.config.latency_ms, self.config.jitter_ms)) / 1000
+
+        time.sleep(delay)
+
+        if ':generateContent' not in path:
+            return 404, {'error': {'code': 404, 'message': f'Unknown path: {path}', 'status': 'NOT_FOUND'}}
+
+        if self._roll(self.config.rate_503):
+            with self._lock:
+                self.stats['errors_503'] += 1
+            return 503, {'error': {
+                'code': 503,
+                'message': 'The model is overloaded. Please try again later.',
+                'status': 'UNAVAILABLE',
+            }}
+
+        request = json.loads(body or b'{}')
+        generation_config = request.get('generationConfig', {})
+        text, finish_reason = self._make_text(request)
+        parts = [part for content in request.get('contents', []) for part in content.get('parts', [])]
+        prompt_tokens = (
+            sum(self._image_tokens(part['inlineData']) for part in parts if 'inlineData' in part)
+            + sum(len(part.get('text', '')) for part in parts) // 2  # 한글 약 2자당 1토큰
+        )
+
+        # 사고 토큰: 예산이 있으면 예산의 50~100%, 없으면 설정값 ±50% (동적 사고)
+        thinking_config = generation_config.get('thinkingConfig', {})
+        budget = thinking_config.get('thinkingBudget', thinking_config.get('thinking_budget'))
+        with self._lock:
+            if budget is None:
+                thoughts_tokens = int(self.config.thinking_tokens * self._random.uniform(0.5, 1.5))
+            else:
+                thoughts_tokens = int(budget * self._random.uniform(0.5, 1.0))
+
+        # gemini-2.5처럼 사고 토큰도 출력 상한에 포함
+        candidate_tokens = len(text) // 2
+        max_output = generation_config.get('maxOutputTokens')
+        if max_output and thoughts_tokens + candidate_tokens > max_output:
+            thoughts_tokens = min(thoughts_tokens, max_output)
+            candidate_tokens = max_output - thoughts_tokens
+            text = text[:candidate_tokens * 2]
+            finish_reason = 'MAX_TOKENS'
+
+        with self._lock:
+            self.stats['thoughts_tokens'] += thoughts_tokens
+            if finish_reason == 'MAX_TOKENS':
+                self.stats['truncated'] += 1
+
+        if self.config.ms_per_token:
+            time.sleep((thoughts_tokens + candidate_tokens) * self.config.ms_per_token / 1000)
+
+        return 200, {
+            'candidates': [{
+                'content': {'parts': [{'text': text}], 'role': 'model'},
+                'finishReason': finish_reason,
+                'index': 0,
+            }],
+            'usageMetadata': {
+                'promptTokenCount': prompt_tokens,
+                'candidatesTokenCount': candidate_tokens,
+                'thoughtsTokenCount': thoughts_tokens,
+                'totalTokenCount': prompt_tokens + candidate_tokens + thoughts_tokens,
+            },
+            'modelVersion': path.split('/models/')[-1].split(':')[0],
+        }
+
+    @staticmethod
+    def _image_tokens(inline_data: Dict) -> int:
+        """이미지 크기로 입력 토큰 계산 (Gemini 타일 규칙, 읽을 수 없으면 258)"""
+        try:
+            # SDK는 URL-safe base64로 보냄
+            with Image.open(io.BytesIO(base64.urlsafe_b64decode(inline_data.get('data', '')))) as img:
+                return image_tokens(*img.size)
+        except Exception:
+            return 258
+
+    def _make_text(self, request: Dict):
+        """평가 JSON 텍스트 생성 (설정 비율에 따라 깨뜨림)"""
+        not_visible = self._roll(self.config.not_visible_rate)
+
+        # 가시성 사전 판별 요청 (응답 스키마에 park_visible이 있는 경우)
+        if 'park_visible' in json.dumps(request.get('generationConfig', {})):
+            with self._lock:
+                self.stats['prescreen_requests'] += 1
+                if not_visible:
+                    self.stats['not_visible'] += 1
+            text = json.dumps({
+                'park_visible': not not_visible,
+                'reason': '가짜 응답: 공원 가려짐' if not_visible else '가짜 응답: 공원 보임',
+            }, ensure_ascii=False)
+            return text, 'STOP'
+
+        # 이미지별 고정 등급 (같은 이미지면 항상 같은 값)
+        image_key = ''.join(
+            part['inlineData'].get('data', '')[:4096]
+            for content in request.get('contents', [])
+            for part in content.get('parts', [])
+            if 'inlineData' in part
+        )
+
+        # reason 길이 (응답 스키마의 maxLength를 지킴)
+        reason_chars = self.config.reason_chars
+        limit = re.search(r'"max_?[lL]ength":\s*"?(\d+)', json.dumps(request.get('generationConfig', {})))
+        if limit and reason_chars:
+            reason_chars = min(reason_chars, int(limit.group(1)))
+
+        with self._lock:
+            result = {}
+            for indicator in INDICATORS:
+                if not_visible:
+                    level = 'not_visible'
+                elif self._random.random() < self.config.consistency:
+                    digest = hashlib.md5(f'{self.config.seed}:{indicator}:{image_key}'.encode()).digest()
+                    level = LEVELS[digest[0] % len(LEVELS)]
+                else:
+                    level = self._random.choice(LEVELS)
+                reason = f'가짜 응답: {indicator} {level}'
+                if reason_chars:
+                    reason = (reason + ' ' + '관찰 내용 ' * (reason_chars // 6 + 1))[:reason_chars]
+                result[indicator] = {'level': level, 'reason': reason}
+            result['summary'] = '벤치마크용 가짜 평가'
+
+            if not_visible:
+                self.stats['not_visible'] += 1
+
+        text = json.dumps(result, ensure_ascii=False)
+
+        if not self._roll(self.config.malformed_rate):
+            return text, 'STOP'
+
+        with self._lock:
+            self.stats['malformed'] += 1
+            kind = self._random.choice(MALFORMED_KINDS)
+
+        if kind == 'truncated':
+            return text[:int(len(text) * 0.8)], 'MAX_TOKENS'
+        if kind == 'trailing_comma':
+            return text[:-1] + ',}', 'STOP'
+        if kind == 'fenced':
+            return f'```json\n{text}\n```', 'STOP'
+        return f'평가 결과입니다:\n{text}', 'STOP'
+
+
+def main():
+    """가짜 서버 단독 실행"""
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 Gemini API 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=500.0)
+    parser.add_argument('--jitter-ms', type=float, default=100.0)
+    parser.add_argument('--rate-503', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--not-visible-rate', type=float, default=0.2)
+    parser.add_argument('--consistency', type=float, default=0.0)
+    parser.add_argument('--thinking-tokens', type=int, default=0)
+    parser.add_argument('--ms-per-token', type=float, default=0.0)
+    parser.add_argument('--reason-chars', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeGeminiConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_503=args.rate_503,
+        malformed_rate=args.malformed_rate,
+        not_visible_rate=args.not_visible_rate,
+        consistency=args.consistency,
+        thinking_tokens=args.thinking_tokens,
+        ms_per_token=args.ms_per_token,
+        reason_chars=args.reason_chars,
+        seed=args.seed
+    )
+    server = FakeGeminiServer(config, port=args.port).start()
+    print(f"가짜 Gemini 서버 실행 중: {server.base_url} (Ctrl+C로 종료)")
+    print(f"GEMINI_BASE_URL={server.base_url}")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1125 @@
+"""
+오프라인 벤치마크
+
+실제 API 키 없이 캡처/평가 경로의 처리량과 지연 시간을 측정합니다.
+- 캡처: 템플릿 서버가 가짜 kakao.maps SDK(benchmarks/static/fake_kakao_sdk.js)를 서빙
+- 평가: 가짜 Gemini 서버(benchmarks/fake_gemini.py)에 연결
+
+결과는 임시 폴더([tmp]/park_benchmarks/benchmark_[시각].json, --output으로 변경)에 저장되며,
+--baseline으로 이전 결과를 주면 허용 범위를 넘는 성능 저하가 있을 때 종료 코드 1을 반환합니다.
+
+사용법:
+    python -m benchmarks.run_benchmarks                         # 전체
+    python -m benchmarks.run_benchmarks evaluate evaluate_script  # 일부만
+    python -m benchmarks.run_benchmarks --output output/benchmarks/baseline.json  # 기준 결과 저장
+    python -m benchmarks.run_benchmarks --baseline output/benchmarks/baseline.json
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from src.instrumentation import build_summary, load_trace, percentile, tracer
+from benchmarks.fake_gemini import FakeGeminiConfig, FakeGeminiServer
+
+REPO_ROOT = Path(__file__).parent.parent
+STATIC_DIR = Path(__file__).parent / 'static'
+PARK_CSV = REPO_ROOT / 'data' / '인천광역시_미추홀구_도시공원정보_20250105.csv'
+
+logger = logging.getLogger(__name__)
+
+
+def fake_sdk_url(args) -> str:
+    """가짜 SDK 스크립트 주소 (템플릿 서버 기준 상대 경로)"""
+    return (
+        f"/fake_kakao_sdk.js?no_pano_rate={args.no_pano_rate}"
+        f"&render_ms={args.render_ms}&hang_rate={args.hang_rate}&seed={args.seed}"
+        f"&extras={int(args.sdk_extras)}"
+    )
+
+
+def make_synthetic_images(root: Path, num_parks: int, per_park: int, size=(2560, 1440)) -> List[Path]:
+    """
+    평가용 합성 이미지 생성 (하늘/도로/나무 모양 + 사진 같은 질감)
+
+    Args:
+        root: 공원 폴더 상위 경로
+        num_parks: 공원 수
+        per_park: 공원당 이미지 수
+        size: 이미지 크기
+
+    Returns:
+        생성된 이미지 경로 리스트
+    """
+    paths = []
+    width, height = size
+    rng = np.random.default_rng(0)
+
+    for park_idx in range(num_parks):
+        park_folder = root / f'벤치공원{park_idx + 1:02d}'
+        park_folder.mkdir(parents=True, exist_ok=True)
+
+        for img_idx in range(per_park):
+            image = Image.new('RGB', size, (170, 200, 230))
+            draw = ImageDraw.Draw(image)
+            draw.rectangle([0, height // 2, width, height], fill=(90, 90, 85))
+
+            for tree in range(12):
+                x = (tree * 211 + img_idx * 97 + park_idx * 53) % width
+                radius = 60 + (tree * 37 + img_idx * 11) % 120
+                draw.ellipse([x - radius, height // 2 - 2 * radius, x + radius, height // 2],
+                             fill=(40, 110 + tree * 5 % 60, 50))
+
+            # 단색 면이 품질 검사에서 누락 타일로 잡히지 않도록 저주파 질감 추가
+            texture = rng.normal(128, 12, (height // 8, width // 8)).clip(0, 255).astype(np.uint8)
+            texture = np.asarray(Image.fromarray(texture).resize(size, Image.BILINEAR), dtype=np.int16) - 128
+            pixels = np.asarray(image, dtype=np.int16) + texture[:, :, None]
+            image = Image.fromarray(pixels.clip(0, 255).astype(np.uint8))
+
+            path = park_folder / f'방향{img_idx + 1}.jpg'
+            image.save(path, format='JPEG', quality=90)
+            paths.append(path)
+
+    return paths
+
+
+def summarize_latencies(latencies: List[float], elapsed: float, extra: Dict = None) -> Dict:
+    """
+    지연 시간 리스트와 경과 시간으로 결과 생성 (tracer 단계별 집계 포함)
+
+    Args:
+        latencies: 항목별 소요 시간 (초)
+        elapsed: 전체 경과 시간 (초)
+        extra: 결과에 추가할 값
+
+    Returns:
+        벤치마크 결과 딕셔너리
+    """
+    values = sorted(latencies)
+    stage_summary = tracer.summary()
+
+    result = {
+        'items': len(values),
+        'elapsed_sec': round(elapsed, 3),
+        'throughput_per_sec': round(len(values) / elapsed, 3) if elapsed > 0 else 0.0,
+        'latency': {
+            'p50': round(percentile(values, 50), 4),
+            'p95': round(percentile(values, 95), 4),
+            'p99': round(percentile(values, 99), 4),
+            'max': round(values[-1], 4) if values else 0.0,
+        },
+        'stages': stage_summary['stages'],
+        'counters': stage_summary['counters'],
+    }
+    if extra:
+        result.update(extra)
+    return result
+
+
+def bench_capture(args, workdir: Path) -> Dict:
+    """capture_roadview_multidir: 한 세션에서 샘플 포인트 연속 캡처 (--viewpoints면 추가 시점 포함)"""
+    from src.roadview_client import RoadviewClient, parse_viewpoints
+    from src.park_sampler import ParkSampler
+    from src.network_cache import NetworkCache
+
+    viewpoints = parse_viewpoints(args.viewpoints)
+
+    # 가짜 SDK는 템플릿 서버(localhost)에서 오므로 localhost 요청을 기록/재생
+    network_cache = None
+    if args.network_cache != 'off':
+        network_cache = NetworkCache(str(workdir / 'network_cache'), mode=args.network_cache,
+                                     hosts=('localhost', '127.0.0.1'))
+
+    client = RoadviewClient(api_key='fake', port=args.port, sdk_url=fake_sdk_url(args),
+                            static_dir=str(STATIC_DIR), network_cache=network_cache,
+                            profile=args.capture_profile)
+    points = ParkSampler().generate_circular_points(
+        park_name='벤치공원', center_lat=37.441929, center_lng=126.654533,
+        radius_meters=40, num_directions=args.captures
+    )
+
+    latencies = []
+    successes = 0
+    client.open(headless=True)
+    started = time.perf_counter()
+
+    try:
+        for point in points:
+            t0 = time.perf_counter()
+            success = client.capture_roadview_multidir(
+                sample_lat=point['sample_lat'],
+                sample_lng=point['sample_lng'],
+                target_lat=point['target_lat'],
+                target_lng=point['target_lng'],
+                output_path=str(workdir / 'capture' / f"{point['direction']}.jpg"),
+                width=args.width,
+                height=args.height,
+                timeout=args.capture_timeout,
+                viewpoints=viewpoints
+            )
+            latencies.append(time.perf_counter() - t0)
+            successes += int(success)
+    finally:
+        client.close()
+
+    return summarize_latencies(latencies, time.perf_counter() - started, {
+        'successes': successes,
+        'images': successes * (1 + len(viewpoints)),
+        'viewpoints': [viewpoint['name'] for viewpoint in viewpoints],
+        'network_cache': network_cache.report() if network_cache else None,
+        'capture_profile': args.capture_profile,
+    })
+
+
+def bench_adaptive(args, workdir: Path) -> Dict:
+    """capture_park_adaptive: CSV 앞쪽 공원들을 적응형 캡처"""
+    from src.roadview_client import RoadviewClient
+    from src.park_sampler import ParkSampler
+    from src.adaptive_capture import AdaptiveCaptureManager
+    from src.park_catalog import load_parks_from_csv
+
+    parks = load_parks_from_csv(str(PARK_CSV))[:args.parks]
+    client = RoadviewClient(api_key='fake', port=args.port, sdk_url=fake_sdk_url(args),
+                            static_dir=str(STATIC_DIR))
+    manager = AdaptiveCaptureManager(client, ParkSampler())
+
+    latencies = []
+    images = 0
+    client.open(headless=True)
+    started = time.perf_counter()
+
+    try:
+        for park in parks:
+            t0 = time.perf_counter()
+            success, _, _ = manager.capture_park_adaptive(
+                park_name=park['name'],
+                center_lat=park['lat'],
+                center_lng=park['lng'],
+                park_type=park['type'],
+                area_sqm=park['area'],
+                num_directions=park['num_directions'],
+                output_folder=str(workdir / 'adaptive' / park['name']),
+                min_success_rate=0.6,
+                max_radius_multiplier=2.5,
+                radius_increment=0.4,
+                width=args.width,
+                height=args.height
+            )
+            latencies.append(time.perf_counter() - t0)
+            images += success
+    finally:
+        client.close()
+
+    return summarize_latencies(latencies, time.perf_counter() - started, {'images': images})
+
+
+def bench_evaluate(args, workdir: Path) -> Dict:
+    """evaluate_image: 합성 이미지를 가짜 Gemini 서버로 평가"""
+    from src.gemini_evaluator import GeminiEvaluator
+
+    images = make_synthetic_images(workdir / 'evaluate', num_parks=1, per_park=args.images)
+
+    with FakeGeminiServer(gemini_config(args)) as server:
+        evaluator = GeminiEvaluator(api_key='fake', base_url=server.base_url, prescreen=args.prescreen)
+        evaluator.retry_policy.base_wait = args.retry_wait
+        evaluator.consensus_samples = args.consensus
+        evaluator.consensus_agreement = args.agreement
+        evaluate = evaluator.evaluate_image_consensus if args.consensus > 1 else evaluator.evaluate_image
+
+        latencies = []
+        failures = 0
+        started = time.perf_counter()
+
+        for path in images:
+            t0 = time.perf_counter()
+            try:
+                evaluate(str(path), park_name=path.parent.name, direction=path.stem)
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - t0)
+
+        elapsed = time.perf_counter() - started
+
+    return summarize_latencies(latencies, elapsed, {
+        'failures': failures,
+        'api_requests': server.stats['requests'],
+        'request_bytes': server.stats['request_bytes'],
+        'server_503': server.stats['errors_503'],
+        'server_malformed': server.stats['malformed'],
+        'decode_stats': dict(evaluator.decode_stats),
+        'prescreen': args.prescreen,
+        'prescreen_stats': dict(evaluator.prescreen_stats),
+        'consensus': evaluator.consensus_report() if args.consensus > 1 else None,
+        'circuit_breaker': evaluator.breaker.snapshot(),
+    })
+
+
+def run_script(command: List[str], cwd: Path, env: Dict, trace_path: Path) -> Dict:
+    """
+    엔트리 스크립트를 하위 프로세스로 실행하고 트레이스로 결과 생성
+
+    Args:
+        command: 실행할 명령
+        cwd: 작업 폴더 (output/이 이 아래에 생성됨)
+        env: 추가 환경변수
+        trace_path: 스크립트가 기록할 트레이스 경로
+
+    Returns:
+        벤치마크 결과 딕셔너리
+    """
+    full_env = dict(os.environ)
+    full_env.update(env)
+    full_env['PYTHONPATH'] = str(REPO_ROOT) + os.pathsep + full_env.get('PYTHONPATH', '')
+
+    started = time.perf_counter()
+    completed = subprocess.run(command + ['--trace', str(trace_path)], cwd=cwd, env=full_env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - started
+
+    if completed.returncode != 0:
+        logger.error(completed.stderr[-2000:])
+
+    summary = load_trace([trace_path]) if trace_path.exists() else build_summary({}, {}, 0)
+    return {
+        'returncode': completed.returncode,
+        'elapsed_sec': round(elapsed, 3),
+        'stages': summary['stages'],
+        'counters': summary['counters'],
+        'throughput_per_hour': summary['throughput_per_hour'],
+    }
+
+
+def bench_evaluate_script(args, workdir: Path) -> Dict:
+    """evaluate_parks.py 전체 실행 (가짜 Gemini 서버)"""
+    cwd = workdir / 'evaluate_script'
+    make_synthetic_images(cwd / 'output' / 'roadview_images', num_parks=args.parks, per_park=args.images_per_park)
+
+    with FakeGeminiServer(gemini_config(args)) as server:
+        result = run_script(
+            [sys.executable, str(REPO_ROOT / 'evaluate_parks.py')],
+            cwd=cwd,
+            env={
+                'GEMINI_API_KEY': 'fake',
+                'GEMINI_BASE_URL': server.base_url,
+                'GEMINI_RETRY_WAIT': str(args.retry_wait),
+                'GEMINI_PRESCREEN': args.prescreen or '',
+                'IMAGE_DEDUP': '1' if args.dedup else '',
+            },
+            trace_path=cwd / 'trace.jsonl'
+        )
+        result['api_requests'] = server.stats['requests']
+
+    return result
+
+
+def bench_capture_script(args, workdir: Path) -> Dict:
+    """capture_all_parks.py 전체 실행 (가짜 kakao.maps SDK, CSV 앞쪽 N개 공원)"""
+    cwd = workdir / 'capture_script'
+    (cwd / 'data').mkdir(parents=True, exist_ok=True)
+
+    # 공원 수를 줄인 CSV 복사본
+    with open(PARK_CSV, 'r', encoding='utf-8-sig') as f:
+        rows = list(csv.reader(f))
+    with open(cwd / 'data' / PARK_CSV.name, 'w', encoding='utf-8-sig', newline='') as f:
+        csv.writer(f).writerows(rows[:args.parks + 1])
+
+    result = run_script(
+        [sys.executable, str(REPO_ROOT / 'scripts' / 'capture_all_parks.py'),
+         '--workers', str(args.workers), '--base-port', str(args.port),
+         '--schedule', args.schedule, '--capture-profile', args.capture_profile, '--cache-dir', str(cwd / 'browser_cache') if args.browser_cache else ''],
+        cwd=cwd,
+        env={
+            'KAKAO_API_KEY': 'fake',
+            'KAKAO_SDK_URL': fake_sdk_url(args),
+            'ROADVIEW_STATIC_DIR': str(STATIC_DIR),
+        },
+        trace_path=cwd / 'trace.jsonl'
+    )
+
+    # capture_all_parks.py는 예외를 잡고 종료 코드 0으로 끝나므로 (예: Chromium 없음) 실제 캡처 여부로 판정
+    result['images'] = len(list((cwd / 'output' / 'roadview_images').glob('*/*.jpg')))
+    if not result['counters'].get('capture.success') or not result['images']:
+        raise RuntimeError(f"캡처된 이미지가 없습니다 (종료 코드 {result['returncode']}, 브라우저 설치 확인)")
+    return result
+
+
+def bench_schedule(args, workdir: Path) -> Dict:
+    """캡처 순서 방식별 공원 간 이동 거리와 워커 구간 균형 (브라우저 없이 계산만)"""
+    from src.park_catalog import load_parks_from_csv
+    from src.capture_pool import group_parks_by_folder
+    from src.capture_scheduler import SCHEDULE_METHODS, order_tasks, partition_tasks, tour_length_m
+
+    tasks = group_parks_by_folder(load_parks_from_csv(str(PARK_CSV)))
+    num_workers = max(2, args.workers)
+
+    methods = {}
+    latencies = []
+    started = time.perf_counter()
+    for method in SCHEDULE_METHODS:
+        t0 = time.perf_counter()
+        ordered = order_tasks(tasks, method)
+        chunks = partition_tasks(ordered, num_workers)
+        latencies.append(time.perf_counter() - t0)
+
+        points = [(task[0]['lat'], task[0]['lng']) for task in ordered]
+        directions = [sum(park['num_directions'] for task in chunk for park in task) for chunk in chunks]
+        # 워커 구간 안에서의 이동 거리 합 (구간이 지리적으로 뭉쳐 있을수록 짧음)
+        worker_tour = sum(
+            tour_length_m([(task[0]['lat'], task[0]['lng']) for task in chunk]) for chunk in chunks
+        )
+        methods[method] = {
+            'tour_km': round(tour_length_m(points) / 1000, 2),
+            'worker_tour_km': round(worker_tour / 1000, 2),
+            'directions_per_worker': directions,
+        }
+        print(f"   [{method}] 이동 {methods[method]['tour_km']}km, "
+              f"워커 {num_workers}개 구간 내 이동 {methods[method]['worker_tour_km']}km, 방향 수 {directions}")
+
+    return summarize_latencies(latencies, time.perf_counter() - started, {'methods': methods})
+
+
+def make_grid_network(parks: List[Dict], spacing: float, seed: int, margin_m: float = 1000.0):
+    """
+    공원 좌표를 덮는 합성 보행 도로망 (좌표를 흔든 격자, 간선 일부 제거)
+
+    Args:
+        parks: 공원 정보 리스트
+        spacing: 도로 간격 (미터)
+        seed: 난수 시드
+        margin_m: 공원 경계 상자 바깥 여유 (미터)
+
+    Returns:
+        RoadNetwork
+    """
+    from src.accessibility import RoadNetwork
+
+    rng = random.Random(seed)
+    lats = [park['lat'] for park in parks]
+    lngs = [park['lng'] for park in parks]
+    dlat = spacing / 111_320
+    dlng = spacing / (111_320 * math.cos(math.radians(sum(lats) / len(lats))))
+    margin = margin_m / spacing
+
+    rows = int((max(lats) - min(lats)) / dlat + 2 * margin) + 1
+    cols = int((max(lngs) - min(lngs)) / dlng + 2 * margin) + 1
+    south = min(lats) - margin * dlat
+    west = min(lngs) - margin * dlng
+    points = [
+        [(south + (r + rng.uniform(-0.2, 0.2)) * dlat, west + (c + rng.uniform(-0.2, 0.2)) * dlng) for c in range(cols)]
+        for r in range(rows)
+    ]
+
+    lines = []
+    for r in range(rows):
+        for c in range(cols):
+            if c + 1 < cols and rng.random() > 0.15:
+                lines.append([points[r][c], points[r][c + 1]])
+            if r + 1 < rows and rng.random() > 0.15:
+                lines.append([points[r][c], points[r + 1][c]])
+    return RoadNetwork.from_lines(lines)
+
+
+def bench_accessibility(args, workdir: Path) -> Dict:
+    """서비스 권역 분석: 합성 격자 도로망에서 유치거리/공원 구성을 바꿔 반복 분석"""
+    from src.park_catalog import load_parks_from_csv
+    from src.accessibility import ServiceAreaAnalyzer
+
+    parks = load_parks_from_csv(str(PARK_CSV))
+
+    t0 = time.perf_counter()
+    network = make_grid_network(parks, args.road_spacing, args.seed)
+    build_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    analyzer = ServiceAreaAnalyzer(network, cell_size=args.cell_size)
+    grid_sec = time.perf_counter() - t0
+
+    # 시나리오: 유형별 유치거리, 일괄 유치거리 변경, 공원 하나씩 제외
+    scenarios = [(None, parks), (300, parks), (800, parks)]
+    scenarios += [(None, parks[:i] + parks[i + 1:]) for i in range(min(5, len(parks)))]
+
+    latencies = []
+    started = time.perf_counter()
+    for threshold, scenario_parks in scenarios:
+        t0 = time.perf_counter()
+        result = analyzer.analyze(scenario_parks, threshold=threshold)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    summary = analyzer.analyze(parks).summary()
+    print(f"   도로망 노드 {network.num_nodes:,}개 (생성 {build_sec:.2f}s), 격자 {analyzer.cols}x{analyzer.rows} "
+          f"(스냅 {grid_sec:.2f}s), 권역 {summary['coverage_ratio']:.1%}")
+    result.save(workdir / 'accessibility')
+
+    return summarize_latencies(latencies, elapsed, {
+        'nodes': network.num_nodes,
+        'edges': network.num_edges,
+        'cells': summary['cells'],
+        'build_sec': round(build_sec, 3),
+        'grid_sec': round(grid_sec, 3),
+        'coverage_ratio': summary['coverage_ratio'],
+    })
+
+
+def bench_od_cache(args, workdir: Path) -> Dict:
+    """OD 캐시 시나리오 분석: 캐시 생성/재사용 시간과 공원 추가·제거 증분 갱신 vs 전체 재분석"""
+    from src.park_catalog import load_parks_from_csv
+    from src.accessibility import ServiceAreaAnalyzer
+    from src.od_cache import ODCache, ScenarioAccessibility, scenario_key
+
+    parks = load_parks_from_csv(str(PARK_CSV))
+    network = make_grid_network(parks, args.road_spacing, args.seed)
+    analyzer = ServiceAreaAnalyzer(network, cell_size=args.cell_size)
+    cache = ODCache(str(workdir / 'od_cache'))
+
+    t0 = time.perf_counter()
+    cache.load_or_build(analyzer, 1000)
+    build_sec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    od = cache.load_or_build(analyzer, 1000)
+    load_sec = time.perf_counter() - t0
+
+    state = ScenarioAccessibility(analyzer, od)
+    for park in parks:
+        state.add_park(park)
+
+    # 공원 하나씩 제거 후 다시 추가 (시나리오 한 건 = 제거 + 추가)
+    rng = random.Random(args.seed)
+    latencies = []
+    started = time.perf_counter()
+    for park in rng.sample(parks, min(20, len(parks))):
+        latencies.append(state.remove_park(scenario_key(park)) + state.add_park(park))
+    elapsed = time.perf_counter() - started
+
+    t0 = time.perf_counter()
+    analyzer.analyze(parks)
+    full_sec = time.perf_counter() - t0
+
+    print(f"   OD {od.nnz:,}쌍, 생성 {build_sec:.1f}s, 재사용 {load_sec * 1000:.1f}ms, "
+          f"시나리오 p50 {sorted(latencies)[len(latencies) // 2] * 1000:.1f}ms (전체 재분석 {full_sec * 1000:.0f}ms)")
+    return summarize_latencies(latencies, elapsed, {
+        'pairs': od.nnz,
+        'build_sec': round(build_sec, 3),
+        'load_sec': round(load_sec, 4),
+        'full_analyze_sec': round(full_sec, 4),
+    })
+
+
+def bench_site_optimizer(args, workdir: Path) -> Dict:
+    """신규 공원 입지 선정: 합성 후보지 수천 곳에서 k곳 선정, 지연 탐욕법 vs 매 라운드 전체 재평가"""
+    from src.park_catalog import load_parks_from_csv
+    from src.accessibility import ServiceAreaAnalyzer
+    from src.od_cache import ODCache
+    from src.site_optimizer import SiteOptimizer, cell_population
+
+    parks = load_parks_from_csv(str(PARK_CSV))
+    network = make_grid_network(parks, args.road_spacing, args.seed)
+    analyzer = ServiceAreaAnalyzer(network, cell_size=args.cell_size)
+    od = ODCache(str(workdir / 'od_cache')).load_or_build(analyzer, 1000)
+
+    # 도로 노드 근처의 후보지 (면적 3천~3만㎡ 근린공원)
+    rng = np.random.default_rng(args.seed)
+    nodes = rng.choice(network.num_nodes, size=args.site_candidates, replace=False)
+    candidates = [
+        {'name': f'후보{i}', 'lat': float(network.lat[node]), 'lng': float(network.lng[node]),
+         'area': float(rng.uniform(3_000, 30_000)), 'type': '근린공원'}
+        for i, node in enumerate(nodes)
+    ]
+    # 셀 인구: 감마 분포 합성값
+    population = cell_population(analyzer) * rng.gamma(2.0, 50.0, analyzer.rows * analyzer.cols)
+
+    optimizer = SiteOptimizer(analyzer, od, population)
+    optimizer.set_existing(parks)
+
+    results = {}
+    for method in ('greedy', 'lazy'):
+        results[method] = optimizer.select(candidates, args.site_k, method=method)
+
+    lazy, greedy = results['lazy'], results['greedy']
+    same = [site['name'] for site in lazy['selected']] == [site['name'] for site in greedy['selected']]
+    select_sec = {method: result['elapsed_sec'] - result['lookup_sec'] for method, result in results.items()}
+    print(f"   후보지 {len(candidates):,}곳, k={args.site_k}: 권역 조회 {lazy['lookup_sec']:.2f}s, "
+          f"평가 {greedy['evaluations']:,}회 → {lazy['evaluations']:,}회, "
+          f"선정 {select_sec['greedy'] * 1000:.0f}ms → {select_sec['lazy'] * 1000:.0f}ms, 결과 일치 {same}")
+    return summarize_latencies([lazy['elapsed_sec']], lazy['elapsed_sec'], {
+        'candidates': len(candidates),
+        'k': args.site_k,
+        'lookup_sec': lazy['lookup_sec'],
+        'greedy_evaluations': greedy['evaluations'],
+        'lazy_evaluations': lazy['evaluations'],
+        'greedy_select_sec': round(select_sec['greedy'], 4),
+        'lazy_select_sec': round(select_sec['lazy'], 4),
+        'same_selection': same,
+    })
+
+
+def bench_park_catalog(args, workdir: Path) -> Dict:
+    """공원 카탈로그: 도시 규모 합성 CSV 파싱 vs 디스크 캐시(pickle) vs 프로세스 안 메모"""
+    from src import park_catalog
+    from src.park_catalog import ParkCatalog
+
+    # 실제 CSV 행을 좌표만 흔들어 반복
+    with open(PARK_CSV, 'r', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+    rng = random.Random(args.seed)
+    csv_path = workdir / 'parks.csv'
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for i in range(args.catalog_rows):
+            row = dict(rows[i % len(rows)])
+            row['관리번호'] = f'99999-{i:06d}'
+            row['공원명'] = f"{row['공원명']}{i}"
+            row['위도'] = f"{float(row['위도']) + rng.uniform(-0.3, 0.3):.6f}"
+            row['경도'] = f"{float(row['경도']) + rng.uniform(-0.3, 0.3):.6f}"
+            writer.writerow(row)
+
+    cache_dir = str(workdir / 'catalog_cache')
+    t0 = time.perf_counter()
+    ParkCatalog.from_csv(csv_path)
+    parse_sec = time.perf_counter() - t0
+
+    ParkCatalog.load(csv_path, cache_dir=cache_dir)  # 캐시 생성
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(5):
+        park_catalog._MEMO.clear()
+        t0 = time.perf_counter()
+        catalog = ParkCatalog.load(csv_path, cache_dir=cache_dir)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    t0 = time.perf_counter()
+    ParkCatalog.load(csv_path, cache_dir=cache_dir)
+    memo_sec = time.perf_counter() - t0
+
+    print(f"   공원 {len(catalog):,}개: CSV 파싱 {parse_sec * 1000:.0f}ms, "
+          f"디스크 캐시 p50 {sorted(latencies)[len(latencies) // 2] * 1000:.0f}ms, 메모 {memo_sec * 1000:.2f}ms")
+    return summarize_latencies(latencies, elapsed, {
+        'parks': len(catalog),
+        'parse_sec': round(parse_sec, 4),
+        'memo_sec': round(memo_sec, 5),
+    })
+
+
+def bench_name_index(args, workdir: Path) -> Dict:
+    """공원명 색인: 도시 규모 카탈로그에서 평가 행(방향별, 표기 변형 섞음) 이름 찾기"""
+    import unicodedata
+
+    from src.park_catalog import Park, ParkCatalog
+
+    # 실제 공원명 + 번호 (일부는 번호 없이 두어 같은 이름 충돌 생성)
+    base = ParkCatalog.load(PARK_CSV)
+    rng = random.Random(args.seed)
+    parks = []
+    for i in range(args.catalog_rows):
+        name = base.names[i % len(base)]
+        parks.append(Park(f'99999-{i:06d}', name if i % 50 == 0 else f"{name[:-2]}{i}{name[-2:]}",
+                          base.classifications[i % len(base)], 37.0 + rng.random(), 127.0 + rng.random()))
+    catalog = ParkCatalog.from_parks(parks)
+
+    # 평가 CSV 행: 공원당 8방향, 파일명 표기 변형 (NFD, 공백, 관리번호_이름)
+    queries = []
+    for park in parks:
+        variant = rng.randrange(4)
+        if variant == 1:
+            text = unicodedata.normalize('NFD', park.name)
+        elif variant == 2:
+            text = f" {park.name[:-2]} {park.name[-2:]}"
+        elif variant == 3:
+            text = f"{park.id}_{park.name}"
+        else:
+            text = park.name
+        queries.extend([text] * 8)
+
+    t0 = time.perf_counter()
+    index = catalog.name_index
+    build_sec = time.perf_counter() - t0
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(5):
+        index._memo.clear()
+        t0 = time.perf_counter()
+        matches = [index.resolve(text) for text in queries]
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    resolved = sum(match.index is not None for match in matches)
+    collisions = {level: len(keys) for level, keys in index.collisions.items()}
+    print(f"   공원 {len(catalog):,}개, 평가 행 {len(queries):,}개: 색인 {build_sec * 1000:.0f}ms, "
+          f"찾기 p50 {sorted(latencies)[len(latencies) // 2] * 1000:.0f}ms, 찾음 {resolved / len(queries):.1%}, "
+          f"충돌 {collisions}")
+    return summarize_latencies(latencies, elapsed, {
+        'parks': len(catalog),
+        'queries': len(queries),
+        'build_sec': round(build_sec, 4),
+        'resolved_ratio': round(resolved / len(queries), 4),
+        'collisions': collisions,
+    })
+
+
+def bench_green_space(args, workdir: Path) -> Dict:
+    """행정동별 1인당 공원 면적: 전국 규모 합성 행정동(보로노이)과 점/폴리곤 공원으로 공간 조인"""
+    import shapely
+    from src.green_space import DongBoundaries, compute_green_space
+
+    rng = np.random.default_rng(args.seed)
+    # 남한 대략 경계 상자 안의 보로노이 폴리곤을 행정동으로 사용
+    seeds = shapely.multipoints(np.column_stack([rng.uniform(126.0, 129.5, args.dongs),
+                                                 rng.uniform(34.5, 38.3, args.dongs)]))
+    cells = shapely.get_parts(shapely.voronoi_polygons(seeds, extend_to=shapely.box(126.0, 34.5, 129.5, 38.3)))
+    cells = shapely.intersection(cells, shapely.box(126.0, 34.5, 129.5, 38.3))
+    codes = [f'{i:08d}' for i in range(len(cells))]
+
+    lng = rng.uniform(126.0, 129.5, args.synthetic_parks)
+    lat = rng.uniform(34.5, 38.3, args.synthetic_parks)
+    area = rng.lognormal(8, 1.2, args.synthetic_parks)
+    parks = [{'name': f'공원{i}', 'lat': lat[i], 'lng': lng[i], 'area': area[i]} for i in range(len(lat))]
+    # 10%는 면적에 맞춘 정사각형 폴리곤 (행정동 경계에 걸치면 면적을 나눔)
+    for park in parks[::10]:
+        half = math.sqrt(park['area']) / 2 / 111_320
+        park['geometry'] = shapely.box(park['lng'] - half, park['lat'] - half, park['lng'] + half, park['lat'] + half)
+
+    population = {'by_code': {code: int(rng.integers(2_000, 60_000)) for code in codes}, 'by_name': {}}
+    scores = {park['name']: float(rng.integers(5, 16)) for park in parks}
+
+    t0 = time.perf_counter()
+    boundaries = DongBoundaries(codes, codes, cells)
+    index_sec = time.perf_counter() - t0
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(3):
+        t0 = time.perf_counter()
+        results = compute_green_space(boundaries, parks, population, scores)
+        latencies.append(time.perf_counter() - t0)
+
+    below = sum(1 for row in results if row['기준미달'])
+    print(f"   행정동 {len(boundaries):,}개 (색인 {index_sec:.2f}s), 공원 {len(parks):,}개, 기준 미달 {below:,}개")
+    return summarize_latencies(latencies, time.perf_counter() - started, {
+        'dongs': len(boundaries),
+        'parks': len(parks),
+        'index_sec': round(index_sec, 3),
+        'below_standard': below,
+    })
+
+
+def bench_two_step_fca(args, workdir: Path) -> Dict:
+    """2SFCA: 시 단위 합성 인구 격자와 공원 공급 지점 (KD-tree 희소 거리 + 희소 행렬 곱)"""
+    from src.two_step_fca import DECAY_FUNCTIONS, PopulationGrid, compute_accessibility, summarize
+
+    rng = np.random.default_rng(args.seed)
+    # 인천 규모 (약 30km x 30km) 100m 격자
+    side = int(args.fca_extent_km * 10)
+    lat0, lng0 = 37.45, 126.65
+    rows, cols = np.divmod(np.arange(side * side), side)
+    lat = lat0 + (rows - side / 2) * 100 / 111_320
+    lng = lng0 + (cols - side / 2) * 100 / (111_320 * math.cos(math.radians(lat0)))
+    grid = PopulationGrid(lat, lng, rng.gamma(0.6, 40, side * side), cell_size=100)
+
+    num_parks = args.fca_parks
+    parks = [
+        {'name': f'공원{i}', 'lat': float(rng.choice(lat)), 'lng': float(rng.choice(lng)),
+         'area': float(rng.lognormal(8, 1.2)), 'score': float(rng.integers(5, 16))}
+        for i in range(num_parks)
+    ]
+
+    latencies = []
+    decays = {}
+    started = time.perf_counter()
+    for decay in DECAY_FUNCTIONS:
+        t0 = time.perf_counter()
+        result = compute_accessibility(grid, parks, catchment=args.catchment, decay=decay)
+        latencies.append(time.perf_counter() - t0)
+        decays[decay] = summarize(grid, result)
+        print(f"   [{decay}] {latencies[-1]:.2f}s, 쌍 {decays[decay]['pairs']:,}개, "
+              f"접근성 중앙값 {decays[decay]['median_access']:.3f}, p90 {decays[decay]['p90_access']:.3f}㎡/인")
+
+    return summarize_latencies(latencies, time.perf_counter() - started, {
+        'cells': len(grid),
+        'parks': num_parks,
+        'decays': decays,
+    })
+
+
+def make_broken_images(root: Path, good: List[Path]) -> List[Path]:
+    """
+    캡처 실패 형태의 이미지 생성 (검은 화면, 오류 화면, 흐린 화면, 타일 누락)
+
+    Args:
+        root: 저장 폴더
+        good: 원본으로 쓸 정상 이미지
+
+    Returns:
+        생성된 이미지 경로 리스트
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+
+    for idx, source in enumerate(good):
+        kind = idx % 4
+        path = root / f'broken_{idx:03d}.jpg'
+
+        with Image.open(source) as img:
+            if kind == 0:
+                broken = Image.new('RGB', img.size, (0, 0, 0))
+            elif kind == 1:
+                broken = Image.new('RGB', img.size, (238, 238, 238))
+                ImageDraw.Draw(broken).rectangle([10, 10, 420, 60], fill=(255, 77, 77))
+            elif kind == 2:
+                broken = img.filter(ImageFilter.GaussianBlur(20))
+            else:
+                broken = img.copy()
+                ImageDraw.Draw(broken).rectangle([0, 0, img.width // 2, img.height], fill=(128, 128, 128))
+
+        broken.save(path, format='JPEG', quality=90)
+        paths.append(path)
+
+    return paths
+
+
+def bench_quality(args, workdir: Path) -> Dict:
+    """이미지 품질 검사: 정상/불량 합성 이미지를 프로세스 풀에서 검사"""
+    from src.image_quality import QualityGate
+
+    good = make_synthetic_images(workdir / 'good', num_parks=1, per_park=args.images)
+    broken = make_broken_images(workdir / 'broken', good)
+
+    gate = QualityGate(mode='skip', workers=args.quality_workers)
+    started = time.perf_counter()
+    try:
+        reports = gate.screen(good + broken)
+    finally:
+        gate.close()
+    elapsed = time.perf_counter() - started
+
+    false_rejects = sum(1 for path in good if not reports[str(path)]['ok'])
+    missed = sum(1 for path in broken if reports[str(path)]['ok'])
+    per_image = elapsed / len(reports) if reports else 0.0
+
+    return summarize_latencies([per_image] * len(reports), elapsed, {
+        'workers': gate.workers,
+        'false_rejects': false_rejects,
+        'missed_broken': missed,
+    })
+
+
+def bench_profiles(args, workdir: Path) -> Dict:
+    """평가 프로필별 지연 시간, 출력 잘림 비율, 토큰 비교 (같은 이미지, 사고 토큰을 흉내 내는 가짜 서버)"""
+    from src.gemini_evaluator import GeminiEvaluator
+
+    images = make_synthetic_images(workdir / 'profiles', num_parks=1, per_park=args.images)
+    config = gemini_config(args)
+    config.thinking_tokens = args.thinking_tokens
+    config.ms_per_token = args.ms_per_token
+    config.reason_chars = args.reason_chars
+
+    profiles = {}
+    all_latencies = []
+    started = time.perf_counter()
+
+    for name in args.profiles.split(','):
+        profile = None if name == 'default' else name
+        with FakeGeminiServer(config) as server:
+            evaluator = GeminiEvaluator(api_key='fake', base_url=server.base_url, profile=profile)
+            evaluator.retry_policy.base_wait = args.retry_wait
+
+            latencies = []
+            failures = 0
+            for path in images:
+                t0 = time.perf_counter()
+                try:
+                    evaluator.evaluate_image(str(path), park_name=path.parent.name, direction=path.stem)
+                except Exception:
+                    failures += 1
+                latencies.append(time.perf_counter() - t0)
+
+        usage = evaluator.usage.summary()
+        truncation = evaluator.truncation_report()
+        values = sorted(latencies)
+        all_latencies.extend(latencies)
+        profiles[name] = {
+            'generation': evaluator.generation_config,
+            'latency': {'p50': round(percentile(values, 50), 4), 'p95': round(percentile(values, 95), 4)},
+            'failures': failures,
+            'api_requests': server.stats['requests'],
+            'truncation_rate': truncation['truncation_rate'],
+            'truncated': truncation['truncated'],
+            'decode_stats': dict(evaluator.decode_stats),
+            'thoughts_tokens_per_image': round(usage['thoughts_tokens'] / len(images), 1),
+            'output_tokens_per_image': round(usage['output_tokens'] / len(images), 1),
+            'cost_per_image_usd': round(usage['cost_usd'] / len(images), 6),
+        }
+        print(f"   [{name}] p50 {profiles[name]['latency']['p50']:.3f}s, p95 {profiles[name]['latency']['p95']:.3f}s, "
+              f"잘림 {truncation['truncation_rate']:.0%}, 요청 {server.stats['requests']}건, "
+              f"사고 {profiles[name]['thoughts_tokens_per_image']:.0f}/출력 {profiles[name]['output_tokens_per_image']:.0f} 토큰/장, "
+              f"실패 {failures}건")
+
+    return summarize_latencies(all_latencies, time.perf_counter() - started, {'profiles': profiles})
+
+
+def bench_image_prep(args, workdir: Path) -> Dict:
+    """요청 이미지 준비 방식별 (원본 전체 화면 vs 축소본 + 부분 이미지) 요청 크기, 입력 토큰, 지연 시간 비교"""
+    from src.gemini_evaluator import GeminiEvaluator
+    from src.image_prep import ImagePrep
+
+    images = make_synthetic_images(workdir / 'image_prep', num_parks=1, per_park=args.images)
+
+    modes = {}
+    all_latencies = []
+    started = time.perf_counter()
+
+    for mode in ('full', 'tiles'):
+        with FakeGeminiServer(gemini_config(args)) as server:
+            evaluator = GeminiEvaluator(api_key='fake', base_url=server.base_url, image_prep=ImagePrep(mode=mode))
+            evaluator.retry_policy.base_wait = args.retry_wait
+
+            latencies = []
+            failures = 0
+            for path in images:
+                t0 = time.perf_counter()
+                try:
+                    evaluator.evaluate_image(str(path), park_name=path.parent.name, direction=path.stem)
+                except Exception:
+                    failures += 1
+                latencies.append(time.perf_counter() - t0)
+
+        usage = evaluator.usage.summary()
+        prep = evaluator.image_prep.report()
+        values = sorted(latencies)
+        all_latencies.extend(latencies)
+        modes[mode] = {
+            'latency': {'p50': round(percentile(values, 50), 4), 'p95': round(percentile(values, 95), 4)},
+            'failures': failures,
+            'parts_per_image': round(prep['parts'] / prep['images'], 2) if prep['images'] else 0,
+            'bytes_per_image': prep['bytes_per_image'],
+            'request_bytes_per_image': round(server.stats['request_bytes'] / server.stats['requests']),
+            'prompt_tokens_per_image': round(usage['prompt_tokens'] / len(images)),
+            'cost_per_image_usd': round(usage['cost_usd'] / len(images), 6),
+        }
+        print(f"   [{mode}] p50 {modes[mode]['latency']['p50']:.3f}s, 이미지 {prep['bytes_per_image'] / 1024:.0f}KB/장 "
+              f"({modes[mode]['parts_per_image']}장), 입력 {modes[mode]['prompt_tokens_per_image']:,} 토큰/장")
+
+    return summarize_latencies(all_latencies, time.perf_counter() - started, {'modes': modes})
+
+
+def gemini_config(args) -> FakeGeminiConfig:
+    """명령행 인자로 가짜 Gemini 서버 설정 생성"""
+    return FakeGeminiConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_503=args.rate_503,
+        malformed_rate=args.malformed_rate,
+        not_visible_rate=args.not_visible_rate,
+        consistency=args.consistency,
+        seed=args.seed
+    )
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'capture': bench_capture,
+    'adaptive': bench_adaptive,
+    'evaluate': bench_evaluate,
+    'evaluate_script': bench_evaluate_script,
+    'capture_script': bench_capture_script,
+    'quality': bench_quality,
+    'profiles': bench_profiles,
+    'image_prep': bench_image_prep,
+    'schedule': bench_schedule,
+    'accessibility': bench_accessibility,
+    'od_cache': bench_od_cache,
+    'site_optimizer': bench_site_optimizer,
+    'park_catalog': bench_park_catalog,
+    'name_index': bench_name_index,
+    'green_space': bench_green_space,
+    'two_step_fca': bench_two_step_fca,
+}
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    기준 결과 대비 성능 저하 항목 찾기
+
+    Args:
+        results: 이번 벤치마크 결과
+        baseline: 기준 벤치마크 결과
+        tolerance: 허용 비율 (0.2 = 20%)
+
+    Returns:
+        성능 저하 메시지 리스트
+    """
+    regressions = []
+
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if not base:
+            continue
+
+        if 'latency' in result and 'latency' in base and base['latency']['p50'] > 0:
+            ratio = result['latency']['p50'] / base['latency']['p50']
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name}: p50 지연 {base['latency']['p50']:.3f}s → {result['latency']['p50']:.3f}s (×{ratio:.2f})")
+
+        if base.get('elapsed_sec', 0) > 0 and 'latency' not in result:
+            ratio = result['elapsed_sec'] / base['elapsed_sec']
+            if ratio > 1 + tolerance:
+                regressions.append(f"{name}: 전체 시간 {base['elapsed_sec']:.1f}s → {result['elapsed_sec']:.1f}s (×{ratio:.2f})")
+
+    return regressions
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="오프라인 캡처/평가 벤치마크")
+    parser.add_argument('benchmarks', nargs='*', default=[],
+                        help=f"실행할 벤치마크 ({', '.join(BENCHMARKS)}, 기본: 전체)")
+    parser.add_argument('--output', default=None,
+                        help="결과 JSON 경로 (기본: 저장소 밖 임시 폴더의 park_benchmarks/benchmark_[시각].json)")
+    parser.add_argument('--baseline', default=None, help="비교할 기준 결과 JSON")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="허용 성능 저하 비율 (기본 0.2)")
+    parser.add_argument('--seed', type=int, default=0)
+
+    capture = parser.add_argument_group('캡처 (가짜 kakao.maps SDK)')
+    capture.add_argument('--port', type=int, default=8090)
+    capture.add_argument('--captures', type=int, default=8, help="capture 벤치마크 샘플 포인트 수")
+    capture.add_argument('--parks', type=int, default=3, help="adaptive/스크립트 벤치마크 공원 수")
+    capture.add_argument('--workers', type=int, default=1, help="capture_script 워커 수")
+    capture.add_argument('--render-ms', type=int, default=100)
+    capture.add_argument('--no-pano-rate', type=float, default=0.2)
+    capture.add_argument('--hang-rate', type=float, default=0.0)
+    capture.add_argument('--capture-timeout', type=int, default=5000)
+    capture.add_argument('--schedule', default='hilbert', help="capture_script 캡처 순서 (hilbert, nearest, csv)")
+    capture.add_argument('--browser-cache', action='store_true',
+                         help="capture_script에서 워커별 영속 브라우저 캐시 사용")
+    capture.add_argument('--network-cache', choices=['off', 'record', 'replay', 'auto'], default='off',
+                         help="capture에서 SDK 응답 기록/재생")
+    capture.add_argument('--capture-profile', choices=['default', 'lean'], default='default',
+                         help="capture/capture_script 캡처 페이지 프로필")
+    capture.add_argument('--sdk-extras', action='store_true',
+                         help="가짜 SDK가 통계 스크립트/웹폰트 요청을 함께 보냄 (--capture-profile lean 차단 효과 측정)")
+    capture.add_argument('--viewpoints', default='', help="capture 추가 시점 (예: left,right)")
+    capture.add_argument('--width', type=int, default=1280)
+    capture.add_argument('--height', type=int, default=720)
+
+    gemini = parser.add_argument_group('평가 (가짜 Gemini 서버)')
+    gemini.add_argument('--images', type=int, default=20, help="evaluate 벤치마크 이미지 수")
+    gemini.add_argument('--images-per-park', type=int, default=4)
+    gemini.add_argument('--latency-ms', type=float, default=300.0)
+    gemini.add_argument('--jitter-ms', type=float, default=50.0)
+    gemini.add_argument('--rate-503', type=float, default=0.05)
+    gemini.add_argument('--malformed-rate', type=float, default=0.05)
+    gemini.add_argument('--not-visible-rate', type=float, default=0.2)
+    gemini.add_argument('--retry-wait', type=float, default=0.05, help="재시도 초기 대기 (초)")
+    gemini.add_argument('--quality-workers', type=int, default=None, help="quality 벤치마크 검사 프로세스 수")
+    gemini.add_argument('--consistency', type=float, default=0.0,
+                        help="가짜 서버가 같은 이미지에 고정 등급을 답할 확률 (합의 평가용)")
+    gemini.add_argument('--consensus', type=int, default=1, help="evaluate 합의 평가 최대 샘플 수 (1이면 끔)")
+    gemini.add_argument('--agreement', type=float, default=0.6, help="합의 비율")
+    gemini.add_argument('--dedup', action='store_true', help="evaluate_script에서 중복 이미지 평가 생략")
+    gemini.add_argument('--prescreen', choices=['model', 'heuristic'], default=None,
+                        help="가시성 사전 판별 방식 (기본: 사용 안 함)")
+    gemini.add_argument('--profiles', default='default,fast,standard,thorough',
+                        help="profiles 벤치마크에서 비교할 평가 프로필 (default: 프로필 없음)")
+    gemini.add_argument('--thinking-tokens', type=int, default=1500,
+                        help="profiles: 사고 예산이 없는 요청의 평균 사고 토큰 (모델 기본 동적 사고)")
+    gemini.add_argument('--ms-per-token', type=float, default=0.5, help="profiles: 사고/출력 토큰당 지연 (밀리초)")
+    gemini.add_argument('--reason-chars', type=int, default=200, help="profiles: 제한이 없을 때 reason 길이")
+
+    gis = parser.add_argument_group('접근성 분석 (합성 도로망)')
+    gis.add_argument('--road-spacing', type=float, default=40.0, help="합성 격자 도로 간격 (미터)")
+    gis.add_argument('--cell-size', type=float, default=50.0, help="분석 격자 셀 크기 (미터)")
+    gis.add_argument('--dongs', type=int, default=3500, help="green_space 합성 행정동 수 (전국 약 3,500개)")
+    gis.add_argument('--synthetic-parks', type=int, default=20000, help="green_space 합성 공원 수")
+    gis.add_argument('--fca-extent-km', type=float, default=30.0, help="two_step_fca 합성 격자 한 변 (km, 100m 셀)")
+    gis.add_argument('--fca-parks', type=int, default=1500, help="two_step_fca 합성 공원 수")
+    gis.add_argument('--catalog-rows', type=int, default=20000, help="park_catalog/name_index 합성 공원 수 (전국 도시공원 약 2만 개)")
+    gis.add_argument('--site-candidates', type=int, default=3000, help="site_optimizer 합성 후보지 수")
+    gis.add_argument('--site-k', type=int, default=10, help="site_optimizer 선정할 곳 수")
+    gis.add_argument('--catchment', type=float, default=1000.0, help="two_step_fca 집수 거리 (미터)")
+
+    args = parser.parse_args()
+
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"알 수 없는 벤치마크: {', '.join(unknown)}")
+
+    return args
+
+
+def main():
+    """벤치마크 실행"""
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING, format='[%(levelname)s] %(message)s')
+
+    names = args.benchmarks or list(BENCHMARKS)
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix='park_bench_') as tmp:
+        for name in names:
+            print(f"▶ {name} 실행 중...")
+            tracer.reset()
+            workdir = Path(tmp) / name
+            workdir.mkdir(parents=True, exist_ok=True)
+
+            try:
+                results[name] = BENCHMARKS[name](args, workdir)
+            except Exception as e:
+                logger.error(f"{name} 실패: {e}")
+                results[name] = {'error': str(e)}
+                continue
+
+            result = results[name]
+            if 'latency' in result:
+                print(f"   {result['items']}건, {result['throughput_per_sec']:.2f}건/초, "
+                      f"p50 {result['latency']['p50']:.3f}s, p95 {result['latency']['p95']:.3f}s")
+            else:
+                print(f"   종료 코드 {result['returncode']}, 전체 {result['elapsed_sec']:.1f}s")
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')},
+        'results': results,
+    }
+
+    output_path = Path(args.output or Path(tempfile.gettempdir()) / 'park_benchmarks' /
+                       f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n📄 결과 저장: {output_path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 성능 저하 감지 (허용 {args.tolerance * 100:.0f}%):")
+            for message in regressions:
+                print(f"   - {message}")
+            sys.exit(1)
+
+        print(f"\n✅ 기준 대비 성능 저하 없음 (허용 {args.tolerance * 100:.0f}%)")
+
+    if any('error' in result or result.get('returncode', 0) != 0 for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+/*
+ * 벤치마크용 가짜 kakao.maps SDK
+ *
+ * 로드뷰 템플릿이 사용하는 API(LatLng, Roadview, RoadviewClient, event)만 흉내 내며,
+ * 네트워크 없이 캔버스에 파노라마 대용 그림을 그립니다.
+ * 동작은 스크립트 주소의 쿼리 파라미터로 조절합니다.
+ *
+ *   no_pano_rate  getNearestPanoId가 null을 반환할 비율 (기본 0)
+ *   hang_rate     init 이벤트가 오지 않는(타임아웃) 비율 (기본 0)
+ *   search_ms     파노라마 검색 지연 (기본 20)
+ *   render_ms     파노라마 렌더링 지연 (기본 100)
+ *   seed          결과를 바꾸는 시드 (같은 좌표·시드면 항상 같은 결과)
+ *   extras        1이면 실제 SDK처럼 화면과 무관한 통계 스크립트/웹폰트 요청을 함께 보냄
+ *                 (이 스크립트를 ?asset=tiara.js, ?asset=font.woff2로 다시 받아 용량만 흉내 냄)
+ *
+ * 예: /fake_kakao_sdk.js?no_pano_rate=0.3&render_ms=300
+ */
+(function () {
+    const script = document.currentScript;
+    const query = script && script.src.indexOf('?') >= 0 ? script.src.split('?')[1] : '';
+    const params = new URLSearchParams(query);
+
+    const config = {
+        noPanoRate: parseFloat(params.get('no_pano_rate') || '0'),
+        hangRate: parseFloat(params.get('hang_rate') || '0'),
+        searchMs: parseInt(params.get('search_ms') || '20', 10),
+        renderMs: parseInt(params.get('render_ms') || '100', 10),
+        seed: params.get('seed') || '0',
+        extras: params.get('extras') === '1',
+    };
+
+    // 화면과 무관한 부가 요청 (캡처 프로필의 리소스 차단 효과 측정용)
+    if (config.extras && script) {
+        const base = script.src.split('?')[0];
+        fetch(base + '?asset=tiara.js&t=' + Date.now()).catch(function () {});
+        if (window.FontFace) {
+            new FontFace('FakeKakaoFont', 'url(' + base + '?asset=font.woff2)').load().catch(function () {});
+        }
+    }
+
+    // 문자열 → [0, 1) 결정적 해시 (FNV-1a)
+    function hashUnit(text) {
+        let h = 0x811c9dc5;
+        for (let i = 0; i < text.length; i++) {
+            h ^= text.charCodeAt(i);
+            h = Math.imul(h, 0x01000193) >>> 0;
+        }
+        return h / 4294967296;
+    }
+
+    function LatLng(lat, lng) {
+        this.lat = lat;
+        this.lng = lng;
+    }
+    LatLng.prototype.getLat = function () { return this.lat; };
+    LatLng.prototype.getLng = function () { return this.lng; };
+
+    const listeners = new Map();
+
+    const event = {
+        addListener: function (target, type, handler) {
+            if (!listeners.has(target)) {
+                listeners.set(target, {});
+            }
+            const handlers = listeners.get(target);
+            (handlers[type] = handlers[type] || []).push(handler);
+        },
+        trigger: function (target, type) {
+            const handlers = (listeners.get(target) || {})[type] || [];
+            handlers.forEach(function (handler) { handler(); });
+        },
+    };
+
+    function Roadview(container) {
+        this.container = container;
+        this.panoId = null;
+        this.position = null;
+        this.viewpoint = { pan: 0, tilt: 0, zoom: 0 };
+
+        this.canvas = document.createElement('canvas');
+        this.canvas.style.width = '100%';
+        this.canvas.style.height = '100%';
+        container.appendChild(this.canvas);
+    }
+
+    Roadview.prototype.setPanoId = function (panoId, position) {
+        const self = this;
+        this.panoId = panoId;
+        // 실제 SDK처럼 카메라 위치는 요청 좌표에서 약간 벗어남
+        const offset = (hashUnit('pos' + panoId) - 0.5) * 0.0001;
+        this.position = new LatLng(position.getLat() + offset, position.getLng() - offset);
+
+        if (hashUnit(config.seed + 'hang' + panoId) < config.hangRate) {
+            return;
+        }
+
+        setTimeout(function () {
+            self._draw();
+            event.trigger(self, 'init');
+        }, config.renderMs);
+    };
+
+    Roadview.prototype.setViewpoint = function (viewpoint) {
+        this.viewpoint = Object.assign({}, this.viewpoint, viewpoint);
+        this._draw();
+        event.trigger(this, 'viewpoint_changed');
+    };
+
+    Roadview.prototype.getViewpoint = function () { return Object.assign({}, this.viewpoint); };
+    Roadview.prototype.getPosition = function () { return this.position; };
+    Roadview.prototype.getPanoId = function () { return this.panoId; };
+
+    // 하늘·도로·나무 모양의 결정적 그림 (파노라마 ID와 시점에 따라 달라짐)
+    Roadview.prototype._draw = function () {
+        const width = this.container.clientWidth || 1200;
+        const height = this.container.clientHeight || 800;
+        this.canvas.width = width;
+        this.canvas.height = height;
+
+        const ctx = this.canvas.getContext('2d');
+        const base = hashUnit('hue' + this.panoId) * 360;
+        const pan = this.viewpoint.pan || 0;
+        const horizon = height * (0.5 + (this.viewpoint.tilt || 0) / 180);
+
+        const sky = ctx.createLinearGradient(0, 0, 0, horizon);
+        sky.addColorStop(0, 'hsl(' + (200 + base / 10) + ', 60%, 75%)');
+        sky.addColorStop(1, 'hsl(' + (200 + base / 10) + ', 40%, 90%)');
+        ctx.fillStyle = sky;
+        ctx.fillRect(0, 0, width, horizon);
+
+        ctx.fillStyle = 'hsl(30, 10%, ' + (35 + base / 36) + '%)';
+        ctx.fillRect(0, horizon, width, height - horizon);
+
+        for (let i = 0; i < 24; i++) {
+            const u = hashUnit(this.panoId + ':' + i);
+            const x = ((u * 360 - pan + 720) % 360) / 360 * width;
+            const treeHeight = height * (0.15 + 0.3 * hashUnit('h' + this.panoId + i));
+            ctx.fillStyle = 'hsl(' + (90 + 50 * u) + ', 45%, ' + (25 + 20 * u) + '%)';
+            ctx.beginPath();
+            ctx.ellipse(x, horizon - treeHeight / 2, treeHeight / 3, treeHeight / 2, 0, 0, Math.PI * 2);
+            ctx.fill();
+        }
+    };
+
+    function RoadviewClient() {}
+
+    RoadviewClient.prototype.getNearestPanoId = function (position, radius, callback) {
+        const key = position.getLat().toFixed(5) + ',' + position.getLng().toFixed(5);
+        setTimeout(function () {
+            if (hashUnit(config.seed + 'pano' + key) < config.noPanoRate) {
+                callback(null);
+                return;
+            }
+            callback(1000000 + Math.floor(hashUnit('id' + key) * 9000000));
+        }, config.searchMs);
+    };
+
+    window.kakao = {
+        maps: {
+            LatLng: LatLng,
+            Roadview: Roadview,
+            RoadviewClient: RoadviewClient,
+            event: event,
+        },
+    };
+})();
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+2SFCA 공원 접근성 지수 산출 스크립트
+
+공원 품질 점수(select_best_direction.py 총점)와 면적을 공급량으로, 인구 격자를 수요로 하여
+거리 감쇠를 반영한 접근성 지수를 계산합니다.
+
+입력: output/park_best_directions.csv, 인구 격자 CSV 또는 행정동 경계 + 행정동별 인구
+출력: output/park_best_directions_2sfca.csv (공원별 공급 비율), output/accessibility/2sfca_grid.csv
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from src.green_space import DongBoundaries, load_population
+from src.park_catalog import DEFAULT_PARK_CSV
+from src.two_step_fca import (
+    DECAY_FUNCTIONS, DEFAULT_CATCHMENT, PopulationGrid, compute_accessibility, export_results,
+    load_best_direction_parks, summarize
+)
+
+load_dotenv()
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="2SFCA 공원 접근성 지수 산출")
+    parser.add_argument(
+        '--best-directions', default='output/park_best_directions.csv',
+        help="select_best_direction.py 결과 (공원 좌표, 면적, 총점)"
+    )
+    parser.add_argument(
+        '--parks', default=DEFAULT_PARK_CSV,
+        help="공원 정보 CSV (공원 면적, 공원면적이 빈 공원은 기본 면적)"
+    )
+    parser.add_argument(
+        '--population-grid', default=os.getenv('POPULATION_GRID_PATH'),
+        help="격자 인구 CSV (위도, 경도, 인구 열, 기본: 환경변수 POPULATION_GRID_PATH)"
+    )
+    parser.add_argument(
+        '--boundaries', default=os.getenv('DONG_BOUNDARY_PATH'),
+        help="격자 인구가 없을 때 행정동 인구를 배분할 행정동 경계 (기본: 환경변수 DONG_BOUNDARY_PATH)"
+    )
+    parser.add_argument(
+        '--population', default=os.getenv('DONG_POPULATION_PATH'),
+        help="행정동별 인구 CSV (기본: 환경변수 DONG_POPULATION_PATH)"
+    )
+    parser.add_argument('--cell-size', type=float, default=100.0, help="행정동 인구 배분 격자 크기 (미터)")
+    parser.add_argument(
+        '--catchment', type=float, default=DEFAULT_CATCHMENT,
+        help=f"집수 거리 (미터, 기본: {DEFAULT_CATCHMENT})"
+    )
+    parser.add_argument(
+        '--decay', choices=DECAY_FUNCTIONS, default='gaussian',
+        help="거리 감쇠 (gaussian: 가까울수록 큰 가중, none: 집수 거리 안 동일, gravity: 거리^-1.5)"
+    )
+    parser.add_argument('--output-grid', default='output/accessibility/2sfca_grid.csv', help="격자 결과 CSV")
+    return parser.parse_args()
+
+
+def main():
+    """
+    2SFCA 접근성 산출 실행
+    """
+    args = parse_args()
+
+    if not Path(args.best_directions).exists():
+        print(f"❌ 최고 방향 CSV가 없습니다: {args.best_directions} (select_best_direction.py를 먼저 실행하세요)")
+        return
+
+    started = time.perf_counter()
+    parks = load_best_direction_parks(args.best_directions, args.parks)
+
+    if args.population_grid:
+        grid = PopulationGrid.from_csv(args.population_grid)
+        print(f"👥 인구 격자: {len(grid):,}셀 ({args.population_grid})")
+    elif args.boundaries and args.population:
+        boundaries = DongBoundaries.load(args.boundaries)
+        grid = PopulationGrid.from_dongs(boundaries, load_population(args.population), cell_size=args.cell_size)
+        print(f"👥 행정동 인구를 {args.cell_size:g}m 격자 {len(grid):,}셀에 배분")
+    else:
+        print("❌ 인구 자료를 지정하세요 (--population-grid 또는 --boundaries + --population)")
+        return
+
+    result = compute_accessibility(grid, parks, catchment=args.catchment, decay=args.decay)
+    paths = export_results(grid, parks, result, args.best_directions, args.output_grid)
+    summary = summarize(grid, result)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n📊 2SFCA ({args.decay}, 집수 거리 {args.catchment:g}m, {elapsed:.2f}초)")
+    print(f"   공원 {summary['parks']}개, 격자-공원 쌍 {summary['pairs']:,}개")
+    print(f"   인구 가중 평균 접근성: {summary['mean_access']:.3f}㎡/인 (품질 가중)")
+    print(f"   격자 접근성 중앙값: {summary['median_access']:.3f}㎡/인, 90 백분위수: {summary['p90_access']:.3f}㎡/인")
+    print(f"   집수 거리 안에 공원이 없는 인구: {summary['zero_access_population_ratio']:.1%}")
+    for name, path in paths.items():
+        print(f"💾 {name}: {path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+행정동별 1인당 공원 면적 산출 스크립트
+
+입력: 행정동 경계 (GeoJSON 등), 행정동별 인구 CSV, 공원 정보 CSV,
+      (선택) output/park_best_directions.csv 품질 점수
+출력: output/green_space/green_space_by_dong.csv, green_space_by_dong.geojson
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from src.green_space import (
+    PER_CAPITA_STANDARD, DongBoundaries, compute_green_space, load_population, load_quality_scores,
+    save_results, unassigned_parks
+)
+from src.park_catalog import DEFAULT_PARK_CSV, load_parks_from_csv
+from src.park_polygons import load_park_polygons
+
+load_dotenv()
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="행정동별 1인당 공원 면적 산출")
+    parser.add_argument(
+        '--boundaries', default=os.getenv('DONG_BOUNDARY_PATH'),
+        help="행정동 경계 파일 (GeoJSON, 그 외 형식은 geopandas 필요, 기본: 환경변수 DONG_BOUNDARY_PATH)"
+    )
+    parser.add_argument(
+        '--population', default=os.getenv('DONG_POPULATION_PATH'),
+        help="행정동별 인구 CSV (기본: 환경변수 DONG_POPULATION_PATH)"
+    )
+    parser.add_argument(
+        '--parks', default=DEFAULT_PARK_CSV,
+        help="공원 정보 CSV"
+    )
+    parser.add_argument(
+        '--scores', default='output/park_best_directions.csv',
+        help="품질 가중에 쓸 select_best_direction.py 결과 (없으면 품질 가중 면적 = 면적)"
+    )
+    parser.add_argument(
+        '--park-polygons', default=os.getenv('PARK_POLYGON_PATH'),
+        help="공원 폴리곤 원본 (있으면 행정동 경계에 걸친 공원 면적을 교차 비율대로 나눔, 기본: 환경변수 PARK_POLYGON_PATH)"
+    )
+    parser.add_argument('--code-field', default=None, help="행정동 코드 필드 (기본: 자동 탐지)")
+    parser.add_argument('--name-field', default=None, help="행정동 이름 필드 (기본: 자동 탐지)")
+    parser.add_argument('--population-field', default=None, help="인구 필드 (기본: 자동 탐지)")
+    parser.add_argument(
+        '--standard', type=float, default=PER_CAPITA_STANDARD,
+        help=f"1인당 공원 면적 기준 (㎡, 기본: {PER_CAPITA_STANDARD:g})"
+    )
+    parser.add_argument('--output', default='output/green_space', help="결과 폴더")
+    return parser.parse_args()
+
+
+def main():
+    """
+    행정동별 1인당 공원 면적 산출 실행
+    """
+    args = parse_args()
+    if not args.boundaries or not args.population:
+        print("❌ 행정동 경계와 인구 파일을 지정하세요 (--boundaries, --population)")
+        return
+
+    started = time.perf_counter()
+    boundaries = DongBoundaries.load(args.boundaries, code_field=args.code_field, name_field=args.name_field)
+    population = load_population(args.population, code_field=args.code_field, name_field=args.name_field,
+                                 population_field=args.population_field)
+    parks = load_parks_from_csv(args.parks)
+    if args.park_polygons:
+        polygons = load_park_polygons(parks, args.park_polygons)
+        print(f"🗺️  공원 폴리곤 {polygons.attach(parks, key='geometry')}/{len(parks)}개")
+
+    quality_scores = None
+    if Path(args.scores).exists():
+        quality_scores = load_quality_scores(args.scores, args.parks)
+        print(f"⭐ 품질 점수: {len(quality_scores)}개 공원 ({args.scores})")
+    else:
+        print(f"⚠️  품질 점수 파일이 없어 품질 가중 없이 계산합니다: {args.scores}")
+
+    results = compute_green_space(boundaries, parks, population, quality_scores, standard=args.standard)
+    paths = save_results(results, boundaries, args.output)
+    elapsed = time.perf_counter() - started
+
+    missing_population = [row['행정동명'] for row in results if row['인구'] is None]
+    outside = unassigned_parks(boundaries, parks)
+
+    print(f"\n📊 행정동 {len(results)}개, 공원 {len(parks)}개 ({elapsed:.2f}초)")
+    for row in sorted(results, key=lambda row: row['1인당공원면적'] if row['1인당공원면적'] is not None else -1):
+        if row['인구'] is None:
+            continue
+        mark = '⚠️ ' if row['기준미달'] else '✅'
+        print(f"   {mark} {row['행정동명']}: 공원 {row['공원수']}개, {row['1인당공원면적']:.2f}㎡/인 "
+              f"(품질 가중 {row['1인당품질가중면적']:.2f}㎡/인)")
+
+    if missing_population:
+        print(f"\n⚠️  인구 데이터가 없는 행정동 {len(missing_population)}개: {', '.join(missing_population[:10])}")
+    if outside:
+        print(f"⚠️  행정동 경계 밖 공원 {len(outside)}개: {', '.join(outside[:10])}")
+    for name, path in paths.items():
+        print(f"💾 {name}: {path}")
+
+
+if __name__ == '__main__':
+    main()
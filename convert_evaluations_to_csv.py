@@ -16,6 +16,8 @@ import csv
 import logging
 from pathlib import Path
 
+from src.park_catalog import DEFAULT_PARK_CSV, ParkCatalog
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -64,17 +66,26 @@ def check_all_visible(direction_data):
     return True
 
 
-def process_json_file(json_path):
+def process_json_file(json_path, name_index=None):
     """
     JSON 파일을 읽어서 CSV 행 데이터로 변환
 
     Args:
         json_path (Path): JSON 파일 경로
+        name_index (ParkNameIndex): 카탈로그 이름 색인 (있으면 파일명을 CSV 공원명과 관리번호로 바꿈)
 
     Returns:
         list: CSV 행 데이터 리스트
     """
     park_name = json_path.stem  # 파일명에서 확장자 제거하여 공원명 추출
+    park_id = ''
+    if name_index is not None:
+        match = name_index.resolve(park_name)
+        if match.index is not None:
+            park_name = name_index.catalog.names[match.index]
+            park_id = name_index.catalog.ids[match.index]
+        if match.ambiguous and match.method != 'id':
+            logger.warning(f"{park_name}: 같은 이름의 공원이 여러 개입니다 ({name_index.describe(match)})")
 
     logger.info(f"처리 중: {park_name}")
 
@@ -84,8 +95,8 @@ def process_json_file(json_path):
     rows = []
 
     for direction, direction_data in data.items():
-        # summary는 방향이 아니므로 건너뛰기
-        if direction == 'summary' or not isinstance(direction_data, dict):
+        # summary와 '_'로 시작하는 메타 정보는 방향이 아니므로 건너뛰기
+        if direction == 'summary' or direction.startswith('_') or not isinstance(direction_data, dict):
             continue
 
         # 모든 항목이 visible 상태인지 확인
@@ -94,6 +105,7 @@ def process_json_file(json_path):
         # CSV 행 생성
         row = {
             '공원명': park_name,
+            '관리번호': park_id,
             '사진방향': direction,
         }
 
@@ -135,22 +147,26 @@ def main():
     # 모든 JSON 파일 찾기
     json_files = sorted(input_dir.glob('*.json'))
 
-    # roadview_evaluate.json은 제외 (메타 파일로 추정)
-    json_files = [f for f in json_files if f.name != 'roadview_evaluate.json']
+    # roadview_evaluate.json과 '_'로 시작하는 파일(_run_usage.json 등)은 제외 (메타 파일)
+    json_files = [f for f in json_files if f.name != 'roadview_evaluate.json' and not f.name.startswith('_')]
 
     logger.info(f"총 {len(json_files)}개의 JSON 파일 발견")
 
+    # 파일명 → 공원 (공원 정보 CSV가 없으면 파일명 그대로)
+    park_info_path = Path(DEFAULT_PARK_CSV)
+    name_index = ParkCatalog.load(park_info_path).name_index if park_info_path.exists() else None
+
     # 모든 데이터 수집
     all_rows = []
 
     for json_path in json_files:
-        rows = process_json_file(json_path)
+        rows = process_json_file(json_path, name_index)
         all_rows.extend(rows)
 
     logger.info(f"총 {len(all_rows)}개의 데이터 행 생성")
 
     # CSV 파일 작성
-    fieldnames = ['공원명', '사진방향', 'facility_maintenance', 'rest_facilities',
+    fieldnames = ['공원명', '관리번호', '사진방향', 'facility_maintenance', 'rest_facilities',
                   'greenery_diversity', 'openness', 'aesthetics']
 
     with open(output_path, 'w', encoding='utf-8-sig', newline='') as f:
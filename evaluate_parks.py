@@ -7,10 +7,15 @@ output/ 폴더의 모든 공원 이미지를 Gemini API로 평가합니다.
 
 import os
 import sys
+import argparse
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
-from src.gemini_evaluator import GeminiEvaluator
+from src.gemini_evaluator import EVALUATION_PROFILES, GeminiEvaluator
+from src.image_prep import CROP_NAMES, PREP_MODES, ImagePrep
+from src.image_quality import GATE_MODES, QualityGate, direction_images
+from src.perceptual_hash import DEFAULT_THRESHOLD, HASH_METHODS, DuplicateIndex
+from src.instrumentation import configure_tracing, default_trace_path, tracer, write_run_report
 
 
 def setup_logging():
@@ -21,8 +26,67 @@ def setup_logging():
     )
 
 
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="Gemini API를 사용한 공원 이미지 평가")
+    parser.add_argument(
+        '--trace', default=None,
+        help="단계별 시간 트레이스 JSONL 경로 (기본: output/traces/evaluate_[시각].jsonl)"
+    )
+    parser.add_argument(
+        '--prescreen', choices=['model', 'heuristic'], default=None,
+        help="가시성 사전 판별 후 보이는 이미지만 전체 평가 (model: 저가 모델, heuristic: 로컬 녹지 비율)"
+    )
+    parser.add_argument(
+        '--quality-gate', choices=GATE_MODES, default=os.getenv('IMAGE_QUALITY_GATE', 'off'),
+        help="캡처 실패 이미지 처리 (off: 검사 안 함, skip: 평가 생략, requeue: _rejected/로 옮겨 재캡처 대상으로) "
+             "(기본: 환경변수 IMAGE_QUALITY_GATE 또는 off, 기준 보정 전까지는 check_image_quality.py로 먼저 점검)"
+    )
+    parser.add_argument(
+        '--profile', choices=list(EVALUATION_PROFILES), default=None,
+        help="평가 프로필 (fast: 사고 끔/짧은 근거, standard, thorough: 긴 사고/상세 근거) "
+             "(기본: 환경변수 GEMINI_PROFILE, 없으면 모델 기본 설정)"
+    )
+    parser.add_argument(
+        '--image-prep', choices=PREP_MODES, default=os.getenv('IMAGE_PREP', 'full'),
+        help="요청 이미지 (full: 원본 전체 화면, tiles: 전체 축소본 + 원본 해상도 부분 이미지를 한 요청에) "
+             "(기본: 환경변수 IMAGE_PREP 또는 full)"
+    )
+    parser.add_argument(
+        '--crops', default=os.getenv('IMAGE_CROPS', ','.join(CROP_NAMES)),
+        help=f"tiles 방식에서 보낼 이미지 (쉼표 구분, 기본: {','.join(CROP_NAMES)})"
+    )
+    parser.add_argument(
+        '--consensus', type=int, default=None,
+        help="이미지당 최대 샘플 수 (2 이상이면 항목별 다수결 합의 평가, 기본: 환경변수 GEMINI_CONSENSUS_SAMPLES 또는 1)"
+    )
+    parser.add_argument(
+        '--agreement', type=float, default=None,
+        help="합의로 볼 득표 비율 (최대 샘플 수 기준, 기본: 환경변수 GEMINI_CONSENSUS_AGREEMENT 또는 0.6)"
+    )
+    parser.add_argument(
+        '--dedup', action='store_true', default=os.getenv('IMAGE_DEDUP', '').lower() in ('1', 'true', 'yes'),
+        help="거의 같은 이미지는 대표 이미지만 평가하고 결과 복사 (기본: 환경변수 IMAGE_DEDUP)"
+    )
+    parser.add_argument(
+        '--dedup-threshold', type=int, default=int(os.getenv('IMAGE_DEDUP_THRESHOLD', str(DEFAULT_THRESHOLD))),
+        help=f"중복으로 볼 최대 해밍 거리 (64비트 중, 기본: {DEFAULT_THRESHOLD})"
+    )
+    parser.add_argument(
+        '--dedup-method', choices=HASH_METHODS, default=os.getenv('IMAGE_DEDUP_METHOD', 'dhash'),
+        help="지각 해시 방식 (기본: dhash)"
+    )
+    parser.add_argument(
+        '--dedup-scope', choices=['park', 'all'], default=os.getenv('IMAGE_DEDUP_SCOPE', 'park'),
+        help="park: 같은 공원 안에서만, all: 인접 공원 사이도 중복 탐지 (기본: park, all은 다른 공원 결과를 복사할 수 있음)"
+    )
+    return parser.parse_args()
+
+
 def main():
     """메인 실행 함수"""
+    args = parse_args()
+
     print("=" * 80)
     print("Gemini API를 사용한 공원 이미지 평가")
     print("=" * 80)
@@ -39,15 +103,40 @@ def main():
     # 로깅 설정
     setup_logging()
 
+    # 단계별 시간 측정
+    trace_path = args.trace or default_trace_path('evaluate')
+    configure_tracing(trace_path)
+
     # 평가자 생성
     try:
-        evaluator = GeminiEvaluator()
+        evaluator = GeminiEvaluator(
+            prescreen=args.prescreen,
+            quality_gate=QualityGate(mode=args.quality_gate),
+            profile=args.profile,
+            image_prep=ImagePrep(mode=args.image_prep, crops=[name.strip() for name in args.crops.split(',') if name.strip()])
+        )
     except ValueError as e:
         print(f"\n❌ 오류: {e}")
         print("\n.env 파일에 GEMINI_API_KEY를 설정해주세요.")
         print("자세한 내용은 .env.example 파일을 참고하세요.")
         sys.exit(1)
 
+    if evaluator.profile:
+        settings = EVALUATION_PROFILES[evaluator.profile]
+        print(f"⚙️  평가 프로필: {evaluator.profile} (사고 예산 {settings['thinking_budget']}, "
+              f"출력 상한 {settings['max_output_tokens']} 토큰, 근거 {settings['reason_max_length']}자 이내)\n")
+
+    if evaluator.image_prep.enabled:
+        print(f"✂️  이미지 준비: {evaluator.image_prep.mode} ({', '.join(evaluator.image_prep.crops)}, "
+              f"타일 {evaluator.image_prep.tile_size}px)\n")
+
+    if args.consensus:
+        evaluator.consensus_samples = args.consensus
+    if args.agreement:
+        evaluator.consensus_agreement = args.agreement
+    if evaluator.consensus_samples > 1:
+        print(f"🗳️  합의 평가: 이미지당 최대 {evaluator.consensus_samples}회, 득표 비율 {evaluator.consensus_agreement:.0%} 이상\n")
+
     # output 폴더에서 공원 목록 찾기
     # 먼저 output/ 직접 확인, 없으면 output/roadview_images/ 확인
     output_dir = Path('output')
@@ -65,7 +154,7 @@ def main():
         sys.exit(1)
 
     # roadview_images 폴더의 하위 디렉토리만 공원으로 인식
-    park_folders = [f for f in roadview_dir.iterdir() if f.is_dir()]
+    park_folders = sorted(f for f in roadview_dir.iterdir() if f.is_dir())
 
     if not park_folders:
         print(f"\n❌ 오류: {output_dir} 폴더에 공원 이미지가 없습니다.")
@@ -74,6 +163,20 @@ def main():
 
     print(f"📂 찾은 공원: {len(park_folders)}개\n")
 
+    # 거의 같은 이미지 클러스터 (평가 순서와 같은 순서로 구성해야 대표가 먼저 평가됨)
+    if args.dedup:
+        image_paths = [path for folder in park_folders for path in direction_images(folder)]
+        with tracer.span('image.dedup_index', images=len(image_paths)):
+            evaluator.duplicate_index = DuplicateIndex(
+                threshold=args.dedup_threshold,
+                method=args.dedup_method,
+                scope=args.dedup_scope
+            ).build(image_paths)
+
+        stats = evaluator.duplicate_index.stats
+        print(f"🔁 중복 이미지: {stats['duplicates']}장 (클러스터 {stats['clusters']}개, "
+              f"공원 간 {stats['cross_park_duplicates']}장, {stats['method']} 거리 ≤ {stats['threshold']})\n")
+
     # 평가 결과 저장 폴더 생성
     evaluate_dir = output_dir / 'roadview_evaluate'
     evaluate_dir.mkdir(exist_ok=True)
@@ -104,17 +207,21 @@ def main():
                 output_path=str(output_path)
             )
 
-            # 간단한 결과 출력
+            # 간단한 결과 출력 ('_'로 시작하는 메타 정보 제외)
+            directions = {key: r for key, r in results.items() if not key.startswith('_')}
             total_score = sum(
                 r.get('overall_score', 0.0)
-                for r in results.values()
+                for r in directions.values()
                 if 'error' not in r
             )
-            valid_count = sum(1 for r in results.values() if 'error' not in r)
+            valid_count = sum(1 for r in directions.values() if 'error' not in r)
+
+            if '_budget_stopped' in results:
+                print(f"⛔ 사용량 한도 도달로 일부 이미지를 평가하지 못했습니다 (다음 실행에서 다시 평가하세요)")
 
             if valid_count > 0:
                 avg_score = total_score / valid_count
-                print(f"✅ 평가 완료: 평균 점수 {avg_score:.1f}점 ({valid_count}/{len(results)}개 성공)")
+                print(f"✅ 평가 완료: 평균 점수 {avg_score:.1f}점 ({valid_count}/{len(directions)}개 성공)")
                 success_count += 1
             else:
                 print(f"⚠️  모든 이미지 평가 실패")
@@ -124,6 +231,18 @@ def main():
             print(f"❌ 평가 실패: {e}")
             failed_parks.append(park_name)
 
+        park_usage = evaluator.usage.park_summary(park_name)
+        if park_usage['requests']:
+            print(f"💰 토큰 {park_usage['total_tokens']:,} (사고 {park_usage['thoughts_tokens']:,}), "
+                  f"예상 비용 ${park_usage['cost_usd']:.4f}")
+
+        # 사용량 한도에 도달하면 남은 공원은 다음 실행에서 평가
+        if evaluator.budget.exhausted:
+            remaining = park_folders[idx:]
+            print(f"\n⛔ 사용량 한도 도달: 이후 공원 {len(remaining)}개는 평가하지 않았습니다.")
+            failed_parks.extend(folder.name for folder in remaining)
+            break
+
     # 최종 결과 출력
     print("\n" + "=" * 80)
     print("✅ 전체 평가 완료!")
@@ -141,6 +260,34 @@ def main():
     print(f"   - 파일 형식: 공원명.json")
     print("=" * 80)
 
+    evaluator.quality_gate.close()
+
+    # 실행 전체 토큰/비용 집계 저장 ('_'로 시작하는 파일은 CSV 변환 시 제외)
+    usage_path = evaluate_dir / '_run_usage.json'
+    evaluator.usage.save(usage_path)
+    run_usage = evaluator.usage.summary()
+    print(f"\n💰 전체 사용량: 요청 {run_usage['requests']}건, 토큰 {run_usage['total_tokens']:,}, "
+          f"예상 비용 ${run_usage['cost_usd']:.4f} ({usage_path})")
+    if evaluator.quality_gate.stats['rejected']:
+        print(f"\n🖼️  품질 불량으로 제외한 이미지: {evaluator.quality_gate.stats['rejected']}장"
+              f" (재캡처 대기 {evaluator.quality_gate.stats['requeued']}장)")
+
+    # 단계별 소요 시간 리포트
+    print()
+    extra = {'circuit_breaker': evaluator.breaker.snapshot(), 'quality_gate': dict(evaluator.quality_gate.stats)}
+    extra['truncation'] = evaluator.truncation_report()
+    extra['image_prep'] = evaluator.image_prep.report()
+    if evaluator.duplicate_index:
+        extra['dedup'] = evaluator.duplicate_index.stats
+    if evaluator.consensus_samples > 1:
+        extra['consensus'] = evaluator.consensus_report()
+    extra['usage'] = {key: value for key, value in run_usage.items() if key != 'by_park'}
+    if evaluator.budget.enabled:
+        extra['budget'] = evaluator.budget.snapshot()
+    if evaluator.prescreen:
+        extra['prescreen'] = dict(evaluator.prescreen_stats, method=evaluator.prescreen)
+    print(write_run_report(trace_path, extra=extra))
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+"""
+프롬프트/모델 A/B 실험 실행 스크립트
+
+이미 캡처된 output/roadview_images/ 이미지 중 공원구분별로 층화 추출한 일부만
+여러 변형(프롬프트, 모델, 생성 설정)으로 동시에 평가하고, 변형별로 나란히 저장합니다.
+기준 변형 대비 등급 일치율, 점수 이동, 지연 시간, 토큰 사용량을 리포트합니다.
+전체 평가 결과(output/roadview_evaluate/)는 건드리지 않습니다.
+
+사용법:
+    python experiment_runner.py docs/experiments/flash_vs_pro.json
+    python experiment_runner.py docs/experiments/flash_vs_pro.json --per-stratum 3 --concurrency 8
+
+실험 설정 (JSON):
+    {
+        "name": "flash_vs_pro",
+        "baseline": "flash",
+        "sample": {"per_stratum": 2, "seed": 0},
+        "variants": [
+            {"name": "flash", "model": "gemini-2.5-flash"},
+            {"name": "pro", "model": "gemini-2.5-pro"},
+            {"name": "flash_t0", "model": "gemini-2.5-flash", "generation": {"temperature": 0.0}},
+            {"name": "prompt_v2", "prompt": "docs/prompts/park_evaluation_prompt_v2.md"},
+            {"name": "flash_fast", "model": "gemini-2.5-flash", "profile": "fast"},
+            {"name": "flash_tiles", "model": "gemini-2.5-flash", "image_prep": {"mode": "tiles"}}
+        ]
+    }
+
+출력: output/experiments/[실험명]/
+    subset.json              평가 대상 이미지 (다시 실행해도 같은 이미지 사용)
+    [변형명]/[공원명].json    변형별 평가 결과 (evaluate_parks.py와 같은 형식, 이미 있는 이미지는 건너뜀)
+    report.json              변형별 비교 리포트
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import logging
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from dotenv import load_dotenv
+from src.gemini_evaluator import INDICATORS, GeminiEvaluator
+from src.instrumentation import percentile
+from src.image_prep import ImagePrep
+from src.image_quality import direction_images
+from src.park_catalog import ParkCatalog
+
+PARK_INFO_PATH = Path('data') / '인천광역시_미추홀구_도시공원정보_20250105.csv'
+LEVEL_SCORES = {'low': 1, 'medium': 2, 'high': 3}
+
+logger = logging.getLogger(__name__)
+
+
+def setup_logging():
+    """로깅 설정 (경고 이상만 출력, 진행 상황은 print로 표시)"""
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='[%(levelname)s] %(message)s',
+        force=True
+    )
+
+
+def load_experiment(config_path):
+    """
+    실험 설정 로드 및 검증
+
+    Args:
+        config_path (Path): 실험 설정 JSON 경로
+
+    Returns:
+        dict: 실험 설정
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config.setdefault('name', Path(config_path).stem)
+    variants = config.get('variants', [])
+    if not variants:
+        raise ValueError("실험 설정에 variants가 없습니다")
+
+    names = [variant.get('name', '') for variant in variants]
+    for name in names:
+        if not re.match(r'^[\w.-]+$', name):
+            raise ValueError(f"변형 이름은 영문/숫자/_/-/.만 사용할 수 있습니다: {name!r}")
+    if len(set(names)) != len(names):
+        raise ValueError("변형 이름이 중복되었습니다")
+
+    config.setdefault('baseline', names[0])
+    if config['baseline'] not in names:
+        raise ValueError(f"기준 변형을 찾을 수 없습니다: {config['baseline']}")
+
+    return config
+
+
+def select_subset(images_dir, per_stratum, seed, catalog=None):
+    """
+    공원구분별 층화 추출
+
+    Args:
+        images_dir (Path): 공원 폴더 상위 경로
+        per_stratum (int): 공원구분별 이미지 수
+        seed (int): 추출 시드
+        catalog (ParkCatalog): 공원 카탈로그 (폴더명을 이름 색인으로 찾음, 없으면 모두 미분류)
+
+    Returns:
+        list: [{'park': 공원명, 'direction': 방향, 'path': 경로, 'stratum': 공원구분}]
+    """
+    strata = defaultdict(list)
+
+    for park_folder in sorted(f for f in images_dir.iterdir() if f.is_dir()):
+        index = catalog.resolve(park_folder.name).index if catalog is not None else None
+        stratum = catalog.classifications[index] if index is not None else '미분류'
+        for image_path in direction_images(park_folder):
+            strata[stratum].append({
+                'park': park_folder.name,
+                'direction': image_path.stem,
+                'path': str(image_path),
+                'stratum': stratum,
+            })
+
+    rng = random.Random(seed)
+    subset = []
+    for stratum in sorted(strata):
+        items = strata[stratum]
+        subset.extend(rng.sample(items, min(per_stratum, len(items))))
+
+    return subset
+
+
+class VariantStore:
+    """변형별 평가 결과 저장 (공원별 JSON, 이미지 단위로 이어서 실행 가능)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def _load(self, park):
+        if park not in self._cache:
+            path = self.root / f'{park}.json'
+            if path.exists():
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._cache[park] = json.load(f)
+            else:
+                self._cache[park] = {}
+        return self._cache[park]
+
+    def get(self, park, direction):
+        with self._lock:
+            return self._load(park).get(direction)
+
+    def put(self, park, direction, result):
+        with self._lock:
+            results = self._load(park)
+            results[direction] = result
+            tmp_path = self.root / f'{park}.json.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.root / f'{park}.json')
+
+
+def build_evaluator(variant):
+    """
+    변형 설정으로 평가자 생성
+
+    Args:
+        variant (dict): {'name', 'model', 'prompt', 'profile', 'generation', 'image_prep'}
+
+    Returns:
+        GeminiEvaluator
+    """
+    return GeminiEvaluator(
+        model_name=variant.get('model'),
+        prompt_path=variant.get('prompt'),
+        generation_config=variant.get('generation'),
+        profile=variant.get('profile'),
+        image_prep=ImagePrep(**variant.get('image_prep', {}))
+    )
+
+
+def needs_evaluation(result):
+    """
+    저장된 결과를 다시 평가해야 하는지 (없거나 일시적 오류로 끝난 경우)
+
+    Args:
+        result (dict | None): VariantStore에 저장된 결과
+
+    Returns:
+        bool: 다시 평가할지 여부
+    """
+    return result is None or 'error' in result
+
+
+def evaluate_one(evaluator, store, item):
+    """
+    이미지 한 장 평가 후 저장 (지연 시간 기록)
+
+    Returns:
+        dict: 평가 결과
+    """
+    started = time.perf_counter()
+    try:
+        result = evaluator.evaluate_image(item['path'], park_name=item['park'], direction=item['direction'])
+    except Exception as e:
+        result = {'error': str(e)}
+    result['latency_sec'] = round(time.perf_counter() - started, 3)
+    store.put(item['park'], item['direction'], result)
+    return result
+
+
+def compare_variant(results, baseline_results):
+    """
+    변형 하나의 비용/품질 지표 계산
+
+    Args:
+        results (dict): (공원, 방향) → 결과
+        baseline_results (dict): (공원, 방향) → 기준 변형 결과
+
+    Returns:
+        dict: 리포트 항목
+    """
+    ok = {key: r for key, r in results.items() if 'error' not in r}
+    latencies = sorted(r['latency_sec'] for r in ok.values() if 'latency_sec' in r)
+    tokens = [r.get('usage', {}).get('total_tokens', 0) for r in ok.values()]
+    costs = [r.get('usage', {}).get('cost_usd', 0.0) for r in ok.values()]
+
+    same = compared = 0
+    shifts = []
+    not_visible = 0
+
+    for key, result in ok.items():
+        levels = [result[indicator]['level'] for indicator in INDICATORS]
+        not_visible += 'not_visible' in levels
+
+        base = baseline_results.get(key)
+        if not base or 'error' in base:
+            continue
+
+        for indicator in INDICATORS:
+            level, base_level = result[indicator]['level'], base[indicator]['level']
+            compared += 1
+            same += level == base_level
+            if level in LEVEL_SCORES and base_level in LEVEL_SCORES:
+                shifts.append(LEVEL_SCORES[level] - LEVEL_SCORES[base_level])
+
+    return {
+        'images': len(results),
+        'failures': len(results) - len(ok),
+        'agreement': round(same / compared, 3) if compared else None,
+        'score_shift': round(sum(shifts) / len(shifts), 3) if shifts else None,
+        'not_visible_rate': round(not_visible / len(ok), 3) if ok else None,
+        'latency_p50': round(percentile(latencies, 50), 3),
+        'latency_p95': round(percentile(latencies, 95), 3),
+        'tokens_total': sum(tokens),
+        'tokens_per_image': round(sum(tokens) / len(tokens), 1) if tokens else 0.0,
+        'cost_usd_total': round(sum(costs), 6),
+        'cost_usd_per_image': round(sum(costs) / len(costs), 6) if costs else 0.0,
+    }
+
+
+def print_report(report):
+    """변형별 비교 표 출력"""
+    print()
+    print(f"{'변형':<16}{'이미지':>6}{'실패':>6}{'일치율':>8}{'점수이동':>9}{'p50(s)':>8}{'p95(s)':>8}{'토큰/장':>9}{'$/장':>10}")
+    print("-" * 82)
+    for name, row in report['variants'].items():
+        agreement = f"{row['agreement']:.1%}" if row['agreement'] is not None else '-'
+        shift = f"{row['score_shift']:+.2f}" if row['score_shift'] is not None else '-'
+        marker = ' *' if name == report['baseline'] else ''
+        print(f"{name + marker:<16}{row['images']:>6}{row['failures']:>6}{agreement:>8}{shift:>9}"
+              f"{row['latency_p50']:>8.2f}{row['latency_p95']:>8.2f}{row['tokens_per_image']:>9.0f}"
+              f"{row['cost_usd_per_image']:>10.5f}")
+    print("\n* 기준 변형 (일치율/점수 이동은 기준 대비, 점수 이동은 low=1 ~ high=3 기준 평균 차이)")
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="프롬프트/모델 A/B 실험")
+    parser.add_argument('config', help="실험 설정 JSON")
+    parser.add_argument('--images-dir', default='output/roadview_images', help="캡처 이미지 폴더")
+    parser.add_argument('--per-stratum', type=int, default=None, help="공원구분별 이미지 수 (설정 파일 값 덮어쓰기)")
+    parser.add_argument('--concurrency', type=int, default=None, help="동시 요청 수 (기본: 설정 파일 또는 4)")
+    parser.add_argument('--resample', action='store_true', help="저장된 subset.json을 무시하고 다시 추출")
+    return parser.parse_args()
+
+
+def main():
+    """메인 실행 함수"""
+    args = parse_args()
+
+    env_path = Path(__file__).parent / '.env'
+    load_dotenv(dotenv_path=env_path, override=True)
+    setup_logging()
+
+    config = load_experiment(args.config)
+    experiment_dir = Path('output') / 'experiments' / config['name']
+    experiment_dir.mkdir(parents=True, exist_ok=True)
+
+    print("=" * 80)
+    print(f"A/B 실험: {config['name']} (변형 {len(config['variants'])}개, 기준: {config['baseline']})")
+    print("=" * 80)
+
+    # 평가 대상 이미지 (한 번 추출하면 재사용하여 변형을 추가해도 같은 이미지로 비교)
+    subset_path = experiment_dir / 'subset.json'
+    if subset_path.exists() and not args.resample:
+        with open(subset_path, 'r', encoding='utf-8') as f:
+            subset = json.load(f)
+        print(f"📂 저장된 평가 대상 사용: {len(subset)}장")
+    else:
+        sample = config.get('sample', {})
+        per_stratum = args.per_stratum or sample.get('per_stratum', 2)
+        catalog = ParkCatalog.load(PARK_INFO_PATH) if PARK_INFO_PATH.exists() else None
+        subset = select_subset(Path(args.images_dir), per_stratum, sample.get('seed', 0), catalog)
+        with open(subset_path, 'w', encoding='utf-8') as f:
+            json.dump(subset, f, ensure_ascii=False, indent=2)
+        strata = sorted({item['stratum'] for item in subset})
+        print(f"📂 층화 추출: {len(subset)}장 (공원구분 {len(strata)}개 × 최대 {per_stratum}장)")
+
+    if not subset:
+        print(f"\n❌ 오류: {args.images_dir}에 평가할 이미지가 없습니다.")
+        sys.exit(1)
+
+    # 변형별 평가자와 저장소
+    try:
+        evaluators = {variant['name']: build_evaluator(variant) for variant in config['variants']}
+    except (ValueError, FileNotFoundError) as e:
+        print(f"\n❌ 오류: {e}")
+        sys.exit(1)
+    stores = {name: VariantStore(experiment_dir / name) for name in evaluators}
+
+    # 아직 평가하지 않았거나 오류로 끝난 (변형, 이미지)만 동시에 실행
+    tasks = [
+        (name, item)
+        for item in subset
+        for name in evaluators
+        if needs_evaluation(stores[name].get(item['park'], item['direction']))
+    ]
+    concurrency = args.concurrency or config.get('concurrency', 4)
+    print(f"🚀 평가 {len(tasks)}건 (이미 있는 결과 {len(subset) * len(evaluators) - len(tasks)}건 재사용, 동시 {concurrency}건)\n")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(evaluate_one, evaluators[name], stores[name], item): (name, item)
+            for name, item in tasks
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            name, item = futures[future]
+            result = future.result()
+            status = '❌' if 'error' in result else '✅'
+            print(f"[{done}/{len(tasks)}] {status} {name}: {item['park']} - {item['direction']} ({result['latency_sec']:.1f}s)")
+
+    # 변형별 비교
+    results = {
+        name: {
+            (item['park'], item['direction']): stores[name].get(item['park'], item['direction'])
+            for item in subset
+        }
+        for name in evaluators
+    }
+    baseline_results = results[config['baseline']]
+
+    report = {
+        'name': config['name'],
+        'baseline': config['baseline'],
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'images': len(subset),
+        'variants': {
+            variant['name']: {
+                'model': evaluators[variant['name']].model_name,
+                'prompt': str(evaluators[variant['name']].prompt_path),
+                'profile': evaluators[variant['name']].profile,
+                'generation': evaluators[variant['name']].generation_config,
+                'truncation': evaluators[variant['name']].truncation_report(),
+                'image_prep': evaluators[variant['name']].image_prep.report(),
+                **compare_variant(results[variant['name']], baseline_results),
+            }
+            for variant in config['variants']
+        },
+    }
+
+    report_path = experiment_dir / 'report.json'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print_report(report)
+    print(f"\n📄 리포트 저장: {report_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+공원 폴리곤 가져오기 스크립트
+
+로컬 OSM 추출본(.osm.pbf), 공공데이터포털 Shapefile 또는 GeoJSON에서 공원 폴리곤을 읽어 CSV 공원과 짝짓고,
+결과를 캐시(output/park_polygons/*.npz)와 확인용 GeoJSON으로 저장합니다.
+캡처(scripts/capture_all_parks.py)와 녹지 면적(compute_green_space.py)은 같은 캐시를 --park-polygons로 바로 불러옵니다.
+
+입력: data/인천광역시_미추홀구_도시공원정보_20250105.csv, 폴리곤 원본
+출력: output/park_polygons/park_polygons_[키].npz, output/park_polygons/park_polygons.geojson
+"""
+
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+from src.park_catalog import DEFAULT_PARK_CSV, load_parks_from_csv
+from src.park_polygons import DEFAULT_MATCH_DISTANCE, load_park_polygons
+
+load_dotenv()
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="공원 폴리곤 가져오기 (OSM/Shapefile → CSV 공원 짝짓기)")
+    parser.add_argument(
+        '--source', default=os.getenv('PARK_POLYGON_PATH'),
+        help="폴리곤 원본 (.osm.pbf는 osmium, .shp는 geopandas 필요, 기본: 환경변수 PARK_POLYGON_PATH)"
+    )
+    parser.add_argument(
+        '--parks', default=DEFAULT_PARK_CSV,
+        help="공원 정보 CSV"
+    )
+    parser.add_argument(
+        '--max-distance', type=float, default=DEFAULT_MATCH_DISTANCE,
+        help=f"공원 좌표와 폴리곤 사이 최대 거리 (미터, 기본: {DEFAULT_MATCH_DISTANCE:g})"
+    )
+    parser.add_argument('--cache-dir', default='output/park_polygons', help="캐시 폴더")
+    parser.add_argument('--rebuild', action='store_true', help="캐시가 있어도 원본을 다시 읽어 짝짓기")
+    return parser.parse_args()
+
+
+def main():
+    """
+    공원 폴리곤 가져오기 실행
+    """
+    args = parse_args()
+    if not args.source:
+        print("❌ 폴리곤 원본을 지정하세요 (--source 또는 PARK_POLYGON_PATH)")
+        return
+
+    parks = load_parks_from_csv(args.parks)
+    print(f"🌳 공원 {len(parks)}개")
+
+    started = time.perf_counter()
+    polygons = load_park_polygons(parks, args.source, cache_dir=args.cache_dir,
+                                  max_distance=args.max_distance, rebuild=args.rebuild)
+    elapsed = time.perf_counter() - started
+
+    summary = polygons.summary()
+    print(f"\n📊 짝지은 공원 {polygons.matched}/{len(polygons)}개 ({elapsed:.2f}초)")
+    print(f"   이름 일치 {summary['name']}개, 좌표 포함 {summary['contains']}개, "
+          f"가까운 폴리곤 {summary['nearest']}개, 없음 {summary['unmatched']}개")
+
+    unmatched = [name for name, method in zip(polygons.names, polygons.methods) if not method]
+    if unmatched:
+        print(f"⚠️  폴리곤이 없는 공원 (원형 샘플링): {', '.join(unmatched[:15])}"
+              + (f" 외 {len(unmatched) - 15}개" if len(unmatched) > 15 else ""))
+
+    geojson_path = os.path.join(args.cache_dir, 'park_polygons.geojson')
+    polygons.to_geojson(geojson_path, parks)
+    print(f"💾 geojson: {geojson_path}")
+
+
+if __name__ == '__main__':
+    main()
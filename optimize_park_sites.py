@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+신규 공원 입지 선정 스크립트
+
+후보지(지구단위계획 예정지 등) 중 k곳을 골라 기존 공원 유치거리 밖에 있던 인구를 가장 많이 덮도록 선정합니다.
+후보지 권역은 analyze_accessibility.py --scenario와 같은 OD 거리 캐시를 재사용합니다.
+
+입력: 도로망, 공원 정보 CSV, 후보지 CSV/GeoJSON, (선택) 인구 격자 또는 행정동 경계 + 행정동별 인구
+출력: output/site_selection/ (selected_sites.csv, selected_sites.geojson, site_selection_summary.json)
+"""
+
+import argparse
+import os
+import time
+
+from dotenv import load_dotenv
+from src.accessibility import DEFAULT_CELL_SIZE, DEFAULT_MAX_SNAP, RoadNetwork, ServiceAreaAnalyzer, service_distance
+from src.green_space import DongBoundaries, load_population
+from src.od_cache import ODCache
+from src.park_catalog import DEFAULT_PARK_CSV, load_parks_from_csv
+from src.site_optimizer import (
+    DEFAULT_CANDIDATE_TYPE, SELECTION_METHODS, SiteOptimizer, cell_population, load_candidates, save_selection
+)
+from src.two_step_fca import PopulationGrid
+
+load_dotenv()
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="신규 공원 입지 선정 (권역 인구 최대화)")
+    parser.add_argument('--candidates', required=True, help="후보지 CSV(이름, 위도, 경도, 면적) 또는 GeoJSON")
+    parser.add_argument('--k', type=int, default=5, help="선정할 곳 수")
+    parser.add_argument(
+        '--network', default=os.getenv('ROAD_NETWORK_PATH'),
+        help="보행 도로망 파일 (.osm.pbf 또는 GeoJSON, 기본: 환경변수 ROAD_NETWORK_PATH)"
+    )
+    parser.add_argument(
+        '--parks', default=DEFAULT_PARK_CSV,
+        help="기존 공원 정보 CSV"
+    )
+    parser.add_argument(
+        '--candidate-type', default=DEFAULT_CANDIDATE_TYPE,
+        help=f"유형이 없는 후보지의 공원 유형 (유치거리 결정, 기본: {DEFAULT_CANDIDATE_TYPE})"
+    )
+    parser.add_argument('--candidate-area', type=float, default=0.0, help="면적이 없는 후보지의 면적 (㎡)")
+    parser.add_argument('--threshold', type=float, default=None, help="모든 공원/후보지에 같은 유치거리 적용 (미터)")
+    parser.add_argument(
+        '--population-grid', default=os.getenv('POPULATION_GRID_PATH'),
+        help="격자 인구 CSV (기본: 환경변수 POPULATION_GRID_PATH, 인구 자료가 없으면 면적 기준)"
+    )
+    parser.add_argument(
+        '--boundaries', default=os.getenv('DONG_BOUNDARY_PATH'),
+        help="격자 인구가 없을 때 행정동 인구를 배분할 행정동 경계 (기본: 환경변수 DONG_BOUNDARY_PATH)"
+    )
+    parser.add_argument(
+        '--population', default=os.getenv('DONG_POPULATION_PATH'),
+        help="행정동별 인구 CSV (기본: 환경변수 DONG_POPULATION_PATH)"
+    )
+    parser.add_argument('--method', choices=SELECTION_METHODS, default='lazy',
+                        help="lazy: 지연 탐욕법 (기본), greedy: 매 라운드 전체 재평가")
+    parser.add_argument('--cell-size', type=float, default=DEFAULT_CELL_SIZE, help="격자 셀 크기 (미터)")
+    parser.add_argument('--max-snap', type=float, default=DEFAULT_MAX_SNAP,
+                        help="셀 중심에서 도로까지 이 거리보다 멀면 분석 제외 (미터)")
+    parser.add_argument(
+        '--od-cache-dir', default=os.getenv('OD_CACHE_DIR', 'output/od_cache'),
+        help="셀-노드 거리 캐시 폴더 (기본: 환경변수 OD_CACHE_DIR 또는 output/od_cache)"
+    )
+    parser.add_argument('--output', default='output/site_selection', help="결과 폴더")
+    return parser.parse_args()
+
+
+def main():
+    """
+    입지 선정 실행
+    """
+    args = parse_args()
+    if not args.network:
+        print("❌ 도로망 파일을 지정하세요 (--network 또는 ROAD_NETWORK_PATH)")
+        return
+
+    parks = load_parks_from_csv(args.parks)
+    candidates = load_candidates(args.candidates, park_type=args.candidate_type, area=args.candidate_area)
+    print(f"🌳 기존 공원 {len(parks)}개, 후보지 {len(candidates):,}곳")
+    if not candidates:
+        return
+
+    network = RoadNetwork.load(args.network)
+    analyzer = ServiceAreaAnalyzer(network, cell_size=args.cell_size, max_snap=args.max_snap)
+
+    if args.population_grid:
+        grid = PopulationGrid.from_csv(args.population_grid)
+        print(f"👥 인구 격자: {len(grid):,}셀 ({args.population_grid})")
+    elif args.boundaries and args.population:
+        boundaries = DongBoundaries.load(args.boundaries)
+        grid = PopulationGrid.from_dongs(boundaries, load_population(args.population), cell_size=args.cell_size)
+        print(f"👥 행정동 인구를 {args.cell_size:g}m 격자 {len(grid):,}셀에 배분")
+    else:
+        grid = None
+        print("⚠️  인구 자료가 없어 셀 면적 기준으로 선정합니다")
+    population = cell_population(analyzer, grid)
+
+    threshold = max(service_distance(park, args.threshold) for park in parks + candidates)
+    started = time.perf_counter()
+    od = ODCache(args.od_cache_dir).load_or_build(analyzer, threshold)
+    print(f"🗂️  OD 캐시: {od.nnz:,}쌍, 상한 {od.threshold:g}m ({time.perf_counter() - started:.2f}초)")
+
+    optimizer = SiteOptimizer(analyzer, od, population, threshold=args.threshold)
+    baseline = optimizer.set_existing(parks)
+    result = optimizer.select(candidates, args.k, method=args.method)
+    paths = save_selection(result, args.output)
+
+    unit = '명' if grid is not None else '셀'
+    total = baseline['total_population']
+    print(f"\n📊 입지 선정 ({args.method}, {result['elapsed_sec']:.2f}초, 한계 이득 평가 {result['evaluations']:,}회)")
+    print(f"   현재 권역 안: {baseline['covered_population']:,.0f}{unit} "
+          f"({baseline['covered_population'] / total:.1%})" if total else "   인구 0")
+    for site in result['selected']:
+        print(f"   {site['rank']:>2}. {site['name']}: +{site['gain']:,.0f}{unit} → {site['coverage_ratio']:.1%}")
+    if len(result['selected']) < args.k:
+        print(f"   (새로 덮을 인구가 있는 후보지가 {len(result['selected'])}곳뿐입니다)")
+    for name, path in paths.items():
+        print(f"💾 {name}: {path}")
+
+
+if __name__ == '__main__':
+    main()
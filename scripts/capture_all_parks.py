@@ -4,125 +4,94 @@
 CSV 파일에서 공원 정보를 읽어서 모든 공원의 로드뷰를 다방향 샘플링으로 캡처합니다.
 """
 
-import csv
+import argparse
 import os
 from dotenv import load_dotenv
 from src import RoadviewClient
+from src.roadview_client import CAPTURE_PROFILES, VIEWPOINT_PRESETS, parse_viewpoints
 from src.park_sampler import ParkSampler
 from src.adaptive_capture import AdaptiveCaptureManager
+from src.capture_pool import CaptureManifest, capture_park, group_parks_by_folder, run_capture_pool, worker_cache_dir
+from src.network_cache import CACHE_MODES
+from src.capture_scheduler import SCHEDULE_METHODS, order_tasks, tour_length_m
+from src.instrumentation import configure_tracing, default_trace_path, write_run_report
+from src.park_catalog import DEFAULT_PARK_CSV, ParkCatalog
+from src.park_polygons import load_park_polygons
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
 
-def parse_park_type(park_classification: str) -> str:
-    """
-    공원구분을 시스템 타입으로 변환
-
-    Args:
-        park_classification: CSV의 공원구분 (예: "어린이공원", "근린공원")
-
-    Returns:
-        시스템 타입 ("어린이공원", "근린공원", "도시공원", "기타")
-    """
-    if "어린이" in park_classification:
-        return "어린이공원"
-    elif "근린" in park_classification:
-        return "근린공원"
-    elif "도시" in park_classification:
-        return "도시공원"
-    elif "소공원" in park_classification:
-        return "소공원"
-    else:
-        return "기타"
-
-
-def get_num_directions(park_type: str, area: float) -> int:
-    """
-    공원 타입과 면적에 따라 적절한 방향 개수 결정
-
-    Args:
-        park_type: 공원 타입
-        area: 공원 면적 (㎡)
-
-    Returns:
-        방향 개수 (4, 6, 8, 12)
-    """
-    if park_type == "근린공원" or park_type == "도시공원":
-        # 큰 공원: 12방향
-        return 12
-    elif area > 5000:
-        # 큰 어린이공원: 8방향
-        return 8
-    elif area > 2000:
-        # 중간 어린이공원: 6방향
-        return 6
-    else:
-        # 작은 공원: 4방향
-        return 4
+def parse_args():
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="미추홀구 전체 공원 로드뷰 일괄 캡처")
+    parser.add_argument(
+        '--workers', type=int, default=int(os.getenv('CAPTURE_WORKERS', '1')),
+        help="캡처 워커 프로세스 수 (기본: 1, 환경변수 CAPTURE_WORKERS)"
+    )
+    parser.add_argument(
+        '--base-port', type=int, default=8080,
+        help="첫 워커의 템플릿 서버 포트 (워커마다 1씩 증가, 기본: 8080)"
+    )
+    parser.add_argument(
+        '--schedule', choices=SCHEDULE_METHODS, default=os.getenv('CAPTURE_SCHEDULE', 'hilbert'),
+        help="캡처 순서 (hilbert: 힐베르트 곡선, nearest: 최근접 이웃 순회, csv: CSV 순서, "
+             "기본: 환경변수 CAPTURE_SCHEDULE 또는 hilbert)"
+    )
+    parser.add_argument(
+        '--cache-dir', default=os.getenv('CAPTURE_CACHE_DIR', 'output/browser_cache'),
+        help="워커별 브라우저 프로필(디스크 캐시) 상위 폴더, 빈 문자열이면 캡처마다 빈 캐시 "
+             "(기본: 환경변수 CAPTURE_CACHE_DIR 또는 output/browser_cache)"
+    )
+    parser.add_argument(
+        '--network-cache', choices=CACHE_MODES, default=os.getenv('NETWORK_CACHE', 'off'),
+        help="카카오 SDK/파노라마 응답 저장소 (record: 받아서 저장, replay: 저장된 응답만 사용(오프라인), "
+             "auto: 있으면 재사용, 기본: 환경변수 NETWORK_CACHE 또는 off)"
+    )
+    parser.add_argument(
+        '--capture-profile', choices=CAPTURE_PROFILES, default=os.getenv('CAPTURE_PROFILE', 'default'),
+        help="캡처 페이지 프로필 (lean: 통계/웹폰트 등 화면과 무관한 리소스 차단, 가벼운 Chromium 옵션, "
+             "상태 표시 숨김, 기본: 환경변수 CAPTURE_PROFILE 또는 default)"
+    )
+    parser.add_argument(
+        '--viewpoints', default=os.getenv('CAPTURE_VIEWPOINTS', ''),
+        help=f"샘플 포인트마다 같은 파노라마에서 추가로 찍을 시점 (쉼표 구분, 프리셋: {', '.join(VIEWPOINT_PRESETS)} "
+             "또는 이름:pan:tilt:zoom, 기본: 환경변수 CAPTURE_VIEWPOINTS, 없으면 공원 방향 한 장)"
+    )
+    parser.add_argument(
+        '--park-polygons', default=os.getenv('PARK_POLYGON_PATH'),
+        help="공원 폴리곤 원본 (.osm.pbf, .shp, .geojson, 있으면 경계를 따라 샘플링, "
+             "기본: 환경변수 PARK_POLYGON_PATH, 짝지은 결과는 output/park_polygons/에 캐시)"
+    )
+    parser.add_argument(
+        '--trace', default=None,
+        help="단계별 시간 트레이스 JSONL 경로 (기본: output/traces/capture_[시각].jsonl)"
+    )
+    return parser.parse_args()
 
 
-def load_parks_from_csv(csv_path: str):
+def main():
     """
-    CSV 파일에서 공원 정보 로드
-
-    Args:
-        csv_path: CSV 파일 경로
-
-    Returns:
-        공원 정보 리스트
+    미추홀구 전체 공원 로드뷰 일괄 캡처
     """
-    parks = []
-
-    with open(csv_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            try:
-                # 필수 데이터 추출
-                name = row['공원명'].strip()
-                lat = float(row['위도'])
-                lng = float(row['경도'])
-
-                # 면적 (빈 값 처리)
-                area_str = row['공원면적'].strip()
-                area = float(area_str) if area_str else 1500.0
-
-                # 공원 타입
-                park_classification = row['공원구분'].strip()
-                park_type = parse_park_type(park_classification)
+    args = parse_args()
+    viewpoints = parse_viewpoints(args.viewpoints)
 
-                # 방향 개수 자동 결정
-                num_directions = get_num_directions(park_type, area)
+    # 워커 프로세스도 환경변수로 같은 응답 저장소/페이지 프로필 설정을 물려받음
+    os.environ['NETWORK_CACHE'] = args.network_cache
+    os.environ['CAPTURE_PROFILE'] = args.capture_profile
 
-                parks.append({
-                    'name': name,
-                    'lat': lat,
-                    'lng': lng,
-                    'type': park_type,
-                    'area': area,
-                    'num_directions': num_directions,
-                    'classification': park_classification,
-                })
+    # 단계별 시간 측정 (워커 프로세스도 같은 파일에 기록)
+    trace_path = args.trace or default_trace_path('capture')
+    configure_tracing(trace_path)
 
-            except (ValueError, KeyError) as e:
-                print(f"⚠️  데이터 파싱 오류: {row.get('공원명', 'Unknown')} - {e}")
-                continue
-
-    return parks
-
-
-def main():
-    """
-    미추홀구 전체 공원 로드뷰 일괄 캡처
-    """
     print("=" * 80)
     print("미추홀구 전체 공원 로드뷰 일괄 캡처")
     print("=" * 80)
     print()
 
     # CSV 파일 경로
-    csv_path = "data/인천광역시_미추홀구_도시공원정보_20250105.csv"
+    csv_path = DEFAULT_PARK_CSV
 
     if not os.path.exists(csv_path):
         print(f"❌ CSV 파일을 찾을 수 없습니다: {csv_path}")
@@ -130,8 +99,19 @@ def main():
 
     # 공원 정보 로드
     print(f"📂 CSV 파일 로드 중: {csv_path}")
-    parks = load_parks_from_csv(csv_path)
+    catalog = ParkCatalog.load(csv_path)
+    parks = catalog.to_dicts()
+    # 같은 이름의 공원은 관리번호로 폴더를 나눔 (매니페스트/평가 JSON도 공원마다 따로)
+    for index, park in enumerate(parks):
+        park['folder'] = catalog.folder_name(index)
     print(f"✅ {len(parks)}개 공원 정보 로드 완료")
+    duplicates = catalog.name_index.collisions['exact']
+    if duplicates:
+        print(f"🔀 이름이 같은 공원 {sum(map(len, duplicates.values()))}개는 [관리번호]_[공원명] 폴더에 저장: "
+              f"{', '.join(duplicates)}")
+    if args.park_polygons:
+        polygons = load_park_polygons(parks, args.park_polygons)
+        print(f"🗺️  공원 폴리곤 {polygons.attach(parks)}/{len(parks)}개 (나머지는 면적 기반 원형 샘플링)")
     print()
 
     # 통계
@@ -147,19 +127,35 @@ def main():
 
     # 캡처 시작 안내
     print(f"총 {len(parks)}개 공원의 로드뷰를 캡처합니다.")
-    print(f"예상 이미지 수: 약 {sum(p['num_directions'] for p in parks)}개")
+    print(f"예상 이미지 수: 약 {sum(p['num_directions'] for p in parks) * (1 + len(viewpoints))}개")
+    if viewpoints:
+        print(f"추가 시점: {', '.join(vp['name'] for vp in viewpoints)} (같은 파노라마에서 시점만 변경)")
+    print()
+    # 공간 순서로 정렬 (인접 공원을 연달아 캡처하여 브라우저 캐시 재사용)
+    csv_tour = tour_length_m([(park['lat'], park['lng']) for park in parks])
+    parks = [park for task in order_tasks(group_parks_by_folder(parks), args.schedule) for park in task]
+    tour = tour_length_m([(park['lat'], park['lng']) for park in parks])
+    print(f"🧭 캡처 순서: {args.schedule} (공원 간 이동 {tour / 1000:.1f}km, CSV 순서 {csv_tour / 1000:.1f}km)")
+    cache_root = args.cache_dir or None
+    if cache_root:
+        print(f"💾 브라우저 캐시: {cache_root}/worker_N (실행 간 유지)")
     print()
     print("캡처를 시작합니다...")
     print()
 
-    # 클라이언트 및 적응형 캡처 관리자 생성
-    try:
-        client = RoadviewClient()
-        sampler = ParkSampler()
-        adaptive_manager = AdaptiveCaptureManager(client, sampler)
-    except ValueError as e:
-        print(f"❌ 오류: {e}")
-        return
+    output_root = "output/roadview_images"
+    manifest = CaptureManifest(os.path.join(output_root, 'capture_manifest.json'))
+
+    # 적응형 캡처 옵션 (모든 워커 공통)
+    capture_options = {
+        'min_success_rate': 0.6,  # 60% 성공률 목표
+        'max_radius_multiplier': 2.5,  # 최대 2.5배
+        'radius_increment': 0.4,  # 0.4배씩 증가
+        'width': 2560,
+        'height': 1440,
+        'headless': True,
+        'viewpoints': viewpoints,
+    }
 
     # 전체 통계
     total_parks = len(parks)
@@ -167,45 +163,64 @@ def main():
     total_fail = 0
     total_images = 0
 
-    # 각 공원 처리
-    for idx, park in enumerate(parks, 1):
-        print()
-        print("=" * 80)
-        print(f"[{idx}/{total_parks}] {park['name']} ({park['classification']}, {park['area']:.1f}㎡)")
-        print("=" * 80)
-        print(f"📍 위치: ({park['lat']}, {park['lng']})")
-
-        # 출력 폴더 생성
-        park_folder = f"output/roadview_images/{park['name']}"
-        os.makedirs(park_folder, exist_ok=True)
-
-        # 적응형 캡처 실행
-        park_success, total_attempts, final_radius = adaptive_manager.capture_park_adaptive(
-            park_name=park['name'],
-            center_lat=park['lat'],
-            center_lng=park['lng'],
-            park_type=park['type'],
-            area_sqm=park['area'],
-            num_directions=park['num_directions'],
-            output_folder=park_folder,
-            min_success_rate=0.6,  # 60% 성공률 목표
-            max_radius_multiplier=2.5,  # 최대 2.5배
-            radius_increment=0.4,  # 0.4배씩 증가
-            width=2560,
-            height=1440,
-            headless=True
-        )
+    def report(record):
+        nonlocal total_success, total_fail, total_images
 
         # 공원별 결과
         print()
-        print(f"📸 {park['name']} 완료: {park_success}/{total_attempts}개 캡처 성공 (최종 반경: {final_radius}m)")
+        if 'error' in record:
+            print(f"❌ {record['name']} 실패: {record['error']}")
+        else:
+            print(f"📸 {record['name']} 완료: {record['success']}/{record['attempts']}개 캡처 성공 (최종 반경: {record['final_radius']}m)")
 
-        total_images += park_success
-        if park_success > 0:
+        total_images += record['success'] * (1 + len(viewpoints))
+        if record['success'] > 0:
             total_success += 1
         else:
             total_fail += 1
 
+    if args.workers > 1:
+        # 워커 프로세스 풀 (워커마다 브라우저와 포트를 따로 사용)
+        run_capture_pool(
+            parks=parks,
+            output_root=output_root,
+            num_workers=args.workers,
+            capture_options=capture_options,
+            manifest=manifest,
+            base_port=args.base_port,
+            on_result=report,
+            schedule=args.schedule,
+            cache_root=cache_root
+        )
+    else:
+        # 클라이언트 및 적응형 캡처 관리자 생성
+        try:
+            client = RoadviewClient(port=args.base_port, cache_dir=worker_cache_dir(cache_root, 0))
+            sampler = ParkSampler()
+            adaptive_manager = AdaptiveCaptureManager(client, sampler)
+        except ValueError as e:
+            print(f"❌ 오류: {e}")
+            return
+
+        try:
+            # 브라우저를 한 번만 띄워 모든 공원에서 재사용
+            client.open(headless=capture_options['headless'])
+
+            # 각 공원 처리
+            for idx, park in enumerate(parks, 1):
+                print()
+                print("=" * 80)
+                print(f"[{idx}/{total_parks}] {park['name']} ({park['classification']}, {park['area']:.1f}㎡)")
+                print("=" * 80)
+                print(f"📍 위치: ({park['lat']}, {park['lng']})")
+
+                # 적응형 캡처 실행
+                record = capture_park(adaptive_manager, park, output_root, capture_options)
+                manifest.update(record)
+                report(record)
+        finally:
+            client.close()
+
     # 최종 통계
     print()
     print("=" * 80)
@@ -215,9 +230,14 @@ def main():
     print(f"로드뷰 캡처 성공: {total_success}개 공원")
     print(f"로드뷰 없음: {total_fail}개 공원")
     print(f"총 이미지 수: {total_images}개")
-    print(f"이미지 저장 위치: output/[공원명]/")
+    print(f"이미지 저장 위치: {output_root}/[공원명]/")
+    print(f"캡처 매니페스트: {manifest.path}")
     print("=" * 80)
 
+    # 단계별 소요 시간 리포트
+    print()
+    print(write_run_report(trace_path))
+
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,50 @@
+"""
+캡처 이미지 품질 점검
+
+output/roadview_images/의 공원 폴더를 검사하여 검은 화면, 오류 화면, 타일 누락, 흐린 이미지를 출력합니다.
+--requeue를 주면 불량 이미지를 각 공원 폴더의 _rejected/로 옮겨, 다음 캡처 실행에서 다시 촬영되도록 합니다.
+
+사용법:
+    python scripts/check_image_quality.py [--requeue] [--workers N] [공원폴더 ...]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from src.image_quality import QualityGate, describe_issues, screen_folders
+
+
+def main():
+    """품질 점검 실행"""
+    parser = argparse.ArgumentParser(description="캡처 이미지 품질 점검")
+    parser.add_argument('folders', nargs='*', help="공원 폴더 (기본: output/roadview_images/ 하위 전체)")
+    parser.add_argument('--requeue', action='store_true', help="불량 이미지를 _rejected/로 이동")
+    parser.add_argument('--workers', type=int, default=None, help="검사 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args()
+
+    folders = [Path(folder) for folder in args.folders]
+    if not folders:
+        roadview_dir = Path('output') / 'roadview_images'
+        if not roadview_dir.exists():
+            print(f"❌ 오류: {roadview_dir} 폴더를 찾을 수 없습니다.")
+            sys.exit(1)
+        folders = sorted(f for f in roadview_dir.iterdir() if f.is_dir())
+
+    gate = QualityGate(mode='requeue' if args.requeue else 'skip', workers=args.workers)
+    try:
+        bad = screen_folders(folders, gate)
+        for report in bad:
+            print(f"⚠️  {report['path']}: {describe_issues(report, gate.thresholds)}")
+            if args.requeue:
+                print(f"   → {gate.requeue(report['path'])}")
+    finally:
+        gate.close()
+
+    summary = f"\n검사 {gate.stats['checked']}장, 불량 {gate.stats['rejected']}장"
+    if args.requeue:
+        summary += f", 재캡처 대기 {gate.stats['requeued']}장"
+    print(summary)
+
+
+if __name__ == '__main__':
+    main()
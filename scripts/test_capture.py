@@ -14,10 +14,14 @@ from dotenv import load_dotenv
 from src import RoadviewClient
 from src.park_sampler import ParkSampler
 from src.adaptive_capture import AdaptiveCaptureManager
+from src.park_catalog import Park, ParkCatalog
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
+# 테스트 캡처할 공원
+TEST_PARKS = ['매소홀어린이공원', '한나루어린이공원']
+
 
 def main():
     """
@@ -41,25 +45,18 @@ def main():
         print("   3. .env 파일에 KAKAO_API_KEY=발급받은키 입력")
         return
 
-    # 공원 목록 (면적 정보 포함)
-    parks = [
-        {
-            'name': '매소홀어린이공원',
-            'lat': 37.441929,
-            'lng': 126.654533,
-            'type': '어린이공원',
-            'area': 3006.9,  # ㎡
-            'num_directions': 8,
-        },
-        {
-            'name': '한나루어린이공원',
-            'lat': 37.440447,
-            'lng': 126.661832,
-            'type': '어린이공원',
-            'area': 2500,  # ㎡ (추정)
-            'num_directions': 8,
-        },
-    ]
+    # 공원 목록 (공원 카탈로그에서 면적/타입/방향 개수를 가져옴, CSV에 없는 공원만 직접 지정)
+    catalog = ParkCatalog.load()
+    extra_parks = {
+        '한나루어린이공원': Park('', '한나루어린이공원', '어린이공원', 37.440447, 126.661832, reported_area=2500),  # 면적 추정
+    }
+    parks = []
+    for name in TEST_PARKS:
+        park = catalog.get(name) or extra_parks.get(name)
+        if park is None:
+            print(f"⚠️  공원 정보를 찾을 수 없습니다: {name}")
+            continue
+        parks.append(park.to_dict())
 
     # 각 공원에 대해 적응형 캡처 실행
     total_success = 0
@@ -0,0 +1,33 @@
+"""
+트레이스 리포트 출력
+
+capture_all_parks.py / evaluate_parks.py가 남긴 JSONL 트레이스를 합쳐
+단계별 p50/p95/p99, 카운터, 처리량을 출력합니다.
+
+사용법:
+    python scripts/trace_report.py output/traces/capture_20251101_120000.jsonl [...]
+"""
+
+import json
+import sys
+from src.instrumentation import format_summary, load_trace
+
+
+def main():
+    """트레이스 파일 요약 출력"""
+    paths = [arg for arg in sys.argv[1:] if arg != '--json']
+
+    if not paths:
+        print("사용법: python scripts/trace_report.py [--json] TRACE.jsonl [TRACE.jsonl ...]")
+        sys.exit(1)
+
+    summary = load_trace(paths)
+
+    if '--json' in sys.argv:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print(format_summary(summary))
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,8 @@ import unicodedata
 from pathlib import Path
 from collections import defaultdict
 
+from src.park_catalog import DEFAULT_PARK_CSV, ParkCatalog
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -38,35 +40,55 @@ def normalize_text(text):
     return unicodedata.normalize('NFC', text.strip())
 
 
-def load_park_info(park_info_path):
+def format_number(value):
     """
-    공원 정보 CSV 파일 로드
+    CSV 숫자 표기로 되돌리기 (정수면 소수점 없이)
 
     Args:
-        park_info_path (Path): 공원 정보 CSV 파일 경로
+        value (float): 숫자
 
     Returns:
-        dict: 공원명을 키로 하는 공원 정보 딕셔너리
+        str: 숫자 문자열
     """
-    park_info = {}
+    text = repr(float(value))
+    return text[:-2] if text.endswith('.0') else text
 
-    with open(park_info_path, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            park_name = normalize_text(row['공원명'])  # 정규화
-            # 첫 번째 등장하는 공원 정보만 저장 (중복 제거)
-            if park_name not in park_info:
-                park_info[park_name] = {
-                    '공원구분': row['공원구분'].strip(),
-                    '위도': row['위도'].strip(),
-                    '경도': row['경도'].strip(),
-                    '공원면적': row['공원면적'].strip(),
-                    '지정고시일': row['지정고시일'].strip()
-                }
-
-    logger.info(f"공원 정보 로드 완료: {len(park_info)}개 공원")
-    logger.debug(f"로드된 공원 목록 (처음 5개): {list(park_info.keys())[:5]}")
-    return park_info
+
+def park_info_fields(park):
+    """
+    출력 CSV에 붙일 공원 정보 (원본 CSV 표기 그대로)
+
+    Args:
+        park (Park): 카탈로그 공원
+
+    Returns:
+        dict: 공원구분, 위도, 경도, 공원면적, 지정고시일
+    """
+    return {
+        '공원구분': park.classification,
+        '위도': format_number(park.lat),
+        '경도': format_number(park.lng),
+        '공원면적': format_number(park.reported_area) if park.reported_area is not None else '',
+        '지정고시일': park.designated
+    }
+
+
+def resolve_park(name_index, text):
+    """
+    평가 행/폴더/파일 이름을 카탈로그 공원으로 찾기 (경고는 호출한 쪽에서 공원당 한 번)
+
+    Args:
+        name_index (ParkNameIndex): 카탈로그 이름 색인
+        text (str): 관리번호 또는 공원명
+
+    Returns:
+        tuple: (묶음 키, 출력 공원명, NameMatch) - 찾은 공원은 행 번호로 묶고, 못 찾으면 정규화한 이름으로 묶음
+    """
+    match = name_index.resolve(text)
+    if match.index is None:
+        name = normalize_text(text)
+        return name, name, match
+    return match.index, name_index.catalog.names[match.index], match
 
 
 def calculate_total_score(row):
@@ -112,19 +134,21 @@ def select_best_directions(input_path, output_path, park_info_path):
     logger.info(f"출력 파일: {output_path}")
     logger.info(f"공원 정보 파일: {park_info_path}")
 
-    # 공원 정보 로드
-    park_info = load_park_info(park_info_path)
+    # 공원 정보 로드 (이름 색인은 입력 이름별로 한 번만 찾음)
+    catalog = ParkCatalog.load(park_info_path)
+    name_index = catalog.name_index
+    logger.info(f"공원 정보 로드 완료: {len(catalog)}개 공원")
 
-    # 공원별 데이터 저장
+    # 공원별 데이터 저장 (키: 카탈로그 행 번호, 못 찾은 공원은 정규화 이름)
     park_data = defaultdict(list)
-    all_parks = set()  # 모든 공원 목록 추적
+    all_parks = {}  # 묶음 키 → (출력 공원명, NameMatch)
 
-    # CSV 파일 읽기
+    # CSV 파일 읽기 (convert_evaluations_to_csv.py가 넣은 관리번호가 있으면 우선)
     with open(input_path, 'r', encoding='utf-8-sig') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            park_name = normalize_text(row['공원명'])  # 정규화
-            all_parks.add(park_name)  # 공원 목록에 추가
+            park_key, park_name, match = resolve_park(name_index, row.get('관리번호') or row['공원명'])
+            all_parks.setdefault(park_key, (park_name, match))
 
             # 총 점수 계산
             total_score = calculate_total_score(row)
@@ -134,7 +158,7 @@ def select_best_directions(input_path, output_path, park_info_path):
                 continue
 
             # 공원별 데이터에 추가
-            park_data[park_name].append({
+            park_data[park_key].append({
                 'row': row,
                 'total_score': total_score
             })
@@ -145,13 +169,21 @@ def select_best_directions(input_path, output_path, park_info_path):
     best_rows = []
     not_visible_parks = []
 
-    for park_name in all_parks:
-        directions = park_data.get(park_name, [])
+    for park_key, (park_name, match) in all_parks.items():
+        directions = park_data.get(park_key, [])
 
         # 공원 정보 가져오기
-        info = park_info.get(park_name, {})
-        if not info:
-            logger.warning(f"{park_name}: 공원 정보를 찾을 수 없습니다")
+        if match.index is None:
+            info = {}
+            if match.method == 'ambiguous':
+                logger.warning(f"{park_name}: 같은 이름의 공원이 여러 개라 정할 수 없습니다 ({name_index.describe(match)})")
+            else:
+                logger.warning(f"{park_name}: 공원 정보를 찾을 수 없습니다")
+        else:
+            info = park_info_fields(catalog[match.index])
+            if match.ambiguous and match.method != 'id':
+                logger.warning(f"{park_name}: 같은 이름의 공원이 여러 개입니다 - 첫 번째 사용 ({name_index.describe(match)})")
+        park_id = catalog.ids[match.index] if match.index is not None else ''
 
         if not directions:
             # 모든 방향이 not_visible인 경우 - 모든 항목을 9로 설정
@@ -161,6 +193,7 @@ def select_best_directions(input_path, output_path, park_info_path):
             # 9점으로 채워진 행 생성 (공원 정보 포함)
             default_row = {
                 '공원명': park_name,
+                '관리번호': park_id,
                 '공원구분': info.get('공원구분', ''),
                 '위도': info.get('위도', ''),
                 '경도': info.get('경도', ''),
@@ -188,6 +221,7 @@ def select_best_directions(input_path, output_path, park_info_path):
         # 총점 정보 및 공원 정보 추가 (모든 텍스트 정규화)
         row_with_score = {
             '공원명': park_name,
+            '관리번호': park_id,
             '공원구분': info.get('공원구분', ''),
             '위도': info.get('위도', ''),
             '경도': info.get('경도', ''),
@@ -210,13 +244,13 @@ def select_best_directions(input_path, output_path, park_info_path):
 
     # CSV 파일 작성 (헤더 순서: 공원 정보 → 평가 정보)
     fieldnames = [
-        '공원명', '공원구분', '위도', '경도', '공원면적', '지정고시일',
+        '공원명', '관리번호', '공원구분', '위도', '경도', '공원면적', '지정고시일',
         '사진방향', 'facility_maintenance', 'rest_facilities',
         'greenery_diversity', 'openness', 'aesthetics', '총점'
     ]
 
-    # 공원명으로 정렬
-    best_rows.sort(key=lambda x: x['공원명'])
+    # 공원명으로 정렬 (같은 이름은 관리번호 순)
+    best_rows.sort(key=lambda x: (x['공원명'], x['관리번호']))
 
     # Excel 호환성을 위해 CP949 인코딩 사용 (한글 자음/모음 분리 방지)
     try:
@@ -248,7 +282,7 @@ def main():
     # 입력/출력 경로 설정
     input_path = Path('output/park_evaluations.csv')
     output_path = Path('output/park_best_directions.csv')
-    park_info_path = Path('data/인천광역시_미추홀구_도시공원정보_20250105.csv')
+    park_info_path = Path(DEFAULT_PARK_CSV)
 
     # 파일 존재 확인
     if not input_path.exists():
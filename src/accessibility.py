@@ -0,0 +1,572 @@
+"""
+공원 서비스 권역(도보 접근성) 분석 모듈
+
+보행 도로망(OSM PBF 또는 GeoJSON)을 CSR 배열 그래프로 만들고, 모든 공원 입구를 동시에 출발점으로 하는
+다중 출발점 다익스트라로 격자 셀마다 가장 가까운 공원까지의 보행 거리를 계산합니다.
+격자 셀과 도로망 노드의 연결(스냅)은 한 번만 계산해 두므로, 공원이나 유치거리를 바꿔 다시 분석할 때는
+다익스트라 한 번과 배열 연산만 수행하여 구 단위 분석이 1초 안팎에 끝납니다.
+
+결과는 QGIS에서 바로 열 수 있는 ESRI ASCII 격자(.asc, WGS84)와 사각지대 셀 GeoJSON으로 저장합니다.
+"""
+
+import hashlib
+import heapq
+import json
+import math
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# 공원 유형별 유치거리 (미터, 도시공원 및 녹지 등에 관한 법률 시행규칙 기준)
+#   어린이공원 250m, 근린공원(근린생활권) 500m, 도시공원(도보권 근린공원 등) 1000m
+SERVICE_DISTANCES = {
+    '어린이공원': 250,
+    '소공원': 250,
+    '근린공원': 500,
+    '도시공원': 1000,
+    '기타': 500,
+}
+
+# 격자 셀 크기 (미터)
+DEFAULT_CELL_SIZE = 50
+
+# 셀 중심에서 이 거리 안에 도로망 노드가 없으면 분석 제외 (바다, 산지, 철도 부지 등)
+DEFAULT_MAX_SNAP = 150
+
+# 거리 격자 계산 상한 (미터, 이보다 먼 셀은 거리 없음으로 기록)
+DEFAULT_MAX_DISTANCE = 3000
+
+# 보행 도로망에서 제외할 OSM highway 유형
+EXCLUDED_HIGHWAYS = {
+    'motorway', 'motorway_link', 'trunk', 'trunk_link',
+    'construction', 'proposed', 'raceway', 'bus_guideway', 'abandoned',
+}
+
+# 위도 1도 거리 (미터)
+_M_PER_DEG = 111_320
+
+# 격자 nodata 값
+NODATA = -9999
+
+
+class LocalProjection:
+    """기준점 중심 등장방형 투영 (구 단위 지역에서 거리 오차 0.1% 미만, 위경도 격자와 선형 대응)"""
+
+    def __init__(self, lat0: float, lng0: float):
+        self.lat0 = lat0
+        self.lng0 = lng0
+        self.kx = _M_PER_DEG * math.cos(math.radians(lat0))
+        self.ky = _M_PER_DEG
+
+    def to_xy(self, lat, lng) -> Tuple[np.ndarray, np.ndarray]:
+        """위경도 → 미터 좌표 (배열 가능)"""
+        return (np.asarray(lng) - self.lng0) * self.kx, (np.asarray(lat) - self.lat0) * self.ky
+
+    def to_latlng(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        """미터 좌표 → 위경도 (배열 가능)"""
+        return np.asarray(y) / self.ky + self.lat0, np.asarray(x) / self.kx + self.lng0
+
+
+class RoadNetwork:
+    """CSR 배열 보행 도로망 그래프 (무방향, 간선 가중치 = 미터 거리)"""
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, edges: np.ndarray):
+        """
+        초기화
+
+        Args:
+            lat: 노드 위도 배열
+            lng: 노드 경도 배열
+            edges: 간선 배열 (M, 2), 노드 인덱스 쌍
+        """
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.projection = LocalProjection(float(self.lat.mean()), float(self.lng.mean()))
+
+        x, y = self.projection.to_xy(self.lat, self.lng)
+        self.xy = np.column_stack([x, y])
+
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        length = np.hypot(*(self.xy[edges[:, 0]] - self.xy[edges[:, 1]]).T)
+
+        # 양방향 간선을 출발 노드 순으로 정렬해 CSR 구성
+        src = np.concatenate([edges[:, 0], edges[:, 1]])
+        dst = np.concatenate([edges[:, 1], edges[:, 0]])
+        weight = np.concatenate([length, length])
+        order = np.argsort(src, kind='stable')
+
+        self.indices = dst[order].astype(np.int32)
+        self.weights = weight[order]
+        self.indptr = np.zeros(len(self.lat) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(self.lat)), out=self.indptr[1:])
+
+        self.tree = cKDTree(self.xy)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.lat)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices) // 2
+
+    def fingerprint(self) -> str:
+        """도로망 버전 해시 (노드 좌표와 간선이 같으면 같은 값, OD 캐시 키로 사용)"""
+        digest = hashlib.sha256()
+        for array in (self.lat, self.lng, self.indptr, self.indices):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()[:16]
+
+    # ----- 불러오기 -----
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[Sequence[Tuple[float, float]]]) -> 'RoadNetwork':
+        """
+        선형 목록으로 생성 (좌표가 같은 점은 한 노드로 연결)
+
+        Args:
+            lines: [[(위도, 경도), ...], ...]
+
+        Returns:
+            RoadNetwork
+        """
+        node_ids = {}
+        coords = []
+        edges = []
+
+        for line in lines:
+            previous = None
+            for lat, lng in line:
+                key = (round(lat, 7), round(lng, 7))
+                node = node_ids.get(key)
+                if node is None:
+                    node = node_ids[key] = len(coords)
+                    coords.append(key)
+                if previous is not None:
+                    edges.append((previous, node))
+                previous = node
+
+        if not edges:
+            raise ValueError("도로망에 간선이 없습니다")
+
+        coords = np.array(coords)
+        return cls(coords[:, 0], coords[:, 1], np.array(edges))
+
+    @classmethod
+    def from_geojson(cls, path: str) -> 'RoadNetwork':
+        """
+        GeoJSON 도로망 불러오기 (LineString/MultiLineString, properties.highway로 보행 불가 도로 제외)
+
+        Args:
+            path: GeoJSON 파일 경로 (WGS84)
+
+        Returns:
+            RoadNetwork
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            collection = json.load(f)
+
+        lines = []
+        for feature in collection.get('features', []):
+            geometry = feature.get('geometry') or {}
+            highway = (feature.get('properties') or {}).get('highway')
+            if highway in EXCLUDED_HIGHWAYS:
+                continue
+
+            if geometry.get('type') == 'LineString':
+                parts = [geometry['coordinates']]
+            elif geometry.get('type') == 'MultiLineString':
+                parts = geometry['coordinates']
+            else:
+                continue
+            # GeoJSON 좌표는 (경도, 위도)
+            lines.extend([[(point[1], point[0]) for point in part] for part in parts])
+
+        return cls.from_lines(lines)
+
+    @classmethod
+    def from_osm_pbf(cls, path: str) -> 'RoadNetwork':
+        """
+        OSM PBF 도로망 불러오기 (highway 태그가 있는 way, 보행 불가 도로 제외)
+
+        Args:
+            path: .osm.pbf 파일 경로 (Geofabrik 지역 추출본 등)
+
+        Returns:
+            RoadNetwork
+        """
+        try:
+            import osmium
+        except ImportError as e:
+            raise ImportError("OSM PBF를 읽으려면 osmium 패키지가 필요합니다: pip install osmium") from e
+
+        lines = []
+
+        class _WayHandler(osmium.SimpleHandler):
+            def way(self, way):
+                highway = way.tags.get('highway')
+                if highway is None or highway in EXCLUDED_HIGHWAYS or way.tags.get('foot') == 'no':
+                    return
+                line = [(node.lat, node.lon) for node in way.nodes if node.location.valid()]
+                if len(line) >= 2:
+                    lines.append(line)
+
+        _WayHandler().apply_file(str(path), locations=True)
+        return cls.from_lines(lines)
+
+    @classmethod
+    def load(cls, path: str) -> 'RoadNetwork':
+        """확장자로 형식 판별 (.pbf: OSM PBF, 그 외: GeoJSON)"""
+        if str(path).endswith('.pbf'):
+            return cls.from_osm_pbf(path)
+        return cls.from_geojson(path)
+
+
+def multi_source_dijkstra(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    sources: Sequence[int],
+    initial: Sequence[float],
+    labels: Sequence[int],
+    cutoff: float = math.inf
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    다중 출발점 다익스트라 (CSR 그래프)
+
+    출발점마다 초기 비용을 줄 수 있어, 초기 비용을 (스냅 거리 - 유치거리)로 두면
+    유치거리가 공원마다 달라도 한 번의 탐색으로 "어느 공원의 유치거리 안에 드는지"를 구할 수 있습니다.
+
+    Args:
+        indptr: CSR 행 포인터
+        indices: CSR 열 인덱스 (도착 노드)
+        weights: 간선 가중치
+        sources: 출발 노드 목록
+        initial: 출발 노드별 초기 비용
+        labels: 출발 노드별 라벨 (공원 인덱스)
+        cutoff: 이 비용을 넘는 노드는 탐색하지 않음
+
+    Returns:
+        (노드별 최소 비용 배열(도달 못하면 inf), 노드별 최소 비용 라벨 배열(없으면 -1))
+    """
+    num_nodes = len(indptr) - 1
+    dist = [math.inf] * num_nodes
+    origin = [-1] * num_nodes
+
+    for node, cost, label in zip(sources, initial, labels):
+        if cost < dist[node] and cost <= cutoff:
+            dist[node] = cost
+            origin[node] = label
+    heap = [(cost, node) for node, cost in enumerate(dist) if cost < math.inf]
+    heapq.heapify(heap)
+
+    # 파이썬 리스트가 NumPy 원소 접근보다 훨씬 빠름
+    ptr = indptr.tolist()
+    adj = indices.tolist()
+    cost_of = weights.tolist()
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        label = origin[u]
+        for k in range(ptr[u], ptr[u + 1]):
+            v = adj[k]
+            nd = d + cost_of[k]
+            if nd < dist[v] and nd <= cutoff:
+                dist[v] = nd
+                origin[v] = label
+                heappush(heap, (nd, v))
+
+    return np.array(dist), np.array(origin, dtype=np.int32)
+
+
+def service_distance(park: Dict, default: Optional[float] = None) -> float:
+    """
+    공원 유치거리 (미터)
+
+    Args:
+        park: 공원 정보 ('type' 포함)
+        default: 지정하면 유형과 관계없이 이 값 사용
+
+    Returns:
+        유치거리
+    """
+    if default is not None:
+        return float(default)
+    return float(SERVICE_DISTANCES.get(park.get('type'), SERVICE_DISTANCES['기타']))
+
+
+class ServiceArea:
+    """서비스 권역 분석 결과 (격자, 행 0 = 남쪽)"""
+
+    def __init__(self, analyzer: 'ServiceAreaAnalyzer', parks: List[Dict], thresholds: np.ndarray,
+                 distance: np.ndarray, nearest: np.ndarray, covered: np.ndarray, provider: np.ndarray,
+                 elapsed_sec: float):
+        self.analyzer = analyzer
+        self.parks = parks
+        self.thresholds = thresholds
+        self.distance = distance      # 가장 가까운 공원까지 보행 거리 (미터, 없으면 nan)
+        self.nearest = nearest        # 가장 가까운 공원 인덱스 (-1: 없음)
+        self.covered = covered        # 어느 공원의 유치거리 안에 드는지 (분석 제외 셀은 False)
+        self.provider = provider      # 유치거리 여유가 가장 큰 공원 인덱스 (-1: 사각지대)
+        self.elapsed_sec = elapsed_sec
+
+    @property
+    def valid(self) -> np.ndarray:
+        return self.analyzer.valid
+
+    @property
+    def uncovered(self) -> np.ndarray:
+        return self.valid & ~self.covered
+
+    def summary(self) -> Dict:
+        """리포트용 요약 (셀 수, 사각지대 면적, 공원별 담당 면적)"""
+        cell_area = self.analyzer.cell_size ** 2
+        valid = int(self.valid.sum())
+        covered = int(self.covered.sum())
+        counts = np.bincount(self.provider[self.covered], minlength=len(self.parks))
+        # 닿는 셀이 없으면 (작은 도로망, 격자 밖 공원) 중앙값 대신 None (NaN은 JSON에 쓸 수 없음)
+        reached = self.distance[np.isfinite(self.distance)]
+
+        return {
+            'parks': len(self.parks),
+            'cell_size_m': self.analyzer.cell_size,
+            'cells': valid,
+            'covered_cells': covered,
+            'uncovered_cells': valid - covered,
+            'coverage_ratio': round(covered / valid, 4) if valid else 0.0,
+            'uncovered_area_km2': round((valid - covered) * cell_area / 1e6, 4),
+            'median_distance_m': round(float(np.median(reached)), 1) if reached.size else None,
+            'elapsed_sec': round(self.elapsed_sec, 3),
+            'by_park': [
+                {
+                    'name': park.get('name'),
+                    'type': park.get('type'),
+                    'service_distance_m': float(threshold),
+                    'covered_area_km2': round(int(count) * cell_area / 1e6, 4),
+                }
+                for park, threshold, count in zip(self.parks, self.thresholds, counts)
+            ],
+        }
+
+    # ----- 저장 -----
+
+    def save(self, output_dir: str) -> Dict[str, str]:
+        """
+        결과 저장
+
+        Args:
+            output_dir: 저장 폴더
+
+        Returns:
+            {종류: 파일 경로}
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        coverage = np.where(self.covered, 1, 0).astype(np.float64)
+        coverage[~self.valid] = np.nan
+
+        paths = {
+            'distance': output_dir / 'service_distance.asc',
+            'coverage': output_dir / 'coverage.asc',
+            'uncovered': output_dir / 'uncovered_cells.geojson',
+            'summary': output_dir / 'service_area_summary.json',
+        }
+        self.analyzer.write_ascii_grid(paths['distance'], self.distance, decimals=1)
+        self.analyzer.write_ascii_grid(paths['coverage'], coverage, decimals=0)
+        self.analyzer.write_cells_geojson(paths['uncovered'], self.uncovered, {'distance_m': self.distance})
+
+        with open(paths['summary'], 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+        return {name: str(path) for name, path in paths.items()}
+
+
+class ServiceAreaAnalyzer:
+    """도로망 + 분석 격자 (격자 셀 스냅은 생성 시 한 번만 계산)"""
+
+    def __init__(
+        self,
+        network: RoadNetwork,
+        cell_size: float = DEFAULT_CELL_SIZE,
+        max_snap: float = DEFAULT_MAX_SNAP,
+        max_distance: float = DEFAULT_MAX_DISTANCE
+    ):
+        """
+        초기화
+
+        Args:
+            network: 보행 도로망
+            cell_size: 격자 셀 크기 (미터)
+            max_snap: 셀 중심 ~ 도로 노드 최대 거리 (넘으면 분석 제외 셀)
+            max_distance: 거리 격자 계산 상한 (미터)
+        """
+        self.network = network
+        self.cell_size = float(cell_size)
+        self.max_snap = float(max_snap)
+        self.max_distance = float(max_distance)
+
+        # 도로망 경계 상자를 덮는 격자
+        (x_min, y_min), (x_max, y_max) = network.xy.min(axis=0), network.xy.max(axis=0)
+        self.x0 = math.floor(x_min / self.cell_size) * self.cell_size
+        self.y0 = math.floor(y_min / self.cell_size) * self.cell_size
+        self.cols = max(1, math.ceil((x_max - self.x0) / self.cell_size))
+        self.rows = max(1, math.ceil((y_max - self.y0) / self.cell_size))
+
+        cx = self.x0 + (np.arange(self.cols) + 0.5) * self.cell_size
+        cy = self.y0 + (np.arange(self.rows) + 0.5) * self.cell_size
+        centers = np.column_stack([np.tile(cx, self.rows), np.repeat(cy, self.cols)])
+
+        snap, node = network.tree.query(centers, distance_upper_bound=self.max_snap)
+        self.valid = np.isfinite(snap).reshape(self.rows, self.cols)
+        self.cell_node = np.where(np.isfinite(snap), node, 0).reshape(self.rows, self.cols)
+        self.cell_snap = np.where(np.isfinite(snap), snap, 0.0).reshape(self.rows, self.cols)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.rows, self.cols
+
+    def park_sources(self, parks: List[Dict], thresholds: np.ndarray) -> Tuple[List[int], List[float], List[int]]:
+        """
+        공원 입구 노드 (면적을 원으로 가정한 반경 안의 노드, 없으면 가장 가까운 노드)
+
+        Args:
+            parks: 공원 정보 목록 ('lat', 'lng', 'area')
+            thresholds: 공원별 유치거리
+
+        Returns:
+            (노드 목록, 공원 경계까지 거리 목록, 공원 인덱스 목록)
+        """
+        lat = np.array([park['lat'] for park in parks])
+        lng = np.array([park['lng'] for park in parks])
+        x, y = self.network.projection.to_xy(lat, lng)
+        radius = np.sqrt(np.array([park.get('area') or 0.0 for park in parks]) / math.pi)
+
+        sources, offsets, labels = [], [], []
+        for index, (px, py, r) in enumerate(zip(x, y, radius)):
+            inside = self.network.tree.query_ball_point((px, py), r) if r > 0 else []
+            if inside:
+                sources.extend(inside)
+                offsets.extend([0.0] * len(inside))
+            else:
+                snap, node = self.network.tree.query((px, py))
+                sources.append(int(node))
+                offsets.append(max(0.0, float(snap) - r))
+                inside = [node]
+            labels.extend([index] * len(inside))
+
+        return sources, offsets, labels
+
+    def analyze(self, parks: List[Dict], threshold: Optional[float] = None) -> ServiceArea:
+        """
+        서비스 권역 분석
+
+        Args:
+            parks: 공원 정보 목록 ('name', 'lat', 'lng', 'area', 'type')
+            threshold: 모든 공원에 같은 유치거리 적용 (없으면 공원 유형별 SERVICE_DISTANCES)
+
+        Returns:
+            ServiceArea
+        """
+        started = time.perf_counter()
+        network = self.network
+        thresholds = np.array([service_distance(park, threshold) for park in parks])
+        sources, offsets, labels = self.park_sources(parks, thresholds)
+
+        # 1) 가장 가까운 공원까지 거리
+        node_dist, node_park = multi_source_dijkstra(
+            network.indptr, network.indices, network.weights,
+            sources, offsets, labels, cutoff=self.max_distance
+        )
+
+        # 2) 유치거리 여유 (거리 - 유치거리 ≤ 0 이면 권역 안): 유치거리가 다른 공원을 한 번에 처리
+        slack = [offset - thresholds[label] for offset, label in zip(offsets, labels)]
+        node_slack, node_provider = multi_source_dijkstra(
+            network.indptr, network.indices, network.weights,
+            sources, slack, labels, cutoff=0.0
+        )
+
+        # 셀 값 = 노드 값 + 셀 중심에서 노드까지 거리
+        distance = node_dist[self.cell_node] + self.cell_snap
+        distance = np.where(self.valid & (distance <= self.max_distance), distance, np.nan)
+        nearest = np.where(np.isfinite(distance), node_park[self.cell_node], -1)
+
+        cell_slack = node_slack[self.cell_node] + self.cell_snap
+        covered = self.valid & (cell_slack <= 0)
+        provider = np.where(covered, node_provider[self.cell_node], -1)
+
+        return ServiceArea(self, parks, thresholds, distance, nearest, covered, provider,
+                           time.perf_counter() - started)
+
+    # ----- 격자 출력 -----
+
+    def cell_latlng_bounds(self) -> Tuple[float, float, float, float]:
+        """격자 경계 (남, 서, 셀 위도 크기, 셀 경도 크기)"""
+        south, west = self.network.projection.to_latlng(self.x0, self.y0)
+        return float(south), float(west), self.cell_size / self.network.projection.ky, \
+            self.cell_size / self.network.projection.kx
+
+    def write_ascii_grid(self, path, grid: np.ndarray, decimals: int = 1):
+        """
+        ESRI ASCII 격자 저장 (WGS84, GDAL/QGIS 호환 dx/dy 헤더, .prj 함께 저장)
+
+        Args:
+            path: .asc 경로
+            grid: (rows, cols) 배열, nan은 nodata
+            decimals: 소수 자릿수
+        """
+        south, west, dlat, dlng = self.cell_latlng_bounds()
+        values = np.where(np.isfinite(grid), np.round(grid, decimals), NODATA)[::-1]  # 첫 줄이 북쪽
+
+        path = Path(path)
+        with open(path, 'w', encoding='ascii') as f:
+            f.write(f"ncols {self.cols}\nnrows {self.rows}\n")
+            f.write(f"xllcorner {west:.8f}\nyllcorner {south:.8f}\n")
+            f.write(f"dx {dlng:.10f}\ndy {dlat:.10f}\nNODATA_value {NODATA}\n")
+            np.savetxt(f, values, fmt=f'%.{decimals}f')
+
+        path.with_suffix('.prj').write_text(
+            'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563]],'
+            'PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433]]',
+            encoding='ascii'
+        )
+
+    def write_cells_geojson(self, path, mask: np.ndarray, values: Optional[Dict[str, np.ndarray]] = None):
+        """
+        선택한 셀을 사각형 폴리곤 GeoJSON으로 저장
+
+        Args:
+            path: 저장 경로
+            mask: (rows, cols) 불리언 배열
+            values: 셀 속성으로 넣을 격자 {이름: 배열}
+        """
+        south, west, dlat, dlng = self.cell_latlng_bounds()
+        features = []
+        for row, col in zip(*np.nonzero(mask)):
+            s, w = south + row * dlat, west + col * dlng
+            properties = {'row': int(row), 'col': int(col)}
+            for name, grid in (values or {}).items():
+                value = float(grid[row, col])
+                properties[name] = round(value, 1) if math.isfinite(value) else None
+            features.append({
+                'type': 'Feature',
+                'properties': properties,
+                'geometry': {
+                    'type': 'Polygon',
+                    'coordinates': [[
+                        [round(w, 7), round(s, 7)], [round(w + dlng, 7), round(s, 7)],
+                        [round(w + dlng, 7), round(s + dlat, 7)], [round(w, 7), round(s + dlat, 7)],
+                        [round(w, 7), round(s, 7)],
+                    ]],
+                },
+            })
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
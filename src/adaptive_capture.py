@@ -5,8 +5,8 @@
 """
 
 import os
-from typing import Dict, List, Tuple
-from .roadview_client import RoadviewClient
+from typing import Dict, List, Optional, Tuple
+from .roadview_client import RoadviewClient, viewpoint_path
 from .park_sampler import ParkSampler
 
 
@@ -38,7 +38,9 @@ class AdaptiveCaptureManager:
         radius_increment: float = 0.3,
         width: int = 2560,
         height: int = 1440,
-        headless: bool = True
+        headless: bool = True,
+        viewpoints: Optional[List[Dict]] = None,
+        polygon=None
     ) -> Tuple[int, int, int]:
         """
         적응형 공원 캡처
@@ -59,6 +61,8 @@ class AdaptiveCaptureManager:
             width: 이미지 너비
             height: 이미지 높이
             headless: 헤드리스 모드
+            viewpoints: 샘플 포인트마다 같은 파노라마에서 추가로 찍을 시점 (parse_viewpoints 참고)
+            polygon: 공원 폴리곤 (있으면 경계를 따라 샘플링, 반경 증가분만큼 경계 밖으로 이동)
 
         Returns:
             (성공 개수, 전체 시도 개수, 최종 반경)
@@ -67,6 +71,8 @@ class AdaptiveCaptureManager:
         base_radius = self.sampler.calculate_radius_from_area(area_sqm, park_type)
 
         print(f"📐 기본 반경: {base_radius}m (면적: {area_sqm:.1f}㎡)")
+        if polygon is not None:
+            print("🗺️  공원 폴리곤 경계를 따라 샘플링")
 
         current_multiplier = 1.0
         attempt = 1
@@ -85,7 +91,8 @@ class AdaptiveCaptureManager:
                 radius_meters=current_radius,
                 num_directions=num_directions,
                 park_type=park_type,
-                area_sqm=area_sqm
+                area_sqm=area_sqm,
+                polygon=polygon
             )
 
             # 검색 반경 계산 (샘플링 반경의 1.5배, 최소 20m, 최대 50m)
@@ -104,8 +111,9 @@ class AdaptiveCaptureManager:
 
                 output_path = os.path.join(output_folder, f"{point['direction']}.jpg")
 
-                # 이미 성공한 파일이 있으면 스킵
-                if os.path.exists(output_path):
+                # 이미 성공한 파일(추가 시점 포함)이 있으면 스킵
+                expected = [output_path] + [viewpoint_path(output_path, vp['name']) for vp in viewpoints or []]
+                if all(os.path.exists(path) for path in expected):
                     print(f"✅ (기존)")
                     success_count += 1
                     continue
@@ -120,7 +128,8 @@ class AdaptiveCaptureManager:
                     width=width,
                     height=height,
                     headless=headless,
-                    search_radius=search_radius
+                    search_radius=search_radius,
+                    viewpoints=viewpoints
                 )
 
                 if success:
@@ -0,0 +1,282 @@
+"""
+멀티프로세스 캡처 워커 풀
+
+N개의 워커 프로세스가 각자 브라우저와 템플릿 서버 포트를 가지고 공원을 캡처합니다.
+공원은 공간 순서(capture_scheduler)로 정렬한 뒤 워커마다 이어진 구간을 나눠 주어,
+워커의 브라우저 캐시가 가까운 파노라마 타일을 다시 쓰도록 합니다.
+자기 구간을 끝낸 워커는 이웃 워커의 큐에서 남은 공원을 가져가므로 부하도 고르게 분산됩니다.
+결과는 부모 프로세스 한 곳에서만 매니페스트에 기록합니다.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .capture_scheduler import order_tasks, partition_tasks
+
+
+class CaptureManifest:
+    """공원별 캡처 결과 기록 (output/roadview_images/capture_manifest.json)"""
+
+    def __init__(self, path: str):
+        """
+        초기화
+
+        Args:
+            path: 매니페스트 JSON 경로 (기존 파일이 있으면 이어서 기록)
+        """
+        self.path = path
+        self.records = {}
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.records = json.load(f)
+
+    @staticmethod
+    def record_key(record: Dict) -> str:
+        """
+        레코드 키 (관리번호, 없으면 출력 폴더명)
+
+        폴더명이 없는 공원 목록에서는 같은 이름의 공원(예: 미추홀공원)이 같은 폴더를 쓰므로 폴더명만으로는 서로 덮어씁니다.
+        """
+        return record.get('id') or os.path.basename(record['folder'])
+
+    def update(self, record: Dict):
+        """
+        공원 결과를 기록하고 파일에 원자적으로 저장
+
+        Args:
+            record: 캡처 결과 (record_key로 기록)
+        """
+        self.records[self.record_key(record)] = record
+        self.save()
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 중단 시에도 매니페스트가 깨지지 않도록 저장"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, ensure_ascii=False, indent=2)
+
+        os.replace(tmp_path, self.path)
+
+
+def park_folder(park: Dict) -> str:
+    """공원 출력 폴더명 (ParkCatalog.folder_name으로 붙인 'folder', 없으면 공원명)"""
+    return park.get('folder') or park['name']
+
+
+def group_parks_by_folder(parks: List[Dict]) -> List[List[Dict]]:
+    """
+    같은 출력 폴더를 쓰는 공원을 하나의 작업으로 묶기
+
+    이름이 같은 공원(예: 미추홀공원)은 ParkCatalog.folder_name이 관리번호로 폴더를 나누므로 따로 처리되고,
+    폴더명이 없는 공원 목록에서만 같은 이름끼리 묶어 두 워커가 같은 폴더에 동시에 쓰지 않도록 합니다.
+
+    Args:
+        parks: 공원 정보 리스트
+
+    Returns:
+        작업 리스트 (각 작업은 같은 폴더의 공원 리스트)
+    """
+    tasks = {}
+    for park in parks:
+        tasks.setdefault(park_folder(park), []).append(park)
+    return list(tasks.values())
+
+
+def capture_park(manager, park: Dict, output_root: str, capture_options: Dict) -> Dict:
+    """
+    공원 하나를 적응형 캡처하고 결과 레코드 반환
+
+    Args:
+        manager: AdaptiveCaptureManager 인스턴스
+        park: 공원 정보
+        output_root: 공원 폴더 상위 경로
+        capture_options: capture_park_adaptive에 넘길 추가 옵션
+
+    Returns:
+        매니페스트 레코드
+    """
+    folder = os.path.join(output_root, park_folder(park))
+    os.makedirs(folder, exist_ok=True)
+
+    started = time.time()
+    success, attempts, final_radius = manager.capture_park_adaptive(
+        park_name=park['name'],
+        center_lat=park['lat'],
+        center_lng=park['lng'],
+        park_type=park['type'],
+        area_sqm=park['area'],
+        num_directions=park['num_directions'],
+        output_folder=folder,
+        polygon=park.get('polygon'),
+        **capture_options
+    )
+
+    return {
+        'id': park.get('id', ''),
+        'name': park['name'],
+        'folder': folder,
+        'success': success,
+        'attempts': attempts,
+        'final_radius': final_radius,
+        'elapsed_sec': round(time.time() - started, 2),
+        'images': sorted(f for f in os.listdir(folder) if f.endswith('.jpg')),
+        'captured_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def worker_cache_dir(cache_root: Optional[str], worker_id: int) -> Optional[str]:
+    """워커별 브라우저 프로필 폴더 (Chromium 프로필은 프로세스끼리 공유할 수 없음)"""
+    return os.path.join(cache_root, f'worker_{worker_id}') if cache_root else None
+
+
+def _next_task(worker_id: int, task_queues: List):
+    """
+    다음 작업 가져오기 (자기 큐 → 가까운 구간 워커 큐 순서로 훔쳐 오기)
+
+    Returns:
+        (작업, 훔쳐 온 작업인지 여부), 모든 큐가 비었으면 (None, False)
+    """
+    owners = sorted(range(len(task_queues)), key=lambda other: abs(other - worker_id))
+    for owner in owners:
+        try:
+            # 작업은 워커 시작 전에 모두 넣어 두므로, 비어 있으면 더 들어오지 않음
+            return task_queues[owner].get(timeout=1.0 if owner == worker_id else 0.2), owner != worker_id
+        except queue.Empty:
+            continue
+    return None, False
+
+
+def _worker_main(worker_id: int, port: int, task_queues: List, result_queue, output_root: str,
+                 capture_options: Dict, cache_root: Optional[str] = None):
+    """
+    워커 프로세스 진입점
+
+    자기 포트의 RoadviewClient 세션(워커별 브라우저 프로필)을 열어 두고,
+    자기 큐와 이웃 큐가 모두 빌 때까지 작업을 처리합니다.
+    """
+    # spawn된 프로세스에서 임포트 (Playwright는 fork 이후 사용 불가)
+    from .roadview_client import RoadviewClient
+    from .park_sampler import ParkSampler
+    from .adaptive_capture import AdaptiveCaptureManager
+    from .instrumentation import tracer
+
+    client = RoadviewClient(port=port, cache_dir=worker_cache_dir(cache_root, worker_id))
+    manager = AdaptiveCaptureManager(client, ParkSampler())
+
+    try:
+        client.open(headless=capture_options.get('headless', True))
+        while True:
+            task, stolen = _next_task(worker_id, task_queues)
+            if task is None:
+                break
+            if stolen:
+                tracer.count('capture.stolen_tasks')
+
+            for park in task:
+                try:
+                    record = capture_park(manager, park, output_root, capture_options)
+                except Exception as e:
+                    traceback.print_exc()
+                    record = {
+                        'id': park.get('id', ''),
+                        'name': park['name'],
+                        'folder': os.path.join(output_root, park_folder(park)),
+                        'success': 0,
+                        'attempts': 0,
+                        'final_radius': None,
+                        'error': str(e),
+                    }
+
+                record['worker'] = worker_id
+                record['stolen'] = stolen
+                result_queue.put(record)
+    finally:
+        client.close()
+
+
+def run_capture_pool(
+    parks: List[Dict],
+    output_root: str,
+    num_workers: int,
+    capture_options: Dict,
+    manifest: CaptureManifest,
+    base_port: int = 8080,
+    on_result=None,
+    schedule: str = 'hilbert',
+    cache_root: Optional[str] = None
+) -> List[Dict]:
+    """
+    워커 프로세스 풀로 전체 공원 캡처
+
+    Args:
+        parks: 공원 정보 리스트
+        output_root: 공원 폴더 상위 경로
+        num_workers: 워커 프로세스 수
+        capture_options: capture_park_adaptive에 넘길 추가 옵션
+        manifest: 결과를 기록할 CaptureManifest
+        base_port: 첫 워커의 템플릿 서버 포트 (워커 i는 base_port + i)
+        on_result: 결과 레코드를 받을 때마다 호출할 콜백
+        schedule: 캡처 순서 ('hilbert', 'nearest', 'csv')
+        cache_root: 워커별 브라우저 프로필 상위 폴더 (없으면 캡처마다 빈 캐시)
+
+    Returns:
+        결과 레코드 리스트 (완료 순서)
+    """
+    tasks = order_tasks(group_parks_by_folder(parks), schedule)
+    num_workers = max(1, min(num_workers, len(tasks)))
+
+    ctx = mp.get_context('spawn')
+    task_queues = [ctx.Queue() for _ in range(num_workers)]
+    result_queue = ctx.Queue()
+
+    # 워커마다 지리적으로 이어진 구간 (실행마다 같은 구간이 같은 워커 프로필로 가서 캐시 재사용)
+    for worker_id, chunk in enumerate(partition_tasks(tasks, num_workers)):
+        for task in chunk:
+            task_queues[worker_id].put(task)
+
+    workers = []
+    for worker_id in range(num_workers):
+        process = ctx.Process(
+            target=_worker_main,
+            args=(worker_id, base_port + worker_id, task_queues, result_queue,
+                  output_root, capture_options, cache_root),
+            daemon=True
+        )
+        process.start()
+        workers.append(process)
+
+    print(f"🧵 워커 {num_workers}개 시작 (포트 {base_port}~{base_port + num_workers - 1}, 순서: {schedule})")
+
+    results = []
+    try:
+        while len(results) < len(parks):
+            try:
+                record = result_queue.get(timeout=5)
+            except queue.Empty:
+                # 모든 워커가 비정상 종료했으면 더 기다리지 않음
+                if not any(p.is_alive() for p in workers):
+                    print("❌ 모든 워커가 종료되어 남은 결과를 기다리지 않습니다")
+                    break
+                continue
+
+            manifest.update(record)
+            results.append(record)
+
+            if on_result:
+                on_result(record)
+    finally:
+        for process in workers:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+
+    return results
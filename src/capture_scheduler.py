@@ -0,0 +1,164 @@
+"""
+캡처 순서 스케줄링 모듈
+
+CSV 순서대로 캡처하면 멀리 떨어진 공원을 오가느라 브라우저 캐시에 남은 인접 파노라마 타일을
+다시 쓰지 못합니다. 공원 좌표를 힐베르트 곡선 또는 최근접 이웃 순회로 정렬하고,
+워커마다 지리적으로 이어진 구간을 나눠 주어 같은 브라우저 프로필(디스크 캐시)이 가까운 공원을 맡게 합니다.
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+# 캡처 순서 방식 (csv: 원래 순서)
+SCHEDULE_METHODS = ('hilbert', 'nearest', 'csv')
+
+# 힐베르트 곡선 격자 차수 (2^16 x 2^16, 구 단위 지역에서는 수 cm 해상도)
+_HILBERT_ORDER = 16
+
+
+def hilbert_index(x: int, y: int, order: int = _HILBERT_ORDER) -> int:
+    """
+    격자 좌표의 힐베르트 곡선 순번
+
+    Args:
+        x: 가로 격자 좌표 (0 ~ 2^order - 1)
+        y: 세로 격자 좌표 (0 ~ 2^order - 1)
+        order: 격자 차수
+
+    Returns:
+        곡선 위 순번 (가까운 순번은 공간적으로도 가까움)
+    """
+    index = 0
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        index += s * s * ((3 * rx) ^ ry)
+
+        # 사분면 회전
+        if ry == 0:
+            if rx == 1:
+                x = s - 1 - x
+                y = s - 1 - y
+            x, y = y, x
+        s >>= 1
+    return index
+
+
+def _grid(points: Sequence[Tuple[float, float]], order: int) -> List[Tuple[int, int]]:
+    """위경도 목록을 경계 상자 기준 정수 격자로 변환 (경도는 위도에 맞춰 축척 보정)"""
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    lng_scale = math.cos(math.radians(sum(lats) / len(lats)))
+
+    span = max(max(lats) - min(lats), (max(lngs) - min(lngs)) * lng_scale) or 1.0
+    cells = (1 << order) - 1
+    return [
+        (round((lng - min(lngs)) * lng_scale / span * cells), round((lat - min(lats)) / span * cells))
+        for lat, lng in points
+    ]
+
+
+def hilbert_order(points: Sequence[Tuple[float, float]]) -> List[int]:
+    """
+    힐베르트 곡선 순서
+
+    Args:
+        points: [(위도, 경도)]
+
+    Returns:
+        방문 순서 (points 인덱스 목록)
+    """
+    if not points:
+        return []
+
+    keys = [hilbert_index(x, y) for x, y in _grid(points, _HILBERT_ORDER)]
+    return sorted(range(len(points)), key=lambda i: keys[i])
+
+
+def _distance_m(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """두 위경도 사이 거리 (미터, 등장방형 근사)"""
+    lat = math.radians((a[0] + b[0]) / 2)
+    dy = (a[0] - b[0]) * 111_320
+    dx = (a[1] - b[1]) * 111_320 * math.cos(lat)
+    return math.hypot(dx, dy)
+
+
+def nearest_neighbour_order(points: Sequence[Tuple[float, float]]) -> List[int]:
+    """
+    최근접 이웃 순회 순서 (가장 서쪽 점에서 시작)
+
+    Args:
+        points: [(위도, 경도)]
+
+    Returns:
+        방문 순서 (points 인덱스 목록)
+    """
+    if not points:
+        return []
+
+    remaining = set(range(len(points)))
+    current = min(remaining, key=lambda i: (points[i][1], points[i][0]))
+    order = [current]
+    remaining.remove(current)
+
+    while remaining:
+        current = min(remaining, key=lambda i: _distance_m(points[current], points[i]))
+        order.append(current)
+        remaining.remove(current)
+
+    return order
+
+
+def tour_length_m(points: Sequence[Tuple[float, float]]) -> float:
+    """순서대로 방문할 때 총 이동 거리 (미터, 스케줄 비교용)"""
+    return sum(_distance_m(a, b) for a, b in zip(points, points[1:]))
+
+
+def order_tasks(tasks: List[List[Dict]], method: str = 'hilbert') -> List[List[Dict]]:
+    """
+    캡처 작업을 공간 순서로 정렬
+
+    Args:
+        tasks: 작업 리스트 (각 작업은 같은 폴더의 공원 리스트, 'lat'/'lng' 포함)
+        method: 'hilbert', 'nearest', 'csv'
+
+    Returns:
+        정렬된 작업 리스트
+    """
+    if method not in SCHEDULE_METHODS:
+        raise ValueError(f"지원하지 않는 스케줄 방식입니다: {method} (가능: {', '.join(SCHEDULE_METHODS)})")
+
+    if method == 'csv' or len(tasks) < 3:
+        return list(tasks)
+
+    points = [(task[0]['lat'], task[0]['lng']) for task in tasks]
+    order = hilbert_order(points) if method == 'hilbert' else nearest_neighbour_order(points)
+    return [tasks[i] for i in order]
+
+
+def partition_tasks(tasks: List[List[Dict]], num_workers: int) -> List[List[List[Dict]]]:
+    """
+    정렬된 작업을 워커 수만큼 이어진 구간으로 나누기 (방향 수 합이 비슷하도록)
+
+    Args:
+        tasks: order_tasks로 정렬한 작업 리스트
+        num_workers: 워커 수
+
+    Returns:
+        워커별 작업 리스트
+    """
+    weights = [sum(park.get('num_directions', 1) for park in task) for task in tasks]
+    total = sum(weights)
+    chunks = [[] for _ in range(max(1, num_workers))]
+
+    worker = 0
+    filled = 0.0
+    for task, weight in zip(tasks, weights):
+        # 현재 구간이 몫을 채웠으면 다음 워커로 (마지막 워커는 나머지 전부)
+        if worker < len(chunks) - 1 and chunks[worker] and filled + weight / 2 > total * (worker + 1) / len(chunks):
+            worker += 1
+        chunks[worker].append(task)
+        filled += weight
+
+    return chunks
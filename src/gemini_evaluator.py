@@ -6,15 +6,27 @@ google-genai SDK를 사용하여 공원 로드뷰 이미지를 분석하고
 """
 
 import os
+import copy
 import json
 import logging
+import math
+import threading
 import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Dict, Optional
 from google import genai
-from google.genai import types, errors
+from google.genai import types
 from PIL import Image
 from dotenv import load_dotenv
+from .image_prep import ImagePrep
+from .image_quality import QualityGate, describe_issues, direction_images
+from .instrumentation import tracer
+from .perceptual_hash import DuplicateIndex
+from .json_repair import StructuredOutputError, decode_structured
+from .retry_policy import ErrorClass, RetryPolicy, classify_error, get_breaker
+from .usage import BudgetExceededError, BudgetGuard, UsageLedger
 
 # 프로젝트 루트의 .env 파일 명시적으로 로드 (기존 환경변수 덮어쓰기)
 _env_path = Path(__file__).parent.parent / '.env'
@@ -22,17 +34,120 @@ load_dotenv(dotenv_path=_env_path, override=True)
 
 logger = logging.getLogger(__name__)
 
+INDICATORS = ["facility_maintenance", "rest_facilities", "greenery_diversity", "openness", "aesthetics"]
+
+
+def build_evaluation_schema(reason_max_length: Optional[int] = None) -> Dict:
+    """
+    평가 응답 JSON Schema (요청 시 강제, 응답 복구 시 검증에 사용)
+
+    Args:
+        reason_max_length: reason 최대 글자 수 (없으면 제한 없음)
+
+    Returns:
+        JSON Schema 딕셔너리
+    """
+    reason = {"type": "string"}
+    if reason_max_length:
+        reason["maxLength"] = reason_max_length
+
+    # 평가 지표별 응답 형식
+    indicator_schema = {
+        "type": "object",
+        "properties": {
+            "level": {"type": "string", "enum": ["low", "medium", "high", "not_visible"]},
+            "reason": reason
+        },
+        "required": ["level", "reason"]
+    }
+
+    return {
+        "type": "object",
+        "properties": {
+            **{indicator: indicator_schema for indicator in INDICATORS},
+            "summary": {"type": "string"}
+        },
+        "required": INDICATORS + ["summary"]
+    }
+
+
+EVALUATION_SCHEMA = build_evaluation_schema()
+
+# 평가 프로필: 사고 토큰 예산, 출력 토큰 상한, reason 길이 제한
+# (gemini-2.5 모델은 사고 토큰도 출력 상한에 포함되므로 상한은 사고 예산보다 넉넉하게)
+EVALUATION_PROFILES = {
+    "fast": {"thinking_budget": 0, "max_output_tokens": 1024, "reason_max_length": 60},
+    "standard": {"thinking_budget": 512, "max_output_tokens": 2048, "reason_max_length": 120},
+    "thorough": {"thinking_budget": 4096, "max_output_tokens": 8192, "reason_max_length": 300},
+}
+
+# 평가 요청 생성 설정 (실험 변형에서 일부 덮어쓰기 가능)
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 0.2,  # 일관된 평가를 위해 낮은 temperature
+    "top_p": 0.95,
+    "top_k": 40,
+    "max_output_tokens": 2048,
+    "thinking_budget": None,  # None이면 모델 기본값 (동적 사고)
+}
+
+# 응답 usage_metadata에서 읽는 토큰 항목
+USAGE_FIELDS = {
+    "prompt_tokens": "prompt_token_count",
+    "output_tokens": "candidates_token_count",
+    "cached_tokens": "cached_content_token_count",
+    "thoughts_tokens": "thoughts_token_count",
+    "total_tokens": "total_token_count",
+}
+
+# 합의 평가에서 표가 같을 때 고르는 순서 (의심스러우면 낮게)
+LEVEL_ORDER = ["not_visible", "low", "medium", "high"]
+
+# 사전 판별 응답 JSON Schema (가시성만 판단하는 저가 모델용)
+VISIBILITY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "park_visible": {"type": "boolean"},
+        "reason": {"type": "string"}
+    },
+    "required": ["park_visible", "reason"]
+}
+
+# 사전 판별 방식: model (저가 모델), heuristic (로컬 녹지 비율)
+PRESCREEN_MODES = ('model', 'heuristic')
+
 
 class GeminiEvaluator:
     """Gemini API를 사용한 공원 이미지 평가 클라이언트 (2025 최신 버전)"""
 
-    def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: Optional[str] = None,
+        base_url: Optional[str] = None,
+        prescreen: Optional[str] = None,
+        prescreen_model: Optional[str] = None,
+        quality_gate: Optional[QualityGate] = None,
+        duplicate_index: Optional[DuplicateIndex] = None,
+        prompt_path: Optional[str] = None,
+        generation_config: Optional[Dict] = None,
+        profile: Optional[str] = None,
+        image_prep: Optional[ImagePrep] = None
+    ):
         """
         초기화
 
         Args:
             api_key: Google Gemini API 키 (없으면 환경변수에서 로드)
             model_name: 사용할 모델명 (기본: gemini-2.5-flash)
+            base_url: API 엔드포인트 (없으면 환경변수 GEMINI_BASE_URL, 벤치마크용 가짜 서버 등)
+            prescreen: 가시성 사전 판별 방식 ('model', 'heuristic', 없으면 환경변수 GEMINI_PRESCREEN, 기본 사용 안 함)
+            prescreen_model: 사전 판별 모델명 (기본: gemini-2.5-flash-lite)
+            quality_gate: 평가 전 로컬 이미지 품질 검사기 (없으면 검사하지 않음)
+            duplicate_index: 거의 같은 이미지 클러스터 (있으면 대표 이미지만 평가하고 결과 복사)
+            prompt_path: 평가 프롬프트 파일 (기본: docs/prompts/park_evaluation_prompt.md)
+            generation_config: 생성 설정 덮어쓰기 (temperature, top_p, top_k, max_output_tokens, thinking_budget)
+            profile: 평가 프로필 ('fast', 'standard', 'thorough', 없으면 환경변수 GEMINI_PROFILE, 기본 설정 유지)
+            image_prep: 요청 이미지 준비기 (없으면 환경변수 IMAGE_PREP, 기본 원본 전체 화면)
         """
         # API 키 설정
         if not api_key:
@@ -55,17 +170,38 @@ class GeminiEvaluator:
         self.model_name = model_name
 
         # 재시도 설정 (503 에러 대응)
-        self.max_retries = int(os.getenv('GEMINI_MAX_RETRIES', '5'))
         self.initial_retry_wait = float(os.getenv('GEMINI_RETRY_WAIT', '2.0'))
+        self.retry_policy = RetryPolicy(
+            max_retries=int(os.getenv('GEMINI_MAX_RETRIES', '5')),
+            base_wait=self.initial_retry_wait,
+            max_wait=float(os.getenv('GEMINI_RETRY_MAX_WAIT', '60'))
+        )
+
+        # 서킷 브레이커 (같은 프로세스의 모든 평가자가 공유)
+        self.breaker = get_breaker(
+            'gemini',
+            failure_threshold=float(os.getenv('GEMINI_BREAKER_THRESHOLD', '0.5')),
+            cooldown_sec=float(os.getenv('GEMINI_BREAKER_COOLDOWN', '30'))
+        )
 
         # Gemini Client 초기화 (새로운 SDK)
-        self.client = genai.Client(api_key=self.api_key)
+        base_url = base_url or os.getenv('GEMINI_BASE_URL')
+        http_options = types.HttpOptions(base_url=base_url) if base_url else None
+        self.client = genai.Client(api_key=self.api_key, http_options=http_options)
+
+        if base_url:
+            logger.info(f"API 엔드포인트: {base_url}")
 
         logger.info(f"GeminiEvaluator 초기화 완료 (Model: {self.model_name})")
-        logger.info(f"재시도 설정: 최대 {self.max_retries}회, 초기 대기 {self.initial_retry_wait}초")
+        logger.info(
+            f"재시도 설정: 최대 {self.retry_policy.max_retries}회, 대기 {self.retry_policy.base_wait}~"
+            f"{self.retry_policy.max_wait}초 (지터 백오프)"
+        )
 
         # 프롬프트 로드
-        self.prompt_path = Path(__file__).parent.parent / 'docs' / 'prompts' / 'park_evaluation_prompt.md'
+        self.prompt_path = Path(prompt_path) if prompt_path else (
+            Path(__file__).parent.parent / 'docs' / 'prompts' / 'park_evaluation_prompt.md'
+        )
         if not self.prompt_path.exists():
             raise FileNotFoundError(f"평가 프롬프트를 찾을 수 없습니다: {self.prompt_path}")
 
@@ -74,6 +210,463 @@ class GeminiEvaluator:
 
         logger.info(f"평가 프롬프트 로드 완료: {self.prompt_path}")
 
+        unknown = set(generation_config or {}) - set(DEFAULT_GENERATION_CONFIG)
+        if unknown:
+            raise ValueError(f"지원하지 않는 생성 설정입니다: {', '.join(sorted(unknown))}")
+
+        # 평가 프로필 (사고 예산, 출력 상한, reason 길이) → 생성 설정 덮어쓰기보다 먼저 적용
+        self.profile = (profile or os.getenv('GEMINI_PROFILE', '')).strip().lower() or None
+        if self.profile and self.profile not in EVALUATION_PROFILES:
+            raise ValueError(
+                f"지원하지 않는 평가 프로필입니다: {self.profile} (가능: {', '.join(EVALUATION_PROFILES)})"
+            )
+        profile_settings = dict(EVALUATION_PROFILES.get(self.profile, {}))
+        reason_max_length = profile_settings.pop('reason_max_length', None)
+
+        self.generation_config = {**DEFAULT_GENERATION_CONFIG, **profile_settings, **(generation_config or {})}
+        self.response_schema = build_evaluation_schema(reason_max_length)
+        if reason_max_length:
+            self.evaluation_prompt += (
+                f"\n\n**길이 제한**: 각 reason은 {reason_max_length}자 이내로 핵심 관찰만 쓰세요."
+            )
+        if self.profile:
+            logger.info(f"평가 프로필: {self.profile} ({EVALUATION_PROFILES[self.profile]})")
+
+        # 출력 상한 도달(MAX_TOKENS)로 잘린 응답 비율
+        self.truncation_stats = {'responses': 0, 'truncated': 0}
+
+        # 응답 JSON 복구 통계 (재요청을 피한 횟수 집계)
+        self.decode_stats = {'clean': 0, 'repaired': 0, 'retries_avoided': 0, 'unrecoverable': 0}
+        self._stats_lock = threading.Lock()  # 합의 평가 시 여러 스레드가 통계를 갱신
+
+        # 합의 평가 (이미지당 최대 N회 동시 샘플링, 항목별 합의 비율을 넘으면 조기 종료)
+        self.consensus_samples = int(os.getenv('GEMINI_CONSENSUS_SAMPLES', '1'))
+        self.consensus_agreement = float(os.getenv('GEMINI_CONSENSUS_AGREEMENT', '0.6'))
+        self.consensus_stats = {'images': 0, 'samples': 0, 'failed_samples': 0, 'indicators': 0, 'stable_indicators': 0}
+
+        # 토큰/비용 집계와 사용량 한도 (한도에 가까우면 저가 모델로 전환, 도달하면 중단)
+        self.usage = UsageLedger()
+        self.budget = BudgetGuard.from_env()
+        if self.budget.enabled:
+            logger.info(f"사용량 한도: {self.budget.snapshot()}")
+
+        # 가시성 사전 판별 (가려진 이미지는 전체 평가 호출 생략)
+        self.prescreen = (prescreen or os.getenv('GEMINI_PRESCREEN', '')).strip().lower() or None
+        if self.prescreen and self.prescreen not in PRESCREEN_MODES:
+            raise ValueError(f"지원하지 않는 사전 판별 방식입니다: {self.prescreen} (가능: {', '.join(PRESCREEN_MODES)})")
+
+        self.prescreen_model = prescreen_model or os.getenv('GEMINI_PRESCREEN_MODEL', 'gemini-2.5-flash-lite')
+        self.prescreen_min_green = float(os.getenv('PRESCREEN_MIN_GREEN', '0.05'))
+        self.prescreen_stats = {'passed': 0, 'rejected': 0, 'errors': 0}
+
+        # 캡처 실패 이미지(검은 화면, 오류 화면, 타일 누락) 로컬 검사
+        self.quality_gate = quality_gate
+
+        # 중복 이미지는 대표 이미지의 평가 결과를 복사 (대표 경로 → 결과)
+        self.duplicate_index = duplicate_index
+        self.image_prep = image_prep or ImagePrep.from_env()
+        self._representative_results: Dict[str, Dict] = {}
+
+        if self.prescreen == 'model':
+            prescreen_prompt_path = Path(__file__).parent.parent / 'docs' / 'prompts' / 'park_visibility_prompt.md'
+            with open(prescreen_prompt_path, 'r', encoding='utf-8') as f:
+                self.prescreen_prompt = f.read()
+            logger.info(f"가시성 사전 판별: 모델 ({self.prescreen_model})")
+        elif self.prescreen == 'heuristic':
+            logger.info(f"가시성 사전 판별: 녹지 비율 {self.prescreen_min_green:.0%} 미만이면 not_visible")
+
+    def _record_decode(self, repairs):
+        """
+        응답 복구 결과 집계
+
+        코드 블록 제거만으로 파싱되는 응답은 기존에도 처리되던 경우이므로,
+        그 외 복구가 들어간 경우만 '재요청을 피한 횟수'로 셉니다.
+
+        Args:
+            repairs: decode_structured가 반환한 복구 목록
+        """
+        with self._stats_lock:
+            if not repairs:
+                self.decode_stats['clean'] += 1
+                return
+
+            self.decode_stats['repaired'] += 1
+            if not any(repair != 'fence' for repair in repairs):
+                return
+            self.decode_stats['retries_avoided'] += 1
+
+        tracer.count('gemini.retries_avoided')
+
+    @staticmethod
+    def _usage_of(response) -> Dict[str, int]:
+        """응답의 토큰 사용량 (usage_metadata가 없으면 0)"""
+        metadata = getattr(response, 'usage_metadata', None)
+        return {key: int(getattr(metadata, field, None) or 0) for key, field in USAGE_FIELDS.items()}
+
+    def _request_config(self, schema: Dict) -> types.GenerateContentConfig:
+        """생성 설정으로 요청 config 구성 (thinking_budget은 ThinkingConfig로 전달)"""
+        settings = dict(self.generation_config)
+        thinking_budget = settings.pop('thinking_budget', None)
+        if thinking_budget is not None:
+            settings['thinking_config'] = types.ThinkingConfig(thinking_budget=thinking_budget)
+
+        return types.GenerateContentConfig(
+            **settings,
+            response_mime_type="application/json",  # JSON 출력 강제
+            response_schema=schema,  # JSON Schema 강제
+        )
+
+    def _record_finish(self, response) -> bool:
+        """
+        응답 종료 사유 집계
+
+        Returns:
+            출력 상한에 걸려 잘렸는지 여부
+        """
+        candidates = getattr(response, 'candidates', None) or []
+        truncated = bool(candidates) and candidates[0].finish_reason == types.FinishReason.MAX_TOKENS
+
+        with self._stats_lock:
+            self.truncation_stats['responses'] += 1
+            self.truncation_stats['truncated'] += truncated
+
+        if truncated:
+            tracer.count('gemini.truncated')
+        return truncated
+
+    def _green_ratio(self, img: Image.Image) -> float:
+        """
+        녹지 픽셀 비율 (Excess Green 지수: 2G - R - B)
+
+        Args:
+            img: 이미지 (축소본 권장)
+
+        Returns:
+            녹색이 우세한 픽셀 비율 (0~1)
+        """
+        small = img.convert('RGB')
+        small.thumbnail((160, 90))
+        pixels = list(small.getdata())
+        if not pixels:
+            return 0.0
+
+        green = sum(1 for r, g, b in pixels if 2 * g - r - b > 40)
+        return green / len(pixels)
+
+    def _model_prescreen(self, preview_bytes: bytes, park_name: str, direction: str) -> Optional[Dict]:
+        """
+        저가 모델로 공원 가시성 판별 (한 번만 시도)
+
+        Args:
+            preview_bytes: 축소 이미지 JPEG 바이트
+            park_name: 공원 이름
+            direction: 방향
+
+        Returns:
+            {'park_visible': bool, 'reason': str}, 실패하면 None
+        """
+        self.breaker.wait_until_ready()
+
+        try:
+            model = self.budget.model_for(self.prescreen_model, self.usage)
+            call_started = time.perf_counter()
+            with tracer.span('gemini.prescreen_call', model=model):
+                response = self.client.models.generate_content(
+                    model=model,
+                    contents=[
+                        f"공원명: {park_name}\n방향: {direction}\n\n{self.prescreen_prompt}",
+                        types.Part.from_bytes(data=preview_bytes, mime_type='image/jpeg')
+                    ],
+                    config=types.GenerateContentConfig(
+                        temperature=0.0,
+                        max_output_tokens=256,
+                        response_mime_type="application/json",
+                        response_schema=VISIBILITY_SCHEMA,
+                    )
+                )
+            self.usage.record(model, self._usage_of(response), time.perf_counter() - call_started,
+                              park=park_name, kind='prescreen')
+
+            if response is None or not response.text:
+                raise ValueError("사전 판별 응답이 비어있습니다")
+
+            result, _ = decode_structured(response.text, VISIBILITY_SCHEMA)
+            self.breaker.record_success()
+            return result
+
+        except Exception as e:
+            failure = classify_error(e)
+            if failure.counts_toward_breaker:
+                self.breaker.record_failure()
+            elif failure.error_class == ErrorClass.UNKNOWN:
+                self.breaker.release_probe()
+            else:
+                self.breaker.record_success()
+
+            logger.warning(f"사전 판별 실패 ({failure.error_class}), 전체 평가로 진행: {e}")
+            return None
+
+    def _prescreen_image(self, preview: Image.Image, park_name: str, direction: str) -> Optional[Dict]:
+        """
+        가시성 사전 판별
+
+        판별에 실패하면 None을 반환하여 전체 평가로 넘깁니다 (가려졌다고 단정하지 않음).
+
+        Args:
+            preview: 축소 이미지
+            park_name: 공원 이름
+            direction: 방향
+
+        Returns:
+            {'method', 'park_visible', 'reason', ...} 또는 None
+        """
+        with tracer.span('gemini.prescreen', method=self.prescreen) as span:
+            if self.prescreen == 'heuristic':
+                ratio = self._green_ratio(preview)
+                visible = ratio >= self.prescreen_min_green
+                info = {
+                    'method': 'heuristic',
+                    'park_visible': visible,
+                    'green_ratio': round(ratio, 3),
+                    'reason': f"녹지 픽셀 비율 {ratio:.1%} ({'기준 이상' if visible else '기준 미만'})"
+                }
+            else:
+                import io
+                buffer = io.BytesIO()
+                preview.convert('RGB').save(buffer, format='JPEG', quality=85)
+                result = self._model_prescreen(buffer.getvalue(), park_name, direction)
+                if result is None:
+                    with self._stats_lock:
+                        self.prescreen_stats['errors'] += 1
+                    tracer.count('gemini.prescreen_errors')
+                    span['result'] = 'error'
+                    return None
+                info = {'method': 'model', 'model': self.prescreen_model, **result}
+
+            span['result'] = 'passed' if info['park_visible'] else 'rejected'
+
+        outcome = 'passed' if info['park_visible'] else 'rejected'
+        with self._stats_lock:
+            self.prescreen_stats[outcome] += 1
+        tracer.count(f'gemini.prescreen_{outcome}')
+
+        return info
+
+    def _not_visible_result(self, prescreen: Dict) -> Dict:
+        """사전 판별에서 가려진 이미지의 평가 결과 (모든 항목 not_visible)"""
+        result = {
+            indicator: {'level': 'not_visible', 'reason': f"사전 판별: {prescreen['reason']}"}
+            for indicator in INDICATORS
+        }
+        result['summary'] = '공원이 50% 이상 가려져 평가 불가 (사전 판별)'
+        result['prescreen'] = prescreen
+        return result
+
+    def _prepare_request(self, image_path: str, park_name: str, direction: str):
+        """
+        이미지 로드, 가시성 사전 판별, 요청 내용 구성
+
+        Args:
+            image_path: 이미지 파일 경로
+            park_name: 공원 이름
+            direction: 방향
+
+        Returns:
+            (프롬프트, 이미지 Part 목록, 사전 판별로 생략한 경우의 결과 또는 None)
+        """
+        # 이미지 로드 및 바이트 변환 (tiles 방식이면 축소본 + 원본 해상도 부분 이미지)
+        with tracer.span('image.load') as span, Image.open(image_path) as img:
+            images = self.image_prep.prepare(img)
+            img_bytes = sum(len(data) for _, data in images)
+            span['bytes'] = img_bytes
+            span['parts'] = len(images)
+
+            # 사전 판별용 축소본 (저가 모델 입력 토큰 절감)
+            preview = None
+            if self.prescreen:
+                preview = img.copy()
+                preview.thumbnail((768, 768))
+
+        tracer.count('gemini.image_bytes', img_bytes)
+
+        # 가시성 사전 판별에서 가려진 이미지는 전체 평가 생략
+        if preview is not None:
+            prescreen = self._prescreen_image(preview, park_name, direction)
+            if prescreen is not None and not prescreen['park_visible']:
+                logger.info(f"사전 판별로 평가 생략 (not_visible): {prescreen['reason']}")
+                return None, None, self._not_visible_result(prescreen)
+
+        # 평가 프롬프트에 공원 정보 추가
+        full_prompt = (
+            f"공원명: {park_name}\n"
+            f"방향: {direction}\n\n"
+            f"{self.evaluation_prompt}"
+            f"{self.image_prep.describe([name for name, _ in images])}"
+        )
+
+        # 이미지를 Part 객체로 생성
+        image_parts = [types.Part.from_bytes(data=data, mime_type='image/jpeg') for _, data in images]
+
+        return full_prompt, image_parts, None
+
+    def _generate(self, full_prompt: str, image_parts, park_name: str, direction: str) -> Dict:
+        """
+        평가 요청 한 건 (재시도, 서킷 브레이커, 응답 복구 포함)
+
+        Args:
+            full_prompt: 공원 정보가 포함된 평가 프롬프트
+            image_parts: 이미지 Part 목록
+            park_name: 공원 이름 (에러 응답 저장용)
+            direction: 방향 (에러 응답 저장용)
+
+        Returns:
+            평가 결과 딕셔너리
+        """
+        # Gemini API 호출 (재시도 로직 포함)
+        logger.info(f"Gemini API 호출 중... (모델: {self.model_name})")
+
+        response = None
+        last_error = None
+        response_text = None
+
+        previous_wait = 0.0
+        usage = {key: 0 for key in USAGE_FIELDS}  # 재시도한 호출의 토큰도 비용에 포함
+        usage.update(cost_usd=0.0, latency_sec=0.0)
+
+        for attempt in range(self.retry_policy.max_retries):
+            # 서킷 브레이커가 열려 있으면 회복 확인 전까지 대기
+            waited = self.breaker.wait_until_ready()
+            if waited > 0:
+                logger.warning(f"⏸️  서킷 브레이커 대기 {waited:.1f}초 (상태: {self.breaker.state})")
+
+            # 사용량 한도 확인 (도달하면 BudgetExceededError, 가까우면 저가 모델)
+            # 시험 호출 자리를 잡은 채 빠져나가면 다른 스레드가 계속 대기하므로 반납
+            try:
+                model = self.budget.model_for(self.model_name, self.usage)
+            except Exception:
+                self.breaker.release_probe()
+                raise
+
+            try:
+                # 멀티모달 요청 생성
+                call_started = time.perf_counter()
+                with tracer.span('gemini.api_call', model=model, attempt=attempt + 1):
+                    response = self.client.models.generate_content(
+                        model=model,
+                        contents=[full_prompt, *image_parts],
+                        config=self._request_config(self.response_schema)
+                    )
+                call_elapsed = time.perf_counter() - call_started
+
+                call_usage = self._usage_of(response)
+                for key, value in call_usage.items():
+                    usage[key] += value
+                usage['cost_usd'] += self.usage.record(model, call_usage, call_elapsed, park=park_name)
+                usage['latency_sec'] += call_elapsed
+
+                if self._record_finish(response):
+                    logger.warning(
+                        f"출력 상한({self.generation_config['max_output_tokens']} 토큰)에 걸려 응답이 잘렸습니다 "
+                        f"(사고 {call_usage['thoughts_tokens']}, 출력 {call_usage['output_tokens']} 토큰)"
+                    )
+
+                # 응답 검증
+                if response is None or not hasattr(response, 'text') or response.text is None:
+                    # Safety 차단 확인
+                    if hasattr(response, 'prompt_feedback'):
+                        logger.warning(f"프롬프트 피드백: {response.prompt_feedback}")
+                    if hasattr(response, 'candidates'):
+                        logger.warning(f"후보 응답: {response.candidates}")
+                    raise ValueError("API 응답이 비어있습니다 (Safety 필터 또는 기타 차단 가능)")
+
+                # 응답 텍스트 추출
+                response_text = response.text.strip()
+
+                # 빈 응답 체크
+                if not response_text:
+                    raise ValueError("응답 텍스트가 비어있습니다")
+
+                # 디버그: 응답 앞부분 로깅
+                logger.debug(f"응답 앞 200자: {response_text[:200]}")
+
+                # JSON 파싱 (코드 블록·끝 쉼표·잘린 응답은 재요청 없이 로컬 복구)
+                with tracer.span('gemini.json_parse'):
+                    result, repairs = decode_structured(response_text, self.response_schema)
+
+                self._record_decode(repairs)
+                self.breaker.record_success()
+
+                # 성공하면 루프 종료
+                logger.info(
+                    f"API 호출 및 파싱 성공 (시도 {attempt + 1}/{self.retry_policy.max_retries}, "
+                    f"응답 {call_elapsed:.1f}초)"
+                )
+                if repairs:
+                    logger.info(f"응답 JSON 로컬 복구: {', '.join(repairs)}")
+                    result['json_repairs'] = repairs
+                result['usage'] = {
+                    **usage,
+                    'model': model,
+                    'cost_usd': round(usage['cost_usd'], 6),
+                    'latency_sec': round(usage['latency_sec'], 3),
+                }
+                tracer.count('gemini.evaluations')
+                return result
+
+            except Exception as e:
+                last_error = e
+                error_message = str(e)
+                failure = classify_error(e)
+
+                # 브레이커에는 서버 장애성 실패만 반영 (응답은 왔으므로 형식 오류는 성공으로 기록)
+                if failure.counts_toward_breaker:
+                    self.breaker.record_failure()
+                elif failure.error_class == ErrorClass.UNKNOWN:
+                    self.breaker.release_probe()
+                else:
+                    self.breaker.record_success()
+
+                if isinstance(e, StructuredOutputError):
+                    with self._stats_lock:
+                        self.decode_stats['unrecoverable'] += 1
+
+                # JSON 파싱 에러 시 실제 응답 로깅
+                if isinstance(e, (json.JSONDecodeError, StructuredOutputError)) and response_text:
+                    logger.error(f"JSON 파싱 실패. 응답 내용:\n{response_text[:500]}")
+
+                if failure.retryable and attempt < self.retry_policy.max_retries - 1:
+                    # 서버 지정 대기 시간 우선, 없으면 decorrelated jitter 백오프
+                    wait_time = self.retry_policy.next_wait(previous_wait, failure)
+                    previous_wait = wait_time
+
+                    hint = " (서버 지정)" if failure.retry_after is not None else ""
+                    logger.warning(
+                        f"⚠️  {failure.error_class} 에러 발생{f' [{failure.status}]' if failure.status else ''}. "
+                        f"{wait_time:.1f}초 대기 후 재시도{hint}... "
+                        f"(시도 {attempt + 1}/{self.retry_policy.max_retries})"
+                    )
+                    tracer.count('gemini.retries', error_class=failure.error_class)
+                    with tracer.span('gemini.retry_sleep', wait=wait_time):
+                        time.sleep(wait_time)
+                else:
+                    # 재시도 불가능하거나 마지막 시도인 경우 에러 발생
+                    logger.error(f"최종 재시도 실패 ({failure.error_class}): {error_message}")
+                    tracer.count('gemini.failures', error_class=failure.error_class)
+                    # JSON 파싱 실패 시 응답 저장
+                    if isinstance(e, (json.JSONDecodeError, StructuredOutputError)) and response_text:
+                        error_file = Path(__file__).parent.parent / 'output' / 'error_responses' / f'{park_name}_{direction}_error.txt'
+                        error_file.parent.mkdir(parents=True, exist_ok=True)
+                        with open(error_file, 'w', encoding='utf-8') as f:
+                            f.write(response_text)
+                        logger.error(f"에러 응답 저장: {error_file}")
+                    raise
+
+        # 모든 재시도 실패 시 (이 코드에 도달하면 안 됨)
+        if last_error:
+            raise last_error
+        else:
+            raise Exception("API 호출 실패: 알 수 없는 오류")
+
     def evaluate_image(
         self,
         image_path: str,
@@ -102,180 +695,174 @@ class GeminiEvaluator:
         logger.info(f"이미지 평가 시작: {park_name} - {direction} ({image_path})")
 
         try:
-            # 이미지 로드 및 바이트 변환
-            with Image.open(image_path) as img:
-                # 이미지를 바이트로 변환
-                import io
-                img_byte_arr = io.BytesIO()
-                img.save(img_byte_arr, format='JPEG')
-                img_bytes = img_byte_arr.getvalue()
-
-            # 평가 프롬프트에 공원 정보 추가
-            full_prompt = (
-                f"공원명: {park_name}\n"
-                f"방향: {direction}\n\n"
-                f"{self.evaluation_prompt}"
-            )
+            full_prompt, image_parts, skipped = self._prepare_request(image_path, park_name, direction)
+            if skipped is not None:
+                return skipped
 
-            # 이미지를 Part 객체로 생성
-            image_part = types.Part.from_bytes(
-                data=img_bytes,
-                mime_type='image/jpeg'
-            )
+            return self._generate(full_prompt, image_parts, park_name, direction)
 
-            # Gemini API 호출 (재시도 로직 포함)
-            logger.info(f"Gemini API 호출 중... (모델: {self.model_name})")
-
-            response = None
-            last_error = None
-            response_text = None
-
-            for attempt in range(self.max_retries):
-                try:
-                    # JSON Schema 정의
-                    response_schema = {
-                        "type": "object",
-                        "properties": {
-                            "facility_maintenance": {
-                                "type": "object",
-                                "properties": {
-                                    "level": {"type": "string", "enum": ["low", "medium", "high", "not_visible"]},
-                                    "reason": {"type": "string"}
-                                },
-                                "required": ["level", "reason"]
-                            },
-                            "rest_facilities": {
-                                "type": "object",
-                                "properties": {
-                                    "level": {"type": "string", "enum": ["low", "medium", "high", "not_visible"]},
-                                    "reason": {"type": "string"}
-                                },
-                                "required": ["level", "reason"]
-                            },
-                            "greenery_diversity": {
-                                "type": "object",
-                                "properties": {
-                                    "level": {"type": "string", "enum": ["low", "medium", "high", "not_visible"]},
-                                    "reason": {"type": "string"}
-                                },
-                                "required": ["level", "reason"]
-                            },
-                            "openness": {
-                                "type": "object",
-                                "properties": {
-                                    "level": {"type": "string", "enum": ["low", "medium", "high", "not_visible"]},
-                                    "reason": {"type": "string"}
-                                },
-                                "required": ["level", "reason"]
-                            },
-                            "aesthetics": {
-                                "type": "object",
-                                "properties": {
-                                    "level": {"type": "string", "enum": ["low", "medium", "high", "not_visible"]},
-                                    "reason": {"type": "string"}
-                                },
-                                "required": ["level", "reason"]
-                            },
-                            "summary": {"type": "string"}
-                        },
-                        "required": ["facility_maintenance", "rest_facilities", "greenery_diversity", "openness", "aesthetics", "summary"]
-                    }
-
-                    # 멀티모달 요청 생성
-                    response = self.client.models.generate_content(
-                        model=self.model_name,
-                        contents=[full_prompt, image_part],
-                        config=types.GenerateContentConfig(
-                            temperature=0.2,  # 일관된 평가를 위해 낮은 temperature
-                            top_p=0.95,
-                            top_k=40,
-                            max_output_tokens=2048,
-                            response_mime_type="application/json",  # JSON 출력 강제
-                            response_schema=response_schema,  # JSON Schema 강제
-                        )
-                    )
+        except Exception as e:
+            logger.error(f"이미지 평가 실패: {e}", exc_info=True)
+            raise
 
-                    # 응답 검증
-                    if response is None or not hasattr(response, 'text') or response.text is None:
-                        # Safety 차단 확인
-                        if hasattr(response, 'prompt_feedback'):
-                            logger.warning(f"프롬프트 피드백: {response.prompt_feedback}")
-                        if hasattr(response, 'candidates'):
-                            logger.warning(f"후보 응답: {response.candidates}")
-                        raise ValueError("API 응답이 비어있습니다 (Safety 필터 또는 기타 차단 가능)")
-
-                    # 응답 텍스트 추출
-                    response_text = response.text.strip()
-
-                    # 빈 응답 체크
-                    if not response_text:
-                        raise ValueError("응답 텍스트가 비어있습니다")
-
-                    # 디버그: 응답 앞부분 로깅
-                    logger.debug(f"응답 앞 200자: {response_text[:200]}")
-
-                    # JSON 파싱 시도 (코드 블록 제거)
-                    if '```json' in response_text:
-                        response_text = response_text.split('```json')[1].split('```')[0].strip()
-                    elif '```' in response_text:
-                        response_text = response_text.split('```')[1].split('```')[0].strip()
-
-                    # JSON 파싱 검증
-                    result = json.loads(response_text)
-
-                    # 성공하면 루프 종료
-                    logger.info(f"API 호출 및 파싱 성공 (시도 {attempt + 1}/{self.max_retries})")
-                    return result
-
-                except (errors.ServerError, errors.APIError, json.JSONDecodeError, ValueError) as e:
-                    last_error = e
-                    error_message = str(e)
-
-                    # JSON 파싱 에러 시 실제 응답 로깅
-                    if isinstance(e, json.JSONDecodeError) and response_text:
-                        logger.error(f"JSON 파싱 실패. 응답 내용:\n{response_text[:500]}")
-
-                    # 재시도 가능한 에러 판단
-                    is_retryable = (
-                        "503" in error_message or
-                        "500" in error_message or
-                        "overloaded" in error_message.lower() or
-                        "internal" in error_message.lower() or
-                        isinstance(e, json.JSONDecodeError) or
-                        isinstance(e, ValueError)
-                    )
+    def evaluate_image_consensus(
+        self,
+        image_path: str,
+        park_name: str,
+        direction: str,
+        samples: Optional[int] = None,
+        agreement: Optional[float] = None
+    ) -> Dict:
+        """
+        여러 번 샘플링하여 항목별 다수결로 평가합니다 (합의되면 조기 종료)
 
-                    if is_retryable and attempt < self.max_retries - 1:
-                        # 지수 백오프: 2초, 4초, 8초, 16초, 32초...
-                        wait_time = self.initial_retry_wait * (2 ** attempt)
+        처음에는 합의에 필요한 표 수만큼만 동시에 요청하고, 합의되지 않은 항목이 있으면
+        부족한 표 수만큼만 추가로 요청합니다. 모든 샘플이 일치하면 최소 호출로 끝납니다.
 
-                        error_type = "서버 과부하" if "503" in error_message or "500" in error_message else "응답 파싱"
-                        logger.warning(
-                            f"⚠️  {error_type} 에러 발생. {wait_time:.1f}초 대기 후 재시도... "
-                            f"(시도 {attempt + 1}/{self.max_retries})"
-                        )
-                        time.sleep(wait_time)
-                    else:
-                        # 재시도 불가능하거나 마지막 시도인 경우 에러 발생
-                        logger.error(f"최종 재시도 실패: {error_message}")
-                        # JSON 파싱 실패 시 응답 저장
-                        if isinstance(e, json.JSONDecodeError) and response_text:
-                            error_file = Path(__file__).parent.parent / 'output' / 'error_responses' / f'{park_name}_{direction}_error.txt'
-                            error_file.parent.mkdir(parents=True, exist_ok=True)
-                            with open(error_file, 'w', encoding='utf-8') as f:
-                                f.write(response_text)
-                            logger.error(f"에러 응답 저장: {error_file}")
-                        raise
-
-            # 모든 재시도 실패 시 (이 코드에 도달하면 안 됨)
-            if last_error:
-                raise last_error
-            else:
-                raise Exception("API 호출 실패: 알 수 없는 오류")
+        Args:
+            image_path: 이미지 파일 경로
+            park_name: 공원 이름
+            direction: 방향
+            samples: 최대 샘플 수 (기본: GEMINI_CONSENSUS_SAMPLES)
+            agreement: 합의로 볼 득표 비율 (최대 샘플 수 기준, 기본: GEMINI_CONSENSUS_AGREEMENT)
 
-        except Exception as e:
-            logger.error(f"이미지 평가 실패: {e}", exc_info=True)
-            raise
+        Returns:
+            평가 결과 딕셔너리 (항목별 votes, agreement와 consensus 요약 포함)
+        """
+        samples = max(1, samples or self.consensus_samples)
+        agreement = agreement or self.consensus_agreement
+        need = min(samples, max(1, math.ceil(agreement * samples)))
+
+        logger.info(f"합의 평가 시작: {park_name} - {direction} (최대 {samples}회, {need}표 이상 합의)")
+
+        full_prompt, image_parts, skipped = self._prepare_request(image_path, park_name, direction)
+        if skipped is not None:
+            return skipped
+
+        votes = {indicator: Counter() for indicator in INDICATORS}
+        samples_ok = []
+        errors = []
+
+        def top_votes(indicator):
+            counts = votes[indicator]
+            return counts.most_common(1)[0][1] if counts else 0
+
+        with tracer.span('gemini.consensus', max_samples=samples) as span, \
+                ThreadPoolExecutor(max_workers=samples) as executor:
+            pending = {
+                executor.submit(self._generate, full_prompt, image_parts, park_name, direction)
+                for _ in range(need)
+            }
+            launched = need
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    samples_ok.append(result)
+                    for indicator in INDICATORS:
+                        votes[indicator][result[indicator]['level']] += 1
+
+                # 아직 합의 가능한 미합의 항목에 필요한 추가 표 수
+                remaining = samples - launched
+                shortfall = 0
+                for indicator in INDICATORS:
+                    missing = need - top_votes(indicator)
+                    if 0 < missing <= remaining + len(pending):
+                        shortfall = max(shortfall, missing)
+
+                extra = min(remaining, max(0, shortfall - len(pending)))
+                for _ in range(extra):
+                    pending.add(executor.submit(self._generate, full_prompt, image_parts, park_name, direction))
+                launched += extra
+
+            span['samples'] = launched
+
+        if not samples_ok:
+            raise errors[-1]
+
+        result = {}
+        stable = 0
+        for indicator in INDICATORS:
+            counts = votes[indicator]
+            top = top_votes(indicator)
+            level = min((lv for lv, count in counts.items() if count == top), key=LEVEL_ORDER.index)
+            reason = next(sample[indicator]['reason'] for sample in samples_ok if sample[indicator]['level'] == level)
+            stable += top >= need
+            result[indicator] = {
+                'level': level,
+                'reason': reason,
+                'votes': dict(counts),
+                'agreement': round(top / len(samples_ok), 2),
+            }
+
+        # 최종 등급과 가장 많이 일치하는 샘플의 요약 사용
+        best = max(samples_ok, key=lambda sample: sum(
+            sample[indicator]['level'] == result[indicator]['level'] for indicator in INDICATORS
+        ))
+        result['summary'] = best['summary']
+        result['usage'] = {
+            key: sum(sample.get('usage', {}).get(key, 0) for sample in samples_ok)
+            for key in [*USAGE_FIELDS, 'cost_usd', 'latency_sec']
+        }
+        result['usage']['cost_usd'] = round(result['usage']['cost_usd'], 6)
+        result['consensus'] = {
+            'samples': len(samples_ok),
+            'failed_samples': len(errors),
+            'max_samples': samples,
+            'required_votes': need,
+            'stable_indicators': stable,
+            'stable': stable == len(INDICATORS),
+        }
+
+        with self._stats_lock:
+            self.consensus_stats['images'] += 1
+            self.consensus_stats['samples'] += launched
+            self.consensus_stats['failed_samples'] += len(errors)
+            self.consensus_stats['indicators'] += len(INDICATORS)
+            self.consensus_stats['stable_indicators'] += stable
+
+        tracer.count('gemini.consensus_samples', launched)
+        tracer.count('gemini.consensus_stable', stable)
+        logger.info(f"합의 평가 완료: {launched}회 호출, 합의 {stable}/{len(INDICATORS)}개 항목")
+
+        return result
+
+    def truncation_report(self) -> Dict:
+        """
+        출력 상한에 걸린 응답 비율 (프로필 조정용)
+
+        Returns:
+            {'profile', 'responses', 'truncated', 'truncation_rate'}
+        """
+        with self._stats_lock:
+            stats = dict(self.truncation_stats)
+
+        stats['profile'] = self.profile
+        stats['truncation_rate'] = round(stats['truncated'] / stats['responses'], 4) if stats['responses'] else 0.0
+        return stats
+
+    def consensus_report(self) -> Dict:
+        """
+        합의 평가 비용 요약
+
+        Returns:
+            통계와 이미지당 호출 수, 합의된 항목 하나당 호출 수
+        """
+        with self._stats_lock:
+            stats = dict(self.consensus_stats)
+
+        stats['max_samples'] = self.consensus_samples
+        stats['agreement'] = self.consensus_agreement
+        stats['samples_per_image'] = round(stats['samples'] / stats['images'], 2) if stats['images'] else 0.0
+        stats['samples_per_stable_score'] = (
+            round(stats['samples'] / stats['stable_indicators'], 2) if stats['stable_indicators'] else None
+        )
+        return stats
 
     def evaluate_park_images(
         self,
@@ -306,18 +893,53 @@ class GeminiEvaluator:
 
         results = {}
 
-        # 모든 .jpg 파일 찾기
-        image_files = sorted(park_path.glob('*.jpg'))
+        # 방향별 .jpg 파일 찾기 (추가 시점 {방향}_{시점}.jpg 제외)
+        image_files = direction_images(park_path)
 
         logger.info(f"찾은 이미지: {len(image_files)}개")
 
+        # 품질 불량 이미지는 평가하지 않음 (재캡처 대상이면 _rejected/로 이동)
+        rejected = {}
+        if self.quality_gate is not None and self.quality_gate.enabled:
+            with tracer.span('image.quality_check', images=len(image_files)):
+                reports = self.quality_gate.screen(image_files)
+
+            for image_file in image_files:
+                report = reports[str(image_file)]
+                if report['ok']:
+                    continue
+
+                tracer.count('image.quality_rejected')
+                logger.warning(
+                    f"품질 불량 이미지 제외: {image_file.name} - {describe_issues(report, self.quality_gate.thresholds)}"
+                )
+                entry = {'issues': report['issues'], **report['metrics']}
+                if self.quality_gate.mode == 'requeue':
+                    entry['requeued_to'] = str(self.quality_gate.requeue(str(image_file)))
+                rejected[image_file.stem] = entry
+
+            image_files = [path for path in image_files if reports[str(path)]['ok']]
+
         for image_file in image_files:
             # 방향명 추출 (파일명에서 확장자 제거)
             direction = image_file.stem
 
+            # 대표 이미지가 이미 평가되었으면 결과 복사 (대표가 품질 불량/실패면 직접 평가)
+            representative = self.duplicate_index.representative(image_file) if self.duplicate_index else None
+            if representative in self._representative_results:
+                result = copy.deepcopy(self._representative_results[representative])
+                result.pop('usage', None)  # 호출하지 않았으므로 비용 없음
+                result['duplicate_of'] = f"{Path(representative).parent.name}/{Path(representative).stem}"
+                result['duplicate_distance'] = self.duplicate_index.distance(image_file, representative)
+                results[direction] = result
+                tracer.count('gemini.duplicates_reused')
+                logger.info(f"중복 이미지 평가 생략: {direction} → {result['duplicate_of']}")
+                continue
+
             try:
-                # 이미지 평가
-                result = self.evaluate_image(
+                # 이미지 평가 (합의 평가 설정 시 여러 번 샘플링)
+                evaluate = self.evaluate_image_consensus if self.consensus_samples > 1 else self.evaluate_image
+                result = evaluate(
                     image_path=str(image_file),
                     park_name=park_name,
                     direction=direction
@@ -325,6 +947,15 @@ class GeminiEvaluator:
 
                 results[direction] = result
 
+                if self.duplicate_index and len(self.duplicate_index.clusters.get(str(image_file), [])) > 1:
+                    self._representative_results[str(image_file)] = result
+
+            except BudgetExceededError as e:
+                # 한도에 도달하면 남은 이미지는 평가하지 않음 (다음 실행에서 이어서 평가)
+                logger.error(f"사용량 한도 도달로 평가 중단: {e}")
+                results['_budget_stopped'] = str(e)
+                break
+
             except Exception as e:
                 logger.error(f"이미지 평가 실패: {direction} - {e}")
                 results[direction] = {
@@ -334,6 +965,14 @@ class GeminiEvaluator:
 
         logger.info(f"공원 전체 평가 완료: {park_name} ({len(results)}/{len(image_files)}개 성공)")
 
+        if rejected:
+            # 방향이 아닌 메타 정보는 '_'로 시작하는 키에 저장 (CSV 변환 시 제외)
+            results['_quality_rejected'] = rejected
+
+        park_usage = self.usage.park_summary(park_name)
+        if park_usage['requests']:
+            results['_usage'] = park_usage
+
         return results
 
     def save_evaluation_results(
@@ -0,0 +1,400 @@
+"""
+행정동별 1인당 공원 면적 산출 모듈
+
+행정동 경계 폴리곤을 STRtree로 색인하고 공원을 한 번의 벡터화 공간 조인으로 행정동에 배정합니다.
+공원이 점(위경도)이면 점-폴리곤 포함 관계로, 폴리곤이면 교차 면적 비율로 공원 면적을 나눕니다.
+select_best_direction.py의 총점을 품질 가중치로 곱한 "품질 가중 면적"도 함께 계산하며,
+행정동 수천 개(전국 약 3,500개)도 공간 조인 한 번과 bincount 집계로 처리합니다.
+"""
+
+import csv
+import json
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping, shape
+
+from .park_catalog import DEFAULT_PARK_CSV, ParkCatalog, normalize_name
+
+# 1인당 공원 면적 기준 (㎡, 도시공원 및 녹지 등에 관한 법률 시행규칙: 도시지역 주민 1인당 6㎡ 이상)
+PER_CAPITA_STANDARD = 6.0
+
+# 품질 점수 지표와 만점 (convert_evaluations_to_csv.py: 지표별 low 1 / medium 2 / high 3 → 총점 5~15점)
+QUALITY_INDICATORS = ('facility_maintenance', 'rest_facilities', 'greenery_diversity', 'openness', 'aesthetics')
+MAX_QUALITY_SCORE = 3 * len(QUALITY_INDICATORS)
+
+# select_best_direction.py가 모든 방향이 not_visible인 공원에 넣는 지표 값 (총점 45, 실제 점수 아님)
+NOT_VISIBLE_SCORE = '9'
+
+# 필드 자동 탐지 후보 (통계청/행정안전부/admdongkor 경계, 주민등록 인구통계 CSV)
+CODE_FIELDS = ('adm_cd2', 'adm_cd', 'ADM_CD', '행정기관코드', '행정동코드', 'code')
+NAME_FIELDS = ('adm_nm', 'ADM_NM', '읍면동명', '행정기관', '행정동명', 'name')
+POPULATION_FIELDS = ('총인구수', '총 인구수', '인구수', '인구', 'population')
+
+# 위도 1도 거리 (미터)
+_M_PER_DEG = 111_320
+
+
+def _normalize(text) -> str:
+    """이름 비교용 정규화 (NFC, 공백 제거)"""
+    return unicodedata.normalize('NFC', str(text)).replace(' ', '').strip()
+
+
+def dong_key(name: str) -> str:
+    """
+    행정동 이름 매칭 키 (시도/시군구를 뺀 마지막 부분, 가운뎃점 표기 통일)
+
+    예: "인천광역시 미추홀구 숭의1·3동" → "숭의1.3동"
+    """
+    last = unicodedata.normalize('NFC', str(name)).split()[-1] if str(name).split() else ''
+    return _normalize(last).replace('·', '.').replace('ㆍ', '.').replace(',', '.')
+
+
+def _pick_field(fields: Sequence[str], candidates: Sequence[str], override: Optional[str] = None) -> Optional[str]:
+    """필드 이름 선택 (지정값 우선, 없으면 후보 중 처음 있는 것)"""
+    if override:
+        if override not in fields:
+            raise KeyError(f"필드를 찾을 수 없습니다: {override} (있는 필드: {', '.join(fields)})")
+        return override
+    return next((name for name in candidates if name in fields), None)
+
+
+def geodesic_area_m2(geometries: np.ndarray) -> np.ndarray:
+    """
+    위경도 폴리곤 면적 (㎡, 도형마다 중심 위도로 경도 축척 보정)
+
+    Args:
+        geometries: shapely 도형 배열 (WGS84)
+
+    Returns:
+        면적 배열
+    """
+    lat = shapely.get_y(shapely.centroid(geometries))
+    return shapely.area(geometries) * _M_PER_DEG * _M_PER_DEG * np.cos(np.radians(lat))
+
+
+class DongBoundaries:
+    """행정동 경계 + STRtree 색인"""
+
+    def __init__(self, codes: List[str], names: List[str], geometries: Sequence):
+        """
+        초기화
+
+        Args:
+            codes: 행정동 코드
+            names: 행정동 이름
+            geometries: 경계 폴리곤 (WGS84)
+        """
+        self.codes = [str(code) for code in codes]
+        self.names = [str(name) for name in names]
+        self.geometries = shapely.make_valid(np.asarray(geometries, dtype=object))
+        self.area_m2 = geodesic_area_m2(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def load(cls, path: str, code_field: Optional[str] = None, name_field: Optional[str] = None) -> 'DongBoundaries':
+        """
+        행정동 경계 불러오기
+
+        GeoJSON은 바로 읽고, Shapefile/GeoPackage 등은 geopandas로 읽어 WGS84로 변환합니다.
+
+        Args:
+            path: 경계 파일 경로
+            code_field: 행정동 코드 필드 (없으면 CODE_FIELDS에서 자동 탐지)
+            name_field: 행정동 이름 필드 (없으면 NAME_FIELDS에서 자동 탐지)
+
+        Returns:
+            DongBoundaries
+        """
+        if str(path).endswith(('.geojson', '.json')):
+            with open(path, 'r', encoding='utf-8') as f:
+                features = json.load(f)['features']
+            records = [feature.get('properties') or {} for feature in features]
+            geometries = [shape(feature['geometry']) for feature in features]
+        else:
+            try:
+                import geopandas
+            except ImportError as e:
+                raise ImportError("GeoJSON 외 형식을 읽으려면 geopandas 패키지가 필요합니다: pip install geopandas") from e
+            frame = geopandas.read_file(path)
+            if frame.crs is not None:
+                frame = frame.to_crs(4326)
+            records = frame.drop(columns='geometry').to_dict('records')
+            geometries = list(frame.geometry)
+
+        fields = list(records[0]) if records else []
+        code_field = _pick_field(fields, CODE_FIELDS, code_field)
+        name_field = _pick_field(fields, NAME_FIELDS, name_field)
+        if code_field is None and name_field is None:
+            raise KeyError(f"행정동 코드/이름 필드를 찾을 수 없습니다 (있는 필드: {', '.join(fields)})")
+
+        codes = [record.get(code_field, '') if code_field else '' for record in records]
+        names = [record.get(name_field, '') if name_field else '' for record in records]
+        return cls(codes, names, geometries)
+
+
+def load_population(
+    path: str,
+    code_field: Optional[str] = None,
+    name_field: Optional[str] = None,
+    population_field: Optional[str] = None
+) -> Dict[str, Dict[str, int]]:
+    """
+    행정동별 인구 CSV 불러오기 (UTF-8, 실패하면 CP949)
+
+    Args:
+        path: 인구 CSV 경로
+        code_field: 행정동 코드 필드 (없으면 자동 탐지)
+        name_field: 행정동 이름 필드 (없으면 자동 탐지)
+        population_field: 인구 필드 (없으면 자동 탐지)
+
+    Returns:
+        {'by_code': {코드: 인구}, 'by_name': {이름 키: 인구}}
+    """
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='cp949') as f:
+            rows = list(csv.DictReader(f))
+
+    fields = list(rows[0]) if rows else []
+    code_field = _pick_field(fields, CODE_FIELDS, code_field)
+    name_field = _pick_field(fields, NAME_FIELDS, name_field)
+    population_field = _pick_field(fields, POPULATION_FIELDS, population_field)
+    if population_field is None:
+        raise KeyError(f"인구 필드를 찾을 수 없습니다 (있는 필드: {', '.join(fields)})")
+
+    by_code, by_name = {}, {}
+    for row in rows:
+        try:
+            population = int(float(str(row[population_field]).replace(',', '')))
+        except ValueError:
+            continue
+        if code_field and row.get(code_field):
+            by_code[str(row[code_field]).strip()] = population
+        if name_field and row.get(name_field):
+            by_name[dong_key(row[name_field])] = population
+
+    return {'by_code': by_code, 'by_name': by_name}
+
+
+def quality_score(row: Dict) -> Optional[float]:
+    """
+    최고 방향 CSV 행의 총점
+
+    모든 방향이 not_visible인 공원의 기본값 행(지표마다 9)과 범위를 벗어난 값은 평가가 없는 것으로 보고
+    None을 돌려줍니다 (호출하는 쪽에서 평균 점수로 대체).
+
+    Args:
+        row: select_best_direction.py 결과 행
+
+    Returns:
+        총점 (5~15) 또는 None
+    """
+    if any(row.get(indicator) == NOT_VISIBLE_SCORE for indicator in QUALITY_INDICATORS):
+        return None
+    try:
+        score = float(row['총점'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return score if 0 < score <= MAX_QUALITY_SCORE else None
+
+
+def quality_key(park: Dict) -> str:
+    """품질 점수 키 (관리번호, 없으면 정규화 공원명)"""
+    return park.get('id') or normalize_name(park.get('name'))
+
+
+def load_quality_scores(path: str, park_csv: str = DEFAULT_PARK_CSV) -> Dict[str, float]:
+    """
+    select_best_direction.py 결과에서 공원별 총점 불러오기 (UTF-8-BOM 또는 CP949)
+
+    행은 카탈로그 이름 색인(관리번호 열 우선)으로 찾아 관리번호를 키로 쓰므로 이름이 같은 공원도 점수가 따로 붙습니다.
+
+    Args:
+        path: output/park_best_directions.csv
+        park_csv: 공원 정보 CSV (없으면 정규화 공원명 키)
+
+    Returns:
+        {quality_key: 총점} (not_visible 기본값 공원은 제외)
+    """
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                rows = list(csv.DictReader(f))
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"CSV 인코딩을 알 수 없습니다: {path}")
+
+    catalog = ParkCatalog.load(park_csv) if Path(park_csv).exists() else None
+
+    scores = {}
+    for row in rows:
+        score = quality_score(row)
+        if score is None or not row.get('공원명'):
+            continue
+        park_id = row.get('관리번호', '')
+        if catalog is not None:
+            index = catalog.resolve(park_id or row['공원명']).index
+            park_id = catalog.ids[index] if index is not None else park_id
+        scores[quality_key({'id': park_id, 'name': row['공원명']})] = score
+    return scores
+
+
+def assign_parks(boundaries: DongBoundaries, parks: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    공원을 행정동에 배정 (벡터화 STRtree 조인)
+
+    점 공원은 포함하는 행정동 하나에 전체 면적을, 폴리곤 공원('geometry')은 교차 면적 비율대로 나눠 배정합니다.
+
+    Args:
+        boundaries: 행정동 경계
+        parks: 공원 정보 목록 ('lat', 'lng', 'area', 선택: 'geometry')
+
+    Returns:
+        {'park': 공원 인덱스 배열, 'dong': 행정동 인덱스 배열, 'share': 면적 비율 배열}
+    """
+    park_index, dong_index, share = [], [], []
+
+    # 1) 점 공원: 경계 위 점은 처음 걸린 행정동 하나에만 배정
+    point_ids = np.array([i for i, park in enumerate(parks) if park.get('geometry') is None], dtype=np.int64)
+    if len(point_ids):
+        points = shapely.points(
+            [parks[i]['lng'] for i in point_ids], [parks[i]['lat'] for i in point_ids]
+        )
+        hit_point, hit_dong = boundaries.tree.query(points, predicate='within')
+        _, first = np.unique(hit_point, return_index=True)
+        park_index.append(point_ids[hit_point[first]])
+        dong_index.append(hit_dong[first])
+        share.append(np.ones(len(first)))
+
+    # 2) 폴리곤 공원: 교차 면적 / 공원 면적
+    polygon_ids = np.array([i for i, park in enumerate(parks) if park.get('geometry') is not None], dtype=np.int64)
+    if len(polygon_ids):
+        polygons = np.array([parks[i]['geometry'] for i in polygon_ids], dtype=object)
+        hit_polygon, hit_dong = boundaries.tree.query(polygons, predicate='intersects')
+        overlap = shapely.area(shapely.intersection(polygons[hit_polygon], boundaries.geometries[hit_dong]))
+        total = np.bincount(hit_polygon, weights=overlap, minlength=len(polygon_ids))
+        keep = overlap > 0
+        park_index.append(polygon_ids[hit_polygon[keep]])
+        dong_index.append(hit_dong[keep])
+        share.append(overlap[keep] / total[hit_polygon[keep]])
+
+    if not park_index:
+        return {'park': np.zeros(0, dtype=np.int64), 'dong': np.zeros(0, dtype=np.int64), 'share': np.zeros(0)}
+    return {'park': np.concatenate(park_index), 'dong': np.concatenate(dong_index), 'share': np.concatenate(share)}
+
+
+def compute_green_space(
+    boundaries: DongBoundaries,
+    parks: List[Dict],
+    population: Dict[str, Dict[str, int]],
+    quality_scores: Optional[Dict[str, float]] = None,
+    standard: float = PER_CAPITA_STANDARD
+) -> List[Dict]:
+    """
+    행정동별 공원 면적, 1인당 면적, 품질 가중 1인당 면적
+
+    Args:
+        boundaries: 행정동 경계
+        parks: 공원 정보 목록 ('name', 'lat', 'lng', 'area', 선택: 'geometry')
+        population: load_population 결과
+        quality_scores: {quality_key: 총점} (없으면 품질 가중치 1)
+        standard: 1인당 면적 기준 (㎡)
+
+    Returns:
+        행정동별 결과 리스트
+    """
+    joined = assign_parks(boundaries, parks)
+
+    area = np.array([float(park.get('area') or 0.0) for park in parks])
+    if quality_scores:
+        # 점수가 없는 공원은 평균 점수로 (평가 누락이 면적을 깎지 않도록)
+        mean_score = sum(quality_scores.values()) / len(quality_scores)
+        weight = np.array([
+            quality_scores.get(quality_key(park), mean_score) / MAX_QUALITY_SCORE
+            for park in parks
+        ])
+    else:
+        weight = np.ones(len(parks))
+
+    n = len(boundaries)
+    park_area = np.bincount(joined['dong'], weights=area[joined['park']] * joined['share'], minlength=n)
+    weighted_area = np.bincount(
+        joined['dong'], weights=area[joined['park']] * weight[joined['park']] * joined['share'], minlength=n
+    )
+    # 공원 수: 면적이 가장 많이 걸친 행정동에 한 번만 셈
+    order = np.lexsort((-joined['share'], joined['park']))
+    _, first = np.unique(joined['park'][order], return_index=True)
+    park_count = np.bincount(joined['dong'][order][first], minlength=n)
+
+    results = []
+    for i in range(n):
+        code, name = boundaries.codes[i], boundaries.names[i]
+        people = population['by_code'].get(code)
+        if people is None:
+            people = population['by_name'].get(dong_key(name))
+
+        per_capita = park_area[i] / people if people else None
+        results.append({
+            '행정동코드': code,
+            '행정동명': name,
+            '인구': people,
+            '공원수': int(park_count[i]),
+            '공원면적': round(float(park_area[i]), 1),
+            '품질가중면적': round(float(weighted_area[i]), 1),
+            '행정동면적': round(float(boundaries.area_m2[i]), 1),
+            '공원면적비율': round(float(park_area[i] / boundaries.area_m2[i]), 4) if boundaries.area_m2[i] else None,
+            '1인당공원면적': round(per_capita, 3) if per_capita is not None else None,
+            '1인당품질가중면적': round(float(weighted_area[i]) / people, 3) if people else None,
+            '기준미달': bool(per_capita < standard) if per_capita is not None else None,
+        })
+
+    return results
+
+
+def unassigned_parks(boundaries: DongBoundaries, parks: List[Dict]) -> List[str]:
+    """어느 행정동에도 배정되지 않은 공원 이름 (좌표 오류 또는 경계 밖)"""
+    assigned = set(assign_parks(boundaries, parks)['park'].tolist())
+    return [park['name'] for i, park in enumerate(parks) if i not in assigned]
+
+
+def save_results(results: List[Dict], boundaries: DongBoundaries, output_dir: str) -> Dict[str, str]:
+    """
+    결과 저장 (CSV: Excel용 UTF-8-BOM, GeoJSON: QGIS 단계구분도용)
+
+    Args:
+        results: compute_green_space 결과
+        boundaries: 행정동 경계
+        output_dir: 저장 폴더
+
+    Returns:
+        {종류: 파일 경로}
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = output_dir / 'green_space_by_dong.csv'
+    geojson_path = output_dir / 'green_space_by_dong.geojson'
+
+    with open(csv_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]) if results else [])
+        writer.writeheader()
+        writer.writerows(results)
+
+    features = [
+        {'type': 'Feature', 'properties': row, 'geometry': mapping(geometry)}
+        for row, geometry in zip(results, boundaries.geometries)
+    ]
+    with open(geojson_path, 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
+
+    return {'csv': str(csv_path), 'geojson': str(geojson_path)}
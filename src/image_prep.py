@@ -0,0 +1,220 @@
+"""
+평가 요청용 이미지 준비 모듈
+
+캡처 이미지(2560x1440)를 그대로 보내면 API가 내부에서 768px 타일로 축소하여
+벤치 녹, 파손 같은 작은 부분이 뭉개지고 업로드 크기도 큽니다.
+tiles 방식은 전체 화면 축소본 한 장과 원본 해상도의 타일 크기 부분 이미지
+(화면 중앙 = 공원 방향, 좌/우)를 만들어 한 요청에 함께 보냅니다.
+"""
+
+import io
+import math
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+# 이미지 준비 방식 (full: 원본 전체 화면, tiles: 축소본 + 부분 이미지)
+PREP_MODES = ('full', 'tiles')
+
+# 모델 입력 타일 크기 (Gemini는 큰 이미지를 768x768 타일로 나누어 타일당 258 토큰)
+TILE_SIZE = 768
+TOKENS_PER_TILE = 258
+
+# 부분 이미지 중심 위치 (가로, 세로 비율). 캡처는 공원 방위를 화면 중앙에 맞추므로 center가 공원 방향
+CROP_CENTERS = {
+    'center': (0.5, 0.5),
+    'left': (1 / 6, 0.5),
+    'right': (5 / 6, 0.5),
+}
+
+# 전체 화면 축소본
+OVERVIEW = 'overview'
+
+CROP_NAMES = (OVERVIEW,) + tuple(CROP_CENTERS)
+
+# 프롬프트에 붙일 이미지 설명
+CROP_DESCRIPTIONS = {
+    OVERVIEW: '전체 화면 축소본 (배치와 개방감 판단용)',
+    'center': '화면 중앙, 공원 방향 원본 해상도 확대',
+    'left': '화면 왼쪽 원본 해상도 확대',
+    'right': '화면 오른쪽 원본 해상도 확대',
+}
+
+
+def image_tokens(width: int, height: int) -> int:
+    """
+    이미지 한 장의 예상 입력 토큰 (Gemini 2.x 타일 규칙)
+
+    두 변이 모두 384px 이하면 258 토큰, 아니면 768x768 타일 수 × 258 토큰입니다.
+
+    Args:
+        width: 가로 픽셀
+        height: 세로 픽셀
+
+    Returns:
+        토큰 수
+    """
+    if width <= 384 and height <= 384:
+        return TOKENS_PER_TILE
+    return math.ceil(width / TILE_SIZE) * math.ceil(height / TILE_SIZE) * TOKENS_PER_TILE
+
+
+def crop_box(size: Tuple[int, int], name: str, tile_size: int = TILE_SIZE) -> Tuple[int, int, int, int]:
+    """
+    원본 해상도 부분 이미지 영역 (화면 밖으로 나가지 않게 조정)
+
+    Args:
+        size: 원본 (가로, 세로)
+        name: 부분 이미지 이름 (center, left, right)
+        tile_size: 부분 이미지 한 변 (원본 픽셀)
+
+    Returns:
+        (left, top, right, bottom)
+    """
+    width, height = size
+    crop_w, crop_h = min(tile_size, width), min(tile_size, height)
+    cx, cy = CROP_CENTERS[name]
+
+    left = min(max(0, round(cx * width - crop_w / 2)), width - crop_w)
+    top = min(max(0, round(cy * height - crop_h / 2)), height - crop_h)
+    return left, top, left + crop_w, top + crop_h
+
+
+def render_crops(img: Image.Image, crops: Sequence[str], tile_size: int = TILE_SIZE) -> List[Tuple[str, Image.Image]]:
+    """
+    이미지에서 축소본/부분 이미지 생성
+
+    Args:
+        img: 원본 이미지
+        crops: 만들 이미지 이름 목록 (CROP_NAMES 중)
+        tile_size: 타일 크기
+
+    Returns:
+        [(이름, 이미지)]
+    """
+    rendered = []
+    for name in crops:
+        if name == OVERVIEW:
+            # 면적 평균(BOX) 축소: 축소 비율이 커도 앨리어싱이 적고 LANCZOS보다 몇 배 빠름
+            scale = min(1.0, tile_size / max(img.size))
+            size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+            rendered.append((name, img.resize(size, Image.BOX) if scale < 1.0 else img.copy()))
+        else:
+            rendered.append((name, img.crop(crop_box(img.size, name, tile_size))))
+    return rendered
+
+
+class ImagePrep:
+    """평가 요청 이미지 준비기 (요청 크기, 예상 토큰 집계 포함, 스레드 안전)"""
+
+    def __init__(
+        self,
+        mode: str = 'full',
+        crops: Optional[Sequence[str]] = None,
+        tile_size: int = TILE_SIZE,
+        quality: int = 75
+    ):
+        """
+        초기화
+
+        Args:
+            mode: 'full' (원본 전체 화면) 또는 'tiles' (축소본 + 부분 이미지)
+            crops: tiles 방식에서 보낼 이미지 (기본: overview, center, left, right)
+            tile_size: 부분 이미지 한 변 (원본 픽셀)
+            quality: tiles 방식 JPEG 품질 (기본: PIL 기본값, full 방식과 같음)
+        """
+        if mode not in PREP_MODES:
+            raise ValueError(f"지원하지 않는 이미지 준비 방식입니다: {mode} (가능: {', '.join(PREP_MODES)})")
+
+        crops = tuple(crops or CROP_NAMES)
+        unknown = [name for name in crops if name not in CROP_NAMES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 부분 이미지입니다: {', '.join(unknown)} (가능: {', '.join(CROP_NAMES)})")
+
+        self.mode = mode
+        self.crops = crops
+        self.tile_size = tile_size
+        self.quality = quality
+        self.stats = {'images': 0, 'parts': 0, 'bytes': 0, 'estimated_tokens': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'ImagePrep':
+        """환경변수 IMAGE_PREP, IMAGE_CROPS, IMAGE_TILE_SIZE로 생성"""
+        crops = os.getenv('IMAGE_CROPS')
+        return cls(
+            mode=os.getenv('IMAGE_PREP', 'full'),
+            crops=[name.strip() for name in crops.split(',') if name.strip()] if crops else None,
+            tile_size=int(os.getenv('IMAGE_TILE_SIZE', str(TILE_SIZE)))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'full'
+
+    def prepare(self, img: Image.Image) -> List[Tuple[str, bytes]]:
+        """
+        요청에 넣을 JPEG 이미지 목록
+
+        Args:
+            img: 원본 이미지
+
+        Returns:
+            [(이름, JPEG 바이트)] (full 방식이면 [('full', 원본)])
+        """
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        if self.enabled:
+            images = render_crops(img, self.crops, self.tile_size)
+            options = {'quality': self.quality}
+        else:
+            images = [('full', img)]
+            options = {}
+
+        parts = []
+        tokens = 0
+        for name, part in images:
+            buffer = io.BytesIO()
+            part.save(buffer, format='JPEG', **options)
+            parts.append((name, buffer.getvalue()))
+            tokens += image_tokens(*part.size)
+
+        with self._lock:
+            self.stats['images'] += 1
+            self.stats['parts'] += len(parts)
+            self.stats['bytes'] += sum(len(data) for _, data in parts)
+            self.stats['estimated_tokens'] += tokens
+        return parts
+
+    def describe(self, names: Sequence[str]) -> str:
+        """
+        프롬프트에 붙일 이미지 구성 설명 (full 방식이면 빈 문자열)
+
+        Args:
+            names: prepare가 돌려준 이미지 이름 순서
+
+        Returns:
+            설명 문자열
+        """
+        if not self.enabled:
+            return ''
+
+        lines = [f"{index}. {CROP_DESCRIPTIONS[name]}" for index, name in enumerate(names, start=1)]
+        return (
+            "\n\n**이미지 구성**: 같은 로드뷰 화면 한 장을 아래 순서로 나누어 보냅니다. "
+            "모두 하나의 장면으로 보고 한 번만 평가하세요.\n" + "\n".join(lines)
+        )
+
+    def report(self) -> Dict:
+        """리포트용 통계 (이미지당 평균 포함)"""
+        with self._lock:
+            stats = dict(self.stats, mode=self.mode)
+        if self.enabled:
+            stats['crops'] = list(self.crops)
+        images = stats['images']
+        stats['bytes_per_image'] = round(stats['bytes'] / images) if images else 0
+        stats['tokens_per_image'] = round(stats['estimated_tokens'] / images) if images else 0
+        return stats
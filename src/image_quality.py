@@ -0,0 +1,295 @@
+"""
+로드뷰 이미지 품질 검사 모듈
+
+캡처 실패로 생긴 이미지(검은 화면, 로드뷰 오류 화면, 타일이 덜 로드된 화면, 흐린 화면)를
+Gemini로 보내기 전에 로컬에서 걸러냅니다.
+축소한 흑백 픽셀에 대해 NumPy로 밝기/대비, 엔트로피, 라플라시안 분산(선명도),
+단색 블록 비율(누락 타일)을 계산하며, 여러 이미지는 프로세스 풀에서 병렬로 검사합니다.
+"""
+
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from PIL import Image
+
+# 검사 기준 (축소 이미지 기준, 0~255 흑백)
+DEFAULT_THRESHOLDS = {
+    'dark_mean': 15.0,         # 평균 밝기 미만이면 검은 화면
+    'blank_std': 6.0,          # 밝기 표준편차 미만이면 단색(빈 화면, 오류 화면)
+    'min_entropy': 3.5,        # 히스토그램 엔트로피(bit) 미만이면 정보 없음
+    'min_sharpness': 20.0,     # 라플라시안 분산 미만이면 흐림(렌더링 전 캡처)
+    'flat_block_std': 1.0,     # 블록 표준편차 미만이면 단색 블록 (하늘 그라데이션보다 평탄)
+    'max_flat_ratio': 0.35,    # 단색 블록 비율 초과면 타일 누락
+}
+
+# 문제 항목 → (지표, 비교, 검사 기준 키)
+ISSUE_METRICS = {
+    'black_frame': ('mean', '<', 'dark_mean'),
+    'blank': ('std', '<', 'blank_std'),
+    'low_entropy': ('entropy', '<', 'min_entropy'),
+    'blurry': ('sharpness', '<', 'min_sharpness'),
+    'missing_tiles': ('flat_ratio', '>', 'max_flat_ratio'),
+}
+
+# 품질 불량 이미지 처리 방식
+GATE_MODES = ('off', 'skip', 'requeue')
+
+# 재캡처 대기 이미지 폴더 (공원 폴더 아래, *.jpg glob에 걸리지 않음)
+REJECTED_DIR = '_rejected'
+
+_ANALYSIS_WIDTH = 320
+_BLOCK_GRID = (8, 12)  # (행, 열)
+
+
+def direction_images(folder) -> List[Path]:
+    """
+    공원 폴더의 방향별 이미지 (추가 시점 이미지 제외)
+
+    추가 시점은 같은 파노라마에서 찍은 {방향}_{시점}.jpg(roadview_client.viewpoint_path)이므로 방향이 아닙니다.
+    방향 이름에도 '_'가 들어갈 수 있어(내부_북) 접두어에 해당하는 {방향}.jpg가 함께 있을 때만 추가 시점으로 봅니다.
+
+    Args:
+        folder: 공원 폴더
+
+    Returns:
+        이미지 경로 목록 (이름순)
+    """
+    paths = sorted(Path(folder).glob('*.jpg'))
+    stems = {path.stem for path in paths}
+
+    def is_viewpoint(stem: str) -> bool:
+        return any(stem[:i] in stems for i, char in enumerate(stem) if char == '_' and i > 0)
+
+    return [path for path in paths if not is_viewpoint(path.stem)]
+
+
+def _grayscale(path: str) -> np.ndarray:
+    """이미지를 축소한 흑백 배열로 로드"""
+    with Image.open(path) as img:
+        img.draft('L', (_ANALYSIS_WIDTH * 2, _ANALYSIS_WIDTH * 2))  # JPEG는 디코딩 단계에서 축소
+        gray = img.convert('L')
+        if gray.width > _ANALYSIS_WIDTH:
+            height = max(1, round(gray.height * _ANALYSIS_WIDTH / gray.width))
+            gray = gray.resize((_ANALYSIS_WIDTH, height), Image.BILINEAR)
+        return np.asarray(gray, dtype=np.float32)
+
+
+def _entropy(gray: np.ndarray) -> float:
+    """256단계 히스토그램 엔트로피 (bit)"""
+    hist = np.bincount(gray.astype(np.uint8).ravel(), minlength=256).astype(np.float64)
+    prob = hist[hist > 0] / hist.sum()
+    return float(-(prob * np.log2(prob)).sum())
+
+
+def _sharpness(gray: np.ndarray) -> float:
+    """4-이웃 라플라시안 분산 (클수록 선명)"""
+    if gray.shape[0] < 3 or gray.shape[1] < 3:
+        return 0.0
+
+    lap = (
+        gray[:-2, 1:-1] + gray[2:, 1:-1] + gray[1:-1, :-2] + gray[1:-1, 2:]
+        - 4.0 * gray[1:-1, 1:-1]
+    )
+    return float(lap.var())
+
+
+def _flat_block_ratio(gray: np.ndarray, block_std: float) -> float:
+    """격자 블록 중 단색(표준편차가 기준 미만)인 블록 비율"""
+    rows, cols = _BLOCK_GRID
+    height = gray.shape[0] // rows * rows
+    width = gray.shape[1] // cols * cols
+    if height == 0 or width == 0:
+        return 1.0
+
+    blocks = gray[:height, :width].reshape(rows, height // rows, cols, width // cols)
+    stds = blocks.std(axis=(1, 3))
+    return float((stds < block_std).mean())
+
+
+def analyze_image(path: str, thresholds: Optional[Dict] = None) -> Dict:
+    """
+    이미지 한 장 품질 검사
+
+    Args:
+        path: 이미지 경로
+        thresholds: 검사 기준 (없으면 DEFAULT_THRESHOLDS)
+
+    Returns:
+        {
+            'path': str,
+            'ok': bool,
+            'issues': ['black_frame', 'blank', 'low_entropy', 'blurry', 'missing_tiles', 'unreadable'],
+            'metrics': {'mean', 'std', 'entropy', 'sharpness', 'flat_ratio'}
+        }
+    """
+    limits = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+
+    try:
+        gray = _grayscale(path)
+    except Exception as e:
+        return {'path': str(path), 'ok': False, 'issues': ['unreadable'], 'metrics': {}, 'error': str(e)}
+
+    metrics = {
+        'mean': float(gray.mean()),
+        'std': float(gray.std()),
+        'entropy': _entropy(gray),
+        'sharpness': _sharpness(gray),
+        'flat_ratio': _flat_block_ratio(gray, limits['flat_block_std']),
+    }
+
+    issues = []
+    if metrics['mean'] < limits['dark_mean']:
+        issues.append('black_frame')
+    if metrics['std'] < limits['blank_std']:
+        issues.append('blank')
+    if metrics['entropy'] < limits['min_entropy']:
+        issues.append('low_entropy')
+    if metrics['sharpness'] < limits['min_sharpness']:
+        issues.append('blurry')
+    if metrics['flat_ratio'] > limits['max_flat_ratio']:
+        issues.append('missing_tiles')
+
+    return {
+        'path': str(path),
+        'ok': not issues,
+        'issues': issues,
+        'metrics': {key: round(value, 3) for key, value in metrics.items()},
+    }
+
+
+def describe_issues(report: Dict, thresholds: Optional[Dict] = None) -> str:
+    """
+    불량 판정 사유를 지표 값과 기준으로 표시 (기준 보정용 로그)
+
+    Args:
+        report: analyze_image 결과
+        thresholds: 검사에 쓴 기준 (없으면 DEFAULT_THRESHOLDS)
+
+    Returns:
+        예: "blurry (sharpness 12.4 < 20.0), missing_tiles (flat_ratio 0.42 > 0.35)"
+    """
+    limits = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    parts = []
+    for issue in report['issues']:
+        if issue not in ISSUE_METRICS:
+            parts.append(f"{issue} ({report['error']})" if report.get('error') else issue)
+            continue
+        metric, op, limit_key = ISSUE_METRICS[issue]
+        value = report['metrics'][metric] + 0.0  # -0.0 표시 방지
+        parts.append(f"{issue} ({metric} {value:g} {op} {limits[limit_key]:g})")
+    return ', '.join(parts)
+
+
+def _analyze_task(args):
+    """프로세스 풀 작업 (피클 가능한 최상위 함수)"""
+    path, thresholds = args
+    return analyze_image(path, thresholds)
+
+
+class QualityGate:
+    """
+    평가 전 이미지 품질 검사기
+
+    프로세스 풀은 처음 검사할 때 만들어 공원이 바뀌어도 재사용합니다.
+    """
+
+    def __init__(
+        self,
+        mode: str = 'skip',
+        workers: Optional[int] = None,
+        thresholds: Optional[Dict] = None
+    ):
+        """
+        초기화
+
+        Args:
+            mode: 불량 이미지 처리 방식 (skip: 평가 생략, requeue: _rejected/로 옮겨 다음 캡처에서 다시 촬영)
+            workers: 검사 프로세스 수 (없으면 CPU 수, 1이면 현재 프로세스에서 검사)
+            thresholds: 검사 기준 덮어쓰기
+        """
+        if mode not in GATE_MODES:
+            raise ValueError(f"지원하지 않는 품질 검사 방식입니다: {mode} (가능: {', '.join(GATE_MODES)})")
+
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.stats = {'checked': 0, 'rejected': 0, 'requeued': 0}
+        self._executor = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    def screen(self, paths: Iterable) -> Dict[str, Dict]:
+        """
+        여러 이미지 품질 검사
+
+        Args:
+            paths: 이미지 경로 목록
+
+        Returns:
+            경로(str) → analyze_image 결과
+        """
+        paths = [str(path) for path in paths]
+        if not paths:
+            return {}
+
+        tasks = [(path, self.thresholds) for path in paths]
+
+        if self.workers <= 1 or len(paths) == 1:
+            reports = [_analyze_task(task) for task in tasks]
+        else:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            reports = list(self._executor.map(_analyze_task, tasks, chunksize=chunksize))
+
+        self.stats['checked'] += len(reports)
+        self.stats['rejected'] += sum(1 for report in reports if not report['ok'])
+        return {report['path']: report for report in reports}
+
+    def requeue(self, path: str) -> Path:
+        """
+        불량 이미지를 공원 폴더의 _rejected/로 이동
+
+        적응형 캡처는 이미 있는 방향 파일을 건너뛰므로, 옮겨 두면 다음 캡처 실행에서 다시 촬영됩니다.
+
+        Args:
+            path: 이미지 경로
+
+        Returns:
+            이동된 경로
+        """
+        source = Path(path)
+        target_dir = source.parent / REJECTED_DIR
+        target_dir.mkdir(exist_ok=True)
+        target = target_dir / source.name
+        shutil.move(str(source), str(target))
+        self.stats['requeued'] += 1
+        return target
+
+    def close(self):
+        """프로세스 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+def screen_folders(folders: List[Path], gate: QualityGate) -> List[Dict]:
+    """
+    공원 폴더들의 이미지를 한꺼번에 검사 (단독 점검용)
+
+    Args:
+        folders: 공원 폴더 목록
+        gate: 품질 검사기
+
+    Returns:
+        불량 이미지 검사 결과 목록
+    """
+    paths = [path for folder in folders for path in direction_images(folder)]
+    reports = gate.screen(paths)
+    return [report for report in reports.values() if not report['ok']]
@@ -0,0 +1,393 @@
+"""
+단계별 시간 측정 모듈
+
+브라우저 실행, 페이지 로드, 스크린샷, Gemini API 호출 등 각 단계를
+span(구간)과 counter(누적값)로 기록하여 JSONL 트레이스 파일로 남기고,
+실행이 끝나면 단계별 p50/p95/p99, 처리량, 재시도 횟수, 전송 바이트를 요약합니다.
+
+트레이스 경로는 환경변수 PARK_TRACE_PATH 또는 configure_tracing()으로 지정하며,
+지정하지 않으면 메모리에만 집계합니다. 워커 프로세스는 환경변수를 물려받아
+같은 파일에 한 줄씩 이어 쓰므로, 리포트는 파일 기준으로 만들면 전체 프로세스가 합쳐집니다.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """
+    정렬된 값에서 백분위수 계산 (선형 보간)
+
+    Args:
+        sorted_values: 오름차순 정렬된 값 리스트
+        q: 백분위 (0~100)
+
+    Returns:
+        백분위수 (값이 없으면 0.0)
+    """
+    if not sorted_values:
+        return 0.0
+
+    k = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(k)
+    upper = math.ceil(k)
+
+    if lower == upper:
+        return sorted_values[int(k)]
+
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+class Tracer:
+    """span/counter 기록기"""
+
+    def __init__(self, trace_path: Optional[str] = None):
+        """
+        초기화
+
+        Args:
+            trace_path: JSONL 트레이스 파일 경로 (None이면 파일 기록 안 함)
+        """
+        self._lock = threading.Lock()
+        self._file = None
+        self.trace_path = None
+        self.durations = defaultdict(list)
+        self.counters = defaultdict(float)
+        self.started_at = time.time()
+
+        if trace_path:
+            self.configure(trace_path)
+
+    def configure(self, trace_path: str):
+        """
+        트레이스 파일 지정 (이어쓰기)
+
+        Args:
+            trace_path: JSONL 트레이스 파일 경로
+        """
+        with self._lock:
+            if self._file:
+                self._file.close()
+
+            os.makedirs(os.path.dirname(trace_path) or '.', exist_ok=True)
+            self.trace_path = trace_path
+            self._file = open(trace_path, 'a', encoding='utf-8')
+
+    def _emit(self, event: Dict):
+        """트레이스 파일에 이벤트 한 줄 기록"""
+        if self._file is None:
+            return
+
+        event['ts'] = round(time.time(), 6)
+        event['pid'] = os.getpid()
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """
+        구간 시간 측정
+
+        with tracer.span('page.goto', url=url) as span:
+            ...
+            span['bytes'] = 1234  # 속성 추가 가능
+
+        Args:
+            name: 단계 이름
+            **attrs: 이벤트에 함께 기록할 속성
+
+        Yields:
+            속성 딕셔너리 (블록 안에서 값 추가 가능)
+        """
+        start = time.perf_counter()
+        error = None
+
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+
+            with self._lock:
+                self.durations[name].append(duration)
+
+            event = {'type': 'span', 'name': name, 'duration': round(duration, 6)}
+            if error:
+                event['error'] = error
+            if attrs:
+                event['attrs'] = attrs
+            self._emit(event)
+
+    def count(self, name: str, value: float = 1, **attrs):
+        """
+        누적값 증가
+
+        Args:
+            name: 카운터 이름 (예: 'gemini.retries', 'capture.bytes')
+            value: 증가량
+            **attrs: 이벤트에 함께 기록할 속성
+        """
+        with self._lock:
+            self.counters[name] += value
+
+        event = {'type': 'counter', 'name': name, 'value': value}
+        if attrs:
+            event['attrs'] = attrs
+        self._emit(event)
+
+    def reset(self):
+        """메모리 집계 초기화 (트레이스 파일은 유지)"""
+        with self._lock:
+            self.durations.clear()
+            self.counters.clear()
+            self.started_at = time.time()
+
+    def summary(self) -> Dict:
+        """현재 프로세스에서 집계한 요약"""
+        with self._lock:
+            durations = {name: list(values) for name, values in self.durations.items()}
+            counters = dict(self.counters)
+
+        return build_summary(durations, counters, time.time() - self.started_at)
+
+
+def build_summary(durations: Dict[str, List[float]], counters: Dict[str, float], elapsed: float) -> Dict:
+    """
+    단계별 시간과 카운터로 요약 생성
+
+    Args:
+        durations: 단계 이름 → 소요 시간(초) 리스트
+        counters: 카운터 이름 → 누적값
+        elapsed: 전체 경과 시간 (초)
+
+    Returns:
+        {'elapsed_sec', 'stages': {이름: {count, total, p50, p95, p99, max}}, 'counters', 'throughput_per_hour'}
+    """
+    stages = {}
+    for name, values in sorted(durations.items()):
+        values = sorted(values)
+        stages[name] = {
+            'count': len(values),
+            'total': round(sum(values), 3),
+            'p50': round(percentile(values, 50), 3),
+            'p95': round(percentile(values, 95), 3),
+            'p99': round(percentile(values, 99), 3),
+            'max': round(values[-1], 3),
+        }
+
+    hours = elapsed / 3600 if elapsed > 0 else 0
+    throughput = {
+        name: round(value / hours, 1)
+        for name, value in counters.items()
+        if hours and (name.endswith('.success') or name.endswith('.evaluations'))
+    }
+
+    return {
+        'elapsed_sec': round(elapsed, 1),
+        'stages': stages,
+        'counters': {name: counters[name] for name in sorted(counters)},
+        'throughput_per_hour': throughput,
+    }
+
+
+def load_trace(paths: Iterable[str]) -> Dict:
+    """
+    JSONL 트레이스 파일(들)을 읽어 전체 프로세스 기준 요약 생성
+
+    Args:
+        paths: 트레이스 파일 경로들
+
+    Returns:
+        build_summary() 결과
+    """
+    durations = defaultdict(list)
+    counters = defaultdict(float)
+    first_ts = None
+    last_ts = None
+
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                event = json.loads(line)
+                ts = event.get('ts')
+                if ts is not None:
+                    start_ts = ts - event.get('duration', 0)
+                    first_ts = start_ts if first_ts is None else min(first_ts, start_ts)
+                    last_ts = ts if last_ts is None else max(last_ts, ts)
+
+                if event['type'] == 'span':
+                    durations[event['name']].append(event['duration'])
+                elif event['type'] == 'counter':
+                    counters[event['name']] += event['value']
+
+    elapsed = (last_ts - first_ts) if first_ts is not None else 0.0
+    return build_summary(durations, counters, elapsed)
+
+
+def format_summary(summary: Dict) -> str:
+    """
+    요약을 터미널 출력용 표로 변환
+
+    Args:
+        summary: build_summary() 결과
+
+    Returns:
+        출력 문자열
+    """
+    lines = [
+        f"⏱️  전체 경과: {summary['elapsed_sec']:.1f}초",
+        "",
+        f"{'단계':<24}{'횟수':>7}{'합계(s)':>11}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}",
+        "-" * 78,
+    ]
+
+    for name, stage in summary['stages'].items():
+        lines.append(
+            f"{name:<24}{stage['count']:>7}{stage['total']:>11.2f}"
+            f"{stage['p50']:>9.3f}{stage['p95']:>9.3f}{stage['p99']:>9.3f}{stage['max']:>9.3f}"
+        )
+
+    if summary['counters']:
+        lines.append("")
+        lines.append("카운터:")
+        for name, value in summary['counters'].items():
+            lines.append(f"   {name}: {value:g}")
+
+    if summary['throughput_per_hour']:
+        lines.append("")
+        lines.append("처리량 (시간당):")
+        for name, value in summary['throughput_per_hour'].items():
+            lines.append(f"   {name}: {value:g}")
+
+    counters = summary['counters']
+    if counters.get('capture.requests'):
+        lines.append("")
+        lines.append(
+            f"브라우저 캐시: 요청 {counters['capture.requests']:g}건 중 {counters.get('capture.cache_hits', 0):g}건 적중 "
+            f"({counters.get('capture.cache_hits', 0) / counters['capture.requests']:.1%}), "
+            f"네트워크 전송 {counters.get('capture.network_bytes', 0) / 1024 / 1024:.1f}MB"
+            + (f", 차단 {counters['capture.blocked']:g}건" if counters.get('capture.blocked') else "")
+        )
+
+    lookups = counters.get('network_cache.hits', 0) + counters.get('network_cache.misses', 0)
+    if lookups:
+        lines.append(
+            f"네트워크 응답 저장소: 적중 {counters.get('network_cache.hits', 0):g}/{lookups:g}건 "
+            f"({counters.get('network_cache.hits', 0) / lookups:.1%}), "
+            f"재생 실패 {counters.get('network_cache.replay_miss', 0):g}건"
+        )
+
+    breaker = summary.get('circuit_breaker')
+    if breaker:
+        lines.append("")
+        lines.append(
+            f"서킷 브레이커 [{breaker['name']}]: {breaker['state']}, 차단 {breaker['trips']}회, "
+            f"열림 {breaker['open_seconds']:.1f}초, 대기 {breaker['wait_seconds']:.1f}초"
+        )
+
+    usage = summary.get('usage')
+    if usage and usage['requests']:
+        lines.append(
+            f"토큰 사용량: 요청 {usage['requests']}건, 입력 {usage['prompt_tokens']:,}, 출력 {usage['output_tokens']:,}, "
+            f"사고 {usage['thoughts_tokens']:,}, 캐시 {usage['cached_tokens']:,}, 예상 비용 ${usage['cost_usd']:.4f}"
+        )
+
+    truncation = summary.get('truncation')
+    if truncation and truncation['responses']:
+        lines.append(
+            f"출력 잘림 [{truncation['profile'] or 'default'}]: {truncation['truncated']}/{truncation['responses']}건 "
+            f"({truncation['truncation_rate']:.1%})"
+        )
+
+    image_prep = summary.get('image_prep')
+    if image_prep and image_prep['images']:
+        lines.append(
+            f"요청 이미지 [{image_prep['mode']}]: 이미지당 {image_prep['bytes_per_image'] / 1024:.0f}KB, "
+            f"예상 입력 토큰 {image_prep['tokens_per_image']:,} ({image_prep['parts']}장/{image_prep['images']}건)"
+        )
+
+    consensus = summary.get('consensus')
+    if consensus and consensus['images']:
+        per_stable = consensus['samples_per_stable_score']
+        lines.append(
+            f"합의 평가: 이미지당 {consensus['samples_per_image']:.2f}회 호출 (최대 {consensus['max_samples']}회), "
+            f"합의 항목 {consensus['stable_indicators']}/{consensus['indicators']}, "
+            f"합의 점수당 {per_stable if per_stable is not None else '-'}회"
+        )
+
+    prescreen = summary.get('prescreen')
+    if prescreen:
+        lines.append(
+            f"사전 판별 [{prescreen['method']}]: 통과 {prescreen['passed']}건, "
+            f"생략 {prescreen['rejected']}건, 실패 {prescreen['errors']}건"
+        )
+
+    return "\n".join(lines)
+
+
+# 모듈 전역 트레이서 (환경변수로 파일 경로를 물려받음)
+tracer = Tracer(os.getenv('PARK_TRACE_PATH'))
+
+
+def configure_tracing(trace_path: str):
+    """
+    전역 트레이서의 파일 경로 지정
+
+    환경변수에도 기록하여 이후 생성되는 워커 프로세스가 같은 파일에 기록하도록 합니다.
+
+    Args:
+        trace_path: JSONL 트레이스 파일 경로
+    """
+    os.environ['PARK_TRACE_PATH'] = trace_path
+    tracer.configure(trace_path)
+
+
+def default_trace_path(run_name: str) -> str:
+    """
+    실행별 기본 트레이스 경로 (output/traces/{run_name}_{시각}.jsonl)
+
+    Args:
+        run_name: 실행 이름 (예: 'capture', 'evaluate')
+
+    Returns:
+        트레이스 파일 경로
+    """
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    return os.path.join('output', 'traces', f'{run_name}_{timestamp}.jsonl')
+
+
+def write_run_report(trace_path: str, extra: Dict = None) -> str:
+    """
+    트레이스 파일로 실행 리포트를 만들어 같은 이름의 .summary.json으로 저장
+
+    Args:
+        trace_path: JSONL 트레이스 파일 경로
+        extra: 리포트에 함께 저장할 항목 (예: {'circuit_breaker': {...}})
+
+    Returns:
+        터미널 출력용 리포트 문자열
+    """
+    summary = load_trace([trace_path])
+    if extra:
+        summary.update(extra)
+
+    summary_path = os.path.splitext(trace_path)[0] + '.summary.json'
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    return format_summary(summary) + f"\n\n📄 리포트 저장: {summary_path}"
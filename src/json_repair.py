@@ -0,0 +1,222 @@
+"""
+구조화 응답 JSON 복구 모듈
+
+모델 응답이 약간 깨진 경우(코드 블록, 앞뒤 설명문, 끝의 쉼표, 잘린 문자열/괄호)
+API를 다시 호출하지 않고 로컬에서 복구한 뒤 응답 스키마로 검증합니다.
+필수 항목이 빠져 복구할 수 없을 때만 StructuredOutputError를 발생시켜 재요청하도록 합니다.
+"""
+
+import json
+import re
+from typing import Dict, List, Tuple
+
+
+class StructuredOutputError(ValueError):
+    """스키마에 맞게 복구할 수 없는 응답"""
+
+
+# 객체 안에서 값 없이 끝난 키 ("key" 또는 "key":) - 잘린 응답 끝에서 제거
+_DANGLING_KEY = re.compile(r'(?<=[{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+
+def strip_wrapping(text: str) -> Tuple[str, List[str]]:
+    """
+    코드 블록과 JSON 앞의 설명문 제거
+
+    Args:
+        text: 모델 응답 원문
+
+    Returns:
+        (첫 '{'부터 시작하는 텍스트, 적용한 복구 목록)
+    """
+    repairs = []
+    text = text.strip()
+
+    if text.startswith('```'):
+        text = re.sub(r'^```[a-zA-Z]*\s*', '', text)
+        text = re.sub(r'\s*```\s*$', '', text)
+        repairs.append('fence')
+
+    start = text.find('{')
+    if start > 0:
+        text = text[start:]
+        repairs.append('leading_text')
+
+    return text, repairs
+
+
+def _drop_trailing_comma(out: List[str]):
+    """출력 버퍼 끝의 공백과 쉼표 제거"""
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ',':
+        out.pop()
+
+
+def repair_json(text: str) -> Tuple[str, List[str]]:
+    """
+    끝의 쉼표와 잘린 문자열/괄호 복구
+
+    문자열 안쪽인지 추적하며 한 번 훑어서, 닫는 괄호 앞의 쉼표를 지우고
+    끝에서 열린 문자열, 값 없는 키, 닫히지 않은 괄호를 정리합니다.
+
+    Args:
+        text: '{'로 시작하는 JSON 텍스트
+
+    Returns:
+        (복구된 텍스트, 적용한 복구 목록)
+    """
+    repairs = []
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch in '{[':
+            stack.append(ch)
+        elif ch in '}]':
+            before = len(out)
+            _drop_trailing_comma(out)
+            if len(out) != before and 'trailing_comma' not in repairs:
+                repairs.append('trailing_comma')
+            if stack:
+                stack.pop()
+
+        out.append(ch)
+
+        # 최상위 객체가 닫히면 뒤따르는 텍스트는 무시
+        if not stack and ch in '}]':
+            break
+
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+        repairs.append('truncated_string')
+
+    if stack:
+        repairs.append('unclosed_brackets')
+
+    while stack:
+        opener = stack.pop()
+        repaired = ''.join(out)
+
+        if opener == '{':
+            repaired = _DANGLING_KEY.sub('', repaired)
+
+        out = list(repaired)
+        _drop_trailing_comma(out)
+        out.append('}' if opener == '{' else ']')
+
+    return ''.join(out), repairs
+
+
+_TYPE_CHECKS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+}
+
+
+def salvage(value, schema: Dict, path: str, repairs: List[str]):
+    """
+    스키마로 값 검증, 빠진 자유 텍스트 항목은 빈 문자열로 채움
+
+    Args:
+        value: 검증할 값
+        schema: JSON Schema (object/array/string/number/integer/boolean, enum, required)
+        path: 오류 메시지용 경로
+        repairs: 적용한 복구를 기록할 리스트
+
+    Returns:
+        검증된 값
+
+    Raises:
+        StructuredOutputError: 필수 항목을 복구할 수 없는 경우
+    """
+    expected = schema.get('type')
+    if expected and not _TYPE_CHECKS[expected](value):
+        raise StructuredOutputError(f"{path or '응답'}: {expected} 타입이 아닙니다 ({type(value).__name__})")
+
+    if 'enum' in schema and value not in schema['enum']:
+        raise StructuredOutputError(f"{path}: 허용되지 않은 값 {value!r}")
+
+    if expected == 'array' and 'items' in schema:
+        return [salvage(item, schema['items'], f'{path}[{i}]', repairs) for i, item in enumerate(value)]
+
+    if expected != 'object':
+        return value
+
+    properties = schema.get('properties', {})
+    result = {}
+
+    for key, item in value.items():
+        if key in properties:
+            result[key] = salvage(item, properties[key], f'{path}.{key}'.lstrip('.'), repairs)
+        else:
+            result[key] = item
+
+    for key in schema.get('required', []):
+        if key in result:
+            continue
+
+        prop = properties.get(key, {})
+        if prop.get('type') == 'string' and 'enum' not in prop:
+            # 자유 텍스트(reason, summary)는 비워서 살림
+            result[key] = ''
+            repairs.append(f"filled:{f'{path}.{key}'.lstrip('.')}")
+        else:
+            raise StructuredOutputError(f"{f'{path}.{key}'.lstrip('.')}: 필수 항목이 없습니다")
+
+    return result
+
+
+def decode_structured(text: str, schema: Dict) -> Tuple[Dict, List[str]]:
+    """
+    모델 응답을 스키마에 맞는 딕셔너리로 복구
+
+    Args:
+        text: 모델 응답 원문
+        schema: 응답 JSON Schema
+
+    Returns:
+        (결과 딕셔너리, 적용한 복구 목록 - 원문 그대로 파싱되면 빈 리스트)
+
+    Raises:
+        StructuredOutputError: 로컬 복구가 불가능한 경우 (재요청 필요)
+    """
+    cleaned, repairs = strip_wrapping(text)
+
+    if not cleaned.startswith('{'):
+        raise StructuredOutputError("응답에 JSON 객체가 없습니다")
+
+    try:
+        value, end = json.JSONDecoder().raw_decode(cleaned)
+        if cleaned[end:].strip():
+            repairs.append('trailing_text')
+    except json.JSONDecodeError:
+        repaired, fixes = repair_json(cleaned)
+        repairs.extend(fixes)
+        try:
+            value = json.loads(repaired)
+        except json.JSONDecodeError as e:
+            raise StructuredOutputError(f"JSON 복구 실패: {e}") from e
+
+    value = salvage(value, schema, '', repairs)
+    return value, repairs
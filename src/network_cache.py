@@ -0,0 +1,256 @@
+"""
+카카오 네트워크 응답 기록/재생 모듈
+
+Playwright 라우트 가로채기로 카카오맵 SDK 스크립트, 파노라마 메타데이터, 로드뷰 타일 응답을
+디스크에 저장해 두고 다시 캡처할 때 로컬에서 응답합니다.
+응답 본문은 내용 해시(sha256)로 저장하여 같은 타일이 여러 URL로 와도 한 번만 저장되고,
+요청(메서드 + URL) 색인은 항목마다 파일 하나라 여러 워커 프로세스가 함께 써도 안전합니다.
+
+모드:
+    off     가로채지 않음
+    record  항상 네트워크에서 받아 저장 (기존 항목 갱신)
+    replay  저장된 응답만 사용, 없으면 요청 실패 처리 (완전 오프라인, 재실행 결과 고정)
+    auto    저장된 응답이 있으면 사용, 없으면 받아서 저장
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .instrumentation import tracer
+
+CACHE_MODES = ('off', 'record', 'replay', 'auto')
+
+# 가로챌 호스트 (접미사 일치): SDK, 로드뷰 API, 파노라마 타일 CDN
+DEFAULT_HOSTS = ('kakao.com', 'kakaocdn.net', 'daumcdn.net', 'daum.net')
+
+# 요청마다 바뀌어 색인에서 빼는 쿼리 파라미터 (캐시 무력화용 타임스탬프)
+VOLATILE_PARAMS = ('_', 't', 'ts')
+
+# JSONP 콜백 파라미터 (본문 앞의 콜백 이름을 빼고 저장, 재생 시 새 이름으로 바꿈)
+JSONP_PARAMS = ('callback',)
+
+# 본문을 디코딩해서 저장하므로 다시 보내면 안 되는 헤더
+_DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+def _atomic_write(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 교체 (동시에 쓰는 워커가 있어도 깨지지 않음)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class NetworkCache:
+    """내용 주소 기반 응답 저장소 + Playwright 라우트 핸들러"""
+
+    def __init__(self, root: str, mode: str = 'auto', hosts: Optional[Sequence[str]] = None):
+        """
+        초기화
+
+        Args:
+            root: 저장 폴더 (index/, blobs/ 생성)
+            mode: 'off', 'record', 'replay', 'auto'
+            hosts: 가로챌 호스트 접미사 (기본: DEFAULT_HOSTS)
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 네트워크 캐시 모드입니다: {mode} (가능: {', '.join(CACHE_MODES)})")
+
+        self.root = Path(root)
+        self.mode = mode
+        self.hosts = tuple(hosts or DEFAULT_HOSTS)
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0, 'bytes_served': 0, 'bytes_fetched': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional['NetworkCache']:
+        """환경변수 NETWORK_CACHE(모드), NETWORK_CACHE_DIR, NETWORK_CACHE_HOSTS로 생성 (off면 None)"""
+        mode = os.getenv('NETWORK_CACHE', 'off')
+        if mode == 'off':
+            return None
+
+        hosts = os.getenv('NETWORK_CACHE_HOSTS')
+        return cls(
+            root=os.getenv('NETWORK_CACHE_DIR', 'output/network_cache'),
+            mode=mode,
+            hosts=[host.strip() for host in hosts.split(',') if host.strip()] if hosts else None
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+
+    # ----- 색인 -----
+
+    def should_intercept(self, url: str) -> bool:
+        """가로챌 요청인지 (지정 호스트의 http(s) 요청만)"""
+        parts = urlsplit(url)
+        host = parts.hostname or ''
+        return parts.scheme in ('http', 'https') and any(
+            host == suffix or host.endswith('.' + suffix) for suffix in self.hosts
+        )
+
+    @staticmethod
+    def normalize(url: str) -> tuple:
+        """
+        색인용 URL 정규화
+
+        Returns:
+            (정규화 URL, JSONP 콜백 이름 또는 None)
+        """
+        parts = urlsplit(url)
+        callback = None
+        query = []
+        for key, value in parse_qsl(parts.query, keep_blank_values=True):
+            if key in JSONP_PARAMS:
+                callback = value
+            elif key not in VOLATILE_PARAMS:
+                query.append((key, value))
+
+        # 스킴은 빼고 (//host/path) 쿼리는 정렬
+        normalized = urlunsplit(('', parts.netloc, parts.path, urlencode(sorted(query)), ''))
+        return normalized, callback
+
+    def key(self, method: str, url: str, post_data: Optional[bytes] = None) -> str:
+        """요청 색인 키 (sha256)"""
+        normalized, _ = self.normalize(url)
+        digest = hashlib.sha256(f"{method.upper()} {normalized}".encode('utf-8'))
+        if post_data:
+            digest.update(post_data)
+        return digest.hexdigest()
+
+    def _index_path(self, key: str) -> Path:
+        return self.root / 'index' / key[:2] / f'{key}.json'
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / 'blobs' / digest[:2] / digest
+
+    # ----- 저장/조회 -----
+
+    def lookup(self, key: str) -> Optional[Dict]:
+        """
+        저장된 응답 조회
+
+        Returns:
+            {'status', 'headers', 'body', 'jsonp'} 또는 None
+        """
+        index_path = self._index_path(key)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            body = self._blob_path(entry['blob']).read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+        entry['body'] = body
+        return entry
+
+    def store(self, key: str, url: str, status: int, headers: Dict, body: bytes,
+              callback: Optional[str] = None):
+        """
+        응답 저장 (본문은 내용 해시로 한 번만)
+
+        Args:
+            key: 요청 색인 키
+            url: 원래 URL (확인용으로 함께 기록)
+            status: HTTP 상태 코드
+            headers: 응답 헤더
+            body: 응답 본문 (디코딩된 바이트)
+            callback: JSONP 콜백 이름 (있으면 본문 앞 콜백 이름을 빼고 저장)
+        """
+        jsonp = bool(callback) and body.startswith(callback.encode('utf-8'))
+        if jsonp:
+            body = body[len(callback.encode('utf-8')):]
+
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            _atomic_write(blob_path, body)
+
+        entry = {
+            'url': url,
+            'status': status,
+            'headers': {name: value for name, value in headers.items() if name.lower() not in _DROP_HEADERS},
+            'blob': digest,
+            'jsonp': jsonp,
+        }
+        _atomic_write(self._index_path(key), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+        with self._lock:
+            self.stats['stored'] += 1
+
+    # ----- Playwright -----
+
+    def attach(self, page):
+        """
+        페이지에 라우트 핸들러 연결
+
+        Args:
+            page: Playwright Page 객체
+        """
+        if self.enabled:
+            page.route(self.should_intercept, self._handle)
+
+    def _handle(self, route):
+        """라우트 핸들러: 저장된 응답으로 응답하거나, 받아서 저장"""
+        request = route.request
+        if request.resource_type == 'document':
+            route.continue_()  # 템플릿 페이지 자체는 캡처마다 내용이 달라 저장하지 않음
+            return
+
+        post_data = request.post_data_buffer
+        key = self.key(request.method, request.url, post_data)
+        _, callback = self.normalize(request.url)
+
+        if self.mode in ('replay', 'auto'):
+            entry = self.lookup(key)
+            if entry is not None:
+                body = entry['body']
+                if entry.get('jsonp') and callback:
+                    body = callback.encode('utf-8') + body
+
+                route.fulfill(status=entry['status'], headers=entry['headers'], body=body)
+                self._count('hits', len(body))
+                return
+
+            if self.mode == 'replay':
+                self._count('misses')
+                tracer.count('network_cache.replay_miss')
+                route.abort('internetdisconnected')
+                return
+
+        # record / auto 미스: 실제로 받아서 저장 후 응답
+        self._count('misses')
+        response = route.fetch()
+        body = response.body()
+        with self._lock:
+            self.stats['bytes_fetched'] += len(body)
+
+        if response.status < 400:
+            self.store(key, request.url, response.status, response.headers, body, callback)
+
+        route.fulfill(
+            status=response.status,
+            headers={name: value for name, value in response.headers.items() if name.lower() not in _DROP_HEADERS},
+            body=body
+        )
+
+    def _count(self, name: str, served_bytes: int = 0):
+        with self._lock:
+            self.stats[name] += 1
+            self.stats['bytes_served'] += served_bytes
+        tracer.count(f'network_cache.{name}')
+
+    def report(self) -> Dict:
+        """리포트용 통계 (적중률 포함)"""
+        with self._lock:
+            stats = dict(self.stats, mode=self.mode, root=str(self.root))
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,379 @@
+"""
+격자 셀 → 도로망 노드 보행 거리(OD) 캐시 모듈
+
+가상 공원을 추가/제거하며 접근성을 다시 보는 시나리오 분석(지구단위계획 예정지 중첩 분석)에서
+매번 최단 경로를 새로 구하지 않도록, 분석 격자의 모든 셀에서 거리 상한 안에 있는 도로 노드까지의 거리를
+한 번 계산해 디스크에 저장합니다.
+
+저장 형식은 도착 노드 기준 CSR (노드 → [(셀, 거리)])이고 np.load(mmap_mode='r')로 메모리 매핑하므로
+공원 하나를 추가/제거할 때는 그 공원 입구 노드의 구간만 읽는 희소 조회가 됩니다.
+캐시 폴더는 도로망 해시, 격자 해시, 거리 상한으로 구분되어 도로망이나 격자가 바뀌면 자동으로 다시 만듭니다.
+"""
+
+import hashlib
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from .accessibility import ServiceArea, ServiceAreaAnalyzer, service_distance
+
+# 한 번에 다익스트라를 돌릴 출발 노드 수 (결과 행렬: 배치 × 노드 수 float64)
+_BATCH_NODES = 256
+
+_FILES = ('indptr', 'cells', 'dist')
+
+
+class ODMatrix:
+    """메모리 매핑된 OD 행렬 (도착 노드 기준 CSR)"""
+
+    def __init__(self, path: Path, meta: Dict):
+        self.path = Path(path)
+        self.meta = meta
+        self.threshold = float(meta['threshold'])
+        self.num_cells = int(meta['num_cells'])
+        self.indptr = np.load(self.path / 'indptr.npy', mmap_mode='r')
+        self.cells = np.load(self.path / 'cells.npy', mmap_mode='r')
+        self.dist = np.load(self.path / 'dist.npy', mmap_mode='r')
+
+    @property
+    def nnz(self) -> int:
+        return len(self.cells)
+
+    def lookup(self, nodes, offsets=None, threshold: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        노드 집합에서 각 셀까지 최소 거리
+
+        Args:
+            nodes: 도로 노드 목록 (공원 입구)
+            offsets: 노드별 추가 거리 (공원 경계 ~ 노드, 없으면 0)
+            threshold: 이 거리 이하만 (없으면 캐시 상한)
+
+        Returns:
+            (셀 인덱스 배열, 거리 배열), 셀마다 한 번
+        """
+        offsets = np.zeros(len(nodes)) if offsets is None else np.asarray(offsets, dtype=np.float64)
+        threshold = self.threshold if threshold is None else min(threshold, self.threshold)
+
+        cells, dist = [], []
+        for node, offset in zip(nodes, offsets):
+            start, end = int(self.indptr[node]), int(self.indptr[node + 1])
+            if start == end:
+                continue
+            cells.append(np.asarray(self.cells[start:end]))
+            dist.append(np.asarray(self.dist[start:end], dtype=np.float64) + offset)
+
+        if not cells:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        cells = np.concatenate(cells)
+        dist = np.concatenate(dist)
+        keep = dist <= threshold
+        cells, dist = cells[keep], dist[keep]
+
+        # 셀별 최솟값: (셀, 거리) 정렬 후 셀마다 첫 항목
+        order = np.lexsort((dist, cells))
+        cells, dist = cells[order], dist[order]
+        first = np.ones(len(cells), dtype=bool)
+        first[1:] = cells[1:] != cells[:-1]
+        return cells[first].astype(np.int64), dist[first]
+
+
+class ODCache:
+    """도로망/격자/거리 상한별 OD 행렬 저장소"""
+
+    def __init__(self, root: str = 'output/od_cache'):
+        """
+        초기화
+
+        Args:
+            root: 캐시 폴더
+        """
+        self.root = Path(root)
+
+    @staticmethod
+    def key(analyzer: ServiceAreaAnalyzer, threshold: float) -> str:
+        """캐시 키: 도로망 해시 + 격자 해시 + 거리 상한"""
+        grid = hashlib.sha256(
+            f"{analyzer.x0}:{analyzer.y0}:{analyzer.cols}:{analyzer.rows}:{analyzer.cell_size}:{analyzer.max_snap}".encode()
+        ).hexdigest()[:8]
+        return f"{analyzer.network.fingerprint()}_{grid}_{int(math.ceil(threshold))}m"
+
+    def find(self, analyzer: ServiceAreaAnalyzer, threshold: float) -> Optional[ODMatrix]:
+        """
+        쓸 수 있는 캐시 찾기 (같은 도로망/격자에서 거리 상한이 threshold 이상인 것 중 가장 작은 것)
+
+        Returns:
+            ODMatrix 또는 None
+        """
+        prefix = self.key(analyzer, threshold).rsplit('_', 1)[0]
+        candidates = []
+        for meta_path in self.root.glob(f'{prefix}_*m/meta.json'):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['threshold'] >= threshold:
+                candidates.append((meta['threshold'], meta_path.parent, meta))
+
+        if not candidates:
+            return None
+        _, path, meta = min(candidates, key=lambda candidate: candidate[0])
+        return ODMatrix(path, meta)
+
+    def load_or_build(self, analyzer: ServiceAreaAnalyzer, threshold: float) -> ODMatrix:
+        """
+        캐시가 있으면 불러오고 없으면 계산해서 저장
+
+        Args:
+            analyzer: 도로망 + 분석 격자
+            threshold: 거리 상한 (미터, 시나리오에서 쓸 가장 긴 유치거리 이상)
+
+        Returns:
+            ODMatrix
+        """
+        matrix = self.find(analyzer, threshold)
+        if matrix is not None:
+            print(f"📦 OD 캐시 사용: {matrix.path} ({matrix.nnz:,}쌍, 상한 {matrix.threshold:g}m)")
+            return matrix
+        return self.build(analyzer, threshold)
+
+    def build(self, analyzer: ServiceAreaAnalyzer, threshold: float) -> ODMatrix:
+        """
+        OD 행렬 계산 후 저장
+
+        셀이 연결된 도로 노드에서 거리 상한(- 스냅 거리)까지 다익스트라를 배치로 돌리고,
+        (셀, 노드, 노드 거리 + 스냅 거리)를 노드 기준으로 정렬해 저장합니다.
+
+        Args:
+            analyzer: 도로망 + 분석 격자
+            threshold: 거리 상한 (미터)
+
+        Returns:
+            ODMatrix
+        """
+        started = time.perf_counter()
+        network = analyzer.network
+        graph = csr_matrix((network.weights, network.indices, network.indptr),
+                           shape=(network.num_nodes, network.num_nodes))
+
+        valid_cells = np.flatnonzero(analyzer.valid.ravel())
+        cell_node = analyzer.cell_node.ravel()[valid_cells]
+        cell_snap = analyzer.cell_snap.ravel()[valid_cells]
+
+        # 같은 노드에 붙은 셀은 다익스트라 한 번으로
+        origin_nodes, cell_origin = np.unique(cell_node, return_inverse=True)
+        cells_by_origin = np.argsort(cell_origin, kind='stable')
+        origin_ptr = np.zeros(len(origin_nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cell_origin, minlength=len(origin_nodes)), out=origin_ptr[1:])
+
+        parts_cells, parts_nodes, parts_dist = [], [], []
+        for start in range(0, len(origin_nodes), _BATCH_NODES):
+            batch = origin_nodes[start:start + _BATCH_NODES]
+            rows = dijkstra(graph, directed=False, indices=batch, limit=threshold)
+
+            for offset, row in enumerate(rows):
+                nodes = np.flatnonzero(row <= threshold)
+                node_dist = row[nodes]
+                origin = start + offset
+                for cell_pos in cells_by_origin[origin_ptr[origin]:origin_ptr[origin + 1]]:
+                    dist = node_dist + cell_snap[cell_pos]
+                    keep = dist <= threshold
+                    parts_nodes.append(nodes[keep].astype(np.int32))
+                    parts_dist.append(dist[keep].astype(np.float32))
+                    parts_cells.append(np.full(int(keep.sum()), valid_cells[cell_pos], dtype=np.int32))
+
+        nodes = np.concatenate(parts_nodes) if parts_nodes else np.zeros(0, dtype=np.int32)
+        cells = np.concatenate(parts_cells) if parts_cells else np.zeros(0, dtype=np.int32)
+        dist = np.concatenate(parts_dist) if parts_dist else np.zeros(0, dtype=np.float32)
+
+        order = np.argsort(nodes, kind='stable')
+        indptr = np.zeros(network.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(nodes, minlength=network.num_nodes), out=indptr[1:])
+
+        # 임시 폴더에 쓴 뒤 이름 바꾸기 (중단되어도 깨진 캐시가 남지 않음)
+        path = self.root / self.key(analyzer, threshold)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.mkdir(parents=True, exist_ok=True)
+        np.save(tmp_path / 'indptr.npy', indptr)
+        np.save(tmp_path / 'cells.npy', cells[order])
+        np.save(tmp_path / 'dist.npy', dist[order])
+
+        meta = {
+            'threshold': float(threshold),
+            'num_cells': int(analyzer.rows * analyzer.cols),
+            'valid_cells': int(len(valid_cells)),
+            'nodes': int(network.num_nodes),
+            'pairs': int(len(cells)),
+            'network': network.fingerprint(),
+            'build_sec': round(time.perf_counter() - started, 3),
+        }
+        with open(tmp_path / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        if path.exists():
+            for name in _FILES:
+                (path / f'{name}.npy').unlink(missing_ok=True)
+            (path / 'meta.json').unlink(missing_ok=True)
+            path.rmdir()
+        tmp_path.rename(path)
+
+        size_mb = sum((path / f'{name}.npy').stat().st_size for name in _FILES) / 1024 / 1024
+        print(f"📦 OD 캐시 생성: {path} ({meta['pairs']:,}쌍, {size_mb:.1f}MB, {meta['build_sec']:.1f}초)")
+        return ODMatrix(path, meta)
+
+
+def scenario_key(park: Dict) -> str:
+    """시나리오 공원 키 (관리번호, 없으면 공원명 - CSV에 같은 이름의 공원이 있어도 따로 유지)"""
+    return park.get('id') or park['name']
+
+
+class ScenarioAccessibility:
+    """
+    OD 캐시 기반 증분 서비스 권역 분석
+
+    공원을 추가하면 그 공원 입구 노드의 OD 구간만 읽어 셀별 최솟값을 갱신하고,
+    제거하면 그 공원이 최솟값이던 셀만 남은 공원들의 기여분으로 다시 계산합니다.
+    """
+
+    def __init__(self, analyzer: ServiceAreaAnalyzer, od: ODMatrix, threshold: Optional[float] = None):
+        """
+        초기화
+
+        Args:
+            analyzer: 도로망 + 분석 격자 (OD 캐시를 만든 것과 같아야 함)
+            od: OD 행렬
+            threshold: 모든 공원에 같은 유치거리 적용 (없으면 공원 유형별)
+        """
+        self.analyzer = analyzer
+        self.od = od
+        self.threshold = threshold
+
+        self.parks: Dict[str, Dict] = {}
+        self._contributions: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        self._ids: Dict[str, int] = {}
+
+        size = od.num_cells
+        self.distance = np.full(size, np.inf)   # 가장 가까운 공원까지 거리
+        self.nearest = np.full(size, -1)        # 가장 가까운 공원 번호
+        self.slack = np.full(size, np.inf)      # 거리 - 유치거리 (≤ 0 이면 권역 안)
+        self.provider = np.full(size, -1)       # 유치거리 여유가 가장 큰 공원 번호
+
+    def _apply(self, park_id: int, cells: np.ndarray, dist: np.ndarray, threshold: float):
+        """기여분으로 셀별 최솟값 갱신"""
+        closer = dist < self.distance[cells]
+        self.distance[cells[closer]] = dist[closer]
+        self.nearest[cells[closer]] = park_id
+
+        slack = dist - threshold
+        better = slack < self.slack[cells]
+        self.slack[cells[better]] = slack[better]
+        self.provider[cells[better]] = park_id
+
+    def add_park(self, park: Dict, replace: bool = False) -> float:
+        """
+        공원 추가
+
+        Args:
+            park: 공원 정보 ('name', 'lat', 'lng', 'area', 'type', 선택: 'id')
+            replace: 같은 키(scenario_key)의 공원이 있으면 교체 (아니면 ValueError)
+
+        Returns:
+            소요 시간 (초)
+        """
+        started = time.perf_counter()
+        key = scenario_key(park)
+        if key in self.parks:
+            if not replace:
+                raise ValueError(f"시나리오에 이미 있는 공원입니다: {key} (교체하려면 replace=True 또는 먼저 제거)")
+            self.remove_park(key)
+
+        threshold = service_distance(park, self.threshold)
+        if threshold > self.od.threshold:
+            raise ValueError(f"유치거리 {threshold:g}m가 OD 캐시 상한 {self.od.threshold:g}m보다 깁니다")
+
+        sources, offsets, _ = self.analyzer.park_sources([park], np.array([threshold]))
+        cells, dist = self.od.lookup(sources, offsets)
+
+        park_id = self._ids.setdefault(key, len(self._ids))
+        self.parks[key] = park
+        self._contributions[key] = (cells, dist, threshold)
+        self._apply(park_id, cells, dist, threshold)
+        return time.perf_counter() - started
+
+    def _resolve_key(self, key: str) -> str:
+        """관리번호 또는 공원명을 시나리오 키로 (같은 이름이 여러 개면 관리번호를 요구)"""
+        if key in self.parks:
+            return key
+        matches = [other for other, park in self.parks.items() if park.get('name') == key]
+        if not matches:
+            raise KeyError(f"시나리오에 없는 공원입니다: {key}")
+        if len(matches) > 1:
+            raise ValueError(f"같은 이름의 공원이 여러 개입니다: {key} (관리번호로 지정: {', '.join(matches)})")
+        return matches[0]
+
+    def remove_park(self, key: str) -> float:
+        """
+        공원 제거
+
+        Args:
+            key: 관리번호 또는 공원명 (scenario_key, 이름이 하나뿐이면 공원명도 가능)
+
+        Returns:
+            소요 시간 (초)
+        """
+        started = time.perf_counter()
+        key = self._resolve_key(key)
+
+        park_id = self._ids[key]
+        del self.parks[key]
+        del self._contributions[key]
+
+        affected = np.flatnonzero((self.nearest == park_id) | (self.provider == park_id))
+        self.distance[affected] = np.inf
+        self.nearest[affected] = -1
+        self.slack[affected] = np.inf
+        self.provider[affected] = -1
+
+        if len(affected):
+            mask = np.zeros(self.od.num_cells, dtype=bool)
+            mask[affected] = True
+            for other, (cells, dist, threshold) in self._contributions.items():
+                hit = mask[cells]
+                if hit.any():
+                    self._apply(self._ids[other], cells[hit], dist[hit], threshold)
+
+        return time.perf_counter() - started
+
+    def to_service_area(self) -> ServiceArea:
+        """현재 상태를 ServiceArea로 (격자 저장/요약 재사용, 거리는 OD 캐시 상한까지만)"""
+        shape = self.analyzer.shape
+        keys = list(self.parks)
+        index = {self._ids[key]: position for position, key in enumerate(keys)}
+        remap = np.vectorize(lambda value: index.get(int(value), -1), otypes=[np.int64])
+
+        valid = self.analyzer.valid
+        covered = (self.slack <= 0).reshape(shape) & valid
+        distance = np.where(np.isfinite(self.distance), self.distance, np.nan).reshape(shape)
+        distance[~valid] = np.nan
+        nearest = remap(self.nearest).reshape(shape) if len(self.nearest) else self.nearest.reshape(shape)
+        provider = np.where(covered, remap(self.provider).reshape(shape), -1)
+
+        parks = [self.parks[key] for key in keys]
+        thresholds = np.array([self._contributions[key][2] for key in keys])
+        return ServiceArea(self.analyzer, parks, thresholds, distance, nearest, covered, provider, 0.0)
+
+
+def load_scenario(path: str) -> Dict[str, List]:
+    """
+    시나리오 JSON 불러오기
+
+    형식: {"add": [{"name", "lat", "lng", "area", "type"}], "remove": ["관리번호 또는 공원명"]}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        scenario = json.load(f)
+    return {'add': scenario.get('add', []), 'remove': scenario.get('remove', [])}
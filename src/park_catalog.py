@@ -0,0 +1,507 @@
+"""
+공원 카탈로그 모듈
+
+도시공원정보 CSV를 한 번 읽어 열 단위 배열(좌표는 NumPy)과 이름/관리번호 색인을 만들고,
+개별 공원은 조회할 때 Park(__slots__) 객체로 꺼냅니다.
+공원 타입, 방향 개수, 면적 기본값 같은 파생 값은 모두 여기서 계산하고,
+파싱 결과(열 + 색인)는 CSV 내용 해시를 키로 output/cache/에 pickle로 저장하여 CSV가 그대로면 파싱 없이 불러옵니다.
+"""
+
+import csv
+import hashlib
+import os
+import pickle
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# 기본 공원 정보 CSV
+DEFAULT_PARK_CSV = 'data/인천광역시_미추홀구_도시공원정보_20250105.csv'
+
+# 공원면적이 비어 있을 때 쓰는 면적 (㎡)
+DEFAULT_AREA = 1500.0
+
+# 파싱 결과 캐시 폴더
+DEFAULT_CACHE_DIR = 'output/cache'
+
+# Park 필드나 파생 규칙이 바뀌면 올려서 이전 캐시 무효화
+CACHE_VERSION = 2
+
+# 이름 비교 단계 (엄격 → 느슨): 정규화 이름, 공백/밑줄 제거, 공원 유형 접미사 제거
+NAME_LEVELS = ('exact', 'compact', 'core')
+
+# core 단계에서 떼어 내는 접미사 (긴 것부터)
+NAME_SUFFIXES = ('어린이공원', '근린공원', '체육공원', '문화공원', '역사공원', '수변공원', '묘지공원',
+                 '도시공원', '소공원', '공원')
+
+_COMPACT_PATTERN = re.compile(r'[\s_]+')
+
+
+def parse_park_type(park_classification: str) -> str:
+    """
+    공원구분을 시스템 타입으로 변환
+
+    Args:
+        park_classification: CSV의 공원구분 (예: "어린이공원", "근린공원")
+
+    Returns:
+        시스템 타입 ("어린이공원", "근린공원", "도시공원", "기타")
+    """
+    if "어린이" in park_classification:
+        return "어린이공원"
+    elif "근린" in park_classification:
+        return "근린공원"
+    elif "도시" in park_classification:
+        return "도시공원"
+    elif "소공원" in park_classification:
+        return "소공원"
+    else:
+        return "기타"
+
+
+def get_num_directions(park_type: str, area: float) -> int:
+    """
+    공원 타입과 면적에 따라 적절한 방향 개수 결정
+
+    Args:
+        park_type: 공원 타입
+        area: 공원 면적 (㎡)
+
+    Returns:
+        방향 개수 (4, 6, 8, 12)
+    """
+    if park_type == "근린공원" or park_type == "도시공원":
+        # 큰 공원: 12방향
+        return 12
+    elif area > 5000:
+        # 큰 어린이공원: 8방향
+        return 8
+    elif area > 2000:
+        # 중간 어린이공원: 6방향
+        return 6
+    else:
+        # 작은 공원: 4방향
+        return 4
+
+
+def normalize_name(name: str) -> str:
+    """공원명 정규화 (NFC, 앞뒤 공백 제거)"""
+    return unicodedata.normalize('NFC', (name or '').strip())
+
+
+def name_variants(name: str) -> Tuple[str, str, Optional[str]]:
+    """
+    이름 비교 키 (NAME_LEVELS 순서)
+
+    Args:
+        name: 공원명, 폴더명, 파일명 등
+
+    Returns:
+        (정규화 이름, 공백/밑줄 제거, 유형 접미사 제거 (남는 글자가 없으면 None))
+    """
+    exact = normalize_name(name)
+    compact = _COMPACT_PATTERN.sub('', exact)
+    core = None
+    for suffix in NAME_SUFFIXES:
+        if compact.endswith(suffix):
+            core = compact[:-len(suffix)] or None
+            break
+    return exact, compact, core
+
+
+class Park:
+    """공원 한 곳 (CSV 한 행 + 파생 값)"""
+
+    __slots__ = ('id', 'name', 'classification', 'type', 'lat', 'lng', 'reported_area', 'area',
+                 'num_directions', 'designated')
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        classification: str,
+        lat: float,
+        lng: float,
+        reported_area: Optional[float] = None,
+        designated: str = ''
+    ):
+        """
+        초기화 (타입, 면적, 방향 개수는 자동 계산)
+
+        Args:
+            id: 관리번호 (없으면 빈 문자열)
+            name: 공원명 (정규화 전 그대로)
+            classification: 공원구분
+            lat: 위도
+            lng: 경도
+            reported_area: CSV의 공원면적 (㎡, 비어 있으면 None → DEFAULT_AREA 사용)
+            designated: 지정고시일
+        """
+        self.id = id
+        self.name = name
+        self.classification = classification
+        self.type = parse_park_type(classification)
+        self.lat = lat
+        self.lng = lng
+        self.reported_area = reported_area
+        self.area = reported_area if reported_area is not None else DEFAULT_AREA
+        self.num_directions = get_num_directions(self.type, self.area)
+        self.designated = designated
+
+    def __repr__(self) -> str:
+        return f"Park({self.id!r}, {self.name!r}, {self.type}, {self.area:g}㎡)"
+
+    def to_dict(self) -> Dict:
+        """
+        기존 스크립트가 쓰는 공원 정보 딕셔너리
+
+        Returns:
+            {'id', 'name', 'lat', 'lng', 'type', 'area', 'num_directions', 'classification'}
+        """
+        return {
+            'id': self.id,
+            'name': self.name,
+            'lat': self.lat,
+            'lng': self.lng,
+            'type': self.type,
+            'area': self.area,
+            'num_directions': self.num_directions,
+            'classification': self.classification,
+        }
+
+
+def _read_rows(path: Path) -> List[Dict]:
+    """CSV 행 읽기 (UTF-8, 실패하면 CP949)"""
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return list(csv.DictReader(f))
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='cp949') as f:
+            return list(csv.DictReader(f))
+
+
+def parse_park_csv(path: Union[str, Path]) -> List[Park]:
+    """
+    공원 정보 CSV 파싱 (좌표가 없는 행은 경고 후 제외)
+
+    Args:
+        path: 공원 정보 CSV
+
+    Returns:
+        Park 목록 (CSV 순서)
+    """
+    parks = []
+    for row in _read_rows(Path(path)):
+        try:
+            # 면적 (빈 값 처리)
+            area_str = row['공원면적'].strip()
+            parks.append(Park(
+                id=(row.get('관리번호') or '').strip(),
+                name=row['공원명'].strip(),
+                # 값 종류가 적은 열은 같은 문자열 객체로 (캐시 크기, 불러오기 시간 감소)
+                classification=sys.intern(row['공원구분'].strip()),
+                lat=float(row['위도']),
+                lng=float(row['경도']),
+                reported_area=float(area_str) if area_str else None,
+                designated=sys.intern((row.get('지정고시일') or '').strip()),
+            ))
+        except (ValueError, KeyError, AttributeError) as e:
+            print(f"⚠️  데이터 파싱 오류: {row.get('공원명', 'Unknown')} - {e}")
+    return parks
+
+
+class ParkCatalog:
+    """
+    공원 목록 (열 단위 저장) + 이름/관리번호 색인
+
+    값은 열(리스트, NumPy 배열)로 들고 있고, Park 객체는 get/인덱싱/순회 때만 만듭니다.
+    """
+
+    # 캐시에 저장하는 열
+    COLUMNS = ('ids', 'names', 'classifications', 'types', 'lat', 'lng', 'reported_area', 'area',
+               'num_directions', 'designated')
+
+    def __init__(self, columns: Dict, by_name: Dict[str, int], by_id: Dict[str, int], sources: Sequence[str] = ()):
+        """
+        초기화 (보통 from_parks/from_csv/load 사용)
+
+        Args:
+            columns: COLUMNS 이름 → 값 목록 (reported_area는 빈 값이 NaN)
+            by_name: 정규화한 공원명 → 행 번호 (같은 이름이면 첫 번째)
+            by_id: 관리번호 → 행 번호
+            sources: 원본 CSV 경로
+        """
+        for column in self.COLUMNS:
+            setattr(self, column, columns[column])
+        self.by_name = by_name
+        self.by_id = by_id
+        self.sources = list(sources)
+        self._name_index = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[Park]:
+        return (self[index] for index in range(len(self)))
+
+    def __getitem__(self, index: int) -> Park:
+        reported = float(self.reported_area[index])
+        return Park(self.ids[index], self.names[index], self.classifications[index],
+                    float(self.lat[index]), float(self.lng[index]),
+                    None if np.isnan(reported) else reported, self.designated[index])
+
+    def get(self, name: str) -> Optional[Park]:
+        """공원명으로 찾기 (NFC 정규화, 같은 이름이면 CSV의 첫 번째)"""
+        index = self.by_name.get(normalize_name(name))
+        return self[index] if index is not None else None
+
+    @property
+    def name_index(self) -> 'ParkNameIndex':
+        """이름 찾기 색인 (처음 쓸 때 한 번 만듦)"""
+        if self._name_index is None:
+            self._name_index = ParkNameIndex(self)
+        return self._name_index
+
+    def resolve(self, text: str) -> 'NameMatch':
+        """공원명/관리번호/폴더명으로 찾기 (ParkNameIndex.resolve)"""
+        return self.name_index.resolve(text)
+
+    def folder_name(self, index: int) -> str:
+        """
+        캡처 폴더/평가 JSON 이름
+
+        이름이 CSV에서 하나뿐이면 공원명 그대로 (기존 폴더 유지), 같은 이름이 여러 개면 "관리번호_공원명"으로
+        공원마다 폴더를 나눕니다. 이름 색인은 관리번호 접두어로 원래 공원을 찾습니다.
+
+        Args:
+            index: 카탈로그 행 번호
+
+        Returns:
+            폴더명
+        """
+        name, park_id = self.names[index], self.ids[index]
+        if park_id and normalize_name(name) in self.name_index.collisions['exact']:
+            return f"{park_id}_{name}"
+        return name
+
+    def get_by_id(self, park_id: str) -> Optional[Park]:
+        """관리번호로 찾기"""
+        index = self.by_id.get(park_id.strip())
+        return self[index] if index is not None else None
+
+    def to_dicts(self) -> List[Dict]:
+        """Park.to_dict 목록 (호출마다 새 딕셔너리, 스크립트가 키를 추가해도 카탈로그는 그대로)"""
+        return [
+            {
+                'id': park_id,
+                'name': name,
+                'lat': lat,
+                'lng': lng,
+                'type': park_type,
+                'area': area,
+                'num_directions': num_directions,
+                'classification': classification,
+            }
+            for park_id, name, lat, lng, park_type, area, num_directions, classification in zip(
+                self.ids, self.names, self.lat.tolist(), self.lng.tolist(), self.types,
+                self.area.tolist(), self.num_directions.tolist(), self.classifications
+            )
+        ]
+
+    # ----- 불러오기 -----
+
+    @classmethod
+    def from_parks(cls, parks: Sequence[Park], sources: Sequence[str] = ()) -> 'ParkCatalog':
+        """Park 목록으로 열과 색인 만들기"""
+        columns = {
+            'ids': [park.id for park in parks],
+            'names': [park.name for park in parks],
+            'classifications': [park.classification for park in parks],
+            'types': [park.type for park in parks],
+            'lat': np.array([park.lat for park in parks], dtype=np.float64),
+            'lng': np.array([park.lng for park in parks], dtype=np.float64),
+            'reported_area': np.array([np.nan if park.reported_area is None else park.reported_area
+                                       for park in parks], dtype=np.float64),
+            'area': np.array([park.area for park in parks], dtype=np.float64),
+            'num_directions': np.array([park.num_directions for park in parks], dtype=np.int16),
+            'designated': [park.designated for park in parks],
+        }
+
+        # 같은 이름이 여러 번 나오면 첫 번째 공원 (미추홀공원 등 CSV 중복)
+        by_name, by_id = {}, {}
+        for index, park in enumerate(parks):
+            by_name.setdefault(normalize_name(park.name), index)
+            if park.id:
+                by_id.setdefault(park.id, index)
+        return cls(columns, by_name, by_id, sources)
+
+    @classmethod
+    def from_csv(cls, paths: Union[str, Path, Iterable[Union[str, Path]]]) -> 'ParkCatalog':
+        """CSV 파싱 (캐시 없이, 여러 파일이면 순서대로 이어 붙임)"""
+        paths = _as_paths(paths)
+        parks = [park for path in paths for park in parse_park_csv(path)]
+        return cls.from_parks(parks, [str(path) for path in paths])
+
+    @classmethod
+    def load(
+        cls,
+        paths: Union[str, Path, Iterable[Union[str, Path]]] = DEFAULT_PARK_CSV,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR
+    ) -> 'ParkCatalog':
+        """
+        카탈로그 불러오기 (프로세스 안 메모 → 디스크 캐시 → CSV 파싱 순)
+
+        Args:
+            paths: 공원 정보 CSV (하나 또는 여러 개)
+            cache_dir: 파싱 결과 캐시 폴더 (None이면 디스크 캐시 사용 안 함)
+
+        Returns:
+            ParkCatalog
+        """
+        paths = _as_paths(paths)
+        sources = [str(path) for path in paths]
+
+        # 같은 프로세스에서 파일이 그대로면 다시 읽지 않음
+        stamp = tuple((str(path.resolve()), path.stat().st_size, path.stat().st_mtime_ns) for path in paths)
+        catalog = _MEMO.get(stamp)
+        if catalog is not None:
+            return catalog
+
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        for path in paths:
+            digest.update(path.read_bytes())
+        cache_path = Path(cache_dir) / f'park_catalog_{digest.hexdigest()[:16]}.pkl' if cache_dir else None
+
+        catalog = None
+        if cache_path is not None and cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    payload = pickle.load(f)
+                if payload.get('version') != CACHE_VERSION or set(payload['columns']) != set(cls.COLUMNS):
+                    raise ValueError(f"캐시 형식이 다릅니다: {cache_path}")
+                catalog = cls(payload['columns'], payload['by_name'], payload['by_id'], sources)
+            except Exception as e:
+                # 깨졌거나 다른 버전이 만든 캐시는 무엇이 실패하든 다시 만듦
+                print(f"⚠️  공원 카탈로그 캐시를 다시 만듭니다 ({type(e).__name__}: {e})")
+                catalog = None
+
+        if catalog is None:
+            catalog = cls.from_csv(paths)
+            if cache_path is not None:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+                columns = {column: getattr(catalog, column) for column in cls.COLUMNS}
+                with open(tmp, 'wb') as f:
+                    payload = {'version': CACHE_VERSION, 'columns': columns, 'by_name': catalog.by_name, 'by_id': catalog.by_id}
+                    pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, cache_path)
+
+        _MEMO[stamp] = catalog
+        return catalog
+
+
+class NameMatch(NamedTuple):
+    """이름 찾기 결과"""
+
+    index: Optional[int]            # 카탈로그 행 번호 (못 찾았거나 느슨한 단계에서 여러 개면 None)
+    method: str                     # 'id', NAME_LEVELS 중 하나, 'ambiguous', 'missing'
+    candidates: Tuple[int, ...]     # 같은 키를 가진 행 번호 (2개 이상이면 충돌)
+
+    @property
+    def ambiguous(self) -> bool:
+        return len(self.candidates) > 1
+
+
+class ParkNameIndex:
+    """
+    공원명/관리번호 → 카탈로그 행 번호 색인
+
+    관리번호가 가장 우선이고 (예: "28170-00037", "28170-00037_매소홀어린이공원"), 다음으로 NAME_LEVELS 순서로 찾습니다.
+    같은 키에 공원이 여러 개면 충돌로 기록하며, exact 단계 충돌(CSV에 같은 이름이 여러 번)은 CSV의 첫 번째를 돌려주고
+    compact/core 단계 충돌은 추측하지 않고 'ambiguous'(index None)를 돌려줍니다. 찾은 결과는 입력 문자열별로 기억합니다.
+    """
+
+    def __init__(self, catalog: 'ParkCatalog'):
+        """
+        초기화
+
+        Args:
+            catalog: 공원 카탈로그
+        """
+        self.catalog = catalog
+        self._keys: Dict[str, Dict[str, Tuple[int, ...]]] = {level: {} for level in NAME_LEVELS}
+        for index, name in enumerate(catalog.names):
+            for level, key in zip(NAME_LEVELS, name_variants(name)):
+                if key:
+                    self._keys[level].setdefault(key, ())
+                    self._keys[level][key] += (index,)
+
+        # 단계별 충돌 {키: 행 번호들}
+        self.collisions = {
+            level: {key: indices for key, indices in keys.items() if len(indices) > 1}
+            for level, keys in self._keys.items()
+        }
+        self._memo: Dict[str, NameMatch] = {}
+
+    def resolve(self, text: str) -> NameMatch:
+        """
+        이름/관리번호 찾기
+
+        Args:
+            text: 공원명, 관리번호, 폴더명, 파일명(확장자 제외)
+
+        Returns:
+            NameMatch
+        """
+        match = self._memo.get(text)
+        if match is None:
+            match = self._memo[text] = self._resolve(text)
+        return match
+
+    def _resolve(self, text: str) -> NameMatch:
+        """resolve 본체 (기억 없이)"""
+        by_id = self.catalog.by_id
+        exact = normalize_name(text)
+        for token in (exact, exact.split('_', 1)[0]):
+            if token in by_id:
+                return NameMatch(by_id[token], 'id', (by_id[token],))
+
+        for level, key in zip(NAME_LEVELS, name_variants(exact)):
+            indices = self._keys[level].get(key) if key else None
+            if not indices:
+                continue
+            if len(indices) == 1 or level == 'exact':
+                return NameMatch(indices[0], level, indices)
+            return NameMatch(None, 'ambiguous', indices)
+        return NameMatch(None, 'missing', ())
+
+    def describe(self, match: NameMatch) -> str:
+        """충돌 후보 설명 (로그용, "관리번호 공원명, ...")"""
+        return ', '.join(f"{self.catalog.ids[index] or '-'} {self.catalog.names[index]}" for index in match.candidates)
+
+
+_MEMO: Dict[Tuple, ParkCatalog] = {}
+
+
+def _as_paths(paths) -> List[Path]:
+    """경로 하나 또는 여러 개 → Path 목록"""
+    if isinstance(paths, (str, Path)):
+        return [Path(paths)]
+    return [Path(path) for path in paths]
+
+
+def load_parks_from_csv(csv_path: str = DEFAULT_PARK_CSV) -> List[Dict]:
+    """
+    CSV 파일에서 공원 정보 로드
+
+    Args:
+        csv_path: CSV 파일 경로
+
+    Returns:
+        공원 정보 리스트 (Park.to_dict)
+    """
+    return ParkCatalog.load(csv_path).to_dicts()
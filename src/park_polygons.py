@@ -0,0 +1,353 @@
+"""
+공원 폴리곤 수집 모듈
+
+로컬 OSM 추출본(.osm.pbf), 공공데이터포털 Shapefile, GeoJSON에서 공원 폴리곤을 읽어 CSV 공원과 짝짓고,
+짝지은 결과를 WKB 배열(.npz)로 캐시하여 다음 실행부터는 원본을 다시 읽지 않습니다.
+
+짝짓기: 공원 좌표 주변 폴리곤을 STRtree로 찾은 뒤 이름 일치 > 좌표 포함 > 가까운 거리(면적 비율이 비슷한 것만) 순으로
+점수를 매기고, 점수가 좋은 쌍부터 한 폴리곤이 한 공원에만 배정되도록 고릅니다.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import shapely
+from shapely.geometry import mapping, shape
+
+from .accessibility import LocalProjection
+from .green_space import geodesic_area_m2
+from .park_catalog import normalize_name
+
+# 공원으로 볼 OSM 태그
+OSM_PARK_TAGS = {
+    'leisure': {'park', 'garden', 'playground', 'nature_reserve'},
+    'landuse': {'recreation_ground', 'village_green'},
+}
+
+# 이름 속성 후보 (OSM, 공공데이터포털 도시공원 Shapefile)
+NAME_FIELDS = ('name:ko', 'name', '공원명', 'PARK_NM', 'PRK_NM', 'PARK_NAM', 'DGM_NM')
+
+# 공원 좌표와 폴리곤 사이 최대 거리 (미터)
+DEFAULT_MATCH_DISTANCE = 100.0
+
+# 이름이 다를 때 허용하는 면적 비율 (폴리곤 / CSV)
+AREA_RATIO_LIMITS = (0.25, 4.0)
+
+# 짝짓기 근거 (점수 순)
+MATCH_METHODS = ('name', 'contains', 'nearest')
+
+
+def name_key(name: str) -> str:
+    """이름 비교용 키 (NFC, 공백 제거)"""
+    return normalize_name(name).replace(' ', '')
+
+
+def source_fingerprint(path: str) -> str:
+    """원본 파일 버전 (경로, 크기, 수정 시각, Shapefile은 같은 이름의 부속 파일 포함)"""
+    path = Path(path)
+    files = sorted(path.parent.glob(path.stem + '.*')) if path.suffix.lower() == '.shp' else [path]
+    digest = hashlib.sha256()
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def parks_fingerprint(parks: List[Dict]) -> str:
+    """공원 목록 버전 (이름, 좌표, 면적)"""
+    digest = hashlib.sha256()
+    for park in parks:
+        digest.update(f"{park['name']}|{park['lat']:.7f}|{park['lng']:.7f}|{park.get('area') or 0:.1f}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+# ----- 원본 읽기 -----
+
+def _load_osm(path: str) -> Tuple[List, List[str]]:
+    """OSM PBF에서 공원 면(way, multipolygon relation) 읽기"""
+    try:
+        import osmium
+    except ImportError as e:
+        raise ImportError("OSM PBF를 읽으려면 osmium 패키지가 필요합니다: pip install osmium") from e
+
+    factory = osmium.geom.WKBFactory()
+    wkbs, names = [], []
+
+    class _AreaHandler(osmium.SimpleHandler):
+        def area(self, area):
+            if not any(area.tags.get(key) in values for key, values in OSM_PARK_TAGS.items()):
+                return
+            try:
+                wkbs.append(bytes.fromhex(factory.create_multipolygon(area)))
+            except RuntimeError:
+                return  # 닫히지 않은 링 등 조립 실패
+            names.append(area.tags.get('name:ko') or area.tags.get('name') or '')
+
+    _AreaHandler().apply_file(str(path), locations=True)
+    return list(shapely.from_wkb(wkbs)), names
+
+
+def _load_geojson(path: str) -> Tuple[List, List[str]]:
+    """GeoJSON 폴리곤 읽기 (WGS84)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        features = json.load(f)['features']
+    geometries, names = [], []
+    for feature in features:
+        properties = feature.get('properties') or {}
+        geometries.append(shape(feature['geometry']))
+        names.append(next((str(properties[field]) for field in NAME_FIELDS if properties.get(field)), ''))
+    return geometries, names
+
+
+def _load_geopandas(path: str) -> Tuple[List, List[str]]:
+    """Shapefile/GeoPackage 읽기 (좌표계를 WGS84로 변환)"""
+    try:
+        import geopandas
+    except ImportError as e:
+        raise ImportError("Shapefile을 읽으려면 geopandas 패키지가 필요합니다: pip install geopandas") from e
+
+    frame = geopandas.read_file(path)
+    if frame.crs is not None:
+        frame = frame.to_crs(epsg=4326)
+    field = next((field for field in NAME_FIELDS if field in frame.columns), None)
+    names = frame[field].fillna('').astype(str).tolist() if field else [''] * len(frame)
+    return list(frame.geometry.values), names
+
+
+def load_polygon_source(path: str) -> Tuple[np.ndarray, List[str]]:
+    """
+    공원 폴리곤 원본 읽기 (.pbf: OSM, .geojson/.json: GeoJSON, 그 외: geopandas)
+
+    Args:
+        path: 원본 파일
+
+    Returns:
+        (폴리곤 배열 (경도, 위도), 이름 목록), 면이 아닌 도형은 제외
+    """
+    suffix = str(path).lower()
+    if suffix.endswith(('.pbf', '.osm')):
+        geometries, names = _load_osm(path)
+    elif suffix.endswith(('.geojson', '.json')):
+        geometries, names = _load_geojson(path)
+    else:
+        geometries, names = _load_geopandas(path)
+
+    geometries = np.array(geometries, dtype=object)
+    keep = np.array([geometry is not None and geometry.geom_type in ('Polygon', 'MultiPolygon')
+                     for geometry in geometries], dtype=bool)
+    geometries = shapely.make_valid(geometries[keep]) if keep.any() else geometries[keep]
+    return geometries, [name for name, kept in zip(names, keep) if kept]
+
+
+# ----- 짝짓기 -----
+
+def match_parks(
+    parks: List[Dict],
+    geometries: np.ndarray,
+    names: List[str],
+    max_distance: float = DEFAULT_MATCH_DISTANCE
+) -> List[Optional[Tuple[int, str, float]]]:
+    """
+    CSV 공원과 폴리곤 짝짓기
+
+    Args:
+        parks: 공원 정보 목록 ('name', 'lat', 'lng', 'area')
+        geometries: 폴리곤 배열 (경도, 위도)
+        names: 폴리곤 이름
+        max_distance: 공원 좌표와 폴리곤 사이 최대 거리 (미터)
+
+    Returns:
+        공원별 (폴리곤 인덱스, 근거, 거리) 또는 None
+    """
+    if not parks or len(geometries) == 0:
+        return [None] * len(parks)
+
+    lat = np.array([park['lat'] for park in parks])
+    lng = np.array([park['lng'] for park in parks])
+    projection = LocalProjection(float(lat.mean()), float(lng.mean()))
+
+    def to_xy(coords):
+        x, y = projection.to_xy(coords[:, 1], coords[:, 0])
+        return np.column_stack([x, y])
+
+    projected = shapely.transform(geometries, to_xy)
+    points = shapely.points(np.column_stack(projection.to_xy(lat, lng)))
+    tree = shapely.STRtree(projected)
+    park_index, polygon_index = tree.query(points, predicate='dwithin', distance=max_distance)
+
+    distance = shapely.distance(points[park_index], projected[polygon_index])
+    polygon_area = shapely.area(projected)
+    park_keys = [name_key(park['name']) for park in parks]
+    polygon_keys = [name_key(name) for name in names]
+
+    candidates = []
+    for park, polygon, dist in zip(park_index, polygon_index, distance):
+        park_key, polygon_key = park_keys[park], polygon_keys[polygon]
+        if polygon_key and (park_key == polygon_key or park_key in polygon_key or polygon_key in park_key):
+            method = 'name'
+        else:
+            area = parks[park].get('area') or 0.0
+            ratio = polygon_area[polygon] / area if area > 0 else 1.0
+            if not AREA_RATIO_LIMITS[0] <= ratio <= AREA_RATIO_LIMITS[1]:
+                continue
+            method = 'contains' if dist == 0 else 'nearest'
+        candidates.append((MATCH_METHODS.index(method), float(dist), int(park), int(polygon), method))
+
+    # 점수가 좋은 쌍부터 한 폴리곤 = 한 공원
+    matches = [None] * len(parks)
+    used = set()
+    for _, dist, park, polygon, method in sorted(candidates):
+        if matches[park] is None and polygon not in used:
+            matches[park] = (polygon, method, dist)
+            used.add(polygon)
+    return matches
+
+
+# ----- 캐시 -----
+
+class ParkPolygons:
+    """CSV 공원 순서대로 짝지은 폴리곤 (없으면 None)"""
+
+    def __init__(self, names: List[str], geometries: np.ndarray, methods: List[str], source: str = ''):
+        """
+        초기화
+
+        Args:
+            names: 공원 이름 (CSV 순서)
+            geometries: 폴리곤 (경도, 위도), 짝이 없으면 None
+            methods: 짝짓기 근거 ('name', 'contains', 'nearest', '')
+            source: 원본 파일
+        """
+        self.names = list(names)
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.methods = list(methods)
+        self.source = source
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def matched(self) -> int:
+        return sum(geometry is not None for geometry in self.geometries)
+
+    def summary(self) -> Dict[str, int]:
+        """근거별 짝지은 공원 수"""
+        counts = {method: self.methods.count(method) for method in MATCH_METHODS}
+        counts['unmatched'] = len(self) - self.matched
+        return counts
+
+    def attach(self, parks: List[Dict], key: str = 'polygon') -> int:
+        """
+        공원 정보에 폴리곤 추가 (CSV 순서와 이름이 모두 같을 때)
+
+        Args:
+            parks: load_parks_from_csv 결과 (정렬/필터 전)
+            key: 폴리곤을 넣을 키 (ParkSampler: 'polygon', green_space: 'geometry')
+
+        Returns:
+            폴리곤을 붙인 공원 수
+        """
+        if [park['name'] for park in parks] != self.names:
+            raise ValueError("폴리곤 캐시와 공원 목록 순서가 다릅니다 (정렬/필터 전 목록을 넘기세요)")
+        for park, geometry in zip(parks, self.geometries):
+            if geometry is not None:
+                park[key] = geometry
+        return self.matched
+
+    def save(self, path: str):
+        """WKB 배열로 저장 (allow_pickle 없이 읽을 수 있는 .npz)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        wkbs = [shapely.to_wkb(geometry) if geometry is not None else b'' for geometry in self.geometries]
+        offsets = np.zeros(len(wkbs) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(wkb) for wkb in wkbs])
+
+        tmp = path.with_name(path.stem + '.tmp.npz')
+        np.savez(
+            tmp,
+            names=np.array(self.names, dtype=str),
+            methods=np.array(self.methods, dtype=str),
+            offsets=offsets,
+            wkb=np.frombuffer(b''.join(wkbs), dtype=np.uint8),
+            source=np.array(self.source),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'ParkPolygons':
+        """save로 저장한 .npz 불러오기"""
+        with np.load(path, allow_pickle=False) as data:
+            offsets = data['offsets']
+            buffer = data['wkb'].tobytes()
+            geometries = [
+                shapely.from_wkb(buffer[start:end]) if end > start else None
+                for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+            return cls(data['names'].tolist(), np.array(geometries, dtype=object),
+                       data['methods'].tolist(), str(data['source']))
+
+    def to_geojson(self, path: str, parks: List[Dict]):
+        """짝지은 폴리곤을 GeoJSON으로 저장 (QGIS 확인용)"""
+        features = []
+        matched = [(park, geometry, method) for park, geometry, method
+                   in zip(parks, self.geometries, self.methods) if geometry is not None]
+        areas = geodesic_area_m2(np.array([geometry for _, geometry, _ in matched], dtype=object)) \
+            if matched else []
+        for (park, geometry, method), area in zip(matched, areas):
+            features.append({
+                'type': 'Feature',
+                'properties': {
+                    'name': park['name'],
+                    'match': method,
+                    'csv_area': park.get('area'),
+                    'polygon_area': round(float(area), 1),
+                },
+                'geometry': mapping(geometry),
+            })
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
+
+
+def load_park_polygons(
+    parks: List[Dict],
+    source: str,
+    cache_dir: str = 'output/park_polygons',
+    max_distance: float = DEFAULT_MATCH_DISTANCE,
+    rebuild: bool = False
+) -> ParkPolygons:
+    """
+    공원 폴리곤 불러오기 (캐시가 있으면 원본을 읽지 않음)
+
+    캐시 키는 원본 파일 버전 + 공원 목록 + 최대 거리이므로, 원본이나 CSV가 바뀌면 새로 짝짓습니다.
+
+    Args:
+        parks: load_parks_from_csv 결과 (정렬/필터 전)
+        source: 원본 파일 (.osm.pbf, .shp, .geojson 등)
+        cache_dir: 캐시 폴더
+        max_distance: 공원 좌표와 폴리곤 사이 최대 거리 (미터)
+        rebuild: 캐시가 있어도 새로 만들기
+
+    Returns:
+        ParkPolygons
+    """
+    key = f"{source_fingerprint(source)}_{parks_fingerprint(parks)}_{int(max_distance)}m"
+    path = Path(cache_dir) / f'park_polygons_{key}.npz'
+    if path.exists() and not rebuild:
+        return ParkPolygons.load(path)
+
+    geometries, names = load_polygon_source(source)
+    matches = match_parks(parks, geometries, names, max_distance=max_distance)
+    result = ParkPolygons(
+        [park['name'] for park in parks],
+        np.array([geometries[match[0]] if match else None for match in matches], dtype=object),
+        [match[1] if match else '' for match in matches],
+        source=str(source),
+    )
+    result.save(path)
+    print(f"📦 공원 폴리곤 캐시 생성: {path} (원본 폴리곤 {len(geometries):,}개)")
+    return result
@@ -1,12 +1,15 @@
 """
 공원 샘플링 전략 모듈
 
-폴리곤 데이터 없이 공원을 다양한 각도에서 캡처하기 위한 샘플링 포인트 생성
+공원을 다양한 각도에서 캡처하기 위한 샘플링 포인트 생성
+폴리곤이 있으면 공원 경계를 따라, 없으면 면적으로 추정한 원을 따라 포인트를 둡니다.
 """
 
 import math
 from typing import List, Dict, Literal
 
+import shapely
+
 
 class ParkSampler:
     """공원 샘플링 포인트 생성기"""
@@ -70,11 +73,15 @@ class ParkSampler:
         radius_meters: int = None,
         num_directions: int = 4,
         park_type: str = '기타',
-        area_sqm: float = None
+        area_sqm: float = None,
+        polygon=None
     ) -> List[Dict]:
         """
         공원 중심에서 원형 패턴으로 샘플링 포인트 생성
 
+        polygon이 있으면 방향마다 중심에서 뻗은 선이 공원 경계와 만나는 점에 포인트를 두고,
+        radius_meters가 면적 기반 반경보다 크면 (적응형 재시도) 그 차이만큼 경계 밖으로 옮깁니다.
+
         Args:
             park_name: 공원 이름
             center_lat: 공원 중심 위도
@@ -83,6 +90,7 @@ class ParkSampler:
             num_directions: 방향 개수 (4, 8, 12, 16)
             park_type: 공원 타입 ('어린이공원', '근린공원', '도시공원', '기타')
             area_sqm: 공원 면적 (제곱미터), 제공 시 면적 기반 반경 자동 계산
+            polygon: 공원 폴리곤 (shapely, 경도/위도), 제공 시 target은 폴리곤 중심
 
         Returns:
             샘플 포인트 리스트
@@ -112,16 +120,31 @@ class ParkSampler:
 
         # 방향 이름 매핑
         direction_names = self._get_direction_names(num_directions)
+        angles = [(360 / num_directions) * i for i in range(num_directions)]  # 0도 = 북쪽
+
+        # 방향별 중심 ~ 포인트 거리
+        distances = [radius_meters] * num_directions
+        if polygon is not None:
+            if area_sqm is not None:
+                base_radius = self.calculate_radius_from_area(area_sqm, park_type)
+            else:
+                base_radius = self.DEFAULT_RADIUS.get(park_type, 50)
+            center_lat, center_lng, boundary = self._polygon_boundary_distances(polygon, angles)
+            outward = max(0, radius_meters - base_radius)
+            distances = [
+                distance + outward if distance is not None else radius_meters
+                for distance in boundary
+            ]
+            lng_per_meter = 1 / (111320 * math.cos(math.radians(center_lat)))
 
         # 샘플 포인트 생성
         points = []
-        for i in range(num_directions):
-            angle = (360 / num_directions) * i  # 0도 = 북쪽
+        for i, (angle, distance) in enumerate(zip(angles, distances)):
             angle_rad = math.radians(angle)
 
             # 극좌표 → 직교좌표 변환
-            lat_offset = radius_meters * math.cos(angle_rad)
-            lng_offset = radius_meters * math.sin(angle_rad)
+            lat_offset = distance * math.cos(angle_rad)
+            lng_offset = distance * math.sin(angle_rad)
 
             # 최종 좌표
             sample_lat = center_lat + (lat_offset * lat_per_meter)
@@ -139,6 +162,40 @@ class ParkSampler:
 
         return points
 
+    @staticmethod
+    def _polygon_boundary_distances(polygon, angles: List[float]):
+        """
+        폴리곤 중심에서 방향별로 가장 바깥 경계까지 거리
+
+        Args:
+            polygon: 공원 폴리곤 (shapely, 경도/위도)
+            angles: 방향 각도 (0도 = 북쪽, 시계 방향)
+
+        Returns:
+            (중심 위도, 중심 경도, 방향별 거리 (미터, 경계를 못 찾으면 None))
+        """
+        center = polygon.centroid
+        if not polygon.contains(center):
+            center = polygon.point_on_surface()
+        center_lat, center_lng = center.y, center.x
+
+        # 중심 기준 미터 좌표로 변환
+        kx = 111320 * math.cos(math.radians(center_lat))
+        ky = 111320
+        local = shapely.transform(polygon, lambda coords: (coords - [center_lng, center_lat]) * [kx, ky])
+        boundary = local.boundary
+        min_x, min_y, max_x, max_y = local.bounds
+        reach = math.hypot(max(abs(min_x), abs(max_x)), max(abs(min_y), abs(max_y))) + 1.0
+
+        distances = []
+        for angle in angles:
+            angle_rad = math.radians(angle)
+            ray = shapely.LineString([(0, 0), (reach * math.sin(angle_rad), reach * math.cos(angle_rad))])
+            hits = shapely.get_coordinates(ray.intersection(boundary))
+            distances.append(float(max(math.hypot(x, y) for x, y in hits)) if len(hits) else None)
+
+        return center_lat, center_lng, distances
+
     def generate_multi_ring_points(
         self,
         park_name: str,
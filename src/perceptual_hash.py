@@ -0,0 +1,274 @@
+"""
+지각 해시 기반 중복 이미지 탐지 모듈
+
+인접한 샘플 포인트에서 찍힌 거의 같은 로드뷰 화면을 찾아, 클러스터마다 대표 이미지 하나만 평가하고
+나머지는 대표 결과를 복사하도록 합니다.
+해시(dHash/pHash)는 축소 이미지를 한 배열로 쌓아 NumPy로 한꺼번에 계산하고,
+해밍 거리 검색은 BK-트리로 합니다.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+HASH_METHODS = ('dhash', 'phash')
+
+# 64비트 해시 기준 기본 허용 해밍 거리 (0~64, 작을수록 엄격)
+DEFAULT_THRESHOLD = 6
+
+_BIT_WEIGHTS = (np.uint64(1) << np.arange(64, dtype=np.uint64))
+
+
+def _load_gray(path: str, size: Tuple[int, int]) -> np.ndarray:
+    """해시 계산용 축소 흑백 배열"""
+    with Image.open(path) as img:
+        img.draft('L', (size[0] * 8, size[1] * 8))  # JPEG는 디코딩 단계에서 축소
+        small = img.convert('L').resize(size, Image.BILINEAR)
+        return np.asarray(small, dtype=np.float32)
+
+
+def _load_batch(paths: List[str], size: Tuple[int, int], workers: Optional[int] = None) -> np.ndarray:
+    """여러 이미지를 (N, H, W) 배열로 로드 (JPEG 디코딩은 GIL을 풀어 스레드로 병렬 처리)"""
+    if not paths:
+        return np.zeros((0, size[1], size[0]), dtype=np.float32)
+
+    with ThreadPoolExecutor(max_workers=workers or min(8, (os.cpu_count() or 1) * 2)) as executor:
+        return np.stack(list(executor.map(lambda path: _load_gray(path, size), paths)))
+
+
+def _pack_bits(bits: np.ndarray) -> np.ndarray:
+    """(N, 64) 불리언 → (N,) uint64"""
+    return (bits.reshape(len(bits), 64).astype(np.uint64) * _BIT_WEIGHTS).sum(axis=1, dtype=np.uint64)
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    """DCT-II 직교 행렬"""
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix
+
+
+def dhash_batch(paths: List[str], workers: Optional[int] = None) -> np.ndarray:
+    """
+    차분 해시 (가로 인접 픽셀 밝기 비교, 9x8 축소)
+
+    Args:
+        paths: 이미지 경로 목록
+        workers: 이미지 로드 스레드 수
+
+    Returns:
+        (N,) uint64 해시 배열
+    """
+    gray = _load_batch(paths, (9, 8), workers)
+    if len(gray) == 0:
+        return np.zeros(0, dtype=np.uint64)
+    return _pack_bits(gray[:, :, 1:] > gray[:, :, :-1])
+
+
+def phash_batch(paths: List[str], workers: Optional[int] = None) -> np.ndarray:
+    """
+    DCT 해시 (32x32 축소 → 2차원 DCT → 저주파 8x8 계수를 중앙값과 비교)
+
+    Args:
+        paths: 이미지 경로 목록
+        workers: 이미지 로드 스레드 수
+
+    Returns:
+        (N,) uint64 해시 배열
+    """
+    gray = _load_batch(paths, (32, 32), workers)
+    if len(gray) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    dct = _dct_matrix(32)
+    coeffs = np.einsum('ij,njk,lk->nil', dct, gray, dct)[:, :8, :8].reshape(len(gray), 64)
+    # 직류 성분(0번)은 밝기 평균이라 중앙값 계산에서 제외
+    median = np.median(coeffs[:, 1:], axis=1, keepdims=True)
+    return _pack_bits(coeffs > median)
+
+
+def compute_hashes(paths: List[str], method: str = 'dhash', workers: Optional[int] = None) -> np.ndarray:
+    """
+    지각 해시 일괄 계산
+
+    Args:
+        paths: 이미지 경로 목록
+        method: 'dhash' 또는 'phash'
+        workers: 이미지 로드 스레드 수
+
+    Returns:
+        (N,) uint64 해시 배열
+    """
+    if method not in HASH_METHODS:
+        raise ValueError(f"지원하지 않는 해시 방식입니다: {method} (가능: {', '.join(HASH_METHODS)})")
+
+    paths = [str(path) for path in paths]
+    return dhash_batch(paths, workers) if method == 'dhash' else phash_batch(paths, workers)
+
+
+def hamming(a: int, b: int) -> int:
+    """두 64비트 해시의 해밍 거리"""
+    return bin(int(a) ^ int(b)).count('1')
+
+
+class BKTree:
+    """해밍 거리 BK-트리 (삼각 부등식으로 탐색 가지를 줄임)"""
+
+    def __init__(self):
+        self.root = None  # (해시, 항목, {거리: 자식 노드})
+        self.size = 0
+
+    def add(self, hash_value: int, item):
+        """
+        해시 추가
+
+        Args:
+            hash_value: 64비트 해시
+            item: 함께 저장할 값
+        """
+        node = (int(hash_value), item, {})
+        self.size += 1
+
+        if self.root is None:
+            self.root = node
+            return
+
+        current = self.root
+        while True:
+            distance = hamming(hash_value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, hash_value: int, radius: int) -> List[Tuple[int, object]]:
+        """
+        반경 이내 항목 검색
+
+        Args:
+            hash_value: 찾을 해시
+            radius: 허용 해밍 거리
+
+        Returns:
+            [(거리, 항목)] (가까운 순)
+        """
+        if self.root is None:
+            return []
+
+        found = []
+        stack = [self.root]
+        while stack:
+            node_hash, item, children = stack.pop()
+            distance = hamming(hash_value, node_hash)
+            if distance <= radius:
+                found.append((distance, item))
+
+            for child_distance, child in children.items():
+                if distance - radius <= child_distance <= distance + radius:
+                    stack.append(child)
+
+        return sorted(found, key=lambda pair: pair[0])
+
+
+class DuplicateIndex:
+    """
+    거의 같은 이미지 클러스터 (대표 이미지 + 구성원)
+
+    입력 순서대로 보며, 이미 있는 대표와 허용 거리 이내면 그 클러스터에 넣고 아니면 새 대표가 됩니다.
+    대표끼리만 비교하므로 비슷한 이미지가 꼬리를 물고 이어져 클러스터가 번지지 않습니다.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, method: str = 'dhash', scope: str = 'park'):
+        """
+        초기화
+
+        Args:
+            threshold: 같은 클러스터로 볼 최대 해밍 거리
+            method: 해시 방식 ('dhash', 'phash')
+            scope: 'park'면 같은 공원 폴더 안에서만, 'all'이면 인접 공원끼리도 묶음
+        """
+        if scope not in ('park', 'all'):
+            raise ValueError(f"지원하지 않는 범위입니다: {scope} (가능: park, all)")
+
+        self.threshold = threshold
+        self.method = method
+        self.scope = scope
+        self.hashes: Dict[str, int] = {}
+        self.representative_of: Dict[str, str] = {}
+        self.clusters: Dict[str, List[str]] = {}
+
+    def build(self, paths: Iterable, workers: Optional[int] = None) -> 'DuplicateIndex':
+        """
+        이미지 목록으로 클러스터 구성
+
+        Args:
+            paths: 이미지 경로 목록 (앞쪽 이미지가 대표가 됨, 평가 순서와 맞출 것)
+            workers: 이미지 로드 스레드 수
+
+        Returns:
+            self
+        """
+        paths = [str(path) for path in paths]
+        hashes = compute_hashes(paths, self.method, workers)
+        trees: Dict[str, BKTree] = {}
+
+        for path, hash_value in zip(paths, hashes):
+            hash_value = int(hash_value)
+            self.hashes[path] = hash_value
+
+            key = str(Path(path).parent) if self.scope == 'park' else ''
+            tree = trees.setdefault(key, BKTree())
+            matches = tree.search(hash_value, self.threshold)
+
+            if matches:
+                representative = matches[0][1]
+                self.representative_of[path] = representative
+                self.clusters[representative].append(path)
+            else:
+                tree.add(hash_value, path)
+                self.representative_of[path] = path
+                self.clusters[path] = [path]
+
+        return self
+
+    def representative(self, path) -> Optional[str]:
+        """
+        대표 이미지 경로
+
+        Args:
+            path: 이미지 경로
+
+        Returns:
+            다른 이미지의 중복이면 대표 경로, 대표 자신이거나 색인에 없으면 None
+        """
+        representative = self.representative_of.get(str(path))
+        return representative if representative and representative != str(path) else None
+
+    def distance(self, a, b) -> int:
+        """색인된 두 이미지의 해밍 거리"""
+        return hamming(self.hashes[str(a)], self.hashes[str(b)])
+
+    @property
+    def stats(self) -> Dict:
+        """리포트용 통계"""
+        duplicates = sum(len(members) - 1 for members in self.clusters.values())
+        cross_park = sum(
+            1 for path, representative in self.representative_of.items()
+            if representative != path and Path(representative).parent != Path(path).parent
+        )
+        return {
+            'images': len(self.representative_of),
+            'clusters': len(self.clusters),
+            'duplicates': duplicates,
+            'cross_park_duplicates': cross_park,
+            'threshold': self.threshold,
+            'method': self.method,
+            'scope': self.scope,
+        }
@@ -0,0 +1,349 @@
+"""
+재시도 정책 및 서킷 브레이커 모듈
+
+Gemini SDK 예외를 타입/상태 코드로 분류하고, 서버가 알려준 재시도 시점(Retry-After, RetryInfo)을
+우선 따르며, 그 외에는 decorrelated jitter 백오프로 대기합니다.
+서킷 브레이커는 같은 프로세스의 모든 평가자/스레드가 공유하여, 503 폭주 시
+이미지마다 따로 장애를 발견하며 재시도하지 않고 한꺼번에 쉬었다가 한 건으로 회복 여부를 확인합니다.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import httpx
+from google.genai import errors
+
+from .instrumentation import tracer
+
+
+class ErrorClass:
+    """에러 분류"""
+
+    OVERLOADED = 'overloaded'      # 503
+    RATE_LIMITED = 'rate_limited'  # 429
+    SERVER = 'server'              # 500, 502, 504
+    TIMEOUT = 'timeout'            # 네트워크 타임아웃/연결 오류
+    BAD_OUTPUT = 'bad_output'      # 빈 응답, 복구 불가능한 JSON
+    CLIENT = 'client'              # 그 밖의 4xx (재시도해도 같은 결과)
+    UNKNOWN = 'unknown'
+
+
+# 서버 상태 문제로 브레이커 실패로 셀 분류 (응답 형식 문제는 서버 장애가 아님)
+BREAKER_FAILURES = {ErrorClass.OVERLOADED, ErrorClass.RATE_LIMITED, ErrorClass.SERVER, ErrorClass.TIMEOUT}
+
+RETRYABLE = BREAKER_FAILURES | {ErrorClass.BAD_OUTPUT}
+
+
+class Failure:
+    """분류된 실패 정보"""
+
+    __slots__ = ('error_class', 'retryable', 'retry_after', 'status')
+
+    def __init__(self, error_class: str, retry_after: Optional[float] = None, status: Optional[int] = None):
+        self.error_class = error_class
+        self.retryable = error_class in RETRYABLE
+        self.retry_after = retry_after
+        self.status = status
+
+    @property
+    def counts_toward_breaker(self) -> bool:
+        return self.error_class in BREAKER_FAILURES
+
+
+def _parse_duration(value) -> Optional[float]:
+    """'12s', '1.5s', '30' 형식을 초로 변환"""
+    if value is None:
+        return None
+
+    match = re.match(r'^\s*([0-9]*\.?[0-9]+)\s*s?\s*$', str(value))
+    return float(match.group(1)) if match else None
+
+
+def _retry_after_from(error: errors.APIError) -> Optional[float]:
+    """
+    서버가 알려준 재시도 대기 시간 추출
+
+    Retry-After 헤더를 먼저 보고, 없으면 google.rpc.RetryInfo의 retryDelay를 봅니다.
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is not None:
+        retry_after = _parse_duration(headers.get('retry-after'))
+        if retry_after is not None:
+            return retry_after
+
+    details = getattr(error, 'details', None)
+    if isinstance(details, str):
+        try:
+            details = json.loads(details)
+        except ValueError:
+            details = None
+
+    if isinstance(details, dict):
+        items = details.get('error', details).get('details', [])
+        for item in items if isinstance(items, list) else []:
+            if isinstance(item, dict) and item.get('@type', '').endswith('google.rpc.RetryInfo'):
+                return _parse_duration(item.get('retryDelay'))
+
+    return None
+
+
+def classify_error(error: BaseException) -> Failure:
+    """
+    예외를 분류
+
+    Args:
+        error: SDK 호출 또는 응답 처리 중 발생한 예외
+
+    Returns:
+        Failure (분류, 재시도 여부, 서버 지정 대기 시간)
+    """
+    if isinstance(error, errors.APIError):
+        status = getattr(error, 'code', None)
+        retry_after = _retry_after_from(error)
+
+        if status == 503:
+            return Failure(ErrorClass.OVERLOADED, retry_after, status)
+        if status == 429:
+            return Failure(ErrorClass.RATE_LIMITED, retry_after, status)
+        if status == 408:
+            return Failure(ErrorClass.TIMEOUT, retry_after, status)
+        if isinstance(error, errors.ServerError) or (status and status >= 500):
+            return Failure(ErrorClass.SERVER, retry_after, status)
+        if isinstance(error, errors.ClientError):
+            return Failure(ErrorClass.CLIENT, None, status)
+        return Failure(ErrorClass.UNKNOWN, retry_after, status)
+
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError)):
+        return Failure(ErrorClass.TIMEOUT)
+
+    if isinstance(error, ValueError):
+        # json.JSONDecodeError, StructuredOutputError, 빈 응답
+        return Failure(ErrorClass.BAD_OUTPUT)
+
+    return Failure(ErrorClass.UNKNOWN)
+
+
+class RetryPolicy:
+    """decorrelated jitter 백오프 (서버 지정 대기 시간 우선)"""
+
+    def __init__(self, max_retries: int = 5, base_wait: float = 2.0, max_wait: float = 60.0, seed: int = None):
+        """
+        초기화
+
+        Args:
+            max_retries: 최대 시도 횟수
+            base_wait: 최소 대기 시간 (초)
+            max_wait: 최대 대기 시간 (초)
+            seed: 난수 시드 (테스트/벤치마크 재현용)
+        """
+        self.max_retries = max_retries
+        self.base_wait = base_wait
+        self.max_wait = max_wait
+        self._random = random.Random(seed)
+
+    def next_wait(self, previous_wait: float, failure: Failure) -> float:
+        """
+        다음 재시도까지 대기 시간
+
+        sleep = min(max_wait, uniform(base_wait, previous_wait * 3))
+        서버가 Retry-After를 주면 그 시간에 작은 지터만 더합니다.
+
+        Args:
+            previous_wait: 직전 대기 시간 (첫 재시도면 0)
+            failure: 분류된 실패
+
+        Returns:
+            대기 시간 (초)
+        """
+        if failure.retry_after is not None:
+            return min(self.max_wait, failure.retry_after + self._random.uniform(0, self.base_wait))
+
+        upper = max(self.base_wait, previous_wait * 3)
+        return min(self.max_wait, self._random.uniform(self.base_wait, upper))
+
+
+class CircuitBreaker:
+    """
+    에러율 기반 서킷 브레이커
+
+    최근 window_sec 동안 min_calls 이상 호출 중 실패 비율이 failure_threshold를 넘으면 열림(OPEN).
+    열린 동안 호출은 cooldown_sec 동안 대기하고, 이후 한 건만 시험 호출(HALF_OPEN)하여
+    성공하면 닫히고, 실패하면 대기 시간을 두 배로 늘려 다시 엽니다.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str = 'gemini',
+        failure_threshold: float = 0.5,
+        min_calls: int = 6,
+        window_sec: float = 60.0,
+        cooldown_sec: float = 30.0,
+        max_cooldown_sec: float = 300.0
+    ):
+        """
+        초기화
+
+        Args:
+            name: 브레이커 이름 (리포트/카운터용)
+            failure_threshold: 열림 기준 실패 비율
+            min_calls: 판단에 필요한 최소 호출 수
+            window_sec: 실패 비율 계산 구간 (초)
+            cooldown_sec: 열린 뒤 시험 호출까지 대기 (초)
+            max_cooldown_sec: 연속 실패 시 대기 상한 (초)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.window_sec = window_sec
+        self.base_cooldown_sec = cooldown_sec
+        self.max_cooldown_sec = max_cooldown_sec
+
+        self._lock = threading.Condition()
+        self._outcomes = deque()  # (시각, 성공 여부)
+        self.state = self.CLOSED
+        self.cooldown_sec = cooldown_sec
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.trips = 0
+        self.open_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _prune(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_sec:
+            self._outcomes.popleft()
+
+    def _trip(self, now: float):
+        self.state = self.OPEN
+        self.opened_at = now
+        self.trips += 1
+        tracer.count(f'{self.name}.breaker_trips')
+
+    def wait_until_ready(self) -> float:
+        """
+        호출 가능할 때까지 대기
+
+        Returns:
+            대기한 시간 (초)
+        """
+        waited = 0.0
+
+        with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if self.state == self.CLOSED:
+                    break
+
+                if self.state == self.OPEN:
+                    remaining = self.opened_at + self.cooldown_sec - now
+                    if remaining <= 0:
+                        self.open_seconds += now - self.opened_at
+                        self.state = self.HALF_OPEN
+                        self.probe_in_flight = False
+                        continue
+                elif not self.probe_in_flight:
+                    # HALF_OPEN: 시험 호출은 한 건만
+                    self.probe_in_flight = True
+                    break
+                else:
+                    remaining = self.cooldown_sec
+
+                started = time.monotonic()
+                self._lock.wait(timeout=min(remaining, 1.0))
+                waited += time.monotonic() - started
+
+            self.wait_seconds += waited
+
+        if waited > 0:
+            tracer.count(f'{self.name}.breaker_wait_sec', waited)
+
+        return waited
+
+    def record_success(self):
+        """호출 성공 기록"""
+        with self._lock:
+            now = time.monotonic()
+            self._outcomes.append((now, True))
+            self._prune(now)
+
+            if self.state == self.HALF_OPEN:
+                self.state = self.CLOSED
+                self.cooldown_sec = self.base_cooldown_sec
+                self._outcomes.clear()
+                self._lock.notify_all()
+
+    def record_failure(self):
+        """서버 장애성 실패 기록"""
+        with self._lock:
+            now = time.monotonic()
+            self._outcomes.append((now, False))
+            self._prune(now)
+
+            if self.state == self.HALF_OPEN:
+                self.cooldown_sec = min(self.max_cooldown_sec, self.cooldown_sec * 2)
+                self._trip(now)
+                return
+
+            if self.state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for _, ok in self._outcomes if not ok)
+                if failures / len(self._outcomes) >= self.failure_threshold:
+                    self._trip(now)
+
+    def release_probe(self):
+        """시험 호출이 서버 상태와 무관하게 끝난 경우(응답 형식 오류 등) 다른 호출이 시험하도록 해제"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.probe_in_flight = False
+                self._lock.notify_all()
+
+    def snapshot(self) -> Dict:
+        """리포트용 상태"""
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            open_seconds = self.open_seconds
+            if self.state == self.OPEN:
+                open_seconds += now - self.opened_at
+
+            return {
+                'name': self.name,
+                'state': self.state,
+                'trips': self.trips,
+                'recent_calls': len(self._outcomes),
+                'recent_failure_rate': round(failures / len(self._outcomes), 3) if self._outcomes else 0.0,
+                'cooldown_sec': self.cooldown_sec,
+                'open_seconds': round(open_seconds, 1),
+                'wait_seconds': round(self.wait_seconds, 1),
+            }
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str = 'gemini', **kwargs) -> CircuitBreaker:
+    """
+    이름별 공유 서킷 브레이커 (같은 프로세스의 모든 평가자/스레드가 공유)
+
+    Args:
+        name: 브레이커 이름
+        **kwargs: 처음 생성할 때의 CircuitBreaker 설정
+
+    Returns:
+        CircuitBreaker
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name=name, **kwargs)
+        return _breakers[name]
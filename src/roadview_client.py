@@ -5,23 +5,140 @@ Kakao Roadview Client
 """
 
 import os
+import re
+import fnmatch
 import http.server
 import socketserver
 import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, List, Optional
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from .instrumentation import tracer
+from .network_cache import NetworkCache
+
+# 캡처 페이지 프로필
+#   default: 기본 Chromium 설정, SDK가 요청하는 리소스를 모두 받음
+#   lean:    스크린샷과 무관한 리소스 차단, 헤드리스 CPU 렌더링용 실행 옵션, #status 표시 숨김
+CAPTURE_PROFILES = ('default', 'lean')
+
+# lean 프로필 Chromium 실행 옵션 (백그라운드 작업/확장 끄기, GPU 없이 SwiftShader로 WebGL 렌더링)
+LEAN_LAUNCH_ARGS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-first-run',
+    '--use-angle=swiftshader',
+    '--enable-unsafe-swiftshader',
+]
+
+# lean 프로필 차단 URL 패턴 (CDP Network.setBlockedURLs, * 와일드카드)
+# 통계/광고 수집, 웹폰트, 동영상은 로드뷰 화면에 영향이 없음 (타일 이미지는 차단하면 안 됨)
+LEAN_BLOCKED_URLS = [
+    '*tiara*',
+    '*stat.kakao*',
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*.woff*',
+    '*.ttf*',
+    '*.otf*',
+    '*.mp4*',
+    '*.webm*',
+]
+
+# 스크린샷에 상태 표시가 찍히지 않도록 숨김 (텍스트는 남아 메타데이터 조회에 그대로 사용)
+_HIDE_STATUS_SCRIPT = """
+document.addEventListener('DOMContentLoaded', () => {
+    const style = document.createElement('style');
+    style.textContent = '#status { visibility: hidden !important; }';
+    document.head.appendChild(style);
+});
+"""
+
+# 추가 시점 프리셋 (pan: 공원 방위 기준 오프셋(도), tilt/zoom: 절댓값)
+VIEWPOINT_PRESETS = {
+    'left': {'pan': -60, 'tilt': 0, 'zoom': 0},
+    'right': {'pan': 60, 'tilt': 0, 'zoom': 0},
+    'zoom': {'pan': 0, 'tilt': 0, 'zoom': 1},
+}
+
+
+def parse_viewpoints(spec: Optional[str]) -> List[Dict]:
+    """
+    추가 시점 목록 파싱
+
+    Args:
+        spec: 쉼표로 구분한 프리셋 이름 또는 '이름:pan:tilt:zoom' (예: 'left,right,far_left:-120:0:0')
+
+    Returns:
+        [{'name', 'pan', 'tilt', 'zoom'}]
+    """
+    viewpoints = []
+    for item in (spec or '').split(','):
+        item = item.strip()
+        if not item:
+            continue
+
+        name, *values = item.split(':')
+        if values:
+            pan, tilt, zoom = (list(map(float, values)) + [0.0, 0.0])[:3]
+            viewpoints.append({'name': name, 'pan': pan, 'tilt': tilt, 'zoom': zoom})
+        elif name in VIEWPOINT_PRESETS:
+            viewpoints.append({'name': name, **VIEWPOINT_PRESETS[name]})
+        else:
+            raise ValueError(
+                f"알 수 없는 시점입니다: {name} (프리셋: {', '.join(VIEWPOINT_PRESETS)} 또는 이름:pan:tilt:zoom)"
+            )
+
+    return viewpoints
+
+
+def viewpoint_path(output_path: str, name: str) -> str:
+    """추가 시점 이미지 경로 ({방향}_{시점 이름}.jpg)"""
+    path = Path(output_path)
+    return str(path.with_name(f"{path.stem}_{name}{path.suffix}"))
 
 
 class RoadviewClient:
     """카카오 로드뷰 클라이언트"""
 
-    def __init__(self, api_key: str = None):
+    # 카카오맵 JavaScript SDK 주소 ({api_key} 치환)
+    DEFAULT_SDK_URL = '//dapi.kakao.com/v2/maps/sdk.js?appkey={api_key}'
+
+    def __init__(
+        self,
+        api_key: str = None,
+        port: int = 8080,
+        sdk_url: str = None,
+        static_dir: str = None,
+        cache_dir: str = None,
+        network_cache: Optional[NetworkCache] = None,
+        profile: str = None
+    ):
         """
         초기화
 
         Args:
             api_key: 카카오 JavaScript API 키
+            port: 템플릿 HTTP 서버 포트 (워커 프로세스마다 다르게 지정)
+            sdk_url: 지도 SDK 스크립트 주소 (없으면 환경변수 KAKAO_SDK_URL 또는 카카오 SDK)
+            static_dir: 템플릿 서버가 함께 서빙할 정적 파일 폴더
+                        (없으면 환경변수 ROADVIEW_STATIC_DIR, 벤치마크용 가짜 SDK 등)
+            cache_dir: 브라우저 프로필 폴더 (지정하면 open() 세션의 모든 캡처가 한 컨텍스트와
+                       디스크 캐시를 공유하여, 가까운 파노라마 타일을 다시 받지 않음. 실행 간에도 유지)
+            network_cache: 카카오 응답 기록/재생 저장소 (없으면 환경변수 NETWORK_CACHE, 기본 사용 안 함)
+                           가로챈 요청은 브라우저 HTTP 캐시 대신 이 저장소에서 응답됨
+            profile: 캡처 페이지 프로필 ('default', 'lean', 없으면 환경변수 CAPTURE_PROFILE 또는 default)
         """
         if not api_key:
             api_key = os.getenv('KAKAO_API_KEY')
@@ -33,6 +150,13 @@ class RoadviewClient:
                 )
 
         self.api_key = api_key
+        self.sdk_url = (sdk_url or os.getenv('KAKAO_SDK_URL') or self.DEFAULT_SDK_URL).format(api_key=api_key)
+        self.static_dir = static_dir or os.getenv('ROADVIEW_STATIC_DIR')
+        self.cache_dir = cache_dir
+        self.network_cache = network_cache or NetworkCache.from_env()
+        self.profile = profile or os.getenv('CAPTURE_PROFILE', 'default')
+        if self.profile not in CAPTURE_PROFILES:
+            raise ValueError(f"지원하지 않는 캡처 프로필입니다: {self.profile} (가능: {', '.join(CAPTURE_PROFILES)})")
         self.template_path = Path(__file__).parent / 'templates' / 'roadview_template.html'
         self.template_multidir_path = Path(__file__).parent / 'templates' / 'roadview_template_multidir.html'
 
@@ -42,9 +166,78 @@ class RoadviewClient:
         print(f"[INFO] RoadviewClient 초기화 완료 (API Key: {api_key[:10]}...)")
 
         # HTTP 서버 설정
-        self.port = 8080
+        self.port = port
         self.server = None
         self.server_thread = None
+        self._html_content = ''
+
+        # 브라우저 세션 (open() 호출 시 여러 캡처에서 재사용)
+        self._playwright = None
+        self._browser = None
+        self._context = None  # cache_dir 지정 시 영속 컨텍스트
+
+    def open(self, headless: bool = True):
+        """
+        브라우저와 HTTP 서버를 띄워 두고 이후 캡처에서 재사용
+
+        세션이 열려 있으면 캡처마다 브라우저를 새로 실행하지 않고
+        새 컨텍스트만 생성합니다. cache_dir가 있으면 영속 컨텍스트 하나에서 페이지만 새로 엽니다.
+        작업이 끝나면 close()를 호출하세요.
+
+        Args:
+            headless: 헤드리스 모드 여부
+        """
+        if self._session_open:
+            return
+
+        self._start_server('')
+        try:
+            self._playwright = sync_playwright().start()
+            with tracer.span('browser.launch', session=True, cache=bool(self.cache_dir)):
+                if self.cache_dir:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    self._context = self._playwright.chromium.launch_persistent_context(
+                        self.cache_dir, headless=headless, args=self._launch_args
+                    )
+                else:
+                    self._browser = self._playwright.chromium.launch(headless=headless, args=self._launch_args)
+        except Exception:
+            # 실행 실패 시 세션이 열리지 않아 close()가 불리지 않을 수 있으므로 여기서 정리 (포트 해제)
+            if self._playwright is not None:
+                self._playwright.stop()
+                self._playwright = None
+            self._stop_server()
+            raise
+        cache_note = f", cache={self.cache_dir}" if self.cache_dir else ""
+        print(f"[INFO] 브라우저 세션 시작 (port={self.port}, profile={self.profile}{cache_note})")
+
+    @property
+    def _launch_args(self) -> List[str]:
+        return list(LEAN_LAUNCH_ARGS) if self.profile == 'lean' else []
+
+    @property
+    def _session_open(self) -> bool:
+        return self._browser is not None or self._context is not None
+
+    def close(self):
+        """브라우저 세션 및 HTTP 서버 종료"""
+        if self._context is not None:
+            self._context.close()
+            self._context = None
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+        self._stop_server()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def _create_html(self, lat: float, lng: float) -> str:
         """
@@ -60,7 +253,8 @@ class RoadviewClient:
         with open(self.template_path, 'r', encoding='utf-8') as f:
             template = f.read()
 
-        html = template.replace('{{KAKAO_API_KEY}}', self.api_key)
+        html = template.replace('{{KAKAO_SDK_URL}}', self.sdk_url)
+        html = html.replace('{{KAKAO_API_KEY}}', self.api_key)
         html = html.replace('{{LATITUDE}}', str(lat))
         html = html.replace('{{LONGITUDE}}', str(lng))
 
@@ -70,38 +264,232 @@ class RoadviewClient:
         """
         간단한 HTTP 서버 시작
 
+        서버가 이미 떠 있으면 서빙할 HTML만 교체합니다.
+
         Args:
             html_content: 서빙할 HTML 내용
         """
-        class CustomHandler(http.server.SimpleHTTPRequestHandler):
-            html = html_content
+        self._html_content = html_content
+
+        if self.server is not None:
+            return
+
+        client = self
 
+        class CustomHandler(http.server.SimpleHTTPRequestHandler):
             def do_GET(self):
+                path = self.path.split('?')[0]
+
+                # 정적 파일 (static_dir 지정 시)
+                if path != '/' and client.static_dir:
+                    static_root = Path(client.static_dir).resolve()
+                    file_path = (static_root / path.lstrip('/')).resolve()
+                    if file_path.is_relative_to(static_root) and file_path.is_file():
+                        content_type = self.guess_type(str(file_path))
+                        body = file_path.read_bytes()
+                        self.send_response(200)
+                        self.send_header('Content-type', content_type)
+                        self.send_header('Content-Length', str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                        return
+
                 self.send_response(200)
                 self.send_header('Content-type', 'text/html; charset=utf-8')
                 self.end_headers()
-                self.wfile.write(self.html.encode('utf-8'))
+                self.wfile.write(client._html_content.encode('utf-8'))
 
             def log_message(self, format, *args):
                 pass  # 로그 출력 억제
 
         handler = CustomHandler
-        socketserver.TCPServer.allow_reuse_address = True
-        self.server = socketserver.TCPServer(("", self.port), handler)
 
-        def serve():
-            self.server.serve_forever()
+        with tracer.span('server.start', port=self.port):
+            socketserver.TCPServer.allow_reuse_address = True
+            self.server = socketserver.TCPServer(("", self.port), handler)
+
+            def serve():
+                self.server.serve_forever()
 
-        self.server_thread = threading.Thread(target=serve, daemon=True)
-        self.server_thread.start()
-        time.sleep(0.5)  # 서버 시작 대기
+            self.server_thread = threading.Thread(target=serve, daemon=True)
+            self.server_thread.start()
+            time.sleep(0.5)  # 서버 시작 대기
 
     def _stop_server(self):
-        """HTTP 서버 종료"""
+        """HTTP 서버 종료 (브라우저 세션 중에는 유지)"""
+        if self._session_open:
+            return
+
         if self.server:
             self.server.shutdown()
+            self.server.server_close()
             self.server = None
 
+    @contextmanager
+    def _new_page(self, width: int = None, height: int = None, headless: bool = True):
+        """
+        캡처용 페이지 생성
+
+        세션이 열려 있으면 기존 브라우저에 새 컨텍스트를 만들고,
+        아니면 캡처 한 번을 위해 브라우저를 실행했다가 종료합니다.
+
+        Args:
+            width: 뷰포트 너비 (None이면 기본값)
+            height: 뷰포트 높이 (None이면 기본값)
+            headless: 헤드리스 모드 여부 (세션이 없을 때만 적용)
+
+        Yields:
+            Playwright Page 객체
+        """
+        context_options = {}
+        if width and height:
+            context_options['viewport'] = {'width': width, 'height': height}
+
+        if self._context is not None:
+            # 영속 컨텍스트: 페이지만 새로 열어 디스크 캐시 공유
+            page = self._context.new_page()
+            self._prepare_page(page)
+            try:
+                if width and height:
+                    page.set_viewport_size(context_options['viewport'])
+                with self._track_cache(page):
+                    yield page
+            finally:
+                page.close()
+            return
+
+        if self._browser is not None:
+            with tracer.span('browser.new_context'):
+                context = self._browser.new_context(**context_options)
+            try:
+                page = context.new_page()
+                self._prepare_page(page)
+                with self._track_cache(page):  # 컨텍스트마다 캐시가 비어 있어 비교 기준이 됨
+                    yield page
+            finally:
+                context.close()
+            return
+
+        with sync_playwright() as p:
+            with tracer.span('browser.launch', session=False):
+                browser = p.chromium.launch(headless=headless, args=self._launch_args)
+            try:
+                context = browser.new_context(**context_options)
+                page = context.new_page()
+                self._prepare_page(page)
+                yield page
+            finally:
+                browser.close()
+
+    def _prepare_page(self, page):
+        """
+        새 페이지 설정: 응답 저장소 가로채기, lean 프로필이면 리소스 차단과 상태 표시 숨김
+
+        Args:
+            page: Playwright Page 객체 (goto 전)
+        """
+        if self.network_cache is not None:
+            self.network_cache.attach(page)
+
+        if self.profile != 'lean':
+            return
+
+        page.add_init_script(_HIDE_STATUS_SCRIPT)
+        try:
+            # 라우트 가로채기와 달리 요청마다 Python을 거치지 않아 부하가 없음
+            session = page.context.new_cdp_session(page)
+            session.send('Network.enable')
+            session.send('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URLS})
+        except Exception:
+            # CDP를 쓸 수 없는 브라우저면 라우트로 차단
+            patterns = [re.compile(fnmatch.translate(pattern)) for pattern in LEAN_BLOCKED_URLS]
+            page.route(lambda url: any(pattern.match(url) for pattern in patterns), lambda route: route.abort())
+
+    @contextmanager
+    def _track_cache(self, page):
+        """
+        페이지의 네트워크 요청 중 브라우저 캐시 적중 수와 실제 전송량 집계 (Chromium CDP)
+
+        카운터: capture.requests, capture.cache_hits, capture.network_bytes, capture.blocked
+        """
+        stats = {'requests': 0, 'cache_hits': 0, 'network_bytes': 0, 'blocked': 0}
+
+        try:
+            session = page.context.new_cdp_session(page)
+            session.send('Network.enable')
+        except Exception:
+            yield  # CDP를 쓸 수 없는 브라우저면 집계 생략
+            return
+
+        def on_request(params):
+            stats['requests'] += 1
+
+        def on_cached(params):
+            stats['cache_hits'] += 1  # 메모리 캐시
+
+        def on_response(params):
+            if params['response'].get('fromDiskCache'):
+                stats['cache_hits'] += 1
+
+        def on_finished(params):
+            stats['network_bytes'] += params.get('encodedDataLength', 0)
+
+        def on_failed(params):
+            if params.get('blockedReason'):
+                stats['blocked'] += 1
+
+        session.on('Network.requestWillBeSent', on_request)
+        session.on('Network.requestServedFromCache', on_cached)
+        session.on('Network.responseReceived', on_response)
+        session.on('Network.loadingFinished', on_finished)
+        session.on('Network.loadingFailed', on_failed)
+
+        try:
+            yield
+        finally:
+            for name, value in stats.items():
+                tracer.count(f'capture.{name}', value)
+            try:
+                session.detach()
+            except Exception:
+                pass
+
+    def _screenshot(self, page, output_path: str):
+        """
+        스크린샷 저장 (소요 시간과 파일 크기 기록)
+
+        Args:
+            page: Playwright Page 객체
+            output_path: 저장 경로
+        """
+        with tracer.span('page.screenshot') as span:
+            page.screenshot(path=output_path, full_page=False)
+            span['bytes'] = os.path.getsize(output_path)
+
+        tracer.count('capture.bytes', span['bytes'])
+
+    def _capture_viewpoint(self, page, output_path: str, viewpoint: Dict, settle_ms: int):
+        """
+        로드된 파노라마에서 시점을 바꿔 스크린샷 한 장 추가
+
+        Args:
+            page: 로드뷰가 로드된 Playwright Page 객체
+            output_path: 기본 시점 이미지 경로 (추가 시점 경로는 viewpoint_path)
+            viewpoint: {'name', 'pan', 'tilt', 'zoom'}
+            settle_ms: 시점 변경 후 타일 로딩 대기 (밀리초)
+        """
+        path = viewpoint_path(output_path, viewpoint['name'])
+
+        with tracer.span('page.viewpoint', name=viewpoint['name']):
+            page.evaluate(
+                "([pan, tilt, zoom]) => window.setViewOffset(pan, tilt, zoom)",
+                [viewpoint.get('pan', 0), viewpoint.get('tilt', 0), viewpoint.get('zoom', 0)]
+            )
+            page.wait_for_timeout(settle_ms)
+
+        self._screenshot(page, path)
+        tracer.count('capture.extra_views')
+
     def capture_roadview(
         self,
         lat: float,
@@ -136,22 +524,19 @@ class RoadviewClient:
         self._start_server(html_content)
 
         try:
-            with sync_playwright() as p:
-                # 브라우저 실행
-                browser = p.chromium.launch(headless=headless)
-                context = browser.new_context(viewport={'width': width, 'height': height})
-                page = context.new_page()
-
+            with self._new_page(width, height, headless) as page:
                 # HTTP 서버로 접속
                 url = f'http://localhost:{self.port}/'
                 print(f"[INFO] URL: {url}")
-                page.goto(url)
+                with tracer.span('page.goto'):
+                    page.goto(url)
                 print(f"[INFO] HTML 로드 완료")
 
                 # 로드뷰가 로드될 때까지 대기
                 try:
                     # roadview-loaded 또는 roadview-error 클래스가 추가될 때까지 대기
-                    page.wait_for_selector('body.roadview-loaded, body.roadview-error', timeout=timeout)
+                    with tracer.span('page.wait_ready'):
+                        page.wait_for_selector('body.roadview-loaded, body.roadview-error', timeout=timeout)
 
                     # 에러 체크
                     if page.locator('body.roadview-error').count() > 0:
@@ -162,10 +547,11 @@ class RoadviewClient:
                         return False
 
                     # 추가 대기 (로드뷰 렌더링 완료)
-                    page.wait_for_timeout(2000)
+                    with tracer.span('page.settle'):
+                        page.wait_for_timeout(2000)
 
                     # 스크린샷
-                    page.screenshot(path=output_path, full_page=False)
+                    self._screenshot(page, output_path)
                     print(f"[INFO] 로드뷰 캡처 완료: {output_path}")
 
                     return True
@@ -174,9 +560,6 @@ class RoadviewClient:
                     print(f"[ERROR] 타임아웃: 로드뷰 로드 실패")
                     return False
 
-                finally:
-                    browser.close()
-
         finally:
             # HTTP 서버 종료
             self._stop_server()
@@ -199,14 +582,14 @@ class RoadviewClient:
         self._start_server(html_content)
 
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                page = browser.new_page()
-                page.goto(f'http://localhost:{self.port}/')
+            with self._new_page() as page:
+                with tracer.span('page.goto'):
+                    page.goto(f'http://localhost:{self.port}/')
 
                 try:
                     # 로드 대기
-                    page.wait_for_selector('body.roadview-loaded, body.roadview-error', timeout=15000)
+                    with tracer.span('page.wait_ready'):
+                        page.wait_for_selector('body.roadview-loaded, body.roadview-error', timeout=15000)
 
                     # 상태 텍스트 읽기
                     status_text = page.locator('#status').text_content()
@@ -237,9 +620,6 @@ class RoadviewClient:
                         'message': '타임아웃'
                     }
 
-                finally:
-                    browser.close()
-
         finally:
             self._stop_server()
 
@@ -254,12 +634,15 @@ class RoadviewClient:
         height: int = 800,
         headless: bool = True,
         timeout: int = 15000,
-        search_radius: int = 50
+        search_radius: int = 50,
+        viewpoints: Optional[List[Dict]] = None,
+        viewpoint_settle_ms: int = 300
     ) -> bool:
         """
         다방향 샘플링용 로드뷰 캡처
 
         샘플 좌표 주변에서 로드뷰를 찾아, 타겟 좌표를 향하도록 캡처
+        viewpoints가 있으면 같은 파노라마에서 시점만 바꿔 추가로 캡처 (페이지를 다시 로드하지 않음)
 
         Args:
             sample_lat: 샘플 위도 (로드뷰 찾을 위치)
@@ -271,9 +654,13 @@ class RoadviewClient:
             height: 이미지 높이
             headless: 헤드리스 모드 여부
             timeout: 타임아웃 (밀리초)
+            search_radius: 로드뷰 검색 반경 (미터)
+            viewpoints: 추가 시점 목록 ({'name', 'pan', 'tilt', 'zoom'}, parse_viewpoints 참고)
+                        → {방향}_{name}.jpg로 저장
+            viewpoint_settle_ms: 시점 변경 후 타일 로딩 대기 (밀리초)
 
         Returns:
-            성공 여부
+            성공 여부 (공원 방향 기본 시점 기준)
         """
         if not self.template_multidir_path.exists():
             raise FileNotFoundError(f"다방향 템플릿을 찾을 수 없습니다: {self.template_multidir_path}")
@@ -284,7 +671,8 @@ class RoadviewClient:
         with open(self.template_multidir_path, 'r', encoding='utf-8') as f:
             template = f.read()
 
-        html = template.replace('{{KAKAO_API_KEY}}', self.api_key)
+        html = template.replace('{{KAKAO_SDK_URL}}', self.sdk_url)
+        html = html.replace('{{KAKAO_API_KEY}}', self.api_key)
         html = html.replace('{{SAMPLE_LAT}}', str(sample_lat))
         html = html.replace('{{SAMPLE_LNG}}', str(sample_lng))
         html = html.replace('{{TARGET_LAT}}', str(target_lat))
@@ -295,44 +683,52 @@ class RoadviewClient:
         self._start_server(html)
 
         try:
-            with sync_playwright() as p:
-                # 브라우저 실행
-                browser = p.chromium.launch(headless=headless)
-                context = browser.new_context(viewport={'width': width, 'height': height})
-                page = context.new_page()
-
+            with self._new_page(width, height, headless) as page:
                 # HTTP 서버로 접속
                 url = f'http://localhost:{self.port}/'
-                page.goto(url)
+                with tracer.span('page.goto'):
+                    page.goto(url)
 
                 # 로드뷰가 로드될 때까지 대기
                 try:
-                    page.wait_for_selector('body.roadview-loaded, body.roadview-error', timeout=timeout)
+                    with tracer.span('page.wait_ready'):
+                        page.wait_for_selector('body.roadview-loaded, body.roadview-error', timeout=timeout)
 
                     # 에러 체크
                     if 'roadview-error' in page.locator('body').get_attribute('class'):
                         print(f"[WARN] 로드뷰 없음: sample=({sample_lat}, {sample_lng})")
-                        browser.close()
+                        tracer.count('capture.no_pano')
                         return False
 
                     # 이미지 완전 로딩을 위한 추가 대기 (1초)
-                    page.wait_for_timeout(1000)
+                    with tracer.span('page.settle'):
+                        page.wait_for_timeout(1000)
 
                     # 스크린샷 촬영
                     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                    page.screenshot(path=output_path, full_page=False)
+                    self._screenshot(page, output_path)
 
                     print(f"[INFO] 캡처 완료: {output_path}")
-                    browser.close()
+                    tracer.count('capture.success')
+
+                    # 같은 파노라마에서 시점만 바꿔 추가 캡처 (기본 시점은 이미 저장했으므로 실패해도 성공 처리)
+                    for viewpoint in viewpoints or []:
+                        try:
+                            self._capture_viewpoint(page, output_path, viewpoint, viewpoint_settle_ms)
+                        except Exception as e:
+                            print(f"[WARN] 추가 시점 캡처 실패 ({viewpoint['name']}): {e}")
+                            tracer.count('capture.extra_view_errors')
+
                     return True
 
                 except PlaywrightTimeoutError:
                     print(f"[ERROR] 타임아웃: {output_path}")
-                    browser.close()
+                    tracer.count('capture.timeout')
                     return False
 
         except Exception as e:
             print(f"[ERROR] 캡처 실패: {e}")
+            tracer.count('capture.error')
             return False
 
         finally:
@@ -0,0 +1,303 @@
+"""
+신규 공원 입지 선정 모듈
+
+후보지(지구단위계획 예정지 등) 중에서 k곳을 골라 새로 유치거리 안에 드는 인구를 최대화합니다.
+"새로 덮는 인구"는 이미 고른 후보지가 많을수록 한계 이득이 줄어드는 부분모듈 함수이므로,
+지연 탐욕법(lazy greedy, CELF)으로 이전 라운드의 한계 이득을 상한으로 두고 상한이 큰 후보만 다시 평가합니다.
+후보지별 권역 셀은 OD 거리 캐시(od_cache)의 희소 조회로 구하므로 후보지 수천 곳도 수 초 안에 평가됩니다.
+"""
+
+import csv
+import heapq
+import json
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import shapely
+from shapely.geometry import shape
+
+from .accessibility import ServiceAreaAnalyzer, service_distance
+from .green_space import geodesic_area_m2
+from .od_cache import ODMatrix, ScenarioAccessibility
+from .two_step_fca import PopulationGrid
+
+# 선정 방식 (lazy: 지연 탐욕법, greedy: 매 라운드 모든 후보 재평가)
+SELECTION_METHODS = ('lazy', 'greedy')
+
+# 후보지 공원 유형 기본값 (유치거리 결정)
+DEFAULT_CANDIDATE_TYPE = '근린공원'
+
+
+def load_candidates(path: str, park_type: str = DEFAULT_CANDIDATE_TYPE, area: float = 0.0) -> List[Dict]:
+    """
+    후보지 불러오기
+
+    CSV(이름/name, 위도/lat, 경도/lng, 선택: 면적/area, 공원구분/type) 또는
+    GeoJSON(점 또는 폴리곤, 폴리곤은 중심점과 면적 사용)을 읽습니다.
+
+    Args:
+        path: 후보지 파일
+        park_type: 유형이 없는 후보지의 공원 유형
+        area: 면적이 없는 후보지의 면적 (㎡)
+
+    Returns:
+        후보지 목록 ('name', 'lat', 'lng', 'area', 'type')
+    """
+    candidates = []
+
+    if str(path).endswith(('.geojson', '.json')):
+        with open(path, 'r', encoding='utf-8') as f:
+            features = json.load(f)['features']
+        geometries = [shape(feature['geometry']) for feature in features]
+        areas = geodesic_area_m2(np.array(geometries, dtype=object))
+        for index, (feature, geometry, polygon_area) in enumerate(zip(features, geometries, areas)):
+            properties = feature.get('properties') or {}
+            point = geometry if geometry.geom_type == 'Point' else shapely.point_on_surface(geometry)
+            candidates.append({
+                'name': str(properties.get('name') or properties.get('이름') or f'후보{index + 1}'),
+                'lat': point.y,
+                'lng': point.x,
+                'area': float(properties.get('area') or properties.get('면적') or polygon_area or area),
+                'type': properties.get('type') or properties.get('공원구분') or park_type,
+            })
+        return candidates
+
+    try:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='cp949') as f:
+            rows = list(csv.DictReader(f))
+
+    for index, row in enumerate(rows):
+        try:
+            candidates.append({
+                'name': (row.get('이름') or row.get('name') or f'후보{index + 1}').strip(),
+                'lat': float(row.get('위도') or row['lat']),
+                'lng': float(row.get('경도') or row['lng']),
+                'area': float(row.get('면적') or row.get('area') or area),
+                'type': (row.get('공원구분') or row.get('type') or park_type).strip(),
+            })
+        except (KeyError, ValueError):
+            print(f"⚠️  좌표가 없어 제외: {row}")
+    return candidates
+
+
+def cell_population(analyzer: ServiceAreaAnalyzer, grid: Optional[PopulationGrid] = None) -> np.ndarray:
+    """
+    분석 격자 셀별 인구 (인구 격자 점을 셀에 합산, 없으면 셀마다 1 = 면적 기준)
+
+    Args:
+        analyzer: 도로망 + 분석 격자
+        grid: 인구 격자
+
+    Returns:
+        (rows * cols,) 배열, 분석 제외 셀은 0
+    """
+    valid = analyzer.valid.ravel()
+    if grid is None:
+        return valid.astype(np.float64)
+
+    x, y = analyzer.network.projection.to_xy(grid.lat, grid.lng)
+    col = np.floor((x - analyzer.x0) / analyzer.cell_size).astype(np.int64)
+    row = np.floor((y - analyzer.y0) / analyzer.cell_size).astype(np.int64)
+    inside = (col >= 0) & (col < analyzer.cols) & (row >= 0) & (row < analyzer.rows)
+
+    population = np.bincount(row[inside] * analyzer.cols + col[inside], weights=grid.population[inside],
+                             minlength=analyzer.rows * analyzer.cols)
+    return np.where(valid, population, 0.0)
+
+
+class SiteOptimizer:
+    """OD 캐시 기반 후보지 권역 계산 + 탐욕 선정"""
+
+    def __init__(
+        self,
+        analyzer: ServiceAreaAnalyzer,
+        od: ODMatrix,
+        population: np.ndarray,
+        threshold: Optional[float] = None
+    ):
+        """
+        초기화
+
+        Args:
+            analyzer: 도로망 + 분석 격자 (OD 캐시를 만든 것과 같아야 함)
+            od: OD 행렬
+            population: 셀별 인구 (cell_population)
+            threshold: 모든 공원/후보지에 같은 유치거리 적용 (없으면 유형별)
+        """
+        self.analyzer = analyzer
+        self.od = od
+        self.population = population
+        self.threshold = threshold
+        self.covered = np.zeros(od.num_cells, dtype=bool)
+
+    def set_existing(self, parks: List[Dict]) -> Dict:
+        """
+        기존 공원 권역을 이미 덮인 것으로 설정
+
+        Args:
+            parks: 기존 공원 목록
+
+        Returns:
+            {'covered_population', 'total_population'}
+        """
+        state = ScenarioAccessibility(self.analyzer, self.od, threshold=self.threshold)
+        for park in parks:
+            state.add_park(park)
+        self.covered = (state.slack <= 0) & self.analyzer.valid.ravel()
+        return {
+            'covered_population': float(self.population[self.covered].sum()),
+            'total_population': float(self.population.sum()),
+        }
+
+    def candidate_cells(self, candidates: List[Dict]) -> List[np.ndarray]:
+        """
+        후보지별 유치거리 안의 셀 (OD 캐시 희소 조회)
+
+        Args:
+            candidates: 후보지 목록
+
+        Returns:
+            후보지별 셀 인덱스 배열
+        """
+        cells = []
+        for candidate in candidates:
+            threshold = service_distance(candidate, self.threshold)
+            if threshold > self.od.threshold:
+                raise ValueError(f"유치거리 {threshold:g}m가 OD 캐시 상한 {self.od.threshold:g}m보다 깁니다")
+            sources, offsets, _ = self.analyzer.park_sources([candidate], np.array([threshold]))
+            covered, _ = self.od.lookup(sources, offsets, threshold=threshold)
+            cells.append(covered)
+        return cells
+
+    def select(self, candidates: List[Dict], k: int, method: str = 'lazy') -> Dict:
+        """
+        k곳 선정
+
+        Args:
+            candidates: 후보지 목록
+            k: 선정할 곳 수
+            method: 'lazy' (CELF 지연 탐욕법) 또는 'greedy'
+
+        Returns:
+            {'selected': [{'name', 'gain', 'cumulative', ...}], 'evaluations', 'elapsed_sec', ...}
+        """
+        if method not in SELECTION_METHODS:
+            raise ValueError(f"지원하지 않는 선정 방식입니다: {method} (가능: {', '.join(SELECTION_METHODS)})")
+
+        started = time.perf_counter()
+        cells = self.candidate_cells(candidates)
+        lookup_sec = time.perf_counter() - started
+
+        covered = self.covered.copy()
+        baseline = float(self.population[covered].sum())
+
+        def gain(index: int) -> float:
+            candidate_cells = cells[index]
+            return float(self.population[candidate_cells[~covered[candidate_cells]]].sum())
+
+        evaluations = 0
+        selected = []
+        cumulative = baseline
+
+        if method == 'greedy':
+            remaining = set(range(len(candidates)))
+            for _ in range(min(k, len(candidates))):
+                gains = {index: gain(index) for index in remaining}
+                evaluations += len(gains)
+                best = max(gains, key=lambda index: (gains[index], -index))
+                if gains[best] <= 0:
+                    break
+                remaining.remove(best)
+                covered[cells[best]] = True
+                cumulative += gains[best]
+                selected.append((best, gains[best], cumulative))
+        else:
+            # (−상한, 후보 번호, 상한을 계산한 라운드)
+            heap = []
+            for index in range(len(candidates)):
+                heap.append((-gain(index), index, 0))
+            evaluations += len(candidates)
+            heapq.heapify(heap)
+
+            round_no = 0
+            while heap and len(selected) < k:
+                negative, index, evaluated_round = heapq.heappop(heap)
+                if evaluated_round == round_no:
+                    # 이번 라운드에 계산한 값이 남은 상한 중 가장 크면 확정
+                    if -negative <= 0:
+                        break
+                    covered[cells[index]] = True
+                    cumulative += -negative
+                    selected.append((index, -negative, cumulative))
+                    round_no += 1
+                else:
+                    heapq.heappush(heap, (-gain(index), index, round_no))
+                    evaluations += 1
+
+        total = float(self.population.sum())
+        return {
+            'method': method,
+            'candidates': len(candidates),
+            'evaluations': evaluations,
+            'baseline_population': round(baseline, 1),
+            'total_population': round(total, 1),
+            'lookup_sec': round(lookup_sec, 3),
+            'elapsed_sec': round(time.perf_counter() - started, 3),
+            'selected': [
+                {
+                    'rank': rank,
+                    **{key: candidates[index][key] for key in ('name', 'lat', 'lng', 'area', 'type')},
+                    'gain': round(value, 1),
+                    'cumulative': round(running, 1),
+                    'coverage_ratio': round(running / total, 4) if total else 0.0,
+                }
+                for rank, (index, value, running) in enumerate(selected, start=1)
+            ],
+        }
+
+
+def save_selection(result: Dict, output_dir: str) -> Dict[str, str]:
+    """
+    선정 결과 저장 (CSV, 점 GeoJSON, 요약 JSON)
+
+    Args:
+        result: SiteOptimizer.select 결과
+        output_dir: 저장 폴더
+
+    Returns:
+        {종류: 파일 경로}
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        'csv': output_dir / 'selected_sites.csv',
+        'geojson': output_dir / 'selected_sites.geojson',
+        'summary': output_dir / 'site_selection_summary.json',
+    }
+
+    fieldnames = ['rank', 'name', 'lat', 'lng', 'area', 'type', 'gain', 'cumulative', 'coverage_ratio']
+    with open(paths['csv'], 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(result['selected'])
+
+    features = [
+        {
+            'type': 'Feature',
+            'properties': site,
+            'geometry': {'type': 'Point', 'coordinates': [site['lng'], site['lat']]},
+        }
+        for site in result['selected']
+    ]
+    with open(paths['geojson'], 'w', encoding='utf-8') as f:
+        json.dump({'type': 'FeatureCollection', 'features': features}, f, ensure_ascii=False)
+
+    with open(paths['summary'], 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    return {name: str(path) for name, path in paths.items()}
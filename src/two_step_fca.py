@@ -0,0 +1,387 @@
+"""
+2단계 유동 집수 구역법(2SFCA) 공원 접근성 지수 모듈
+
+공원 공급량(면적 × 품질 점수)과 거리를 함께 반영한 접근성 지수를 계산합니다.
+
+    1단계: 공원 j의 공급 비율 R_j = S_j / Σ_k W(d_kj) P_k   (집수 거리 d0 안의 인구 격자 k)
+    2단계: 격자 i의 접근성   A_i = Σ_j W(d_ij) R_j          (집수 거리 d0 안의 공원 j)
+
+인구 격자와 공원 사이 거리는 KD-tree 반경 질의로 d0 안의 쌍만 희소 행렬로 만들기 때문에
+시 단위 격자(수십만 셀)도 희소 행렬 곱 두 번으로 수 초 안에 끝납니다.
+A_i의 단위는 "1인당 품질 가중 공원 면적(㎡/인)"입니다.
+"""
+
+import csv
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import shapely
+from scipy import sparse
+from scipy.spatial import cKDTree
+
+from .accessibility import LocalProjection
+from .green_space import MAX_QUALITY_SCORE, DongBoundaries, dong_key, quality_key, quality_score
+from .park_catalog import DEFAULT_AREA, DEFAULT_PARK_CSV, ParkCatalog
+
+# 거리 감쇠 함수
+#   none:     집수 거리 안이면 1 (원래 2SFCA)
+#   gaussian: 가우시안 감쇠 (E2SFCA류, d0에서 약 0.01)
+#   gravity:  d^-β (중력 모형, 최소 거리로 나눗셈 폭주 방지)
+DECAY_FUNCTIONS = ('gaussian', 'none', 'gravity')
+
+# 기본 집수 거리 (미터, 도보권 근린공원 유치거리)
+DEFAULT_CATCHMENT = 1000
+
+# 중력 모형 거리 지수, 최소 거리 (미터)
+GRAVITY_BETA = 1.5
+GRAVITY_MIN_DISTANCE = 50
+
+
+def decay_weights(distance: np.ndarray, catchment: float, method: str = 'gaussian') -> np.ndarray:
+    """
+    거리 감쇠 가중치
+
+    Args:
+        distance: 거리 배열 (미터, 모두 catchment 이하)
+        catchment: 집수 거리 (미터)
+        method: 'gaussian', 'none', 'gravity'
+
+    Returns:
+        가중치 배열
+    """
+    if method == 'none':
+        return np.ones_like(distance)
+    if method == 'gaussian':
+        # exp(-½(d/σ)²)에서 σ = d0/3이면 d0에서 약 0.011
+        return np.exp(-0.5 * (distance / (catchment / 3)) ** 2)
+    if method == 'gravity':
+        return (np.maximum(distance, GRAVITY_MIN_DISTANCE) / GRAVITY_MIN_DISTANCE) ** -GRAVITY_BETA
+    raise ValueError(f"지원하지 않는 거리 감쇠 함수입니다: {method} (가능: {', '.join(DECAY_FUNCTIONS)})")
+
+
+def sparse_distances(origins_xy: np.ndarray, destinations_xy: np.ndarray, catchment: float) -> sparse.csr_matrix:
+    """
+    집수 거리 안의 출발지-도착지 직선 거리 희소 행렬 (KD-tree 반경 질의)
+
+    거리 0인 쌍도 빠지지 않도록 값은 거리 + 1(미터)로 저장하고, 사용할 때 1을 뺍니다.
+
+    Args:
+        origins_xy: 출발지 좌표 (N, 2), 미터
+        destinations_xy: 도착지 좌표 (M, 2), 미터
+        catchment: 집수 거리 (미터)
+
+    Returns:
+        (N, M) CSR 행렬, 값 = 거리 + 1
+    """
+    pairs = cKDTree(origins_xy).sparse_distance_matrix(
+        cKDTree(destinations_xy), max_distance=catchment, output_type='ndarray'
+    )
+    return sparse.csr_matrix(
+        (pairs['v'] + 1.0, (pairs['i'], pairs['j'])),
+        shape=(len(origins_xy), len(destinations_xy))
+    )
+
+
+def two_step_fca(
+    distances: sparse.csr_matrix,
+    population: np.ndarray,
+    supply: np.ndarray,
+    catchment: float = DEFAULT_CATCHMENT,
+    decay: str = 'gaussian'
+) -> Dict[str, np.ndarray]:
+    """
+    2SFCA 계산
+
+    Args:
+        distances: (인구 격자 N, 공원 M) 희소 거리 행렬 (값 = 거리 + 1, sparse_distances 형식)
+        population: 격자 인구 (N,)
+        supply: 공원 공급량 (M,)
+        catchment: 집수 거리 (미터)
+        decay: 거리 감쇠 함수
+
+    Returns:
+        {'access': 격자 접근성 (N,), 'ratio': 공원 공급 비율 (M,), 'demand': 공원 가중 수요 인구 (M,)}
+    """
+    weights = distances.copy()
+    weights.data = decay_weights(weights.data - 1.0, catchment, decay)
+
+    demand = weights.T @ population
+    ratio = np.divide(supply, demand, out=np.zeros(len(supply)), where=demand > 0)
+    access = weights @ ratio
+    return {'access': access, 'ratio': ratio, 'demand': demand}
+
+
+def park_supply(parks: List[Dict], quality_scores: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """
+    공원 공급량 = 면적 × 품질 가중치 (총점 / 만점, 점수가 없으면 평균 점수)
+
+    Args:
+        parks: 공원 정보 목록 ('name', 'area', 선택: 'id', 'score')
+        quality_scores: {quality_key: 총점}
+
+    Returns:
+        공급량 배열 (㎡)
+    """
+    scores = dict(quality_scores or {})
+    for park in parks:
+        if park.get('score') is not None:
+            scores.setdefault(quality_key(park), park['score'])
+    mean_score = sum(scores.values()) / len(scores) if scores else MAX_QUALITY_SCORE
+
+    return np.array([
+        float(park.get('area') or 0.0)
+        * scores.get(quality_key(park), mean_score) / MAX_QUALITY_SCORE
+        for park in parks
+    ])
+
+
+def load_best_direction_parks(path: str, park_csv: str = DEFAULT_PARK_CSV) -> List[Dict]:
+    """
+    select_best_direction.py 결과를 공원 공급 지점으로 불러오기 (UTF-8-BOM 또는 CP949)
+
+    면적은 공원 카탈로그에서 가져와 공원면적이 빈 공원도 카탈로그 기본 면적(1500㎡)을 씁니다.
+
+    Args:
+        path: output/park_best_directions.csv
+        park_csv: 공원 정보 CSV (카탈로그, 없으면 결과 CSV의 공원면적 사용)
+
+    Returns:
+        공원 정보 목록 ('id': 관리번호, 'name', 'lat', 'lng', 'area', 'score': 총점 또는 None(not_visible 기본값),
+        'row': 원본 행)
+    """
+    for encoding in ('utf-8-sig', 'cp949'):
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                rows = list(csv.DictReader(f))
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"CSV 인코딩을 알 수 없습니다: {path}")
+
+    catalog = ParkCatalog.load(park_csv) if Path(park_csv).exists() else None
+
+    parks = []
+    for row in rows:
+        index = catalog.resolve(row.get('관리번호') or row.get('공원명', '')).index if catalog is not None else None
+        try:
+            if index is not None:
+                area = float(catalog.area[index])
+            else:
+                area = float(row['공원면적']) if row.get('공원면적') else DEFAULT_AREA
+            parks.append({
+                'id': catalog.ids[index] if index is not None else row.get('관리번호', ''),
+                'name': row['공원명'],
+                'lat': float(row['위도']),
+                'lng': float(row['경도']),
+                'area': area,
+                'score': quality_score(row),
+                'row': row,
+            })
+        except (KeyError, ValueError):
+            print(f"⚠️  좌표가 없어 제외: {row.get('공원명', 'Unknown')}")
+    return parks
+
+
+class PopulationGrid:
+    """인구 격자 (셀 중심 위경도 + 인구)"""
+
+    def __init__(self, lat: np.ndarray, lng: np.ndarray, population: np.ndarray, cell_size: Optional[float] = None):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.population = np.asarray(population, dtype=np.float64)
+        self.cell_size = cell_size
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'PopulationGrid':
+        """
+        격자 인구 CSV 불러오기 (위도/lat, 경도/lng, 인구/population 열)
+
+        Args:
+            path: CSV 경로 (UTF-8 또는 CP949)
+
+        Returns:
+            PopulationGrid
+        """
+        try:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+        except UnicodeDecodeError:
+            with open(path, 'r', encoding='cp949') as f:
+                rows = list(csv.DictReader(f))
+
+        def column(row, *names):
+            for name in names:
+                if row.get(name) not in (None, ''):
+                    return float(str(row[name]).replace(',', ''))
+            raise KeyError(f"열을 찾을 수 없습니다: {', '.join(names)}")
+
+        lat = [column(row, '위도', 'lat') for row in rows]
+        lng = [column(row, '경도', 'lng', 'lon') for row in rows]
+        population = [column(row, '인구', 'population', '총인구수') for row in rows]
+        return cls(lat, lng, population)
+
+    @classmethod
+    def from_dongs(
+        cls,
+        boundaries: DongBoundaries,
+        population: Dict[str, Dict[str, int]],
+        cell_size: float = 100.0
+    ) -> 'PopulationGrid':
+        """
+        행정동 인구를 행정동 안 격자 셀에 균등 배분 (격자 인구 자료가 없을 때)
+
+        Args:
+            boundaries: 행정동 경계
+            population: green_space.load_population 결과
+            cell_size: 격자 셀 크기 (미터)
+
+        Returns:
+            PopulationGrid
+        """
+        west, south, east, north = shapely.total_bounds(boundaries.geometries)
+        projection = LocalProjection((south + north) / 2, (west + east) / 2)
+        dlat = cell_size / projection.ky
+        dlng = cell_size / projection.kx
+
+        lats = south + (np.arange(math.ceil((north - south) / dlat)) + 0.5) * dlat
+        lngs = west + (np.arange(math.ceil((east - west) / dlng)) + 0.5) * dlng
+        grid_lng, grid_lat = np.meshgrid(lngs, lats)
+        grid_lng, grid_lat = grid_lng.ravel(), grid_lat.ravel()
+
+        # 셀 중심이 속한 행정동 (경계 위 셀은 처음 걸린 행정동)
+        hit_cell, hit_dong = boundaries.tree.query(shapely.points(grid_lng, grid_lat), predicate='within')
+        _, first = np.unique(hit_cell, return_index=True)
+        hit_cell, hit_dong = hit_cell[first], hit_dong[first]
+
+        dong_population = np.array([
+            population['by_code'].get(code, population['by_name'].get(dong_key(name), 0))
+            for code, name in zip(boundaries.codes, boundaries.names)
+        ], dtype=np.float64)
+        cells_per_dong = np.bincount(hit_dong, minlength=len(boundaries))
+        per_cell = np.divide(dong_population, cells_per_dong, out=np.zeros(len(boundaries)),
+                             where=cells_per_dong > 0)
+
+        return cls(grid_lat[hit_cell], grid_lng[hit_cell], per_cell[hit_dong], cell_size=cell_size)
+
+
+def compute_accessibility(
+    grid: PopulationGrid,
+    parks: List[Dict],
+    quality_scores: Optional[Dict[str, float]] = None,
+    catchment: float = DEFAULT_CATCHMENT,
+    decay: str = 'gaussian',
+    distances: Optional[sparse.csr_matrix] = None
+) -> Dict:
+    """
+    인구 격자와 공원으로 2SFCA 접근성 계산
+
+    Args:
+        grid: 인구 격자
+        parks: 공원 정보 목록 ('name', 'lat', 'lng', 'area', 선택: 'score')
+        quality_scores: {quality_key: 총점} (없으면 parks의 'score', 둘 다 없으면 면적만)
+        catchment: 집수 거리 (미터)
+        decay: 거리 감쇠 함수
+        distances: 미리 계산한 (격자, 공원) 희소 거리 행렬 (없으면 KD-tree 직선 거리)
+
+    Returns:
+        {'access', 'ratio', 'demand', 'supply', 'pairs'}
+    """
+    if distances is None:
+        projection = LocalProjection(float(grid.lat.mean()), float(grid.lng.mean()))
+        grid_xy = np.column_stack(projection.to_xy(grid.lat, grid.lng))
+        park_xy = np.column_stack(projection.to_xy(
+            np.array([park['lat'] for park in parks]), np.array([park['lng'] for park in parks])
+        ))
+        distances = sparse_distances(grid_xy, park_xy, catchment)
+
+    supply = park_supply(parks, quality_scores)
+    result = two_step_fca(distances, grid.population, supply, catchment, decay)
+    result['supply'] = supply
+    result['pairs'] = distances.nnz
+    return result
+
+
+def summarize(grid: PopulationGrid, result: Dict) -> Dict:
+    """
+    리포트용 요약
+
+    인구 가중 평균은 공급 총량 / 인구로 감쇠 함수와 무관하므로 (2SFCA의 공급 보존),
+    감쇠 함수별 차이는 인구가 있는 셀의 중앙값, 90 백분위수로 비교합니다.
+    """
+    population = grid.population
+    total = population.sum()
+    access = result['access']
+    populated = population > 0
+    return {
+        'cells': len(grid),
+        'population': round(float(total)),
+        'parks': len(result['supply']),
+        'pairs': int(result['pairs']),
+        'mean_access': round(float((access * population).sum() / total), 4) if total else 0.0,
+        'zero_access_population_ratio': round(float(population[access <= 0].sum() / total), 4) if total else 0.0,
+        'median_access': round(float(np.median(access[populated])), 4) if populated.any() else 0.0,
+        'p90_access': round(float(np.percentile(access[populated], 90)), 4) if populated.any() else 0.0,
+    }
+
+
+def export_results(
+    grid: PopulationGrid,
+    parks: List[Dict],
+    result: Dict,
+    best_direction_path: str,
+    grid_path: str
+) -> Dict[str, str]:
+    """
+    결과 저장: 공원별 공급 비율은 최고 방향 CSV 옆에 (_2sfca 접미사), 격자 접근성은 별도 CSV
+
+    Args:
+        grid: 인구 격자
+        parks: load_best_direction_parks 결과 (원본 행 포함)
+        result: compute_accessibility 결과
+        best_direction_path: output/park_best_directions.csv
+        grid_path: 격자 결과 CSV 경로
+
+    Returns:
+        {종류: 파일 경로}
+    """
+    best_direction_path = Path(best_direction_path)
+    park_path = best_direction_path.with_name(f"{best_direction_path.stem}_2sfca.csv")
+
+    park_rows = []
+    for park, supply, demand, ratio in zip(parks, result['supply'], result['demand'], result['ratio']):
+        row = dict(park.get('row') or {'공원명': park['name'], '위도': park['lat'], '경도': park['lng']})
+        row.update({
+            '공급량': round(float(supply), 1),
+            '수요인구': round(float(demand), 1),
+            '공급비율': round(float(ratio), 6),
+        })
+        park_rows.append(row)
+
+    # select_best_direction.py와 같은 인코딩 규칙 (Excel용 CP949, 안 되면 UTF-8-BOM)
+    fieldnames = list(park_rows[0]) if park_rows else []
+    try:
+        with open(park_path, 'w', encoding='cp949', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(park_rows)
+    except UnicodeEncodeError:
+        with open(park_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(park_rows)
+
+    grid_path = Path(grid_path)
+    grid_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(grid_path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['위도', '경도', '인구', '접근성'])
+        for lat, lng, population, access in zip(grid.lat, grid.lng, grid.population, result['access']):
+            writer.writerow([f'{lat:.6f}', f'{lng:.6f}', round(float(population), 2), round(float(access), 6)])
+
+    return {'parks': str(park_path), 'grid': str(grid_path)}
@@ -0,0 +1,260 @@
+"""
+Gemini 토큰 사용량/비용 집계 모듈
+
+요청마다 usage_metadata(입력, 출력, 캐시, 사고 토큰)와 응답 시간을 기록하여
+공원별, 실행 전체, 모델별로 집계하고 예상 비용을 계산합니다.
+BudgetGuard는 설정한 토큰/비용 한도에 가까워지면 저가 모델로 바꾸고, 한도에 도달하면 평가를 멈춥니다.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional
+
+from .instrumentation import tracer
+
+# 100만 토큰당 가격 (USD): (입력, 출력+사고, 캐시 입력) - 2025년 공개 가격 기준, GEMINI_PRICES로 덮어쓰기
+DEFAULT_PRICES = {
+    'gemini-2.5-pro': (1.25, 10.00, 0.31),
+    'gemini-2.5-flash': (0.30, 2.50, 0.075),
+    'gemini-2.5-flash-lite': (0.10, 0.40, 0.025),
+}
+
+TOKEN_KEYS = ('prompt_tokens', 'output_tokens', 'cached_tokens', 'thoughts_tokens', 'total_tokens')
+
+
+class BudgetExceededError(RuntimeError):
+    """토큰/비용 한도 도달"""
+
+
+def load_prices() -> Dict[str, tuple]:
+    """
+    모델별 가격표 (환경변수 GEMINI_PRICES에 JSON으로 덮어쓰기)
+
+    예: GEMINI_PRICES='{"gemini-2.5-flash": [0.30, 2.50, 0.075]}'
+    """
+    prices = dict(DEFAULT_PRICES)
+    override = os.getenv('GEMINI_PRICES')
+    if override:
+        prices.update({model: tuple(values) for model, values in json.loads(override).items()})
+    return prices
+
+
+def estimate_cost(model: str, usage: Dict[str, int], prices: Optional[Dict] = None) -> float:
+    """
+    요청 한 건의 예상 비용 (USD)
+
+    Args:
+        model: 모델명
+        usage: 토큰 사용량 (prompt_tokens, output_tokens, cached_tokens, thoughts_tokens)
+        prices: 가격표 (없으면 load_prices)
+
+    Returns:
+        비용 (가격표에 없는 모델이면 0)
+    """
+    prices = prices if prices is not None else load_prices()
+    price = prices.get(model)
+    if price is None:
+        # 버전 접미사가 붙은 모델명 (예: gemini-2.5-flash-preview-05-20)은 가장 긴 접두사로 찾음
+        matches = [name for name in prices if model.startswith(name)]
+        if not matches:
+            return 0.0
+        price = prices[max(matches, key=len)]
+
+    input_price, output_price, cached_price = price
+    cached = usage.get('cached_tokens', 0)
+    uncached = max(0, usage.get('prompt_tokens', 0) - cached)
+    output = usage.get('output_tokens', 0) + usage.get('thoughts_tokens', 0)
+    return (uncached * input_price + cached * cached_price + output * output_price) / 1_000_000
+
+
+def _empty_totals() -> Dict:
+    return {'requests': 0, **{key: 0 for key in TOKEN_KEYS}, 'cost_usd': 0.0, 'latency_sec': 0.0}
+
+
+def _add(totals: Dict, usage: Dict, cost: float, latency_sec: float):
+    totals['requests'] += 1
+    for key in TOKEN_KEYS:
+        totals[key] += usage.get(key, 0)
+    totals['cost_usd'] += cost
+    totals['latency_sec'] += latency_sec
+
+
+def _rounded(totals: Dict) -> Dict:
+    return {**totals, 'cost_usd': round(totals['cost_usd'], 6), 'latency_sec': round(totals['latency_sec'], 3)}
+
+
+class UsageLedger:
+    """요청별 사용량 장부 (스레드 안전)"""
+
+    def __init__(self, prices: Optional[Dict] = None):
+        """
+        초기화
+
+        Args:
+            prices: 모델별 가격표 (없으면 load_prices)
+        """
+        self.prices = prices if prices is not None else load_prices()
+        self._lock = threading.Lock()
+        self.totals = _empty_totals()
+        self.by_park = defaultdict(_empty_totals)
+        self.by_model = defaultdict(_empty_totals)
+        self.by_kind = defaultdict(_empty_totals)
+
+    def record(
+        self,
+        model: str,
+        usage: Dict[str, int],
+        latency_sec: float,
+        park: Optional[str] = None,
+        kind: str = 'evaluate'
+    ) -> float:
+        """
+        요청 한 건 기록
+
+        Args:
+            model: 모델명
+            usage: 토큰 사용량
+            latency_sec: 응답 시간 (초)
+            park: 공원 이름
+            kind: 요청 종류 (evaluate, prescreen 등)
+
+        Returns:
+            이 요청의 예상 비용 (USD)
+        """
+        cost = estimate_cost(model, usage, self.prices)
+
+        with self._lock:
+            _add(self.totals, usage, cost, latency_sec)
+            _add(self.by_model[model], usage, cost, latency_sec)
+            _add(self.by_kind[kind], usage, cost, latency_sec)
+            if park:
+                _add(self.by_park[park], usage, cost, latency_sec)
+
+        tracer.count('gemini.tokens', usage.get('total_tokens', 0), kind=kind)
+        tracer.count('gemini.cost_usd', cost, kind=kind)
+        return cost
+
+    def park_summary(self, park: str) -> Dict:
+        """공원별 합계"""
+        with self._lock:
+            return _rounded(dict(self.by_park.get(park) or _empty_totals()))
+
+    def summary(self) -> Dict:
+        """실행 전체 합계 (모델별, 요청 종류별, 공원별 포함)"""
+        with self._lock:
+            return {
+                **_rounded(self.totals),
+                'by_model': {model: _rounded(totals) for model, totals in self.by_model.items()},
+                'by_kind': {kind: _rounded(totals) for kind, totals in self.by_kind.items()},
+                'by_park': {park: _rounded(totals) for park, totals in self.by_park.items()},
+            }
+
+    def save(self, path):
+        """실행 전체 집계를 JSON으로 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+class BudgetGuard:
+    """
+    토큰/비용 한도
+
+    downgrade_model이 있으면 한도의 downgrade_at 비율에서 저가 모델로 바꾸고,
+    한도(100%)에 도달하면 BudgetExceededError로 평가를 멈춥니다.
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        max_cost_usd: Optional[float] = None,
+        downgrade_model: Optional[str] = None,
+        downgrade_at: float = 0.8
+    ):
+        """
+        초기화
+
+        Args:
+            max_tokens: 실행 전체 토큰 한도
+            max_cost_usd: 실행 전체 비용 한도 (USD)
+            downgrade_model: 한도에 가까워지면 바꿀 모델 (없으면 바꾸지 않고 한도에서 멈춤)
+            downgrade_at: 모델을 바꿀 한도 비율 (0~1)
+        """
+        self.max_tokens = max_tokens
+        self.max_cost_usd = max_cost_usd
+        self.downgrade_model = downgrade_model
+        self.downgrade_at = downgrade_at
+        self.downgraded = False
+        self.exhausted = False
+
+    @classmethod
+    def from_env(cls) -> 'BudgetGuard':
+        """환경변수 GEMINI_BUDGET_TOKENS, GEMINI_BUDGET_USD, GEMINI_BUDGET_DOWNGRADE_MODEL로 생성"""
+        tokens = os.getenv('GEMINI_BUDGET_TOKENS')
+        cost = os.getenv('GEMINI_BUDGET_USD')
+        return cls(
+            max_tokens=int(tokens) if tokens else None,
+            max_cost_usd=float(cost) if cost else None,
+            downgrade_model=os.getenv('GEMINI_BUDGET_DOWNGRADE_MODEL') or None,
+            downgrade_at=float(os.getenv('GEMINI_BUDGET_DOWNGRADE_AT', '0.8'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_tokens is not None or self.max_cost_usd is not None
+
+    def used_ratio(self, ledger: UsageLedger) -> float:
+        """한도 대비 사용 비율 (토큰/비용 중 큰 쪽)"""
+        ratios = [0.0]
+        if self.max_tokens:
+            ratios.append(ledger.totals['total_tokens'] / self.max_tokens)
+        if self.max_cost_usd:
+            ratios.append(ledger.totals['cost_usd'] / self.max_cost_usd)
+        return max(ratios)
+
+    def model_for(self, model: str, ledger: UsageLedger) -> str:
+        """
+        다음 요청에 쓸 모델
+
+        Args:
+            model: 원래 모델
+            ledger: 사용량 장부
+
+        Returns:
+            모델명 (한도에 가까우면 downgrade_model)
+
+        Raises:
+            BudgetExceededError: 한도에 도달한 경우
+        """
+        if not self.enabled:
+            return model
+
+        ratio = self.used_ratio(ledger)
+        if ratio >= 1.0:
+            self.exhausted = True
+            raise BudgetExceededError(
+                f"사용량 한도 도달 ({ratio:.0%}): 토큰 {ledger.totals['total_tokens']:,}, "
+                f"비용 ${ledger.totals['cost_usd']:.4f}"
+            )
+
+        if self.downgrade_model and ratio >= self.downgrade_at:
+            if not self.downgraded:
+                self.downgraded = True
+                tracer.count('gemini.budget_downgrades')
+            return self.downgrade_model
+
+        return model
+
+    def snapshot(self) -> Dict:
+        """리포트용 상태"""
+        return {
+            'max_tokens': self.max_tokens,
+            'max_cost_usd': self.max_cost_usd,
+            'downgrade_model': self.downgrade_model,
+            'downgraded': self.downgraded,
+            'exhausted': self.exhausted,
+        }